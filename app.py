@@ -7,7 +7,6 @@ für Suchfunktionen. Die Webanwendung wird im Debug-Modus ausgeführt.
 from flask import Flask
 from blueprints.search.routes import search_bp
 import logging
-from logging.config import dictConfig
 import config
 import webbrowser
 import threading
@@ -25,14 +24,14 @@ def create_app():
     app.config.from_object(config.Config)
 
     # Konfiguriere das Logging gemäß den Einstellungen in der Konfigurationsdatei
-    dictConfig(app.config['LOGGING'])
+    config.configure_logging(app.config['LOGGING'])
 
     detailed_logger = logging.getLogger('detailed')
     important_logger = logging.getLogger('important')
     error_logger = logging.getLogger('errors')
 
     detailed_logger.debug('Flask application configuration loaded.')
-    detailed_logger.debug(f'Application config.json: {app.config}')
+    detailed_logger.debug('Application config.json: %s', app.config)
 
     # Registriere den Blueprint für die Suchfunktionen
     app.register_blueprint(search_bp)
@@ -48,7 +47,7 @@ def open_browser():
         webbrowser.open('http://127.0.0.1:5000')
         logging.getLogger('important').info('Web browser opened successfully.')
     except Exception as e:
-        logging.getLogger('errors').error(f'Failed to open web browser: {e}')
+        logging.getLogger('errors').error('Failed to open web browser: %s', e)
 
 if __name__ == '__main__':
     detailed_logger = logging.getLogger('detailed')
@@ -66,11 +65,11 @@ if __name__ == '__main__':
         threading.Timer(1, open_browser).start()
         important_logger.info('Browser will be opened shortly...')
     except Exception as e:
-        error_logger.error(f'Failed to start browser thread: {e}')
+        error_logger.error('Failed to start browser thread: %s', e)
 
     # Starte die Flask-Anwendung im Debug-Modus
     try:
         app.run(debug=True)
         important_logger.info('Flask application running...')
     except Exception as e:
-        error_logger.critical(f'Failed to run Flask application: {e}')
+        error_logger.critical('Failed to run Flask application: %s', e)
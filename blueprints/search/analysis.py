@@ -1,9 +1,213 @@
 import os
+import logging
+import threading
+import numpy as np
 import pandas as pd
 from flask import current_app
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 
-def read_and_search_file(file_path, query, app):
+from .index import SearchIndex, index_path_for, is_indexable
+from .archives import ARCHIVES_FILENAME, list_archive_members, open_binary, open_source_columnar, source_size
+from .corpora import search_roots
+from .metrics import collect_timings, record_timings, submit, timed
+from .results import ResultTable
+
+# Ungefährer Faktor zwischen Rohtextgröße und Speicherbedarf des eingelesenen DataFrames
+DATAFRAME_OVERHEAD = 4
+
+# Verfügbare Backends für die parallele Dateisuche
+SEARCH_BACKENDS = ('thread', 'process')
+
+# Prozess-Pools werden pro Worker-Anzahl einmal erzeugt und wiederverwendet
+_process_pools = {}
+_process_pools_lock = threading.Lock()
+
+def match_rowwise(df, query_lower, regex=False):
+    """
+    Ursprüngliche zeilenweise Suche: baut für jede Zeile eine Series und prüft jede Zelle.
+
+    Args:
+        df (pandas.DataFrame): Die zu durchsuchenden Daten.
+        query_lower (str): Die kleingeschriebene Suchabfrage.
+        regex (bool): Ob die Abfrage als regulärer Ausdruck ausgewertet wird.
+
+    Returns:
+        numpy.ndarray: Boolesche Maske der passenden Zeilen.
+    """
+    return df.apply(lambda row: row.astype(str).str.lower().str.contains(query_lower, regex=regex).any(),
+                    axis=1).to_numpy(dtype=bool)
+
+def match_vectorized(df, query_lower, regex=False):
+    """
+    Spaltenweise Suche: jede Spalte wird einmal kleingeschrieben und vektorisiert durchsucht,
+    die Masken der Spalten werden anschließend ODER-verknüpft.
+
+    Args:
+        df (pandas.DataFrame): Die zu durchsuchenden Daten.
+        query_lower (str): Die kleingeschriebene Suchabfrage.
+        regex (bool): Ob die Abfrage als regulärer Ausdruck ausgewertet wird.
+
+    Returns:
+        numpy.ndarray: Boolesche Maske der passenden Zeilen.
+    """
+    mask = np.zeros(len(df), dtype=bool)
+    for column in df.columns:
+        values = df[column].astype(str)
+        # Numerische Spalten enthalten keine Großbuchstaben, das Kleinschreiben kann entfallen
+        if not (pd.api.types.is_numeric_dtype(df[column]) or pd.api.types.is_bool_dtype(df[column])):
+            values = values.str.lower()
+        mask |= values.str.contains(query_lower, regex=regex, na=False).to_numpy(dtype=bool)
+    return mask
+
+# Verfügbare Such-Engines, auswählbar über den Parameter `engine` von `search_files`
+MATCH_ENGINES = {
+    'vectorized': match_vectorized,
+    'rowwise': match_rowwise,
+}
+
+def filter_matches(df, query_lower, engine='vectorized', regex=False, columns=None):
+    """
+    Filtert die Zeilen eines DataFrames, in denen mindestens eine Zelle die Abfrage enthält.
+
+    Args:
+        df (pandas.DataFrame): Die zu durchsuchenden Daten.
+        query_lower (str): Die kleingeschriebene Suchabfrage.
+        engine (str): Die Such-Engine (siehe `MATCH_ENGINES`).
+        regex (bool): Ob die Abfrage als regulärer Ausdruck ausgewertet wird.
+        columns (list): Nur diese Spalten durchsuchen; None durchsucht alle Spalten.
+
+    Returns:
+        pandas.DataFrame: Die passenden Zeilen.
+    """
+    if df.empty:
+        return df
+    searched = df if columns is None else df[[column for column in df.columns if column in columns]]
+    if searched.columns.empty:
+        return df.iloc[0:0]
+    return df[MATCH_ENGINES[engine](searched, query_lower, regex=regex)]
+
+def estimate_chunk_rows(file_path, chunk_bytes, sample_bytes=64 * 1024):
+    """
+    Schätzt, wie viele Zeilen einer Datei in das Speicherbudget eines Chunks passen.
+
+    Die durchschnittliche Zeilenlänge wird aus einer Stichprobe am Dateianfang ermittelt; der Faktor
+    `DATAFRAME_OVERHEAD` berücksichtigt, dass ein DataFrame deutlich mehr Speicher belegt als der Rohtext.
+
+    Args:
+        file_path (str): Der Pfad zur Datei.
+        chunk_bytes (int): Das Speicherbudget pro Chunk in Bytes.
+        sample_bytes (int): Die Größe der Stichprobe in Bytes.
+
+    Returns:
+        int: Die Anzahl der Zeilen pro Chunk.
+    """
+    with open_binary(file_path) as handle:
+        handle.readline()
+        sample = handle.read(sample_bytes)
+    average_row_bytes = len(sample) / max(sample.count(b'\n'), 1) or 1
+    return max(1, int(chunk_bytes / (average_row_bytes * DATAFRAME_OVERHEAD)))
+
+def iter_matching_chunks(file_path, query_lower, chunk_rows, engine='vectorized', regex=False, columns=None):
+    """
+    Durchsucht eine Datei chunkweise und liefert die passenden Zeilen jedes Chunks als DataFrame.
+
+    Args:
+        file_path (str): Der Pfad zur Datei.
+        query_lower (str): Die kleingeschriebene Suchabfrage.
+        chunk_rows (int): Die Anzahl der Zeilen pro Chunk.
+        engine (str): Die Such-Engine (siehe `MATCH_ENGINES`).
+        regex (bool): Ob die Abfrage als regulärer Ausdruck ausgewertet wird.
+        columns (list): Nur diese Spalten durchsuchen; None durchsucht alle Spalten.
+
+    Yields:
+        pandas.DataFrame: Die Treffer eines Chunks.
+    """
+    with open_binary(file_path) as handle, pd.read_csv(handle, sep="\t", chunksize=chunk_rows) as reader:
+        chunks = iter(reader)
+        while True:
+            with timed('parse'):
+                chunk = next(chunks, None)
+            if chunk is None:
+                return
+            with timed('match'):
+                matches = filter_matches(chunk, query_lower, engine=engine, regex=regex, columns=columns)
+            if not matches.empty:
+                yield matches
+
+def iter_search_file(file_path, query, chunk_rows, engine='vectorized', regex=False):
+    """
+    Durchsucht eine Datei chunkweise und liefert die Treffer jedes Chunks, sobald er verarbeitet ist.
+
+    Es wird immer nur ein Chunk gleichzeitig im Speicher gehalten.
+
+    Args:
+        file_path (str): Der Pfad zur Datei.
+        query (str): Die Suchabfrage.
+        chunk_rows (int): Die Anzahl der Zeilen pro Chunk.
+        engine (str): Die Such-Engine (siehe `MATCH_ENGINES`).
+        regex (bool): Ob die Abfrage als regulärer Ausdruck ausgewertet wird.
+
+    Yields:
+        ResultTable: Die Treffer eines Chunks.
+    """
+    for matches in iter_matching_chunks(file_path, query.lower(), chunk_rows, engine=engine, regex=regex):
+        yield ResultTable.from_frame(matches)
+
+def scan_file(file_path, query, logger, engine='vectorized', regex=False, chunk_bytes=None, columns=None):
+    """
+    Liest eine TXT-Datei ein und gibt die passenden Zeilen zurück.
+
+    Liegt ein aktueller spaltenbasierter Cache vor (siehe `columnar`), wird dieser per Memory-Mapping
+    durchsucht und der Text nicht mehr geparst. Andernfalls werden Dateien, die größer als `chunk_bytes`
+    sind, im Streaming-Modus chunkweise gelesen, damit der Speicherbedarf pro Worker begrenzt bleibt.
+
+    Args:
+        file_path (str): Der Pfad zur Datei.
+        query (str): Die Suchabfrage.
+        logger (logging.Logger): Der Logger für Debug-Ausgaben.
+        engine (str): Die Such-Engine (siehe `MATCH_ENGINES`).
+        regex (bool): Ob die Abfrage als regulärer Ausdruck ausgewertet wird.
+        chunk_bytes (int): Speicherbudget pro Chunk in Bytes; None liest die Datei immer vollständig.
+        columns (list): Nur diese Spalten durchsuchen; None durchsucht alle Spalten.
+
+    Returns:
+        pandas.DataFrame: Die passenden Zeilen; der Index enthält ihre Zeilennummern in der Datei.
+    """
+    # Convert query to lowercase for case-insensitive search
+    query_lower = query.lower()
+
+    # Die zeilenweise Engine dient als Referenz und liest deshalb immer den Text
+    with timed('parse'):
+        table = open_source_columnar(file_path) if engine != 'rowwise' else None
+    if table is not None:
+        block_rows = max(1, chunk_bytes // table.meta['text_bytes_per_row']) if chunk_bytes else None
+        logger.debug("Searching columnar cache of file: %s with query: %s", file_path, query)
+        with timed('match'):
+            return table.search(query_lower, columns=columns, regex=regex, block_rows=block_rows)
+
+    if chunk_bytes and source_size(file_path) > chunk_bytes:
+        chunk_rows = estimate_chunk_rows(file_path, chunk_bytes)
+        logger.debug("Streaming file: %s in chunks of %s rows with query: %s", file_path, chunk_rows, query)
+        chunks = list(iter_matching_chunks(file_path, query_lower, chunk_rows, engine=engine, regex=regex,
+                                           columns=columns))
+        # Der Index der Chunks zählt über die ganze Datei weiter und bleibt als Zeilennummer erhalten
+        return pd.concat(chunks) if chunks else pd.DataFrame()
+
+    with timed('parse'), open_binary(file_path) as handle:
+        df = pd.read_csv(handle, sep="\t")
+    logger.debug("Processing file: %s (%d rows) with query: %s", file_path, len(df), query)
+
+    # Search for matches in the DataFrame
+    with timed('match'):
+        matches = filter_matches(df, query_lower, engine=engine, regex=regex, columns=columns)
+
+    # Nur die Anzahl protokollieren: DataFrames pro Datei zu formatieren kostet mehr als die Suche selbst
+    if not matches.empty:
+        logger.debug("Found %d matches in file: %s", len(matches), file_path)
+    return matches
+
+def read_and_search_file(file_path, query, app, engine='vectorized', regex=False, chunk_bytes=None, columns=None):
     """
     Liest eine CSV-Datei ein und durchsucht sie nach einer bestimmten Abfrage.
 
@@ -11,68 +215,347 @@ def read_and_search_file(file_path, query, app):
         file_path (str): Der Pfad zur Datei.
         query (str): Die Suchabfrage.
         app (Flask): Die Flask-Anwendung für Logging.
+        engine (str): Die Such-Engine (siehe `MATCH_ENGINES`).
+        regex (bool): Ob die Abfrage als regulärer Ausdruck ausgewertet wird.
+        chunk_bytes (int): Speicherbudget pro Chunk in Bytes; None liest die Datei immer vollständig.
+        columns (list): Nur diese Spalten durchsuchen; None durchsucht alle Spalten.
 
     Returns:
-        list: Eine Liste der gefundenen Ergebnisse.
+        ResultTable: Die gefundenen Ergebnisse.
+    """
+    try:
+        matches = scan_file(file_path, query, app.logger, engine=engine, regex=regex, chunk_bytes=chunk_bytes,
+                            columns=columns)
+        with timed('serialize'):
+            return ResultTable.from_frame(matches)
+    except Exception as e:
+        with app.app_context():
+            app.logger.error("Error processing file %s: %s", file_path, e)
+        return ResultTable(error=str(e))
+
+def read_and_search_indexed_file(index, file_id, rows, query, app, engine='vectorized', columns=None):
+    """
+    Liest nur die vom Index gelieferten Kandidatenzeilen einer Datei und verifiziert sie gegen die Abfrage.
+
+    Args:
+        index (SearchIndex): Der Suchindex.
+        file_id (int): Die Datei-ID im Index.
+        rows (list): Die Kandidatenzeilen.
+        query (str): Die Suchabfrage.
+        app (Flask): Die Flask-Anwendung für Logging.
+        engine (str): Die Such-Engine (siehe `MATCH_ENGINES`).
+        columns (list): Nur diese Spalten durchsuchen; None durchsucht alle Spalten.
+
+    Returns:
+        ResultTable: Die gefundenen Ergebnisse.
     """
     try:
-        df = pd.read_csv(file_path, sep="\t")
-        app.logger.debug(f"Processing file: {file_path} with query: {query}")
+        with timed('parse'):
+            df = index.read_rows(file_id, rows)
+        with timed('match'):
+            matches = filter_matches(df, query.lower(), engine=engine, columns=columns)
+        with timed('serialize'):
+            return ResultTable.from_frame(matches)
+    except Exception as e:
+        with app.app_context():
+            app.logger.error("Error reading indexed rows of file %s: %s", file_id, e)
+        return ResultTable(error=str(e))
 
-        # Convert query to lowercase for case-insensitive search
-        query_lower = query.lower()
+def search_file_in_process(file_path, query, engine='vectorized', regex=False, chunk_bytes=None, columns=None):
+    """
+    Worker-Funktion des Prozess-Backends: durchsucht eine Datei ohne Zugriff auf die Flask-Anwendung.
+
+    Args:
+        file_path (str): Der Pfad zur Datei.
+        query (str): Die Suchabfrage.
+        engine (str): Die Such-Engine (siehe `MATCH_ENGINES`).
+        regex (bool): Ob die Abfrage als regulärer Ausdruck ausgewertet wird.
+        chunk_bytes (int): Speicherbudget pro Chunk in Bytes.
+        columns (list): Nur diese Spalten durchsuchen; None durchsucht alle Spalten.
 
-        # Log the first few rows of the dataframe for debugging
-        app.logger.debug(f"First few rows of the dataframe:\n{df.head()}")
+    Returns:
+        ResultTable: Die Treffer; bei einem Fehler leer mit gesetztem `error`.
+    """
+    try:
+        matches = scan_file(file_path, query, logging.getLogger('detailed'), engine=engine, regex=regex,
+                            chunk_bytes=chunk_bytes, columns=columns)
+        with timed('serialize'):
+            return ResultTable.from_frame(matches)
+    except Exception as e:
+        logging.getLogger('errors').error("Error processing file %s: %s", file_path, e)
+        return ResultTable(error=str(e))
 
-        # Search for matches in the DataFrame
-        matches = df[df.apply(lambda row: row.astype(str).str.lower().str.contains(query_lower).any(), axis=1)]
+def search_indexed_file_in_process(index_path, file_id, rows, query, engine='vectorized', columns=None):
+    """
+    Worker-Funktion des Prozess-Backends für Dateien, die über den Index beantwortet werden.
 
-        if not matches.empty:
-            app.logger.debug(f"Found matches in file: {file_path}\n{matches}")
+    Args:
+        index_path (str): Der Pfad zur Index-Datenbank.
+        file_id (int): Die Datei-ID im Index.
+        rows (list): Die Kandidatenzeilen.
+        query (str): Die Suchabfrage.
+        engine (str): Die Such-Engine (siehe `MATCH_ENGINES`).
+        columns (list): Nur diese Spalten durchsuchen; None durchsucht alle Spalten.
 
-        return [row.to_dict() for _, row in matches.iterrows()]
+    Returns:
+        ResultTable: Die Treffer; bei einem Fehler leer mit gesetztem `error`.
+    """
+    try:
+        with timed('parse'):
+            df = SearchIndex(index_path).read_rows(file_id, rows)
+        with timed('match'):
+            matches = filter_matches(df, query.lower(), engine=engine, columns=columns)
+        with timed('serialize'):
+            return ResultTable.from_frame(matches)
     except Exception as e:
-        with app.app_context():
-            app.logger.error(f"Error processing file {file_path}: {e}")
-        return []
+        logging.getLogger('errors').error("Error reading indexed rows of file %s: %s", file_id, e)
+        return ResultTable(error=str(e))
 
-def search_files(query, extract_dir, app, max_workers=4):
+def get_process_pool(max_workers):
     """
-    Durchsucht alle CSV-Dateien in einem angegebenen Verzeichnis nach einer bestimmten Abfrage.
+    Gibt einen wiederverwendbaren Prozess-Pool mit der angegebenen Anzahl Worker zurück.
+
+    Der Pool wird beim ersten Aufruf erzeugt und anschließend für alle Suchen wiederverwendet, damit die
+    Startkosten der Prozesse nicht bei jeder Anfrage anfallen.
+
+    Args:
+        max_workers (int): Die Anzahl der Worker-Prozesse.
+
+    Returns:
+        concurrent.futures.ProcessPoolExecutor: Der Prozess-Pool.
+    """
+    with _process_pools_lock:
+        pool = _process_pools.get(max_workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=max_workers)
+            _process_pools[max_workers] = pool
+        return pool
+
+def discard_process_pool(max_workers):
+    """
+    Entfernt einen (z.B. durch einen abgestürzten Worker) unbrauchbaren Prozess-Pool aus dem Cache.
+
+    Args:
+        max_workers (int): Die Anzahl der Worker-Prozesse des Pools.
+    """
+    with _process_pools_lock:
+        pool = _process_pools.pop(max_workers, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def file_size(file_path):
+    """
+    Gibt die Größe einer Datei (bzw. eines ZIP-Members) zurück, oder 0, wenn sie nicht (mehr) existiert.
+
+    Args:
+        file_path (str): Der Pfad zur Datei oder der virtuelle Member-Pfad.
+
+    Returns:
+        int: Die Dateigröße in Bytes.
+    """
+    return source_size(file_path)
+
+def list_txt_files(extract_dir, corpora=None):
+    """
+    Listet alle TXT-Dateien eines Verzeichnisses in einer stabilen (sortierten) Reihenfolge auf.
+
+    Die TXT-Members der für die Suche ohne Entpacken registrierten ZIP-Dateien (siehe `archives`) werden als
+    virtuelle Pfade `<ZIP-Pfad>/<Member>` mit aufgeführt. Die Position einer Datei in dieser Liste dient als
+    Dateinummer für Cursor bei der seitenweisen Suche.
+
+    Args:
+        extract_dir (str): Das zu durchsuchende Verzeichnis.
+        corpora (list): Optional die Korpus-IDs (siehe `corpora`), auf die die Liste beschränkt wird.
+
+    Returns:
+        list: Die sortierten Dateipfade.
+
+    Raises:
+        UnknownCorpusError: Wenn eine Korpus-ID nicht existiert.
+    """
+    txt_files = []
+    with timed('discover'):
+        for search_root in search_roots(extract_dir, corpora):
+            for root, _, files in os.walk(search_root):
+                txt_files.extend(os.path.join(root, file) for file in files if file.endswith('.txt'))
+                if ARCHIVES_FILENAME in files:
+                    txt_files.extend(list_archive_members(root))
+    return sorted(txt_files)
+
+def table_name_for(file_path):
+    """
+    Leitet den Tabellennamen aus dem Dateinamen ab (z.B. `Fzausweis_3.txt` -> `Fzausweis`).
+
+    Args:
+        file_path (str): Der Pfad zur TXT-Datei.
+
+    Returns:
+        str: Der Tabellenname.
+    """
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    table, _, number = name.rpartition('_')
+    return table if table and number.isdigit() else name
+
+def iter_search_results(query, extract_dir, app, max_workers=4, index_path=None, engine='vectorized', regex=False,
+                        chunk_bytes=None, backend=None, skip_files=(), columns=None, corpora=None):
+    """
+    Durchsucht alle TXT-Dateien eines Verzeichnisses und liefert die Treffer jeder Datei, sobald sie fertig ist.
+
+    Dateien, die aktuell im invertierten Index stehen, werden über den Index beantwortet; nur für
+    noch nicht indexierte Dateien wird ein Vollscan durchgeführt. Die größten Dateien werden zuerst
+    eingeplant, damit eine einzelne große Tabelle nicht das Ende der Suche aufhält. Wird der Generator
+    vorzeitig geschlossen, werden noch nicht gestartete Dateien abgebrochen.
 
     Args:
         query (str): Die Suchabfrage.
         extract_dir (str): Das Verzeichnis, in dem die Dateien durchsucht werden sollen.
         app (Flask): Die Flask-Anwendung für Logging.
         max_workers (int): Die maximale Anzahl der Worker-Threads.
+        index_path (str): Pfad zur Index-Datenbank. Standardmäßig liegt sie im Extraktionsverzeichnis.
+        engine (str): Die Such-Engine (siehe `MATCH_ENGINES`).
+        regex (bool): Ob die Abfrage als regulärer Ausdruck ausgewertet wird (deaktiviert den Index).
+        chunk_bytes (int): Speicherbudget pro Worker für den Streaming-Modus. Standardmäßig
+            `SEARCH_CHUNK_BYTES` aus der Konfiguration.
+        backend (str): 'thread' oder 'process'. Standardmäßig `SEARCH_BACKEND` aus der Konfiguration;
+            das Prozess-Backend verwendet `SEARCH_PROCESS_WORKERS` Worker-Prozesse.
+        skip_files (iterable): Dateinummern (siehe `list_txt_files`), die übersprungen werden.
+        columns (list): Nur diese Spalten durchsuchen (Projektion); None durchsucht alle Spalten.
+        corpora (list): Nur die Dateien dieser Korpora durchsuchen; None durchsucht alle.
 
-    Returns:
-        list: Eine Liste der gefundenen Ergebnisse.
+    Yields:
+        tuple: Dateinummer, Dateipfad und die Treffer dieser Datei (`ResultTable`).
     """
-    results = []
+    if engine not in MATCH_ENGINES:
+        raise ValueError(f"Unknown search engine: {engine}")
+
+    if backend is None:
+        backend = app.config.get('SEARCH_BACKEND', 'thread')
+    if backend not in SEARCH_BACKENDS:
+        raise ValueError(f"Unknown search backend: {backend}")
+
+    if chunk_bytes is None:
+        chunk_bytes = app.config.get('SEARCH_CHUNK_BYTES')
+
     query = query.lower()
 
-    app.logger.debug(f"Starting search in directory: {extract_dir} with query: {query}")
+    app.logger.debug("Starting search in directory: %s with query: %s", extract_dir, query)
 
+    futures = {}
+    pending = None
+    thread_executor = None
+    process_workers = None
     try:
-        file_paths = [os.path.join(root, file)
-                      for root, _, files in os.walk(extract_dir)
-                      for file in files if file.endswith('.txt')]
+        skip_files = set(skip_files)
+        file_numbers = {os.path.abspath(file_path): number
+                        for number, file_path in enumerate(list_txt_files(extract_dir, corpora))
+                        if number not in skip_files}
+        file_paths = list(file_numbers)
+        # Noch nicht gelieferte Dateien (werden bei einem Fehler als fehlgeschlagen gemeldet)
+        pending = dict.fromkeys(file_paths)
+
+        app.logger.debug("Found TXT files: %s", file_paths)
+
+        with timed('index'):
+            index = SearchIndex(index_path or index_path_for(extract_dir))
+            covered = index.covered_files(file_paths) if is_indexable(query, regex) else {}
+            candidates = index.candidate_rows(query, covered.values()) if covered else {}
+        indexed_paths = {file_id: file_path for file_path, file_id in covered.items()}
+        unindexed = [file_path for file_path in file_paths if file_path not in covered]
+        unindexed.sort(key=file_size, reverse=True)
+
+        app.logger.debug("Index covers %s files, full scan for %s files", len(covered), len(unindexed))
 
-        app.logger.debug(f"Found TXT files: {file_paths}")
+        # Dateipfad -> (Worker-Funktion, Argumente), damit Dateien auf einem neuen Pool erneut gestartet werden können
+        tasks = {}
+        if backend == 'process':
+            process_workers = app.config.get('SEARCH_PROCESS_WORKERS') or os.cpu_count()
+            executor = get_process_pool(process_workers)
+            # Die Worker erhalten nur Pfade und Parameter, nicht die Flask-Anwendung; ihre Zeiten kommen mit dem
+            # Ergebnis zurück
+            for file_id, rows in candidates.items():
+                tasks[indexed_paths[file_id]] = (search_indexed_file_in_process,
+                                                 (index.path, file_id, rows, query, engine, columns))
+            for file_path in unindexed:
+                tasks[file_path] = (search_file_in_process, (file_path, query, engine, regex, chunk_bytes, columns))
+        else:
+            executor = thread_executor = ThreadPoolExecutor(max_workers=max_workers)
+            for file_id, rows in candidates.items():
+                tasks[indexed_paths[file_id]] = (read_and_search_indexed_file,
+                                                 (index, file_id, rows, query, app, engine, columns))
+            for file_path in unindexed:
+                tasks[file_path] = (read_and_search_file,
+                                    (file_path, query, app, engine, regex, chunk_bytes, columns))
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(read_and_search_file, file_path, query, app): file_path for file_path in file_paths}
+        def start(file_path):
+            function, args = tasks[file_path]
+            if process_workers is not None:
+                return executor.submit(collect_timings, function, *args)
+            return submit(executor, function, *args)
 
-            for future in as_completed(futures):
-                file_results = future.result()
-                if file_results:
-                    app.logger.debug(f"Results from file: {futures[future]}\n{file_results}")
-                    results.extend(file_results)
+        futures = {start(file_path): file_path for file_path in tasks}
+        retried = False
+        while futures:
+            try:
+                for future in as_completed(futures):
+                    file_path = futures[future]
+                    file_results = future.result()
+                    del futures[future]
+                    del pending[file_path]
+                    if process_workers is not None:
+                        file_results, timings = file_results
+                        record_timings(timings)
+                    if file_results:
+                        app.logger.debug("Results from file: %s: %d rows", file_path, len(file_results))
+                    yield file_numbers[file_path], file_path, file_results
+            except BrokenProcessPool as e:
+                # Ein abgestürzter Worker reißt den ganzen Pool mit: die offenen Dateien einmal auf einem neuen Pool
+                # wiederholen, danach als fehlgeschlagen melden
+                discard_process_pool(process_workers)
+                app.logger.error("Process pool broke while searching %d files: %s", len(futures), e)
+                if retried:
+                    raise
+                retried = True
+                executor = get_process_pool(process_workers)
+                futures = {start(file_path): file_path for file_path in futures.values()}
     except Exception as e:
         with app.app_context():
-            app.logger.error(f"Error searching files: {e}")
+            app.logger.error("Error searching files: %s", e)
+        if pending is None:
+            raise
+        # Nicht durchsuchte Dateien als fehlgeschlagen melden, damit die Antwort als unvollständig erkennbar ist
+        for file_path in list(pending):
+            yield file_numbers[file_path], file_path, ResultTable(error=str(e))
+    finally:
+        for future in futures:
+            future.cancel()
+        if thread_executor is not None:
+            thread_executor.shutdown(wait=False)
+
+def search_files(query, extract_dir, app, max_workers=4, index_path=None, engine='vectorized', regex=False,
+                 chunk_bytes=None, backend=None, columns=None):
+    """
+    Durchsucht alle CSV-Dateien in einem angegebenen Verzeichnis nach einer bestimmten Abfrage.
+
+    Args:
+        query (str): Die Suchabfrage.
+        extract_dir (str): Das Verzeichnis, in dem die Dateien durchsucht werden sollen.
+        app (Flask): Die Flask-Anwendung für Logging.
+        max_workers (int): Die maximale Anzahl der Worker-Threads.
+        index_path (str): Pfad zur Index-Datenbank. Standardmäßig liegt sie im Extraktionsverzeichnis.
+        engine (str): Die Such-Engine (siehe `MATCH_ENGINES`).
+        regex (bool): Ob die Abfrage als regulärer Ausdruck ausgewertet wird (deaktiviert den Index).
+        chunk_bytes (int): Speicherbudget pro Worker für den Streaming-Modus.
+        backend (str): 'thread' oder 'process' (siehe `iter_search_results`).
+        columns (list): Nur diese Spalten durchsuchen; None durchsucht alle Spalten.
+
+    Returns:
+        list: Eine Liste der gefundenen Ergebnisse.
+    """
+    results = []
+    for _, _, file_results in iter_search_results(query, extract_dir, app, max_workers=max_workers,
+                                                  index_path=index_path, engine=engine, regex=regex,
+                                                  chunk_bytes=chunk_bytes, backend=backend, columns=columns):
+        results.extend(file_results)
 
-    app.logger.debug(f"Total results found: {len(results)}")
+    app.logger.debug("Total results found: %s", len(results))
     return results
@@ -0,0 +1,171 @@
+"""
+Suche direkt in ZIP-Archiven (Read-in-place).
+
+Registrierte ZIP-Dateien werden nicht entpackt: ihre TXT-Members erscheinen in der Dateiliste der Suche als virtuelle
+Pfade `<ZIP-Pfad>/<Member>` und werden bei der Suche über `zipfile`-Ströme gelesen. Gespeicherte (unkomprimierte)
+Members werden dabei ohne Dekompression durchgereicht. Wurden die Members beim Ingest direkt in den spaltenbasierten
+Cache gestreamt (`EXTRACT_STREAM`), wird stattdessen dieser Cache durchsucht.
+
+Die Registrierung liegt als `archives.json` im Extraktionsverzeichnis und enthält die absoluten ZIP-Pfade.
+"""
+
+import json
+import os
+import threading
+import zipfile
+
+from .columnar import load_columnar, open_columnar
+from .pipeline import member_columnar_path, zip_stamp
+
+ARCHIVES_FILENAME = 'archives.json'
+
+_registry_lock = threading.Lock()
+
+
+def registry_path_for(extract_dir):
+    """
+    Gibt den Pfad der Archiv-Registrierung eines Extraktionsverzeichnisses zurück.
+
+    Args:
+        extract_dir (str): Das Extraktionsverzeichnis.
+
+    Returns:
+        str: Der Pfad zu `archives.json`.
+    """
+    return os.path.join(extract_dir, ARCHIVES_FILENAME)
+
+
+def registered_archives(extract_dir):
+    """
+    Liest die registrierten ZIP-Dateien.
+
+    Args:
+        extract_dir (str): Das Extraktionsverzeichnis.
+
+    Returns:
+        list: Die absoluten ZIP-Pfade.
+    """
+    try:
+        with open(registry_path_for(extract_dir)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def register_archive(extract_dir, zip_path):
+    """
+    Registriert eine ZIP-Datei für die Suche ohne Entpacken.
+
+    Args:
+        extract_dir (str): Das Extraktionsverzeichnis, in dem gesucht wird.
+        zip_path (str): Der Pfad zur ZIP-Datei.
+    """
+    path = registry_path_for(extract_dir)
+    with _registry_lock:
+        archives = registered_archives(extract_dir)
+        if os.path.abspath(zip_path) in archives:
+            return
+        archives.append(os.path.abspath(zip_path))
+        os.makedirs(extract_dir, exist_ok=True)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(archives, f)
+        os.replace(path + '.tmp', path)
+
+
+def list_archive_members(extract_dir):
+    """
+    Listet die TXT-Members aller registrierten ZIP-Dateien als virtuelle Pfade.
+
+    Args:
+        extract_dir (str): Das Extraktionsverzeichnis.
+
+    Returns:
+        list: Die Pfade `<ZIP-Pfad>/<Member>`; nicht mehr vorhandene ZIP-Dateien werden übersprungen.
+    """
+    members = []
+    for zip_path in registered_archives(extract_dir):
+        try:
+            with zipfile.ZipFile(zip_path, 'r') as zip_file:
+                members.extend(f"{zip_path}/{name}" for name in zip_file.namelist() if name.endswith('.txt'))
+        except (OSError, zipfile.BadZipFile):
+            continue
+    return members
+
+
+def split_member_path(path):
+    """
+    Zerlegt einen virtuellen Member-Pfad in ZIP-Pfad und Member-Namen.
+
+    Args:
+        path (str): Der Pfad.
+
+    Returns:
+        tuple: ZIP-Pfad und Member-Name, oder None für gewöhnliche Dateien.
+    """
+    start = 0
+    while True:
+        position = path.find('.zip/', start)
+        if position < 0:
+            return None
+        zip_path = path[:position + 4]
+        if os.path.isfile(zip_path):
+            return zip_path, path[position + 5:]
+        start = position + 1
+
+
+def open_binary(path):
+    """
+    Öffnet eine TXT-Datei oder einen ZIP-Member zum binären Lesen.
+
+    Args:
+        path (str): Dateipfad oder virtueller Member-Pfad.
+
+    Returns:
+        io.BufferedIOBase: Der geöffnete Strom (muss vom Aufrufer geschlossen werden).
+    """
+    member = split_member_path(path)
+    if member is None:
+        return open(path, 'rb')
+    # Der Member-Strom hält die ZIP-Datei auch nach dem Schließen des ZipFile-Objekts offen
+    with zipfile.ZipFile(member[0], 'r') as zip_file:
+        return zip_file.open(member[1])
+
+
+def source_size(path):
+    """
+    Gibt die (unkomprimierte) Größe einer Datei oder eines ZIP-Members zurück, oder 0, wenn sie fehlt.
+
+    Args:
+        path (str): Dateipfad oder virtueller Member-Pfad.
+
+    Returns:
+        int: Die Größe in Bytes.
+    """
+    try:
+        member = split_member_path(path)
+        if member is None:
+            return os.path.getsize(path)
+        with zipfile.ZipFile(member[0], 'r') as zip_file:
+            return zip_file.getinfo(member[1]).file_size
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return 0
+
+
+def open_source_columnar(path):
+    """
+    Öffnet den spaltenbasierten Cache einer Datei oder eines gestreamten ZIP-Members.
+
+    Args:
+        path (str): Dateipfad oder virtueller Member-Pfad.
+
+    Returns:
+        ColumnarTable: Die geöffnete Tabelle oder None.
+    """
+    member = split_member_path(path)
+    if member is None:
+        return open_columnar(path)
+    zip_path, member_name = member
+    try:
+        return load_columnar(member_columnar_path(zip_path, member_name), zip_stamp(zip_path))
+    except OSError:
+        return None
@@ -0,0 +1,233 @@
+"""
+LRU-Cache für Suchergebnisse.
+
+Der Schlüssel besteht aus der normalisierten Suchanfrage und einem Fingerabdruck des extrahierten Korpus
+(Pfade, Größen und Änderungszeiten aller TXT-Dateien). Ändert sich der Korpus, ändert sich damit auch der
+Schlüssel, sodass veraltete Ergebnisse nie ausgeliefert werden. Die Größe des Caches ist in Bytes begrenzt.
+"""
+
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from .archives import ARCHIVES_FILENAME, registered_archives
+from .corpora import search_roots
+from .results import ResultTable
+
+
+def normalize_query(query):
+    """
+    Normalisiert eine Suchanfrage für den Cache-Schlüssel.
+
+    Nur die Groß-/Kleinschreibung wird angeglichen, da die Suche sie ohnehin ignoriert; Leerzeichen bleiben
+    erhalten, weil "a  b" und "a b" verschiedene Teilstrings finden.
+
+    Args:
+        query (str): Die Suchabfrage.
+
+    Returns:
+        str: Die normalisierte Suchabfrage.
+    """
+    return query.lower()
+
+
+def corpus_fingerprint(extract_dir, corpora=None):
+    """
+    Berechnet einen Fingerabdruck aller TXT-Dateien eines Verzeichnisses und der registrierten ZIP-Dateien.
+
+    Args:
+        extract_dir (str): Das Extraktionsverzeichnis.
+        corpora (list): Nur die Dateien dieser Korpora berücksichtigen; None berücksichtigt alle.
+
+    Returns:
+        str: Der Fingerabdruck (SHA-1, hexadezimal).
+    """
+    digest = hashlib.sha1()
+    for search_root in search_roots(extract_dir, corpora):
+        for root, _, files in sorted(os.walk(search_root)):
+            for file in sorted(files):
+                if not file.endswith('.txt'):
+                    continue
+                file_path = os.path.join(root, file)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                relative_path = os.path.relpath(file_path, extract_dir)
+                digest.update(f"{relative_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+            # Ohne Entpacken durchsuchte ZIP-Dateien (siehe `archives`)
+            if ARCHIVES_FILENAME not in files:
+                continue
+            for zip_path in registered_archives(root):
+                try:
+                    stat = os.stat(zip_path)
+                except OSError:
+                    continue
+                digest.update(f"{zip_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def estimate_size(file_results):
+    """
+    Schätzt den Speicherbedarf einer Ergebnisliste in Bytes.
+
+    Args:
+        file_results (list): Tupel (Dateinummer, Dateipfad, Treffer).
+
+    Returns:
+        int: Der geschätzte Speicherbedarf.
+    """
+    size = sys.getsizeof(file_results)
+    for _, file_path, rows in file_results:
+        size += sys.getsizeof(file_path) + sys.getsizeof(rows)
+        if isinstance(rows, ResultTable):
+            # Die Spaltennamen sind nur einmal pro Datei gespeichert, Zeilen und Zeilennummern als Listen
+            size += sum(sys.getsizeof(column) for column in rows.columns) + sys.getsizeof(rows.row_numbers)
+            rows = rows.rows
+        for row in rows:
+            values = row.values() if isinstance(row, dict) else row
+            size += sys.getsizeof(row) + sum(sys.getsizeof(value) for value in values)
+    return size
+
+
+class ResultCache:
+    """
+    Threadsicherer LRU-Cache, dessen Gesamtgröße in Bytes begrenzt ist.
+    """
+
+    def __init__(self, max_bytes, max_entry_bytes=None):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes or max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Liefert einen Eintrag und markiert ihn als zuletzt verwendet.
+
+        Args:
+            key (tuple): Der Cache-Schlüssel.
+
+        Returns:
+            list: Der gespeicherte Wert oder None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """
+        Speichert einen Eintrag und verdrängt bei Bedarf die am längsten nicht verwendeten Einträge.
+
+        Einträge, die größer als `max_entry_bytes` sind, werden nicht gespeichert.
+
+        Args:
+            key (tuple): Der Cache-Schlüssel.
+            value (list): Die Ergebnisliste.
+
+        Returns:
+            bool: True, wenn der Eintrag gespeichert wurde.
+        """
+        size = estimate_size(value)
+        if size > self.max_entry_bytes:
+            return False
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+        return True
+
+    def clear(self):
+        """
+        Entfernt alle Einträge (z.B. nach einer neuen Extraktion).
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """
+        Gibt die Zähler des Caches zurück.
+
+        Returns:
+            dict: Treffer, Fehlzugriffe, Verdrängungen, Anzahl Einträge und belegte Bytes.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def cached(self, key, produce, skip_files=()):
+        """
+        Liefert dateiweise Suchergebnisse aus dem Cache oder erzeugt und speichert sie.
+
+        Ergebnisse werden nur gespeichert, wenn die Suche vollständig durchlaufen wurde (also nicht durch ein
+        Ergebnislimit abgebrochen), nicht bei einem Cursor begonnen hat und keine Datei fehlgeschlagen ist (siehe
+        `ResultTable.error`).
+
+        Args:
+            key (tuple): Der Cache-Schlüssel.
+            produce (callable): Erzeugt die Ergebnisse, aufgerufen mit den zu überspringenden Dateinummern.
+            skip_files (iterable): Bereits ausgelieferte Dateinummern.
+
+        Returns:
+            iterable: Tupel (Dateinummer, Dateipfad, Treffer).
+        """
+        skip_files = set(skip_files)
+        entries = self.get(key)
+        if entries is not None:
+            return (entry for entry in entries if entry[0] not in skip_files)
+        if skip_files:
+            return produce(skip_files)
+        return self._record(key, produce(skip_files))
+
+    def _record(self, key, file_results):
+        entries = []
+        complete = True
+        for entry in file_results:
+            complete = complete and not getattr(entry[2], 'error', None)
+            entries.append(entry)
+            yield entry
+        if complete:
+            self.put(key, entries)
+
+
+def get_result_cache(app):
+    """
+    Gibt den Ergebnis-Cache einer Flask-Anwendung zurück und legt ihn beim ersten Zugriff an.
+
+    Args:
+        app (Flask): Die Flask-Anwendung.
+
+    Returns:
+        ResultCache: Der Ergebnis-Cache.
+    """
+    cache = app.extensions.get('result_cache')
+    if cache is None:
+        cache = app.extensions.setdefault('result_cache', ResultCache(
+            app.config['RESULT_CACHE_MAX_BYTES'], app.config.get('RESULT_CACHE_MAX_ENTRY_BYTES')))
+    return cache
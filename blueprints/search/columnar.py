@@ -0,0 +1,795 @@
+"""
+Spaltenbasierter Cache der extrahierten TXT-Tabellen.
+
+Jede TXT-Datei wird nach der Extraktion einmal in NumPy-Spaltendateien umgewandelt, die bei der Suche per
+Memory-Mapping geöffnet werden. Texte werden mit variabler Länge abgelegt: ein UTF-8-Puffer (`.bin`), in dem auf jeden
+Wert ein Nullbyte folgt, und die Offsets des Beginns jedes Werts (`.offsets.npy`, eine Zeile mehr als die Tabelle).
+Pro Spalte werden abgelegt:
+
+- `<i>.text.bin`/`<i>.text.offsets.npy`: die bereits kleingeschriebene Textdarstellung, auf der gesucht wird; fehlt
+  bei Textspalten ohne Großbuchstaben (`shared_text` in `meta.json`), dort wird direkt in den Originalwerten gesucht
+- `<i>.values.bin`/`<i>.values.offsets.npy` bei Textspalten, `<i>.values.npy` bei numerischen Spalten: die
+  Originalwerte für die Ausgabe der Treffer
+- `<i>.null.npy`: die Maske fehlender Werte (nur bei Textspalten)
+- `<i>.range.npy`: bei Datumsspalten die Tage seit 1970-01-01 (NaN für fehlende Werte) für Bereichsabfragen
+
+Beim Umwandeln wird der Typ jeder Spalte bestimmt: numerische Spalten und Textspalten, deren Werte fast alle
+Datumsangaben sind (`DATE_FORMATS`, mindestens `DATE_MIN_SHARE`; ungültige Werte gelten als fehlend), unterstützen
+Bereichsprädikate (z.B. `Geburtsdatum` zwischen zwei Daten oder `Motorleistung > 200`). Für diese Spalten stehen in
+`meta.json` Minimum und Maximum jedes Blocks von `ZONE_ROWS` Zeilen (Zone Maps): Dateien und Blöcke, deren
+Wertebereich ein Prädikat nicht erfüllen kann, werden übersprungen, ohne ihre Werte zu lesen. Bereichsprädikate auf
+anderen Spalten werden wie ohne Cache zeilenweise typisiert.
+
+Der Cache liegt im versteckten Verzeichnis `.columnar` neben der TXT-Datei. `meta.json` wird zuletzt geschrieben;
+fehlt sie oder passen Größe/Änderungszeit der Quelldatei nicht mehr, gilt der Cache als veraltet.
+"""
+
+import json
+import operator
+import os
+import re
+import shutil
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from numpy.lib.format import open_memmap
+
+COLUMNAR_DIRNAME = '.columnar'
+META_FILENAME = 'meta.json'
+
+# Version des Cache-Formats; ältere Caches gelten als veraltet und werden beim nächsten Ingest neu geschrieben
+COLUMNAR_VERSION = 3
+
+# Zeilen pro Chunk beim Umwandeln großer Dateien
+CONVERT_CHUNK_ROWS = 100000
+
+# Zeilen pro Block der Zone Maps (Minimum und Maximum je Block)
+ZONE_ROWS = 65536
+
+# Erkannte Datumsformate und ihre Form (Vorprüfung, bevor Werte geparst werden)
+DATE_FORMATS = ('%Y-%m-%d', '%d.%m.%Y')
+DATE_PATTERN = r'\d{4}-\d{2}-\d{2}|\d{1,2}\.\d{1,2}\.\d{4}'
+
+# Mindestanteil der Werte in Datumsform, ab dem eine Textspalte als Datumsspalte gilt
+DATE_MIN_SHARE = 0.9
+
+# Anzahl Werte, an denen die Datumsform zuerst geprüft wird
+DATE_SAMPLE_ROWS = 100
+
+# Vergleichsoperatoren der Bereichsprädikate
+RANGE_OPERATORS = {'<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge, '=': operator.eq}
+
+EPOCH = datetime(1970, 1, 1)
+
+# Ab diesem Verhältnis von Zeilen zu Kandidaten werden nur die Werte der Kandidaten gelesen
+CANDIDATE_SCAN_RATIO = 64
+
+# Trennzeichen nach jedem Wert in den UTF-8-Puffern (ein Suchbegriff ohne Nullbyte kann keine Wertgrenze überspannen)
+TEXT_SEPARATOR = b'\x00'
+
+
+def columnar_path_for(file_path):
+    """
+    Gibt das Cache-Verzeichnis einer TXT-Datei zurück.
+
+    Args:
+        file_path (str): Der Pfad zur TXT-Datei.
+
+    Returns:
+        str: Der Pfad zum Cache-Verzeichnis.
+    """
+    return os.path.join(os.path.dirname(file_path), COLUMNAR_DIRNAME, os.path.basename(file_path))
+
+
+def column_kind(series):
+    """
+    Bestimmt die Speicherart einer Spalte.
+
+    Args:
+        series (pandas.Series): Die Spalte (bzw. ein Chunk davon).
+
+    Returns:
+        str: 'i' (Ganzzahl), 'f' (Gleitkomma), 'b' (Boolesch) oder 'U' (Text).
+    """
+    if pd.api.types.is_bool_dtype(series):
+        return 'b'
+    if pd.api.types.is_integer_dtype(series):
+        return 'i'
+    if pd.api.types.is_float_dtype(series):
+        return 'f'
+    return 'U'
+
+
+def merge_kinds(first, second):
+    """
+    Führt die Speicherarten zweier Chunks derselben Spalte zusammen.
+
+    Args:
+        first (str): Die bisherige Speicherart oder None.
+        second (str): Die Speicherart des neuen Chunks.
+
+    Returns:
+        str: Die gemeinsame Speicherart.
+    """
+    if first is None or first == second:
+        return second
+    if {first, second} == {'i', 'f'}:
+        return 'f'
+    return 'U'
+
+
+def date_days(series):
+    """
+    Wandelt Datumsangaben (`DATE_FORMATS`) in Tage seit 1970-01-01 um.
+
+    Args:
+        series (pandas.Series): Die Werte.
+
+    Returns:
+        pandas.Series: Die Tage als Gleitkommazahlen; NaN für fehlende oder ungültige Werte.
+    """
+    text = series.astype(str).str.strip()
+    parsed = pd.to_datetime(text, format=DATE_FORMATS[0], errors='coerce')
+    for date_format in DATE_FORMATS[1:]:
+        # Nur die noch nicht erkannten Werte mit dem nächsten Format parsen
+        missing = parsed.isna()
+        if missing.any():
+            parsed[missing] = pd.to_datetime(text[missing], format=date_format, errors='coerce')
+    return (parsed - pd.Timestamp(EPOCH)) / pd.Timedelta(days=1)
+
+
+def count_date_values(series):
+    """
+    Zählt die vorhandenen Werte einer Textspalte und wie viele davon die Form einer Datumsangabe haben.
+
+    Erreichen schon die ersten `DATE_SAMPLE_ROWS` Werte `DATE_MIN_SHARE` nicht, werden nur diese gezählt.
+    Ungültige Daten (z.B. 30. Februar oder "unbekannt") werden beim Schreiben zu fehlenden Werten.
+
+    Args:
+        series (pandas.Series): Die Spalte (bzw. ein Chunk davon).
+
+    Returns:
+        tuple: Die Anzahl Werte in Datumsform und die Anzahl vorhandener Werte.
+    """
+    text = series.dropna().astype(str).str.strip()
+    sample = text.head(DATE_SAMPLE_ROWS).str.fullmatch(DATE_PATTERN)
+    if sample.sum() < DATE_MIN_SHARE * len(sample):
+        return int(sample.sum()), len(sample)
+    return int(text.str.fullmatch(DATE_PATTERN).sum()), len(text)
+
+
+def parse_bound(text):
+    """
+    Wandelt die Grenze eines Bereichsprädikats in einen vergleichbaren Wert um.
+
+    Args:
+        text (str): Die Grenze (Datum in einem der `DATE_FORMATS` oder Zahl).
+
+    Returns:
+        tuple: Der Typ ('date' oder 'number') und der Wert (bei Daten die Tage seit 1970-01-01).
+
+    Raises:
+        ValueError: Wenn die Grenze weder Datum noch Zahl ist.
+    """
+    text = text.strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return 'date', (datetime.strptime(text, date_format) - EPOCH).days
+        except ValueError:
+            pass
+    return 'number', float(text)
+
+
+def zone_overlaps(zone, op, value):
+    """
+    Prüft, ob ein Wertebereich (Minimum, Maximum) Werte enthalten kann, die ein Prädikat erfüllen.
+
+    Args:
+        zone (list): Minimum und Maximum oder None, wenn alle Werte fehlen.
+        op (str): Der Vergleichsoperator (siehe `RANGE_OPERATORS`).
+        value (float): Die Grenze.
+
+    Returns:
+        bool: False, wenn der Bereich sicher keine passenden Werte enthält.
+    """
+    if zone is None:
+        return False
+    low, high = zone
+    if op in ('<', '<='):
+        return RANGE_OPERATORS[op](low, value)
+    if op in ('>', '>='):
+        return RANGE_OPERATORS[op](high, value)
+    return low <= value <= high
+
+
+def compute_zones(values, zone_rows=ZONE_ROWS):
+    """
+    Berechnet Minimum und Maximum jedes Blocks einer numerischen Spalte.
+
+    Args:
+        values (numpy.ndarray): Die Werte (NaN für fehlende Werte).
+        zone_rows (int): Die Zeilen pro Block.
+
+    Returns:
+        list: Pro Block [Minimum, Maximum] oder None, wenn alle Werte des Blocks fehlen.
+    """
+    zones = []
+    for start in range(0, len(values), zone_rows):
+        block = np.asarray(values[start:start + zone_rows])
+        if block.dtype.kind == 'f':
+            block = block[~np.isnan(block)]
+        zones.append([block.min().item(), block.max().item()] if len(block) else None)
+    return zones
+
+
+def encode_texts(texts):
+    """
+    Kodiert Texte als UTF-8-Puffer mit `TEXT_SEPARATOR` nach jedem Wert.
+
+    Args:
+        texts (list): Die Texte.
+
+    Returns:
+        tuple: Der Puffer (bytes) und die Länge jedes Werts samt Trennzeichen in Bytes (numpy.ndarray).
+    """
+    encoded = [text.encode('utf-8') for text in texts]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)) + 1
+    return b''.join(value + TEXT_SEPARATOR for value in encoded), lengths
+
+
+def find_in_buffer(buffer, offsets, needle, start, end):
+    """
+    Sucht einen Teilstring in den Werten `start` bis `end` (exklusiv) eines UTF-8-Puffers.
+
+    Gesucht wird vektorisiert über die Bytes: zuerst die Positionen des ersten Bytes, dann werden die weiteren Bytes
+    nur noch an diesen Positionen verglichen. Da UTF-8 selbstsynchronisierend ist, entspricht ein Treffer in den
+    Bytes einem Treffer in den Zeichen.
+
+    Args:
+        buffer (numpy.ndarray): Der Puffer (uint8).
+        offsets (numpy.ndarray): Der Beginn jedes Werts im Puffer (eine Zeile mehr als Werte).
+        needle (bytes): Der kodierte Suchbegriff.
+        start (int): Der erste Wert.
+        end (int): Das Ende (exklusiv).
+
+    Returns:
+        numpy.ndarray: Boolesche Maske der Werte, die den Suchbegriff enthalten.
+    """
+    mask = np.zeros(end - start, dtype=bool)
+    if not needle:
+        mask[:] = True
+        return mask
+    if TEXT_SEPARATOR in needle:
+        return mask
+    low = int(offsets[start])
+    data = buffer[low:int(offsets[end])]
+    pattern = np.frombuffer(needle, dtype=np.uint8)
+    if len(data) < len(pattern):
+        return mask
+    positions = np.flatnonzero(data[:len(data) - len(pattern) + 1] == pattern[0])
+    for k in range(1, len(pattern)):
+        if not len(positions):
+            break
+        positions = positions[data[positions + k] == pattern[k]]
+    rows = np.searchsorted(offsets[start:end + 1], positions + low, side='right') - 1
+    mask[rows] = True
+    return mask
+
+
+def decode_texts(buffer, offsets, rows):
+    """
+    Liest einzelne Werte aus einem UTF-8-Puffer.
+
+    Args:
+        buffer (numpy.ndarray): Der Puffer (uint8).
+        offsets (numpy.ndarray): Der Beginn jedes Werts im Puffer.
+        rows (collections.abc.Iterable): Die Nummern der Werte.
+
+    Returns:
+        list: Die Texte.
+    """
+    return [bytes(buffer[offsets[row]:offsets[row + 1] - 1]).decode('utf-8') for row in rows]
+
+
+def convert_to_columnar(file_path, chunk_rows=CONVERT_CHUNK_ROWS):
+    """
+    Wandelt eine TXT-Datei in den spaltenbasierten Cache um.
+
+    Args:
+        file_path (str): Der Pfad zur TXT-Datei.
+        chunk_rows (int): Die Anzahl der Zeilen pro Chunk.
+
+    Returns:
+        str: Der Pfad zum Cache-Verzeichnis.
+    """
+    stat = os.stat(file_path)
+    return write_columnar(lambda: file_path, columnar_path_for(file_path), (stat.st_size, stat.st_mtime), chunk_rows)
+
+
+def iter_source_chunks(open_source, chunk_rows):
+    """
+    Liest eine Quelle chunkweise und schließt geöffnete Ströme anschließend wieder.
+
+    Args:
+        open_source (callable): Liefert die Quelle (Pfad oder Binärstrom).
+        chunk_rows (int): Die Anzahl der Zeilen pro Chunk.
+
+    Yields:
+        pandas.DataFrame: Die Chunks der Tabelle.
+    """
+    source = open_source()
+    try:
+        with pd.read_csv(source, sep="\t", chunksize=chunk_rows) as reader:
+            yield from reader
+    finally:
+        if hasattr(source, 'close'):
+            source.close()
+
+
+def read_source_header(open_source):
+    """
+    Liest nur die Spaltennamen einer Quelle.
+
+    Args:
+        open_source (callable): Liefert die Quelle (Pfad oder Binärstrom).
+
+    Returns:
+        list: Die Spaltennamen.
+    """
+    source = open_source()
+    try:
+        return [str(column) for column in pd.read_csv(source, sep="\t", nrows=0).columns]
+    finally:
+        if hasattr(source, 'close'):
+            source.close()
+
+
+def write_columnar(open_source, target, stamp, chunk_rows=CONVERT_CHUNK_ROWS):
+    """
+    Schreibt eine tabulatorgetrennte Tabelle in ein Cache-Verzeichnis.
+
+    Die Quelle wird in zwei Durchläufen chunkweise gelesen: der erste bestimmt Zeilenzahl, Spaltentypen und ob eine
+    Textspalte Großbuchstaben enthält, der zweite schreibt die Werte. Der Speicherbedarf hängt daher nur von
+    `chunk_rows` ab, nicht von der Dateigröße.
+
+    Args:
+        open_source (callable): Liefert bei jedem Aufruf die Quelle neu (Pfad oder geöffneter Binärstrom,
+            z.B. ein ZIP-Member).
+        target (str): Das Cache-Verzeichnis.
+        stamp (tuple): Größe und Änderungszeit der Quelle, an denen die Aktualität des Caches geprüft wird.
+        chunk_rows (int): Die Anzahl der Zeilen pro Chunk.
+
+    Returns:
+        str: Der Pfad zum Cache-Verzeichnis.
+    """
+    shutil.rmtree(target, ignore_errors=True)
+    os.makedirs(target)
+
+    # Erster Durchlauf: Zeilen und Typen bestimmen und ob sich die kleingeschriebene Darstellung unterscheidet
+    columns = None
+    kinds = []
+    dates = []
+    date_counts = []
+    shared = []
+    rows = 0
+    for chunk in iter_source_chunks(open_source, chunk_rows):
+        if columns is None:
+            columns = [str(column) for column in chunk.columns]
+            kinds = [None] * len(columns)
+            dates = [None] * len(columns)
+            date_counts = [[0, 0] for _ in columns]
+            shared = [True] * len(columns)
+        for i, column in enumerate(chunk.columns):
+            kinds[i] = merge_kinds(kinds[i], column_kind(chunk[column]))
+            if kinds[i] == 'U' and dates[i] is not False:
+                counts = count_date_values(chunk[column])
+                date_counts[i] = [date_counts[i][0] + counts[0], date_counts[i][1] + counts[1]]
+                if date_counts[i][1]:
+                    dates[i] = date_counts[i][0] >= DATE_MIN_SHARE * date_counts[i][1]
+            if shared[i]:
+                as_text = chunk[column].fillna('').astype(str)
+                shared[i] = bool((as_text.str.lower() == as_text).all())
+        rows += len(chunk)
+
+    if columns is None:
+        columns = read_source_header(open_source)
+        kinds = ['U'] * len(columns)
+        dates = [None] * len(columns)
+        shared = [True] * len(columns)
+
+    # Spalten mit Bereichsprädikaten: numerische Spalten und Textspalten, die fast nur Datumsangaben enthalten
+    range_types = {i: 'number' for i, kind in enumerate(kinds) if kind in ('i', 'f')}
+    range_types.update({i: 'date' for i, kind in enumerate(kinds) if kind == 'U' and dates[i]})
+    shared = [i for i, kind in enumerate(kinds) if kind == 'U' and shared[i]]
+
+    # Texte: die Originalwerte der Textspalten und die Suchdarstellung aller Spalten, die sie nicht teilen
+    buffers = {}
+    for i, kind in enumerate(kinds):
+        parts = ['values'] if kind == 'U' else []
+        if i not in shared:
+            parts.append('text')
+        for part in parts:
+            offsets = open_memmap(os.path.join(target, f'{i}.{part}.offsets.npy'), mode='w+', dtype=np.int64,
+                                  shape=(rows + 1,))
+            offsets[0] = 0
+            buffers[i, part] = (open(os.path.join(target, f'{i}.{part}.bin'), 'wb'), offsets)
+    numeric_dtypes = {'i': np.int64, 'f': np.float64, 'b': np.bool_}
+    values = {i: open_memmap(os.path.join(target, f'{i}.values.npy'), mode='w+', dtype=numeric_dtypes[kind],
+                             shape=(rows,))
+              for i, kind in enumerate(kinds) if kind != 'U'}
+    nulls = {i: open_memmap(os.path.join(target, f'{i}.null.npy'), mode='w+', dtype=np.bool_, shape=(rows,))
+             for i, kind in enumerate(kinds) if kind == 'U'}
+    days = {i: open_memmap(os.path.join(target, f'{i}.range.npy'), mode='w+', dtype=np.float64, shape=(rows,))
+            for i, range_type in range_types.items() if range_type == 'date'}
+
+    def append_texts(i, part, texts, position):
+        handle, offsets = buffers[i, part]
+        data, lengths = encode_texts(texts)
+        handle.write(data)
+        offsets[position + 1:position + 1 + len(lengths)] = offsets[position] + np.cumsum(lengths)
+
+    # Zweiter Durchlauf: Werte schreiben
+    position = 0
+    try:
+        if rows:
+            for chunk in iter_source_chunks(open_source, chunk_rows):
+                end = position + len(chunk)
+                for i, column in enumerate(chunk.columns):
+                    series = chunk[column]
+                    if kinds[i] == 'U':
+                        as_text = series.fillna('').astype(str)
+                        nulls[i][position:end] = series.isna().to_numpy()
+                        append_texts(i, 'values', as_text.tolist(), position)
+                        if i not in shared:
+                            append_texts(i, 'text', as_text.str.lower().tolist(), position)
+                        if i in days:
+                            days[i][position:end] = date_days(series).to_numpy(dtype=np.float64)
+                    else:
+                        # Numerische Spalten werden wie bei der DataFrame-Suche nicht kleingeschrieben
+                        values[i][position:end] = series.to_numpy(dtype=values[i].dtype)
+                        text = values[i][position:end].astype(str)
+                        text[series.isna().to_numpy()] = ''
+                        append_texts(i, 'text', text.tolist(), position)
+                position = end
+    finally:
+        for handle, _ in buffers.values():
+            handle.close()
+
+    text_bytes = 0
+    for (i, part), (_, offsets) in buffers.items():
+        if part == 'text' or i in shared:
+            text_bytes += int(offsets[rows])
+        offsets.flush()
+    for array in list(values.values()) + list(nulls.values()) + list(days.values()):
+        array.flush()
+    zones = {str(i): compute_zones(days[i] if i in days else values[i]) for i in range_types}
+    del buffers, values, nulls, days
+
+    meta = {
+        'version': COLUMNAR_VERSION,
+        'source_size': stamp[0],
+        'source_mtime': stamp[1],
+        'rows': rows,
+        'columns': columns,
+        'kinds': kinds,
+        'shared_text': shared,
+        'text_bytes_per_row': max(1, -(-text_bytes // rows)) if rows else 1,
+        'range_types': {str(i): range_type for i, range_type in range_types.items()},
+        'zone_rows': ZONE_ROWS,
+        'zones': zones,
+    }
+    meta_path = os.path.join(target, META_FILENAME)
+    with open(meta_path + '.tmp', 'w') as f:
+        json.dump(meta, f)
+    os.replace(meta_path + '.tmp', meta_path)
+    return target
+
+
+def update_columnar_cache(file_paths, logger=None):
+    """
+    Wandelt alle neuen oder geänderten TXT-Dateien in den spaltenbasierten Cache um.
+
+    Args:
+        file_paths (list): Die Pfade der TXT-Dateien.
+        logger (logging.Logger): Optionaler Logger für Fortschritt und Fehler.
+
+    Returns:
+        int: Die Anzahl der umgewandelten Dateien.
+    """
+    converted = 0
+    for file_path in file_paths:
+        try:
+            if open_columnar(file_path) is not None:
+                continue
+            convert_to_columnar(file_path)
+            converted += 1
+            if logger:
+                logger.debug("Converted file to columnar cache: %s", file_path)
+        except Exception as e:
+            shutil.rmtree(columnar_path_for(file_path), ignore_errors=True)
+            if logger:
+                logger.error("Error converting file %s to columnar cache: %s", file_path, e)
+    return converted
+
+
+def open_columnar(file_path):
+    """
+    Öffnet den spaltenbasierten Cache einer TXT-Datei, sofern er existiert und aktuell ist.
+
+    Args:
+        file_path (str): Der Pfad zur TXT-Datei.
+
+    Returns:
+        ColumnarTable: Die geöffnete Tabelle oder None.
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return load_columnar(columnar_path_for(file_path), (stat.st_size, stat.st_mtime))
+
+
+def load_columnar(path, stamp):
+    """
+    Öffnet ein Cache-Verzeichnis, sofern es vollständig ist und zur angegebenen Quelle passt.
+
+    Args:
+        path (str): Das Cache-Verzeichnis.
+        stamp (tuple): Größe und Änderungszeit der Quelle.
+
+    Returns:
+        ColumnarTable: Die geöffnete Tabelle oder None.
+    """
+    try:
+        with open(os.path.join(path, META_FILENAME)) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get('version') != COLUMNAR_VERSION or (meta['source_size'], meta['source_mtime']) != tuple(stamp):
+        return None
+    return ColumnarTable(path, meta)
+
+
+class ColumnarTable:
+    """
+    Per Memory-Mapping geöffnete Tabelle aus dem spaltenbasierten Cache.
+    """
+
+    def __init__(self, path, meta):
+        self.path = path
+        self.meta = meta
+        self.columns = meta['columns']
+        self.rows = meta['rows']
+
+    def _load(self, i, part):
+        return np.load(os.path.join(self.path, f'{i}.{part}.npy'), mmap_mode='r')
+
+    def _texts(self, i, part='text'):
+        """
+        Öffnet den UTF-8-Puffer einer Spalte samt Offsets.
+
+        Args:
+            i (int): Die Spaltenposition.
+            part (str): 'text' (kleingeschriebene Suchdarstellung) oder 'values' (Originalwerte einer Textspalte).
+
+        Returns:
+            tuple: Der Puffer (uint8) und die Offsets.
+        """
+        if part == 'text' and i in self.meta['shared_text']:
+            part = 'values'
+        path = os.path.join(self.path, f'{i}.{part}.bin')
+        # Ein leerer Puffer lässt sich nicht per Memory-Mapping öffnen
+        buffer = np.memmap(path, dtype=np.uint8, mode='r') if os.path.getsize(path) else np.zeros(0, dtype=np.uint8)
+        return buffer, self._load(i, f'{part}.offsets')
+
+    def column_positions(self, columns=None):
+        """
+        Gibt die Positionen der gewünschten Spalten zurück (Projektion).
+
+        Args:
+            columns (list): Die Spaltennamen oder None für alle Spalten.
+
+        Returns:
+            list: Die Spaltenpositionen; unbekannte Spalten werden ignoriert.
+        """
+        if columns is None:
+            return list(range(len(self.columns)))
+        return [self.columns.index(column) for column in columns if column in self.columns]
+
+    def match_mask(self, query_lower, columns=None, regex=False, block_rows=None):
+        """
+        Berechnet die Trefferzeilen über die kleingeschriebenen Textspalten.
+
+        Args:
+            query_lower (str): Die kleingeschriebene Suchabfrage.
+            columns (list): Die zu durchsuchenden Spalten oder None für alle.
+            regex (bool): Ob die Abfrage als regulärer Ausdruck ausgewertet wird.
+            block_rows (int): Zeilen pro Block; begrenzt den Speicherbedarf bei großen Tabellen.
+
+        Returns:
+            numpy.ndarray: Boolesche Maske der passenden Zeilen.
+        """
+        mask = np.zeros(self.rows, dtype=bool)
+        block_rows = block_rows or self.rows or 1
+        needle = query_lower.encode('utf-8')
+        for i in self.column_positions(columns):
+            buffer, offsets = self._texts(i)
+            for start in range(0, self.rows, block_rows):
+                end = min(start + block_rows, self.rows)
+                if regex:
+                    block = pd.Series(decode_texts(buffer, offsets, range(start, end)), dtype=object)
+                    hits = block.str.contains(query_lower, regex=True, na=False).to_numpy(dtype=bool)
+                else:
+                    hits = find_in_buffer(buffer, offsets, needle, start, end)
+                mask[start:end] |= hits
+        return mask
+
+    def range_type(self, column):
+        """
+        Gibt den Typ einer Spalte für Bereichsprädikate zurück.
+
+        Args:
+            column (str): Der Spaltenname.
+
+        Returns:
+            str: 'number', 'date' oder None, wenn die Spalte keine Bereichsprädikate unterstützt.
+        """
+        if column not in self.columns:
+            return None
+        return self.meta['range_types'].get(str(self.columns.index(column)))
+
+    def zones(self, column):
+        """
+        Gibt die Zone Map einer Spalte zurück.
+
+        Args:
+            column (str): Der Spaltenname.
+
+        Returns:
+            list: Pro Block [Minimum, Maximum] oder None (siehe `compute_zones`).
+        """
+        return self.meta['zones'][str(self.columns.index(column))]
+
+    def may_match(self, ranges):
+        """
+        Prüft anhand der Zone Maps, ob die Tabelle Zeilen enthalten kann, die alle Bereichsprädikate erfüllen.
+
+        Prädikate auf Spalten ohne passenden Typ (z.B. eine Datumsspalte mit vielen ungültigen Werten) haben keine
+        Zone Map und schließen die Tabelle nicht aus.
+
+        Args:
+            ranges (list): Tupel (Spaltenname, Operator, Typ, Grenze).
+
+        Returns:
+            bool: False, wenn die Tabelle übersprungen werden kann.
+        """
+        for column, op, kind, value in ranges:
+            if self.range_type(column) != kind:
+                continue
+            if not any(zone_overlaps(zone, op, value) for zone in self.zones(column)):
+                return False
+        return True
+
+    def filter_ranges(self, ranges, rows=None):
+        """
+        Wertet UND-verknüpfte Bereichsprädikate aus; Blöcke, die laut Zone Map nicht passen können, werden nicht
+        gelesen.
+
+        Args:
+            ranges (list): Tupel (Spaltenname, Operator, Typ, Grenze).
+            rows (numpy.ndarray): Optionale Kandidatenzeilen, auf die die Auswertung beschränkt wird.
+
+        Returns:
+            numpy.ndarray: Die Nummern der passenden Zeilen.
+        """
+        if not ranges:
+            return np.arange(self.rows) if rows is None else np.asarray(rows, dtype=np.int64)
+        if not self.may_match(ranges):
+            return np.array([], dtype=np.int64)
+        zone_rows = self.meta['zone_rows']
+        blocks = np.ones((self.rows + zone_rows - 1) // zone_rows, dtype=bool)
+        for column, op, kind, value in ranges:
+            if self.range_type(column) == kind:
+                blocks &= np.array([zone_overlaps(zone, op, value) for zone in self.zones(column)], dtype=bool)
+        arrays = [(self._range_values(column, kind), RANGE_OPERATORS[op], value)
+                  for column, op, kind, value in ranges]
+
+        if rows is not None:
+            rows = np.asarray(rows, dtype=np.int64)
+            rows = rows[blocks[rows // zone_rows]]
+            mask = np.ones(len(rows), dtype=bool)
+            for values, compare, value in arrays:
+                mask &= compare(values[rows], value)
+            return rows[mask]
+
+        matches = []
+        for block in np.flatnonzero(blocks):
+            start = block * zone_rows
+            mask = np.ones(min(zone_rows, self.rows - start), dtype=bool)
+            for values, compare, value in arrays:
+                mask &= compare(values[start:start + len(mask)], value)
+            matches.append(start + np.flatnonzero(mask))
+        return np.concatenate(matches) if matches else np.array([], dtype=np.int64)
+
+    def _range_values(self, column, kind):
+        i = self.columns.index(column)
+        range_type = self.meta['range_types'].get(str(i))
+        if range_type == kind:
+            return self._load(i, 'range' if range_type == 'date' else 'values')
+        # Ohne passenden Spaltentyp wird wie bei `structured.range_mask` zeilenweise typisiert
+        if self.meta['kinds'][i] == 'U':
+            values = pd.Series(decode_texts(*self._texts(i, 'values'), range(self.rows)), dtype=object)
+        else:
+            values = pd.Series(self._load(i, 'values'))
+        typed = date_days(values) if kind == 'date' else pd.to_numeric(values, errors='coerce')
+        return typed.to_numpy(dtype=np.float64)
+
+    def take(self, rows, columns=None):
+        """
+        Liest ausgewählte Zeilen mit ihren Originalwerten.
+
+        Args:
+            rows (numpy.ndarray): Die Zeilennummern.
+            columns (list): Die auszugebenden Spalten oder None für alle.
+
+        Returns:
+            pandas.DataFrame: Die Zeilen mit ihren Zeilennummern als Index.
+        """
+        data = {}
+        for i in self.column_positions(columns):
+            if self.meta['kinds'][i] == 'U':
+                values = np.array(decode_texts(*self._texts(i, 'values'), rows), dtype=object)
+                values[self._load(i, 'null')[rows]] = np.nan
+            else:
+                values = self._load(i, 'values')[rows]
+            data[self.columns[i]] = values
+        return pd.DataFrame(data, columns=[self.columns[i] for i in self.column_positions(columns)], index=rows)
+
+    def search(self, query_lower, columns=None, regex=False, block_rows=None):
+        """
+        Durchsucht die Tabelle und gibt die passenden Zeilen zurück.
+
+        Args:
+            query_lower (str): Die kleingeschriebene Suchabfrage.
+            columns (list): Die zu durchsuchenden Spalten oder None für alle.
+            regex (bool): Ob die Abfrage als regulärer Ausdruck ausgewertet wird.
+            block_rows (int): Zeilen pro Block.
+
+        Returns:
+            pandas.DataFrame: Die passenden Zeilen mit allen Spalten.
+        """
+        return self.take(np.flatnonzero(self.match_mask(query_lower, columns, regex, block_rows)))
+
+    def filter_rows(self, predicates, rows=None):
+        """
+        Wertet UND-verknüpfte Spaltenprädikate aus.
+
+        Das erste Prädikat wird auf der ganzen Spalte ausgewertet, jedes weitere nur noch auf den verbliebenen
+        Zeilen. Die Prädikate sollten daher nach absteigender Selektivität sortiert sein.
+
+        Args:
+            predicates (list): Tupel (Spaltenname oder None für alle Spalten, kleingeschriebener Wert).
+            rows (numpy.ndarray): Optionale Kandidatenzeilen, auf die die Auswertung beschränkt wird.
+
+        Returns:
+            numpy.ndarray: Die Nummern der passenden Zeilen.
+        """
+        candidates = None if rows is None else np.asarray(rows, dtype=np.int64)
+        for column, value in predicates:
+            if candidates is not None and not len(candidates):
+                break
+            mask = np.zeros(self.rows if candidates is None else len(candidates), dtype=bool)
+            needle = value.encode('utf-8')
+            for i in self.column_positions(None if column is None else [column]):
+                buffer, offsets = self._texts(i)
+                if candidates is None:
+                    mask |= find_in_buffer(buffer, offsets, needle, 0, self.rows)
+                elif len(candidates) * CANDIDATE_SCAN_RATIO < self.rows:
+                    # Wenige Kandidaten: nur deren Werte lesen statt die ganze Spalte zu durchsuchen
+                    mask |= np.fromiter((needle in bytes(buffer[offsets[row]:offsets[row + 1] - 1])
+                                         for row in candidates), dtype=bool, count=len(candidates))
+                else:
+                    mask |= find_in_buffer(buffer, offsets, needle, 0, self.rows)[candidates]
+            candidates = np.flatnonzero(mask) if candidates is None else candidates[mask]
+        return np.arange(self.rows) if candidates is None else candidates
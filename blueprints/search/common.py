@@ -1,16 +1,16 @@
 import os
-import zipfile
 from werkzeug.utils import secure_filename
 from flask import current_app
-from fuzzywuzzy import process
 
-from tests.test import EXPECTED_SCHEMAS
+from .pipeline import extract_archives
+from .siard import extract_siard
+from .schema_matching import correct_header
 
 UPLOAD_FOLDER = 'uploads'
 
 def save_uploaded_file(file):
     """
-    Speichert die hochgeladene Datei im Verzeichnis 'uploads'.
+    Speichert die hochgeladene Datei im Upload-Verzeichnis (`UPLOAD_FOLDER`, Standard: 'uploads').
 
     Args:
         file (werkzeug.datastructures.FileStorage): Die hochgeladene Datei.
@@ -19,47 +19,61 @@ def save_uploaded_file(file):
         str: Der Pfad zur gespeicherten Datei.
     """
     filename = secure_filename(file.filename)
-    upload_path = os.path.join(UPLOAD_FOLDER, filename)
+    upload_path = os.path.join(current_app.config.get('UPLOAD_FOLDER', UPLOAD_FOLDER), filename)
     os.makedirs(os.path.dirname(upload_path), exist_ok=True)
     file.save(upload_path)
-    current_app.logger.debug(f"File saved to: {upload_path}")
+    current_app.logger.debug("File saved to: %s", upload_path)
     return upload_path
 
-def extract_zip_file(zip_path, extract_dir):
+def extract_zip_file(zip_path, extract_dir, stream=False, manifest=None):
     """
     Extrahiert eine ZIP-Datei in ein angegebenes Verzeichnis und gibt eine Liste der extrahierten TXT-Dateien zurück.
 
+    Die Members werden parallel entpackt (`EXTRACT_WORKERS` aus der Konfiguration); unveränderte Members, die laut
+    Manifest bereits entpackt vorliegen, werden übersprungen.
+
     Args:
         zip_path (str): Der Pfad zur ZIP-Datei.
         extract_dir (str): Das Verzeichnis, in das die Dateien extrahiert werden sollen.
+        stream (bool): TXT-Members direkt in den spaltenbasierten Cache streamen, ohne Dateien zu schreiben.
+        manifest (Manifest): Das Manifest, in dem die neuen Members vermerkt werden (wird nicht gespeichert).
 
     Returns:
-        list: Eine Liste der extrahierten TXT-Dateien.
+        list: Eine Liste der neu extrahierten TXT-Dateien (im Streaming-Modus die Cache-Verzeichnisse).
     """
-    txt_files = []
-    with zipfile.ZipFile(zip_path, 'r') as zip_file:
-        zip_file.extractall(extract_dir)
-        for file in zip_file.namelist():
-            if file.endswith('.txt'):
-                txt_files.append(os.path.join(extract_dir, file))
+    txt_files, _ = extract_archives([(zip_path, extract_dir)], current_app.config.get('EXTRACT_WORKERS'),
+                                    stream, current_app.logger, manifest)
     return txt_files
 
+def extract_siard_file(siard_path, extract_dir, manifest=None):
+    """
+    Wandelt die Tabellen eines SIARD-Pakets in TXT-Dateien im angegebenen Verzeichnis um (siehe `siard`).
+
+    Die Tabellen-XML wird dabei nicht entpackt, sondern direkt aus dem Paket gestreamt; unveränderte Tabellen, die
+    laut Manifest bereits umgewandelt vorliegen, werden übersprungen.
+
+    Args:
+        siard_path (str): Der Pfad zum SIARD-Paket.
+        extract_dir (str): Das Verzeichnis, in das die TXT-Dateien geschrieben werden sollen.
+        manifest (Manifest): Das Manifest, in dem die neuen Tabellen vermerkt werden (wird nicht gespeichert).
+
+    Returns:
+        list: Eine Liste der neu geschriebenen TXT-Dateien.
+    """
+    return extract_siard(siard_path, extract_dir, current_app.config.get('EXTRACT_WORKERS'), current_app.logger,
+                         manifest)
+
 
 def correct_schema(columns):
     """
     Korrigiert die Spaltennamen einer Tabelle basierend auf den erwarteten Schemas.
 
+    Die Ähnlichkeitsberechnung erfolgt gebündelt und zwischengespeichert pro Kopfzeile (siehe `schema_matching`).
+
     Args:
         columns (list): Die Liste der Spaltennamen, die korrigiert werden sollen.
 
     Returns:
         list: Die Liste der korrigierten Spaltennamen.
     """
-    corrected_columns = []
-    for col in columns:
-        best_match, score = process.extractOne(col, [col for schema in EXPECTED_SCHEMAS.values() for col in schema])
-        if score > 80:  # Wenn die Übereinstimmung hoch genug ist, als korrekt betrachten
-            corrected_columns.append(best_match)
-        else:
-            corrected_columns.append(col)  # Wenn keine gute Übereinstimmung gefunden wird, den ursprünglichen Namen beibehalten
-    return corrected_columns
\ No newline at end of file
+    return list(correct_header(tuple(str(column) for column in columns)))
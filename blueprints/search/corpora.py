@@ -0,0 +1,256 @@
+"""
+Korpus-Namensräume für Lieferungen.
+
+Jeder Upload und jeder Verzeichnis-Ingest erhält einen eigenen Korpus mit eigener ID und wird in ein eigenes
+Verzeichnis `corpora/<ID>` unterhalb des Extraktionsverzeichnisses entpackt. Gleichnamige Dateien verschiedener
+Lieferungen überschreiben sich dadurch nicht mehr, und die Suche kann auf einzelne Korpora beschränkt werden, sodass
+ihre Kosten nur noch von den tatsächlich abgefragten Daten abhängen.
+
+Die Metadaten eines Korpus (Erstellungszeit, Art und Quelle des Ingests, Größe) liegen als `corpus.json` in seinem
+Verzeichnis. Alte Korpora werden nach Alter (`CORPUS_MAX_AGE_SECONDS`) oder bei Überschreiten des Speicherkontingents
+(`CORPUS_MAX_BYTES`, älteste zuerst) entfernt.
+"""
+
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+
+CORPORA_DIRNAME = 'corpora'
+CORPUS_META_FILENAME = 'corpus.json'
+
+# Erlaubte Korpus-IDs (verhindert Pfade außerhalb des Korpus-Verzeichnisses)
+CORPUS_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+_corpora_lock = threading.Lock()
+
+
+class UnknownCorpusError(Exception):
+    """
+    Eine angefragte Korpus-ID ist ungültig oder existiert nicht.
+    """
+
+
+def corpus_dir(extract_dir, corpus_id):
+    """
+    Gibt das Verzeichnis eines Korpus zurück.
+
+    Args:
+        extract_dir (str): Das Extraktionsverzeichnis.
+        corpus_id (str): Die Korpus-ID.
+
+    Returns:
+        str: Der Pfad zum Korpus-Verzeichnis.
+
+    Raises:
+        UnknownCorpusError: Wenn die ID ungültige Zeichen enthält.
+    """
+    if not CORPUS_ID_PATTERN.match(corpus_id or ''):
+        raise UnknownCorpusError(f"Invalid corpus id: {corpus_id!r}")
+    return os.path.join(extract_dir, CORPORA_DIRNAME, corpus_id)
+
+
+def read_corpus(extract_dir, corpus_id):
+    """
+    Liest die Metadaten eines Korpus.
+
+    Args:
+        extract_dir (str): Das Extraktionsverzeichnis.
+        corpus_id (str): Die Korpus-ID.
+
+    Returns:
+        dict: Die Metadaten oder None, wenn der Korpus nicht existiert.
+    """
+    try:
+        with open(os.path.join(corpus_dir(extract_dir, corpus_id), CORPUS_META_FILENAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError, UnknownCorpusError):
+        return None
+
+
+def write_corpus(extract_dir, meta):
+    """
+    Schreibt die Metadaten eines Korpus.
+
+    Args:
+        extract_dir (str): Das Extraktionsverzeichnis.
+        meta (dict): Die Metadaten (mit `id`).
+    """
+    directory = corpus_dir(extract_dir, meta['id'])
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, CORPUS_META_FILENAME)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(meta, f)
+    os.replace(path + '.tmp', path)
+
+
+def create_corpus(extract_dir, kind, source, corpus_id=None):
+    """
+    Legt einen neuen Korpus an oder öffnet einen bestehenden für einen erneuten Ingest.
+
+    Args:
+        extract_dir (str): Das Extraktionsverzeichnis.
+        kind (str): Die Art des Ingests (z.B. 'upload' oder 'upload_directory').
+        source (str): Die Quelle (Dateinamen oder Verzeichnis) zur Anzeige.
+        corpus_id (str): Eine bestehende Korpus-ID; ohne ID wird ein neuer Korpus angelegt.
+
+    Returns:
+        dict: Die Metadaten des Korpus.
+
+    Raises:
+        UnknownCorpusError: Wenn die ID ungültig ist.
+    """
+    with _corpora_lock:
+        meta = read_corpus(extract_dir, corpus_id) if corpus_id else None
+        if meta is None:
+            meta = {'id': corpus_id or uuid.uuid4().hex[:12], 'kind': kind, 'source': source,
+                    'created': time.time(), 'size': 0}
+        meta['updated'] = time.time()
+        write_corpus(extract_dir, meta)
+    return meta
+
+
+def directory_size(directory):
+    """
+    Berechnet den Speicherbedarf eines Verzeichnisses (inklusive Caches).
+
+    Args:
+        directory (str): Das Verzeichnis.
+
+    Returns:
+        int: Die Größe in Bytes.
+    """
+    total = 0
+    for root, _, files in os.walk(directory):
+        for file in files:
+            try:
+                total += os.path.getsize(os.path.join(root, file))
+            except OSError:
+                continue
+    return total
+
+
+def update_corpus_size(extract_dir, corpus_id):
+    """
+    Aktualisiert die gespeicherte Größe eines Korpus nach einem Ingest.
+
+    Args:
+        extract_dir (str): Das Extraktionsverzeichnis.
+        corpus_id (str): Die Korpus-ID.
+
+    Returns:
+        dict: Die aktualisierten Metadaten oder None, wenn der Korpus nicht existiert.
+    """
+    with _corpora_lock:
+        meta = read_corpus(extract_dir, corpus_id)
+        if meta is None:
+            return None
+        meta['size'] = directory_size(corpus_dir(extract_dir, corpus_id))
+        meta['updated'] = time.time()
+        write_corpus(extract_dir, meta)
+    return meta
+
+
+def list_corpora(extract_dir):
+    """
+    Listet alle Korpora, älteste zuerst.
+
+    Args:
+        extract_dir (str): Das Extraktionsverzeichnis.
+
+    Returns:
+        list: Die Metadaten aller Korpora.
+    """
+    try:
+        names = os.listdir(os.path.join(extract_dir, CORPORA_DIRNAME))
+    except OSError:
+        return []
+    corpora = [meta for meta in (read_corpus(extract_dir, name) for name in names) if meta is not None]
+    return sorted(corpora, key=lambda meta: meta['created'])
+
+
+def search_roots(extract_dir, corpus_ids=None):
+    """
+    Bestimmt die Verzeichnisse, die für eine Suche durchlaufen werden.
+
+    Args:
+        extract_dir (str): Das Extraktionsverzeichnis.
+        corpus_ids (list): Die Korpus-IDs, auf die die Suche beschränkt wird; None durchsucht alles.
+
+    Returns:
+        list: Die zu durchsuchenden Verzeichnisse.
+
+    Raises:
+        UnknownCorpusError: Wenn eine Korpus-ID ungültig ist oder nicht existiert.
+    """
+    if corpus_ids is None:
+        return [extract_dir]
+    roots = []
+    for corpus_id in dict.fromkeys(corpus_ids):
+        directory = corpus_dir(extract_dir, corpus_id)
+        if not os.path.isdir(directory):
+            raise UnknownCorpusError(f"Unknown corpus: {corpus_id}")
+        roots.append(directory)
+    return roots
+
+
+def remove_corpus(extract_dir, corpus_id):
+    """
+    Löscht einen Korpus mit allen entpackten Dateien und Caches.
+
+    Args:
+        extract_dir (str): Das Extraktionsverzeichnis.
+        corpus_id (str): Die Korpus-ID.
+
+    Returns:
+        str: Das gelöschte Verzeichnis.
+
+    Raises:
+        UnknownCorpusError: Wenn der Korpus nicht existiert.
+    """
+    directory = corpus_dir(extract_dir, corpus_id)
+    if not os.path.isdir(directory):
+        raise UnknownCorpusError(f"Unknown corpus: {corpus_id}")
+    # Erst umbenennen, damit laufende Suchen keinen halb gelöschten Korpus sehen
+    trash = f"{directory}.deleted-{uuid.uuid4().hex[:8]}"
+    os.replace(directory, trash)
+    shutil.rmtree(trash, ignore_errors=True)
+    return directory
+
+
+def select_evictions(corpora, max_age_seconds=None, max_bytes=None, keep=(), now=None):
+    """
+    Wählt die zu entfernenden Korpora nach Alter und Speicherkontingent aus.
+
+    Args:
+        corpora (list): Die Metadaten aller Korpora (siehe `list_corpora`).
+        max_age_seconds (float): Korpora, die älter sind, werden entfernt.
+        max_bytes (int): Das Kontingent für alle Korpora; bei Überschreitung werden die ältesten entfernt.
+        keep (iterable): Korpus-IDs, die nicht entfernt werden (z.B. der gerade eingelesene Korpus).
+        now (float): Der Bezugszeitpunkt (Standard: aktuelle Zeit).
+
+    Returns:
+        list: Die IDs der zu entfernenden Korpora.
+    """
+    now = time.time() if now is None else now
+    keep = set(keep)
+    evict = []
+    remaining = []
+    for meta in sorted(corpora, key=lambda meta: meta['created']):
+        if meta['id'] not in keep and max_age_seconds is not None and now - meta['created'] > max_age_seconds:
+            evict.append(meta['id'])
+        else:
+            remaining.append(meta)
+    if max_bytes is not None:
+        total = sum(meta.get('size', 0) for meta in remaining)
+        for meta in remaining:
+            if total <= max_bytes:
+                break
+            if meta['id'] in keep:
+                continue
+            evict.append(meta['id'])
+            total -= meta.get('size', 0)
+    return evict
@@ -1,31 +1,50 @@
+import io
 import os
+import re
 import zipfile
 import json
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 from flask import current_app
-from .common import extract_zip_file
+from .common import extract_zip_file, correct_schema
+from .pipeline import extract_archives
+from .columnar import column_kind
+from .index import iter_records
+from .metrics import timed
 
-def extract_files_in_directory(directory, extract_to):
+# Größe der Stichprobe (nach der Kopfzeile), aus der Spaltentypen und Zeilenzahl geschätzt werden
+SCHEMA_SAMPLE_BYTES = 64 * 1024  # 64KB
+
+# Datumswerte im ISO-Format, wie sie in den SIARD-Exporten vorkommen
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+def extract_files_in_directory(directory, extract_to, stream=False, manifest=None):
     """
     Extrahiert alle ZIP-Dateien in einem Verzeichnis und gibt eine Liste aller extrahierten TXT-Dateien zurück.
 
+    Die Members aller ZIP-Dateien werden gemeinsam parallel entpackt (`EXTRACT_WORKERS` aus der Konfiguration);
+    unveränderte Members, die laut Manifest bereits entpackt vorliegen, werden übersprungen.
+
     Args:
         directory (str): Das Verzeichnis, das die ZIP-Dateien enthält.
         extract_to (str): Das Verzeichnis, in das die Dateien extrahiert werden sollen.
+        stream (bool): TXT-Members direkt in den spaltenbasierten Cache streamen, ohne Dateien zu schreiben.
+        manifest (Manifest): Das Manifest, in dem die neuen Members vermerkt werden (wird nicht gespeichert).
 
     Returns:
-        list: Eine Liste aller extrahierten TXT-Dateien.
+        list: Eine Liste aller neu extrahierten TXT-Dateien (im Streaming-Modus die Cache-Verzeichnisse).
     """
-    all_txt_files = []
+    archives = []
     for filename in os.listdir(directory):
         if filename.endswith('.zip'):
             file_path = os.path.join(directory, filename)
             extract_path = os.path.join(extract_to, os.path.splitext(filename)[0])
             os.makedirs(extract_path, exist_ok=True)
-            txt_files = extract_zip_file(file_path, extract_path)
-            all_txt_files.extend(txt_files)
+            archives.append((file_path, extract_path))
+    all_txt_files, _ = extract_archives(archives, current_app.config.get('EXTRACT_WORKERS'), stream,
+                                        current_app.logger, manifest)
     return all_txt_files
 
 def analyze_structure(directory):
@@ -44,28 +63,148 @@ def analyze_structure(directory):
         file_structure[relative_path] = {'dirs': dirs, 'files': files}
     return file_structure
 
-def read_schemas(directory):
+def update_structure(file_structure, directory, file_paths):
+    """
+    Aktualisiert eine gespeicherte Verzeichnisstruktur nur für die Verzeichnisse der angegebenen Dateien.
+
+    Statt das ganze Verzeichnis erneut zu durchlaufen, werden nur die Verzeichnisse der neuen oder geänderten Dateien
+    und deren übergeordnete Verzeichnisse neu gelistet.
+
+    Args:
+        file_structure (dict): Die bisherige Struktur (Ausgabe von `analyze_structure`); wird verändert.
+        directory (str): Das analysierte Verzeichnis.
+        file_paths (list): Die neuen oder geänderten Dateien.
+
+    Returns:
+        dict: Die aktualisierte Struktur.
+    """
+    root = os.path.abspath(directory)
+    affected = set()
+    for file_path in file_paths:
+        folder = os.path.dirname(os.path.abspath(file_path))
+        if os.path.commonpath([root, folder]) != root:
+            continue
+        while folder not in affected:
+            affected.add(folder)
+            if folder == root:
+                break
+            folder = os.path.dirname(folder)
+
+    for folder in affected:
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            continue
+        file_structure[os.path.relpath(folder, root)] = {
+            'dirs': [entry.name for entry in entries if entry.is_dir()],
+            'files': [entry.name for entry in entries if entry.is_file()],
+        }
+    return file_structure
+
+def infer_column_type(series):
+    """
+    Leitet den Typ einer Spalte aus einer Stichprobe ab.
+
+    Args:
+        series (pandas.Series): Die Werte der Stichprobe.
+
+    Returns:
+        str: 'integer', 'float', 'boolean', 'date', 'string' oder 'empty' (nur fehlende Werte).
+    """
+    values = series.dropna()
+    if values.empty:
+        return 'empty'
+    kind = column_kind(values)
+    if kind != 'U':
+        return {'i': 'integer', 'f': 'float', 'b': 'boolean'}[kind]
+    if values.astype(str).str.match(DATE_PATTERN).all():
+        return 'date'
+    return 'string'
+
+def sniff_schema(file_path, sample_bytes=SCHEMA_SAMPLE_BYTES):
+    """
+    Liest nur Kopfzeile und eine kleine Stichprobe einer TXT-Datei und leitet daraus das Schema ab.
+
+    Die Zeilenzahl wird aus der durchschnittlichen Satzlänge der Stichprobe hochgerechnet; ist die Datei
+    kleiner als die Stichprobe, ist sie exakt.
+
+    Args:
+        file_path (str): Der Pfad zur TXT-Datei.
+        sample_bytes (int): Die Größe der Stichprobe in Bytes.
+
+    Returns:
+        dict: Korrigierte Spaltennamen (`columns`), Typen (`types`), geschätzte Zeilenzahl (`estimated_rows`),
+        ob diese exakt ist (`exact_rows`) und die Dateigröße (`size`).
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as handle:
+        header = handle.readline()
+        sample = []
+        sample_size = 0
+        complete = True
+        # Satzweise lesen, damit mehrzeilige Felder nicht mitten im Satz abgeschnitten werden
+        for _, record in iter_records(handle):
+            if sample_size >= sample_bytes:
+                complete = False
+                break
+            sample.append(record)
+            sample_size += len(record)
+
+    df = pd.read_csv(io.BytesIO(header + b''.join(sample)), sep="\t")
+    body_bytes = size - len(header)
+    if complete or not sample:
+        estimated_rows = len(df)
+    else:
+        estimated_rows = int(round(body_bytes / (sample_size / len(sample))))
+
+    return {
+        'columns': correct_schema(df.columns.tolist()),
+        'types': [infer_column_type(df[column]) for column in df.columns],
+        'estimated_rows': estimated_rows,
+        'exact_rows': complete,
+        'size': size,
+    }
+
+def read_schemas(directory, max_workers=None, file_paths=None):
     """
     Liest die Schema-Informationen aus den TXT-Dateien im angegebenen Verzeichnis und korrigiert Tippfehler.
 
+    Pro Datei werden nur Kopfzeile und eine Stichprobe gelesen (siehe `sniff_schema`); die Dateien werden
+    parallel verarbeitet.
+
     Args:
         directory (str): Das Verzeichnis, in dem die TXT-Dateien durchsucht werden sollen.
+        max_workers (int): Die Anzahl paralleler Worker (Standard: `EXTRACT_WORKERS` aus der Konfiguration).
+        file_paths (list): Nur diese Dateien lesen (z.B. die neuen oder geänderten eines Ingests) statt alle.
 
     Returns:
-        dict: Eine Darstellung der erkannten Schemas mit korrigierten Feldnamen.
+        dict: Eine Darstellung der erkannten Schemas mit korrigierten Feldnamen, Spaltentypen und geschätzter
+        Zeilenzahl pro Datei.
     """
-    schema_info = defaultdict(list)
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.endswith('.txt'):
-                file_path = os.path.join(root, file)
-                try:
-                    df = pd.read_csv(file_path, sep="\t")
-                    columns = df.columns.tolist()
-                    corrected_columns = correct_schema(columns)
-                    schema_info[file] = corrected_columns
-                    current_app.logger.info(f"Read and corrected schema for file: {file_path}")
-                except Exception as e:
-                    current_app.logger.error(f"Error reading schema from file {file_path}: {e}")
+    if file_paths is None:
+        file_paths = [os.path.join(root, file)
+                      for root, _, files in os.walk(directory)
+                      for file in files if file.endswith('.txt')]
+    else:
+        file_paths = [file_path for file_path in file_paths
+                      if file_path.endswith('.txt') and os.path.isfile(file_path)]
+    logger = current_app.logger
+
+    def sniff(file_path):
+        try:
+            with timed('schema'):
+                schema = sniff_schema(file_path)
+            logger.info("Read and corrected schema for file: %s", file_path)
+            return schema
+        except Exception as e:
+            logger.error("Error reading schema from file %s: %s", file_path, e)
+            return None
+
+    schema_info = defaultdict(dict)
+    max_workers = max_workers or current_app.config.get('EXTRACT_WORKERS') or 4
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for file_path, schema in zip(file_paths, executor.map(sniff, file_paths)):
+            if schema is not None:
+                schema_info[os.path.basename(file_path)] = schema
 
     return schema_info
@@ -0,0 +1,553 @@
+"""
+Persistenter invertierter Index über die extrahierten TXT-Tabellen.
+
+Der Index wird nach jeder Extraktion aktualisiert und in einer SQLite-Datenbank im Extraktionsverzeichnis
+abgelegt. Er bildet jedes Token (kleingeschrieben) auf die Fundstellen (Datei, Zeile, Spalte) ab und speichert
+zusätzlich die Byte-Offsets jeder Zeile, damit Treffer ohne erneutes Parsen der ganzen Datei gelesen werden können.
+Die Werte der Schlüsselspalten (`KEY_COLUMNS`) werden exakt abgelegt, damit verknüpfte Zeilen anderer Tabellen mit
+einer einzigen Abfrage gefunden werden.
+
+Für die Tokens der Namensspalten (`NAME_COLUMNS`) werden zusätzlich der phonetische Schlüssel (Kölner Phonetik) und
+die Löschvarianten für die Tippfehlersuche abgelegt (siehe `phonetics`). Eine unscharfe Namenssuche ist damit eine
+Abfrage über das Vokabular statt eines Vergleichs mit jeder Zelle.
+"""
+
+import io
+import json
+import os
+import re
+import sqlite3
+import threading
+from array import array
+
+import pandas as pd
+
+from .phonetics import cologne_phonetics, deletion_variants, edit_distance, max_distance
+
+INDEX_FILENAME = 'search_index.sqlite3'
+
+# Version des Datenbankschemas; ältere Indizes werden beim Öffnen verworfen und neu aufgebaut
+INDEX_VERSION = 2
+
+# Spalten, über die Tabellen miteinander verknüpft sind
+KEY_COLUMNS = ('PIN', 'STAMM', 'ID', 'AUSWEISID')
+
+# Spalten, deren Tokens phonetisch und tippfehlertolerant gesucht werden können
+NAME_COLUMNS = ('Name', 'Vorname', 'Adresse')
+
+# Tokens sind zusammenhängende Wortzeichen (inkl. Umlaute und Ziffern)
+TOKEN_PATTERN = re.compile(r'\w+')
+
+_write_lock = threading.Lock()
+
+
+def tokenize(text):
+    """
+    Zerlegt einen Text in kleingeschriebene Tokens.
+
+    Args:
+        text (str): Der zu zerlegende Text.
+
+    Returns:
+        list: Die Liste der Tokens in der Reihenfolge ihres Auftretens.
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def is_indexable(query, regex=False):
+    """
+    Prüft, ob eine Suchanfrage über den Index beantwortet werden kann.
+
+    Anfragen ohne Wortzeichen oder als regulärer Ausdruck werden weiterhin per Vollscan ausgewertet.
+
+    Args:
+        query (str): Die Suchabfrage.
+        regex (bool): Ob die Abfrage als regulärer Ausdruck ausgewertet wird.
+
+    Returns:
+        bool: True, wenn der Index verwendet werden kann.
+    """
+    return bool(tokenize(query)) and not regex
+
+
+def index_path_for(extract_dir):
+    """
+    Gibt den Pfad der Index-Datenbank für ein Extraktionsverzeichnis zurück.
+
+    Args:
+        extract_dir (str): Das Extraktionsverzeichnis.
+
+    Returns:
+        str: Der Pfad zur Index-Datenbank.
+    """
+    return os.path.join(extract_dir, INDEX_FILENAME)
+
+
+def iter_records(handle):
+    """
+    Liest eine tabulatorgetrennte Datei satzweise und liefert den Byte-Offset jedes Satzes.
+
+    Zeilenumbrüche innerhalb von Anführungszeichen werden dabei nicht als Satzende gewertet.
+
+    Args:
+        handle (io.BufferedReader): Die im Binärmodus geöffnete Datei.
+
+    Yields:
+        tuple: Der Byte-Offset und der Rohinhalt (bytes) des Satzes.
+    """
+    offset = handle.tell()
+    record = b''
+    record_offset = offset
+    for line in handle:
+        if not record:
+            record_offset = offset
+        record += line
+        offset += len(line)
+        # Eine ungerade Anzahl Anführungszeichen bedeutet ein offenes Feld
+        if record.count(b'"') % 2 == 0:
+            yield record_offset, record
+            record = b''
+    if record:
+        yield record_offset, record
+
+
+def key_value(value):
+    """
+    Normalisiert einen Schlüsselwert für den exakten Vergleich.
+
+    Ganzzahlige Gleitkommawerte (z.B. `42.0` aus Spalten mit fehlenden Werten) werden als Ganzzahl geschrieben.
+
+    Args:
+        value: Der Wert aus der Datei oder einem Suchergebnis.
+
+    Returns:
+        str: Der normalisierte Wert; leer für fehlende Werte.
+    """
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip().strip('"')
+
+
+class SearchIndex:
+    """
+    Invertierter Index (Token -> Datei, Zeile, Spalte) auf Basis von SQLite.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def connect(self):
+        """
+        Öffnet eine Verbindung zur Index-Datenbank und legt das Schema bei Bedarf an.
+
+        Returns:
+            sqlite3.Connection: Die geöffnete Verbindung.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY,
+                path TEXT UNIQUE NOT NULL,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                header BLOB NOT NULL,
+                offsets BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS tokens (
+                id INTEGER PRIMARY KEY,
+                token TEXT UNIQUE NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                token_id INTEGER NOT NULL,
+                file_id INTEGER NOT NULL,
+                row INTEGER NOT NULL,
+                col INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS postings_token ON postings (token_id);
+            CREATE INDEX IF NOT EXISTS postings_file ON postings (file_id);
+            CREATE TABLE IF NOT EXISTS keys (
+                name TEXT NOT NULL,
+                value TEXT NOT NULL,
+                file_id INTEGER NOT NULL,
+                row INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS keys_value ON keys (name, value);
+            CREATE INDEX IF NOT EXISTS keys_file ON keys (file_id);
+            CREATE TABLE IF NOT EXISTS name_tokens (
+                token_id INTEGER PRIMARY KEY
+            );
+            CREATE TABLE IF NOT EXISTS phonetic (
+                code TEXT NOT NULL,
+                token_id INTEGER NOT NULL,
+                PRIMARY KEY (code, token_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS deletions (
+                variant TEXT NOT NULL,
+                token_id INTEGER NOT NULL,
+                PRIMARY KEY (variant, token_id)
+            ) WITHOUT ROWID;
+        """)
+        if connection.execute('PRAGMA user_version').fetchone()[0] < INDEX_VERSION:
+            # Dateien aus älteren Versionen ohne Schlüssel- bzw. Namenseinträge werden beim nächsten Update neu
+            # indexiert
+            connection.executescript(f"""
+                DELETE FROM postings;
+                DELETE FROM keys;
+                DELETE FROM name_tokens;
+                DELETE FROM phonetic;
+                DELETE FROM deletions;
+                DELETE FROM files;
+                PRAGMA user_version = {INDEX_VERSION};
+            """)
+        return connection
+
+    def update(self, file_paths, logger=None):
+        """
+        Nimmt neue oder geänderte TXT-Dateien in den Index auf.
+
+        Dateien, deren Größe und Änderungszeit bereits im Index stehen, werden übersprungen.
+
+        Args:
+            file_paths (list): Die Pfade der zu indexierenden Dateien.
+            logger (logging.Logger): Optionaler Logger für Fortschritt und Fehler.
+
+        Returns:
+            int: Die Anzahl der neu indexierten Dateien.
+        """
+        indexed = 0
+        with _write_lock:
+            connection = self.connect()
+            try:
+                known = self._file_states(connection)
+                for file_path in file_paths:
+                    file_path = os.path.abspath(file_path)
+                    try:
+                        stat = os.stat(file_path)
+                        if known.get(file_path) == (stat.st_size, stat.st_mtime):
+                            continue
+                        self._index_file(connection, file_path, stat)
+                        connection.commit()
+                        indexed += 1
+                        if logger:
+                            logger.debug("Indexed file: %s", file_path)
+                    except Exception as e:
+                        connection.rollback()
+                        if logger:
+                            logger.error("Error indexing file %s: %s", file_path, e)
+            finally:
+                connection.close()
+        return indexed
+
+    def remove_directory(self, directory):
+        """
+        Entfernt alle Dateien unterhalb eines Verzeichnisses aus dem Index (z.B. nach dem Löschen eines Korpus).
+
+        Args:
+            directory (str): Das Verzeichnis.
+
+        Returns:
+            int: Die Anzahl entfernter Dateien.
+        """
+        if not os.path.exists(self.path):
+            return 0
+        prefix = os.path.join(os.path.abspath(directory), '')
+        with _write_lock:
+            connection = self.connect()
+            try:
+                file_ids = [(file_id,) for file_id, path in connection.execute('SELECT id, path FROM files')
+                            if path.startswith(prefix)]
+                connection.executemany('DELETE FROM postings WHERE file_id = ?', file_ids)
+                connection.executemany('DELETE FROM keys WHERE file_id = ?', file_ids)
+                connection.executemany('DELETE FROM files WHERE id = ?', file_ids)
+                connection.commit()
+            finally:
+                connection.close()
+        return len(file_ids)
+
+    def _file_states(self, connection):
+        return {path: (size, mtime) for path, size, mtime in connection.execute('SELECT path, size, mtime FROM files')}
+
+    def _index_file(self, connection, file_path, stat):
+        existing = connection.execute('SELECT id FROM files WHERE path = ?', (file_path,)).fetchone()
+        if existing:
+            connection.execute('DELETE FROM postings WHERE file_id = ?', existing)
+            connection.execute('DELETE FROM keys WHERE file_id = ?', existing)
+            connection.execute('DELETE FROM files WHERE id = ?', existing)
+
+        offsets = array('Q')
+        postings = {}
+        keys = []
+        name_tokens = set()
+        with open(file_path, 'rb') as handle:
+            header = handle.readline()
+            columns = [key_value(column) for column in header.decode('utf-8', errors='replace').split('\t')]
+            key_columns = [(col, name) for col, name in enumerate(columns) if name in KEY_COLUMNS]
+            name_columns = {col for col, name in enumerate(columns) if name in NAME_COLUMNS}
+            for row, (offset, record) in enumerate(iter_records(handle)):
+                offsets.append(offset)
+                cells = record.decode('utf-8', errors='replace').rstrip('\r\n').split('\t')
+                for col, cell in enumerate(cells):
+                    tokens = set(tokenize(cell))
+                    for token in tokens:
+                        postings.setdefault(token, []).append((row, col))
+                    if col in name_columns:
+                        name_tokens |= tokens
+                for col, name in key_columns:
+                    if col < len(cells) and key_value(cells[col]):
+                        keys.append((name, key_value(cells[col]), row))
+
+        file_id = connection.execute(
+            'INSERT INTO files (path, size, mtime, header, offsets) VALUES (?, ?, ?, ?, ?)',
+            (file_path, stat.st_size, stat.st_mtime, header, offsets.tobytes()),
+        ).lastrowid
+
+        connection.executemany('INSERT OR IGNORE INTO tokens (token) VALUES (?)', ((token,) for token in postings))
+        token_ids = dict(connection.execute(
+            'SELECT token, id FROM tokens WHERE token IN (SELECT value FROM json_each(?))',
+            (json.dumps(list(postings)),),
+        ))
+
+        connection.executemany(
+            'INSERT INTO postings (token_id, file_id, row, col) VALUES (?, ?, ?, ?)',
+            ((token_ids[token], file_id, row, col) for token, hits in postings.items() for row, col in hits),
+        )
+        connection.executemany(
+            'INSERT INTO keys (name, value, file_id, row) VALUES (?, ?, ?, ?)',
+            ((name, value, file_id, row) for name, value, row in keys),
+        )
+        self._index_name_tokens(connection, {token: token_ids[token] for token in name_tokens})
+
+    def _index_name_tokens(self, connection, token_ids):
+        # Schlüssel und Löschvarianten hängen nur vom Token ab und werden pro Token einmal abgelegt
+        known = {token_id for token_id, in connection.execute(
+            'SELECT token_id FROM name_tokens WHERE token_id IN (SELECT value FROM json_each(?))',
+            (json.dumps(list(token_ids.values())),))}
+        new_tokens = [(token, token_id) for token, token_id in token_ids.items() if token_id not in known]
+        connection.executemany('INSERT INTO name_tokens (token_id) VALUES (?)',
+                               ((token_id,) for _, token_id in new_tokens))
+        connection.executemany(
+            'INSERT OR IGNORE INTO phonetic (code, token_id) VALUES (?, ?)',
+            ((code, token_id) for code, token_id in ((cologne_phonetics(token), token_id)
+                                                     for token, token_id in new_tokens) if code),
+        )
+        connection.executemany(
+            'INSERT OR IGNORE INTO deletions (variant, token_id) VALUES (?, ?)',
+            ((variant, token_id) for token, token_id in new_tokens for variant in deletion_variants(token)),
+        )
+
+    def covered_files(self, file_paths):
+        """
+        Ermittelt, welche Dateien aktuell (gleiche Größe und Änderungszeit) im Index enthalten sind.
+
+        Args:
+            file_paths (list): Die zu prüfenden Dateipfade.
+
+        Returns:
+            dict: Abbildung absoluter Dateipfad -> Datei-ID für alle abgedeckten Dateien.
+        """
+        if not os.path.exists(self.path):
+            return {}
+        connection = self.connect()
+        try:
+            states = {path: (file_id, size, mtime)
+                      for file_id, path, size, mtime in connection.execute('SELECT id, path, size, mtime FROM files')}
+        finally:
+            connection.close()
+
+        covered = {}
+        for file_path in file_paths:
+            file_path = os.path.abspath(file_path)
+            state = states.get(file_path)
+            if state is None:
+                continue
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            if (stat.st_size, stat.st_mtime) == state[1:]:
+                covered[file_path] = state[0]
+        return covered
+
+    def candidate_rows(self, query, file_ids, columns=None):
+        """
+        Ermittelt die Kandidatenzeilen für eine Suchanfrage.
+
+        Das Ergebnis ist eine Obermenge der tatsächlichen Treffer und muss anschließend verifiziert werden.
+
+        Args:
+            query (str): Die Suchabfrage (kleingeschrieben).
+            file_ids (iterable): Die IDs der zu berücksichtigenden Dateien.
+            columns (dict): Optional Datei-ID -> Spaltenposition; nur Fundstellen in dieser Spalte zählen.
+
+        Returns:
+            dict: Abbildung Datei-ID -> sortierte Liste der Zeilennummern.
+        """
+        query_tokens = tokenize(query)
+        file_ids = set(file_ids)
+        if not query_tokens or not file_ids:
+            return {}
+
+        connection = self.connect()
+        try:
+            hits = None
+            last = len(query_tokens) - 1
+            for position, query_token in enumerate(query_tokens):
+                if 0 < position < last:
+                    # Innere Tokens müssen vollständig übereinstimmen
+                    condition, parameter = 'token = ?', query_token
+                else:
+                    condition, parameter = 'instr(token, ?) > 0', query_token
+                rows = connection.execute(
+                    f'SELECT p.file_id, p.row, p.col FROM postings p '
+                    f'WHERE p.token_id IN (SELECT id FROM tokens WHERE {condition})',
+                    (parameter,),
+                )
+                token_hits = {(file_id, row, col) for file_id, row, col in rows
+                              if file_id in file_ids and (columns is None or columns.get(file_id) == col)}
+                hits = token_hits if hits is None else hits & token_hits
+                if not hits:
+                    return {}
+        finally:
+            connection.close()
+
+        candidates = {}
+        for file_id, row, _ in hits:
+            candidates.setdefault(file_id, set()).add(row)
+        return {file_id: sorted(rows) for file_id, rows in candidates.items()}
+
+    def fuzzy_token_ids(self, connection, query_token):
+        """
+        Ermittelt die Tokens der Namensspalten, die einem Suchtoken unscharf entsprechen (siehe `tokens_match`).
+
+        Args:
+            connection (sqlite3.Connection): Die geöffnete Verbindung.
+            query_token (str): Das kleingeschriebene Suchtoken.
+
+        Returns:
+            set: Die IDs der passenden Tokens (einschließlich des exakt gleichen Tokens).
+        """
+        token_ids = {token_id for token_id, in connection.execute(
+            'SELECT id FROM tokens WHERE token = ?', (query_token,))}
+        code = cologne_phonetics(query_token)
+        if code:
+            token_ids.update(token_id for token_id, in connection.execute(
+                'SELECT token_id FROM phonetic WHERE code = ?', (code,)))
+        distance = max_distance(query_token)
+        if distance:
+            candidates = connection.execute(
+                'SELECT DISTINCT t.id, t.token FROM deletions d JOIN tokens t ON t.id = d.token_id '
+                'WHERE d.variant IN (SELECT value FROM json_each(?))',
+                (json.dumps(sorted(deletion_variants(query_token, distance))),),
+            )
+            for token_id, token in candidates:
+                limit = min(distance, max_distance(token))
+                if limit and edit_distance(query_token, token, limit) <= limit:
+                    token_ids.add(token_id)
+        return token_ids
+
+    def fuzzy_rows(self, query, file_ids, columns):
+        """
+        Ermittelt die Zeilen, in denen jedes Token der Anfrage unscharf (phonetisch oder mit Tippfehlern) in der
+        angegebenen Namensspalte vorkommt.
+
+        Die Teilstring-Treffer der exakten Suche sind nicht enthalten; sie liefert weiterhin `candidate_rows`.
+
+        Args:
+            query (str): Die Suchabfrage (kleingeschrieben).
+            file_ids (iterable): Die IDs der zu berücksichtigenden Dateien.
+            columns (dict): Datei-ID -> Position der Namensspalte.
+
+        Returns:
+            dict: Abbildung Datei-ID -> sortierte Liste der Zeilennummern.
+        """
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+        file_ids = set(file_ids)
+        if not query_tokens or not file_ids:
+            return {}
+
+        connection = self.connect()
+        try:
+            hits = None
+            for query_token in query_tokens:
+                rows = connection.execute(
+                    'SELECT file_id, row, col FROM postings WHERE token_id IN (SELECT value FROM json_each(?))',
+                    (json.dumps(sorted(self.fuzzy_token_ids(connection, query_token))),),
+                )
+                token_hits = {(file_id, row, col) for file_id, row, col in rows
+                              if file_id in file_ids and columns.get(file_id) == col}
+                hits = token_hits if hits is None else hits & token_hits
+                if not hits:
+                    return {}
+        finally:
+            connection.close()
+
+        matches = {}
+        for file_id, row, _ in hits:
+            matches.setdefault(file_id, set()).add(row)
+        return {file_id: sorted(rows) for file_id, rows in matches.items()}
+
+    def lookup_keys(self, name, values, file_ids):
+        """
+        Sucht die Zeilen, deren Schlüsselspalte einen der angegebenen Werte enthält.
+
+        Args:
+            name (str): Der Name der Schlüsselspalte (siehe `KEY_COLUMNS`).
+            values (iterable): Die gesuchten Schlüsselwerte.
+            file_ids (iterable): Die IDs der zu berücksichtigenden Dateien.
+
+        Returns:
+            dict: Abbildung Datei-ID -> sortierte Liste der Zeilennummern.
+        """
+        values = sorted({key_value(value) for value in values} - {''})
+        file_ids = set(file_ids)
+        if not values or not file_ids:
+            return {}
+
+        connection = self.connect()
+        try:
+            rows = connection.execute(
+                'SELECT file_id, row FROM keys WHERE name = ? AND value IN (SELECT value FROM json_each(?))',
+                (name, json.dumps(values)),
+            )
+            matches = {}
+            for file_id, row in rows:
+                if file_id in file_ids:
+                    matches.setdefault(file_id, set()).add(row)
+        finally:
+            connection.close()
+        return {file_id: sorted(rows) for file_id, rows in matches.items()}
+
+    def read_rows(self, file_id, rows):
+        """
+        Liest ausgewählte Zeilen einer indexierten Datei über die gespeicherten Byte-Offsets.
+
+        Args:
+            file_id (int): Die Datei-ID im Index.
+            rows (list): Die zu lesenden Zeilennummern.
+
+        Returns:
+            pandas.DataFrame: Die gelesenen Zeilen mit den Spaltennamen der Datei und ihren Zeilennummern als Index.
+        """
+        connection = self.connect()
+        try:
+            file_path, header, offsets_blob = connection.execute(
+                'SELECT path, header, offsets FROM files WHERE id = ?', (file_id,)).fetchone()
+        finally:
+            connection.close()
+
+        offsets = array('Q')
+        offsets.frombytes(offsets_blob)
+        buffer = io.BytesIO()
+        buffer.write(header)
+        with open(file_path, 'rb') as handle:
+            for row in rows:
+                handle.seek(offsets[row])
+                _, record = next(iter_records(handle))
+                buffer.write(record if record.endswith(b'\n') else record + b'\n')
+        buffer.seek(0)
+        df = pd.read_csv(buffer, sep="\t")
+        df.index = rows
+        return df
@@ -0,0 +1,220 @@
+"""
+Hintergrund-Jobs für das Hochladen und Extrahieren von Lieferungen.
+
+Uploads werden nicht mehr im Request-Thread verarbeitet: jeder Ingest wird als Job mit eigener ID in eine
+begrenzte Warteschlange gestellt und von einem festen Thread-Pool abgearbeitet. Status, Fortschritt und die Dauer
+jedes Verarbeitungsschritts sind über `/jobs/<id>` abrufbar. Ist die Warteschlange voll, wird der Job abgelehnt
+(`QueueFullError`), damit der Aufrufer mit HTTP 429 antworten kann.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_FINISHED = 'finished'
+JOB_FAILED = 'failed'
+
+
+class QueueFullError(Exception):
+    """
+    Die Job-Warteschlange hat ihre maximale Tiefe erreicht.
+    """
+
+
+class Job:
+    """
+    Ein Hintergrund-Job mit Status, Fortschritt und Zeitmessung pro Schritt.
+    """
+
+    def __init__(self, kind):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = JOB_QUEUED
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.step = None
+        self.done = 0
+        self.total = None
+        self.step_seconds = OrderedDict()
+        self.result = None
+        self.error = None
+        self._step_started = None
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+
+    def set_progress(self, step, done=None, total=None):
+        """
+        Meldet den aktuellen Verarbeitungsschritt und optional den Fortschritt innerhalb des Jobs.
+
+        Die Dauer des vorherigen Schritts wird dabei abgeschlossen und aufsummiert.
+
+        Args:
+            step (str): Der Name des Schritts (z.B. 'extract' oder 'index').
+            done (int): Die Anzahl bereits verarbeiteter Elemente.
+            total (int): Die Gesamtzahl der Elemente.
+        """
+        with self._lock:
+            self._close_step()
+            self.step = step
+            self._step_started = time.perf_counter()
+            if done is not None:
+                self.done = done
+            if total is not None:
+                self.total = total
+
+    def _close_step(self):
+        if self.step is not None and self._step_started is not None:
+            elapsed = time.perf_counter() - self._step_started
+            self.step_seconds[self.step] = self.step_seconds.get(self.step, 0.0) + elapsed
+            self._step_started = None
+
+    def start(self):
+        with self._lock:
+            self.status = JOB_RUNNING
+            self.started = time.time()
+
+    def finish(self, result=None, error=None):
+        with self._lock:
+            self._close_step()
+            self.step = None
+            self.result = result
+            self.error = error
+            self.status = JOB_FAILED if error else JOB_FINISHED
+            self.finished = time.time()
+        self._event.set()
+
+    def wait(self, timeout=None):
+        """
+        Wartet, bis der Job abgeschlossen ist.
+
+        Args:
+            timeout (float): Die maximale Wartezeit in Sekunden.
+
+        Returns:
+            bool: True, wenn der Job abgeschlossen ist.
+        """
+        return self._event.wait(timeout)
+
+    @property
+    def is_pending(self):
+        return self.status in (JOB_QUEUED, JOB_RUNNING)
+
+    def to_dict(self):
+        """
+        Gibt Status, Fortschritt und Zeitmessung des Jobs als JSON-fähiges Dictionary zurück.
+
+        Returns:
+            dict: Die Job-Informationen.
+        """
+        with self._lock:
+            now = time.time()
+            return {
+                'id': self.id,
+                'kind': self.kind,
+                'status': self.status,
+                'step': self.step,
+                'progress': {'done': self.done, 'total': self.total},
+                'timing': {
+                    'queued_seconds': round((self.started or now) - self.created, 3),
+                    'run_seconds': round((self.finished or now) - self.started, 3) if self.started else None,
+                    'steps': {step: round(seconds, 3) for step, seconds in self.step_seconds.items()},
+                },
+                'result': self.result,
+                'error': self.error,
+            }
+
+
+class JobQueue:
+    """
+    Begrenzte Warteschlange für Hintergrund-Jobs mit festem Thread-Pool.
+    """
+
+    def __init__(self, max_workers=2, max_pending=32, max_history=1000):
+        self.max_pending = max_pending
+        self.max_history = max_history
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ingest-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def pending(self):
+        """
+        Gibt die Anzahl wartender und laufender Jobs zurück.
+
+        Returns:
+            int: Die Anzahl offener Jobs.
+        """
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.is_pending)
+
+    def submit(self, kind, func, *args):
+        """
+        Stellt einen Job in die Warteschlange.
+
+        Args:
+            kind (str): Die Art des Jobs (z.B. 'upload').
+            func (callable): Die Job-Funktion; sie erhält den Job als erstes Argument und liefert das Ergebnis.
+            *args: Weitere Argumente für die Job-Funktion.
+
+        Returns:
+            Job: Der angelegte Job.
+
+        Raises:
+            QueueFullError: Wenn bereits `max_pending` Jobs offen sind.
+        """
+        job = Job(kind)
+        with self._lock:
+            if sum(1 for existing in self._jobs.values() if existing.is_pending) >= self.max_pending:
+                raise QueueFullError(f"Job queue is full ({self.max_pending} pending jobs)")
+            self._jobs[job.id] = job
+            self._evict()
+        self._executor.submit(self._run, job, func, args)
+        return job
+
+    def _run(self, job, func, args):
+        job.start()
+        try:
+            job.finish(result=func(job, *args))
+        except Exception as e:
+            job.finish(error=str(e))
+
+    def _evict(self):
+        # Nur abgeschlossene Jobs werden aus der Historie entfernt
+        for job_id in [job_id for job_id, job in self._jobs.items() if not job.is_pending]:
+            if len(self._jobs) <= self.max_history:
+                break
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        """
+        Gibt einen Job anhand seiner ID zurück.
+
+        Args:
+            job_id (str): Die Job-ID.
+
+        Returns:
+            Job: Der Job oder None.
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+
+def get_job_queue(app):
+    """
+    Gibt die Job-Warteschlange der Anwendung zurück und legt sie beim ersten Zugriff an.
+
+    Args:
+        app (Flask): Die Flask-Anwendung.
+
+    Returns:
+        JobQueue: Die Job-Warteschlange.
+    """
+    queue = app.extensions.get('job_queue')
+    if queue is None:
+        queue = app.extensions.setdefault('job_queue', JobQueue(
+            app.config['JOB_WORKERS'], app.config['JOB_QUEUE_SIZE'], app.config.get('JOB_HISTORY_SIZE', 1000)))
+    return queue
@@ -0,0 +1,158 @@
+"""
+Tabellenübergreifende Verknüpfung von Treffern über die Schlüsselspalten der SIARD-Tabellen.
+
+`Person` ist über `PIN` mit `Ausweis` und `Fzausweis` verbunden, `Fzausweis` über `STAMM` mit `FZ` und `Fzallgemein`;
+die Historientabellen hängen über `ID` bzw. `STAMM` an ihrer Haupttabelle. Ausgehend von den Treffern einer Tabelle
+werden die verknüpften Zeilen schrittweise über die beim Indexieren angelegte Schlüsseltabelle aufgelöst: pro
+Verknüpfung genügt eine einzige Index-Abfrage, statt jede Zieltabelle vollständig zu durchsuchen.
+"""
+
+from collections import deque
+
+from .analysis import list_txt_files, table_name_for
+from .results import ResultTable
+
+# Verknüpfungen (Tabelle, Spalte, Tabelle, Spalte); sie werden in beide Richtungen verfolgt
+RELATIONS = [
+    ('Person', 'PIN', 'PersonHist', 'PIN'),
+    ('Person', 'PIN', 'Ausweis', 'PIN'),
+    ('Person', 'PIN', 'Fzausweis', 'PIN'),
+    ('Ausweis', 'ID', 'Ausweishist', 'ID'),
+    ('Ausweis', 'ID', 'Ausweiskat', 'AUSWEISID'),
+    ('Ausweiskat', 'ID', 'Ausweiskathist', 'ID'),
+    ('Fzausweis', 'ID', 'Fzausweishist', 'ID'),
+    ('Fzausweis', 'STAMM', 'Fzallgemein', 'STAMM'),
+    ('Fzausweis', 'STAMM', 'FZ', 'STAMM'),
+    ('Fzallgemein', 'STAMM', 'Fzallgemeinhist', 'STAMM'),
+    ('FZ', 'STAMM', 'Fzhist', 'STAMM'),
+]
+
+# Maximale Anzahl Verknüpfungsschritte ab der Ausgangstabelle
+DEFAULT_JOIN_DEPTH = 3
+
+
+def neighbours(table):
+    """
+    Liefert die direkt verknüpften Tabellen einer Tabelle.
+
+    Args:
+        table (str): Der Tabellenname.
+
+    Returns:
+        list: Tupel (eigene Spalte, verknüpfte Tabelle, Spalte der verknüpften Tabelle).
+    """
+    result = []
+    for left, left_column, right, right_column in RELATIONS:
+        if left == table:
+            result.append((left_column, right, right_column))
+        elif right == table:
+            result.append((right_column, left, left_column))
+    return result
+
+
+def plan_joins(start_table, targets=None, max_depth=DEFAULT_JOIN_DEPTH):
+    """
+    Bestimmt die Verknüpfungsschritte (Breitensuche) von der Ausgangstabelle aus.
+
+    Sind Zieltabellen angegeben, bleiben nur die Schritte auf dem kürzesten Weg zu diesen Tabellen übrig.
+
+    Args:
+        start_table (str): Die Tabelle der Ausgangstreffer.
+        targets (iterable): Optional die gewünschten Zieltabellen.
+        max_depth (int): Die maximale Anzahl Schritte.
+
+    Returns:
+        list: Schritte (Tabelle, Spalte, verknüpfte Tabelle, Spalte) in Ausführungsreihenfolge.
+    """
+    steps = []
+    parents = {start_table: None}
+    queue = deque([(start_table, 0)])
+    while queue:
+        table, depth = queue.popleft()
+        if depth >= max_depth:
+            continue
+        for column, other, other_column in neighbours(table):
+            if other in parents:
+                continue
+            parents[other] = table
+            steps.append((table, column, other, other_column))
+            queue.append((other, depth + 1))
+
+    if targets is None:
+        return steps
+
+    needed = set()
+    for target in targets:
+        if target not in parents:
+            continue
+        while target is not None and target not in needed:
+            needed.add(target)
+            target = parents[target]
+    return [step for step in steps if step[2] in needed]
+
+
+def files_by_table(index, extract_dir, corpora=None):
+    """
+    Ordnet die aktuell indexierten Dateien eines Verzeichnisses ihren Tabellen zu.
+
+    Args:
+        index (SearchIndex): Der Suchindex.
+        extract_dir (str): Das Extraktionsverzeichnis.
+        corpora (list): Nur die Dateien dieser Korpora berücksichtigen; None berücksichtigt alle.
+
+    Returns:
+        dict: Abbildung Tabellenname -> Liste der Datei-IDs.
+    """
+    tables = {}
+    for file_path, file_id in index.covered_files(list_txt_files(extract_dir, corpora)).items():
+        tables.setdefault(table_name_for(file_path), []).append(file_id)
+    return tables
+
+
+def lookup_rows(index, file_ids, column, values):
+    """
+    Liest alle Zeilen der angegebenen Dateien, deren Schlüsselspalte einen der Werte enthält.
+
+    Args:
+        index (SearchIndex): Der Suchindex.
+        file_ids (list): Die zu berücksichtigenden Datei-IDs.
+        column (str): Die Schlüsselspalte.
+        values (iterable): Die Schlüsselwerte.
+
+    Returns:
+        list: Die gefundenen Zeilen als Dictionaries.
+    """
+    rows = []
+    for file_id, row_numbers in sorted(index.lookup_keys(column, values, file_ids).items()):
+        rows.extend(ResultTable.from_frame(index.read_rows(file_id, row_numbers)))
+    return rows
+
+
+def resolve_related(index, tables, start_table, start_rows, targets=None, max_depth=DEFAULT_JOIN_DEPTH, logger=None):
+    """
+    Löst die mit den Ausgangstreffern verknüpften Zeilen der übrigen Tabellen auf.
+
+    Args:
+        index (SearchIndex): Der Suchindex mit den Schlüsseleinträgen.
+        tables (dict): Tabellenname -> Datei-IDs (siehe `files_by_table`).
+        start_table (str): Die Tabelle der Ausgangstreffer.
+        start_rows (list): Die Ausgangstreffer als Dictionaries.
+        targets (iterable): Optional die gewünschten Zieltabellen; sonst alle erreichbaren Tabellen.
+        max_depth (int): Die maximale Anzahl Verknüpfungsschritte.
+        logger (logging.Logger): Optionaler Logger.
+
+    Returns:
+        dict: Abbildung Tabellenname -> Liste der verknüpften Zeilen (inkl. der Ausgangstabelle).
+    """
+    found = {start_table: start_rows}
+    for table, column, other, other_column in plan_joins(start_table, targets, max_depth):
+        values = [row.get(column) for row in found.get(table, ())]
+        if not values or other not in tables:
+            continue
+        found[other] = lookup_rows(index, tables[other], other_column, values)
+        if logger:
+            logger.debug("Joined %s.%s -> %s.%s: %s rows", table, column, other, other_column, len(found[other]))
+
+    if targets is not None:
+        return {table: rows for table, rows in found.items() if table == start_table or table in targets}
+    return found
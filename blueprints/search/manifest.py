@@ -0,0 +1,168 @@
+"""
+Manifest der bereits verarbeiteten Dateien für inkrementelle Ingests.
+
+Für jede extrahierte TXT-Datei werden Pfad, Größe, Änderungszeit und eine Prüfsumme des Inhalts gespeichert. Als
+Prüfsumme dient CRC-32, da sie für ZIP-Members bereits im zentralen Verzeichnis des Archivs steht: ein erneut
+hochgeladenes Archiv kann so Member für Member mit dem Manifest verglichen werden, ohne etwas zu entpacken.
+Unveränderte Members werden weder entpackt noch erneut analysiert oder indexiert; Extraktion, Schema-Erkennung und
+Index arbeiten nur auf den neuen oder geänderten Dateien.
+
+Das Manifest liegt als `manifest.json` im Extraktionsverzeichnis.
+"""
+
+import json
+import os
+import threading
+import zlib
+
+MANIFEST_FILENAME = 'manifest.json'
+
+# Puffergröße beim Berechnen der Prüfsumme
+HASH_BUFFER_BYTES = 1024 * 1024  # 1MB
+
+_manifest_lock = threading.Lock()
+
+
+def manifest_path_for(extract_dir):
+    """
+    Gibt den Pfad des Manifests eines Extraktionsverzeichnisses zurück.
+
+    Args:
+        extract_dir (str): Das Extraktionsverzeichnis.
+
+    Returns:
+        str: Der Pfad zu `manifest.json`.
+    """
+    return os.path.join(extract_dir, MANIFEST_FILENAME)
+
+
+def content_hash(file_path):
+    """
+    Berechnet die Prüfsumme (CRC-32) einer Datei wie im zentralen Verzeichnis einer ZIP-Datei.
+
+    Args:
+        file_path (str): Der Pfad zur Datei.
+
+    Returns:
+        str: Die Prüfsumme als 8-stellige Hexadezimalzahl.
+    """
+    crc = 0
+    with open(file_path, 'rb') as handle:
+        for block in iter(lambda: handle.read(HASH_BUFFER_BYTES), b''):
+            crc = zlib.crc32(block, crc)
+    return format_hash(crc)
+
+
+def format_hash(crc):
+    """
+    Formatiert eine CRC-32-Prüfsumme (z.B. `ZipInfo.CRC`) für das Manifest.
+
+    Args:
+        crc (int): Die Prüfsumme.
+
+    Returns:
+        str: Die Prüfsumme als 8-stellige Hexadezimalzahl.
+    """
+    return f"{crc & 0xFFFFFFFF:08x}"
+
+
+class Manifest:
+    """
+    Manifest (Pfad -> Größe, Änderungszeit, Prüfsumme) der verarbeiteten Dateien eines Extraktionsverzeichnisses.
+    """
+
+    def __init__(self, extract_dir):
+        self.path = manifest_path_for(extract_dir)
+        self.entries = self._read()
+        self._updates = {}
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f).get('files', {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def is_current(self, file_path, size=None, digest=None):
+        """
+        Prüft, ob eine Datei unverändert seit dem letzten Ingest vorliegt.
+
+        Die Datei wird dabei nicht gelesen: Größe und Änderungszeit müssen mit dem Manifest übereinstimmen, ebenso
+        die erwartete Größe und Prüfsumme, sofern sie bekannt sind (z.B. aus dem ZIP-Verzeichnis).
+
+        Args:
+            file_path (str): Der Pfad zur Datei.
+            size (int): Die erwartete Größe (z.B. aus dem ZIP-Verzeichnis).
+            digest (str): Die erwartete Prüfsumme.
+
+        Returns:
+            bool: True, wenn die Datei vorhanden und unverändert ist.
+        """
+        file_path = os.path.abspath(file_path)
+        entry = self.entries.get(file_path)
+        if entry is None:
+            return False
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        if stat.st_size != entry['size'] or (size is not None and size != entry['size']):
+            return False
+        if digest is not None and digest != entry['hash']:
+            return False
+        return stat.st_mtime == entry['mtime']
+
+    def record(self, file_path, digest=None):
+        """
+        Trägt den aktuellen Zustand einer Datei in das Manifest ein (wird erst mit `save` geschrieben, nachdem die
+        Datei vollständig verarbeitet ist).
+
+        Args:
+            file_path (str): Der Pfad zur Datei.
+            digest (str): Die Prüfsumme; wird berechnet, wenn sie fehlt.
+        """
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        entry = {'size': stat.st_size, 'mtime': stat.st_mtime, 'hash': digest or content_hash(file_path)}
+        with self._lock:
+            self.entries[file_path] = entry
+            self._updates[file_path] = entry
+
+    def forget_directory(self, directory):
+        """
+        Entfernt alle Einträge unterhalb eines Verzeichnisses aus dem Manifest und schreibt es sofort.
+
+        Args:
+            directory (str): Das Verzeichnis (z.B. eines gelöschten Korpus).
+        """
+        prefix = os.path.join(os.path.abspath(directory), '')
+        with _manifest_lock:
+            entries = {path: entry for path, entry in self._read().items() if not path.startswith(prefix)}
+            if os.path.exists(self.path):
+                with open(self.path + '.tmp', 'w') as f:
+                    json.dump({'files': entries}, f)
+                os.replace(self.path + '.tmp', self.path)
+        with self._lock:
+            self.entries = {path: entry for path, entry in self.entries.items() if not path.startswith(prefix)}
+
+    def save(self):
+        """
+        Schreibt die neuen Einträge in das Manifest.
+
+        Die Einträge werden mit dem aktuellen Stand der Datei zusammengeführt, damit gleichzeitig laufende Ingests
+        sich nicht gegenseitig überschreiben.
+        """
+        with self._lock:
+            updates, self._updates = self._updates, {}
+        if not updates:
+            return
+        with _manifest_lock:
+            entries = self._read()
+            entries.update(updates)
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path + '.tmp', 'w') as f:
+                json.dump({'files': entries}, f)
+            os.replace(self.path + '.tmp', self.path)
+        with self._lock:
+            self.entries = {**entries, **self.entries}
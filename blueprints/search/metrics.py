@@ -0,0 +1,338 @@
+"""
+Zeitmessung der heißen Pfade und Export im Prometheus-Textformat.
+
+Die Dauer der einzelnen Verarbeitungsschritte (Dateisuche im Verzeichnisbaum, Parsen, Abgleich, Serialisierung der
+Ergebnisse, Index-Abfrage, Entpacken und Schema-Analyse) wird pro Datei bzw. Aufruf in Histogramme eingetragen, die
+unter `/metrics` abrufbar sind. Zusätzlich werden die Zeiten einer Anfrage in einem `RequestTimings`-Objekt
+aufsummiert und als `Server-Timing`-Header an die Antwort gehängt.
+
+Das Objekt der laufenden Anfrage liegt in einer Kontextvariablen; Worker-Threads erhalten es über `submit`, Worker-
+Prozesse liefern ihre Zeiten über `collect_timings` mit dem Ergebnis zurück.
+"""
+
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Obergrenzen der Histogramm-Buckets in Sekunden
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Gemessene Verarbeitungsschritte
+STAGES = ('discover', 'index', 'parse', 'match', 'serialize', 'extract', 'schema')
+
+# Content-Type des Prometheus-Textformats
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_current_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+def format_labels(names, values, extra=None):
+    """
+    Formatiert Labels im Prometheus-Textformat.
+
+    Args:
+        names (tuple): Die Label-Namen.
+        values (tuple): Die Label-Werte.
+        extra (tuple): Optional ein zusätzliches Paar (Name, Wert), z.B. für `le`.
+
+    Returns:
+        str: Die Labels in geschweiften Klammern oder ein leerer String.
+    """
+    pairs = list(zip(names, values))
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def format_value(value):
+    """
+    Formatiert einen Messwert bzw. eine Bucket-Grenze.
+
+    Args:
+        value (float): Der Wert.
+
+    Returns:
+        str: Der Wert als Text (`+Inf` für unendlich).
+    """
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    Ein thread-sicheres Histogramm mit festen Buckets und beliebigen Label-Kombinationen.
+    """
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """
+        Trägt einen Messwert ein.
+
+        Args:
+            value (float): Der Messwert (z.B. eine Dauer in Sekunden).
+            **labels: Die Label-Werte.
+        """
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        position = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0}
+            series['counts'][position] += 1
+            series['sum'] += value
+
+    def snapshot(self):
+        """
+        Gibt eine Kopie aller Zeitreihen zurück.
+
+        Returns:
+            dict: Pro Label-Kombination die (nicht kumulierten) Bucket-Zähler und die Summe.
+        """
+        with self._lock:
+            return {key: {'counts': list(series['counts']), 'sum': series['sum']}
+                    for key, series in self._series.items()}
+
+    def render(self):
+        """
+        Gibt das Histogramm im Prometheus-Textformat aus.
+
+        Returns:
+            list: Die Zeilen.
+        """
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for key, series in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series['counts']):
+                cumulative += count
+                labels = format_labels(self.labelnames, key, ('le', format_value(bound)))
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {format_value(series["sum"])}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+    def clear(self):
+        """
+        Verwirft alle Messwerte.
+        """
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """
+    Sammlung aller Histogramme eines Prozesses.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """
+        Gibt das Histogramm mit dem angegebenen Namen zurück und legt es beim ersten Zugriff an.
+
+        Args:
+            name (str): Der Metrikname.
+            documentation (str): Die Beschreibung für `# HELP`.
+            labelnames (tuple): Die Label-Namen.
+            buckets (tuple): Die Bucket-Obergrenzen.
+
+        Returns:
+            Histogram: Das Histogramm.
+        """
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Histogram(name, documentation, labelnames, buckets)
+            return metric
+
+    def render(self):
+        """
+        Gibt alle Metriken im Prometheus-Textformat aus.
+
+        Returns:
+            str: Der Text für den `/metrics`-Endpunkt.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(line for metric in metrics for line in metric.render()) + '\n'
+
+    def clear(self):
+        """
+        Verwirft die Messwerte aller Metriken.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'search_stage_seconds', 'Dauer der Verarbeitungsschritte pro Datei bzw. Aufruf in Sekunden.', ('stage',))
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    'search_request_seconds', 'Dauer der HTTP-Anfragen in Sekunden.', ('endpoint', 'method', 'status'))
+
+
+class RequestTimings:
+    """
+    Summiert die Dauer der Verarbeitungsschritte einer Anfrage (auch über Worker-Threads hinweg).
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds, count=1):
+        """
+        Addiert die Dauer eines Schritts.
+
+        Args:
+            stage (str): Der Schritt (siehe `STAGES`).
+            seconds (float): Die Dauer in Sekunden.
+            count (int): Die Anzahl der zusammengefassten Aufrufe.
+        """
+        with self._lock:
+            total = self._totals.setdefault(stage, [0.0, 0])
+            total[0] += seconds
+            total[1] += count
+
+    def to_dict(self):
+        """
+        Gibt die aufsummierten Zeiten zurück.
+
+        Returns:
+            dict: Pro Schritt die Summe der Dauer in Sekunden (`seconds`) und die Anzahl Aufrufe (`count`).
+        """
+        with self._lock:
+            return {stage: {'seconds': round(seconds, 6), 'count': count}
+                    for stage, (seconds, count) in self._totals.items()}
+
+    def server_timing(self):
+        """
+        Formatiert die Zeiten als Wert des `Server-Timing`-Headers (Dauer in Millisekunden).
+
+        Da Worker parallel arbeiten, kann die Summe eines Schritts größer als die Gesamtdauer (`total`) sein.
+
+        Returns:
+            str: Der Header-Wert.
+        """
+        entries = [f'{stage};dur={info["seconds"] * 1000:.2f}' for stage, info in self.to_dict().items()]
+        entries.append(f'total;dur={(time.perf_counter() - self.started) * 1000:.2f}')
+        return ', '.join(entries)
+
+
+def start_request():
+    """
+    Beginnt die Zeitmessung einer Anfrage im aktuellen Kontext.
+
+    Returns:
+        RequestTimings: Das Objekt, in dem die Zeiten der Anfrage gesammelt werden.
+    """
+    timings = RequestTimings()
+    _current_timings.set(timings)
+    return timings
+
+
+def current_timings():
+    """
+    Gibt die Zeitmessung der laufenden Anfrage zurück.
+
+    Returns:
+        RequestTimings: Das Objekt oder None außerhalb einer Anfrage (z.B. in Hintergrund-Jobs).
+    """
+    return _current_timings.get()
+
+
+def observe(stage, seconds):
+    """
+    Trägt die Dauer eines Schritts in das Histogramm und in die Zeitmessung der laufenden Anfrage ein.
+
+    Args:
+        stage (str): Der Schritt (siehe `STAGES`).
+        seconds (float): Die Dauer in Sekunden.
+    """
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(stage, seconds)
+
+
+@contextmanager
+def timed(stage):
+    """
+    Misst die Dauer des umschlossenen Blocks als Schritt `stage` (siehe `observe`).
+
+    Args:
+        stage (str): Der Schritt (siehe `STAGES`).
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+
+def submit(executor, func, *args):
+    """
+    Plant eine Funktion in einem Thread-Pool ein und gibt ihr die Zeitmessung der laufenden Anfrage mit.
+
+    Args:
+        executor (concurrent.futures.Executor): Der Thread-Pool.
+        func (callable): Die Funktion.
+        *args: Die Argumente.
+
+    Returns:
+        concurrent.futures.Future: Das Future der Funktion.
+    """
+    return executor.submit(contextvars.copy_context().run, func, *args)
+
+
+def collect_timings(func, *args):
+    """
+    Worker-Funktion für Prozess-Pools: führt `func` mit eigener Zeitmessung aus und liefert die Zeiten mit zurück.
+
+    Args:
+        func (callable): Die (picklebare) Funktion.
+        *args: Die Argumente.
+
+    Returns:
+        tuple: Das Ergebnis von `func` und die Zeiten (siehe `RequestTimings.to_dict`).
+    """
+    timings = RequestTimings()
+    token = _current_timings.set(timings)
+    try:
+        return func(*args), timings.to_dict()
+    finally:
+        _current_timings.reset(token)
+
+
+def record_timings(timings):
+    """
+    Übernimmt die von einem Worker-Prozess gemessenen Zeiten (siehe `collect_timings`).
+
+    Args:
+        timings (dict): Die Zeiten pro Schritt.
+    """
+    for stage, info in timings.items():
+        STAGE_SECONDS.observe(info['seconds'], stage=stage)
+        current = _current_timings.get()
+        if current is not None:
+            current.add(stage, info['seconds'], info['count'])
@@ -0,0 +1,172 @@
+"""
+Phonetische Schlüssel und Tippfehlertoleranz für die Namenssuche.
+
+Namen wie "Meier", "Meyer" und "Maier" werden über die Kölner Phonetik auf denselben Schlüssel abgebildet. Für
+Tippfehler (vertauschte, fehlende oder falsche Buchstaben) werden Kandidaten mit dem Symmetric-Delete-Verfahren
+gefunden: jedes Token wird zusammen mit allen Varianten abgelegt, die durch das Löschen von bis zu `max_distance`
+Zeichen entstehen. Zwei Tokens mit Editierdistanz k teilen mindestens eine solche Variante, sodass eine Anfrage nur
+ihre eigenen Varianten im Index nachschlagen und die wenigen Kandidaten mit `edit_distance` bestätigen muss. Damit
+lange Tokens (z.B. Straßennamen) den Index nicht aufblähen, werden nur die Varianten ihres Anfangs
+(`DELETION_PREFIX_LENGTH` Zeichen) gebildet; die Bestätigung vergleicht immer die ganzen Tokens.
+"""
+
+# Umlaute und Sonderzeichen vor der Kodierung
+PHONETIC_REPLACEMENTS = str.maketrans({'Ä': 'A', 'Ö': 'O', 'Ü': 'U', 'ß': 'S', 'É': 'E', 'È': 'E', 'Ç': 'C'})
+
+# Buchstabengruppen der Kölner Phonetik
+VOWELS = frozenset('AEIJOUY')
+C_INITIAL_HARD = frozenset('AHKLOQRUX')
+C_HARD = frozenset('AHKOQUX')
+SIBILANTS = frozenset('SZ')
+DT_SOFT = frozenset('CSZ')
+X_AFTER = frozenset('CKQ')
+
+# Minimale Tokenlänge für eine Editierdistanz von 1 bzw. 2 (kürzere Tokens müssen exakt bzw. phonetisch passen)
+MIN_LENGTH_DISTANCE_1 = 3
+MIN_LENGTH_DISTANCE_2 = 8
+
+# Anzahl Zeichen am Tokenanfang, aus denen die Löschvarianten gebildet werden
+DELETION_PREFIX_LENGTH = 7
+
+
+def cologne_phonetics(word):
+    """
+    Berechnet den phonetischen Schlüssel eines Wortes nach der Kölner Phonetik.
+
+    Args:
+        word (str): Das Wort (z.B. ein Name).
+
+    Returns:
+        str: Der Schlüssel aus Ziffern (z.B. '67' für "Meier"); leer für Wörter ohne Buchstaben.
+    """
+    letters = [letter for letter in word.upper().translate(PHONETIC_REPLACEMENTS) if 'A' <= letter <= 'Z']
+    codes = []
+    for position, letter in enumerate(letters):
+        previous = letters[position - 1] if position else ''
+        following = letters[position + 1] if position + 1 < len(letters) else ''
+        if letter in VOWELS:
+            code = '0'
+        elif letter == 'H':
+            continue
+        elif letter == 'B':
+            code = '1'
+        elif letter == 'P':
+            code = '3' if following == 'H' else '1'
+        elif letter in 'DT':
+            code = '8' if following in DT_SOFT else '2'
+        elif letter in 'FVW':
+            code = '3'
+        elif letter in 'GKQ':
+            code = '4'
+        elif letter == 'C':
+            if not position:
+                code = '4' if following in C_INITIAL_HARD else '8'
+            else:
+                code = '4' if following in C_HARD and previous not in SIBILANTS else '8'
+        elif letter == 'X':
+            code = '8' if previous in X_AFTER else '48'
+        elif letter == 'L':
+            code = '5'
+        elif letter in 'MN':
+            code = '6'
+        elif letter == 'R':
+            code = '7'
+        else:
+            code = '8'
+        codes.append(code)
+
+    # Gleiche benachbarte Ziffern zusammenfassen, dann alle Nullen außer am Anfang entfernen
+    digits = []
+    for digit in ''.join(codes):
+        if not digits or digits[-1] != digit:
+            digits.append(digit)
+    return ''.join(digit for position, digit in enumerate(digits) if digit != '0' or not position)
+
+
+def max_distance(token):
+    """
+    Gibt die tolerierte Editierdistanz für ein Token zurück (längere Tokens vertragen mehr Tippfehler).
+
+    Args:
+        token (str): Das Token.
+
+    Returns:
+        int: Die maximale Editierdistanz (0, 1 oder 2).
+    """
+    if len(token) >= MIN_LENGTH_DISTANCE_2:
+        return 2
+    return 1 if len(token) >= MIN_LENGTH_DISTANCE_1 else 0
+
+
+def deletion_variants(token, distance=None):
+    """
+    Erzeugt alle Varianten des Tokenanfangs, die durch das Löschen von bis zu `distance` Zeichen entstehen.
+
+    Args:
+        token (str): Das Token.
+        distance (int): Die maximale Anzahl gelöschter Zeichen (Standard: `max_distance(token)`).
+
+    Returns:
+        set: Die Varianten einschließlich des (gekürzten) Tokens selbst.
+    """
+    distance = max_distance(token) if distance is None else distance
+    token = token[:DELETION_PREFIX_LENGTH]
+    variants = {token}
+    level = {token}
+    for _ in range(distance):
+        level = {word[:position] + word[position + 1:] for word in level if len(word) > 1
+                 for position in range(len(word))}
+        variants |= level
+    return variants
+
+
+def edit_distance(first, second, limit):
+    """
+    Berechnet die Editierdistanz (Einfügen, Löschen, Ersetzen, Vertauschen benachbarter Zeichen) mit Abbruch.
+
+    Args:
+        first (str): Das erste Wort.
+        second (str): Das zweite Wort.
+        limit (int): Die größte interessierende Distanz.
+
+    Returns:
+        int: Die Distanz oder `limit + 1`, sobald sie `limit` sicher übersteigt.
+    """
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    previous_previous = None
+    previous = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        current = [i] + [0] * len(second)
+        for j, second_char in enumerate(second, 1):
+            cost = first_char != second_char
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and i > 1 and j > 1 and first_char == second[j - 2]
+                    and first[i - 2] == second_char):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def tokens_match(query_token, token):
+    """
+    Prüft, ob ein Token einem Suchtoken unscharf entspricht (gleicher phonetischer Schlüssel oder Tippfehler).
+
+    Tokens ohne Buchstaben (z.B. Hausnummern) müssen exakt übereinstimmen.
+
+    Args:
+        query_token (str): Das kleingeschriebene Suchtoken.
+        token (str): Das kleingeschriebene Token aus den Daten.
+
+    Returns:
+        bool: True, wenn das Token passt.
+    """
+    if query_token == token:
+        return True
+    code = cologne_phonetics(query_token)
+    if code and code == cologne_phonetics(token):
+        return True
+    distance = min(max_distance(query_token), max_distance(token))
+    return distance > 0 and edit_distance(query_token, token, distance) <= distance
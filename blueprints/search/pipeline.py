@@ -0,0 +1,228 @@
+"""
+Parallele Extraktions-Pipeline für ZIP-Lieferungen.
+
+Statt jede ZIP-Datei nacheinander mit `extractall` zu entpacken, wird jeder Member einer Lieferung als eigene
+Aufgabe an einen Thread-Pool übergeben; große Members werden zuerst gestartet. Die Dekompression (zlib) und das
+Schreiben geben das GIL frei, sodass Threads mehrere Kerne auslasten. Jede Aufgabe öffnet die ZIP-Datei selbst,
+da `zipfile.ZipFile` nicht für gleichzeitiges Lesen aus mehreren Threads ausgelegt ist.
+
+Mit einem Manifest (siehe `manifest`) werden nur neue oder geänderte Members entpackt.
+
+Im Streaming-Modus werden die TXT-Members ohne Zwischendatei direkt in den spaltenbasierten Cache umgewandelt.
+"""
+
+import os
+import shutil
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .columnar import COLUMNAR_DIRNAME, load_columnar, write_columnar
+from .manifest import format_hash
+from .metrics import timed
+
+# Puffergröße beim Kopieren dekomprimierter Daten
+COPY_BUFFER_BYTES = 1024 * 1024  # 1MB
+
+
+def member_target(extract_dir, member_name):
+    """
+    Bestimmt den Zielpfad eines Members und verhindert Pfade außerhalb des Zielverzeichnisses.
+
+    Args:
+        extract_dir (str): Das Zielverzeichnis.
+        member_name (str): Der Name des Members im ZIP.
+
+    Returns:
+        str: Der Zielpfad oder None, wenn der Member außerhalb des Zielverzeichnisses landen würde.
+    """
+    root = os.path.abspath(extract_dir)
+    target = os.path.abspath(os.path.join(root, *member_name.replace('\\', '/').split('/')))
+    if os.path.commonpath([root, target]) != root or target == root:
+        return None
+    return target
+
+
+def member_columnar_path(zip_path, member_name):
+    """
+    Gibt das Cache-Verzeichnis eines direkt gestreamten Members zurück.
+
+    Der Cache liegt wie bei TXT-Dateien im versteckten Verzeichnis `.columnar` neben der ZIP-Datei, damit er sich
+    allein aus dem Member-Pfad ableiten lässt.
+
+    Args:
+        zip_path (str): Der Pfad zur ZIP-Datei.
+        member_name (str): Der Name des Members im ZIP.
+
+    Returns:
+        str: Der Pfad zum Cache-Verzeichnis.
+    """
+    return os.path.join(os.path.dirname(os.path.abspath(zip_path)), COLUMNAR_DIRNAME, os.path.basename(zip_path),
+                        *member_name.split('/'))
+
+
+def zip_stamp(zip_path):
+    """
+    Gibt Größe und Änderungszeit einer ZIP-Datei zurück; sie dienen als Aktualitätsmerkmal gestreamter Members.
+
+    Args:
+        zip_path (str): Der Pfad zur ZIP-Datei.
+
+    Returns:
+        tuple: Größe und Änderungszeit.
+    """
+    stat = os.stat(zip_path)
+    return stat.st_size, stat.st_mtime
+
+
+def list_member_tasks(archives, txt_only=False):
+    """
+    Listet die Members aller ZIP-Dateien, größte zuerst.
+
+    Args:
+        archives (list): Tupel (ZIP-Pfad, Zielverzeichnis).
+        txt_only (bool): Nur TXT-Members berücksichtigen.
+
+    Returns:
+        list: Tupel (ZIP-Pfad, Member-Name, Zielverzeichnis, unkomprimierte Größe, CRC-32).
+    """
+    tasks = []
+    for zip_path, extract_dir in archives:
+        with zipfile.ZipFile(zip_path, 'r') as zip_file:
+            for info in zip_file.infolist():
+                if not info.is_dir() and (info.filename.endswith('.txt') or not txt_only):
+                    tasks.append((zip_path, info.filename, extract_dir, info.file_size, info.CRC))
+    tasks.sort(key=lambda task: task[3], reverse=True)
+    return tasks
+
+
+def is_unchanged_member(manifest, zip_path, member_name, extract_dir, size, crc):
+    """
+    Prüft anhand des Manifests, ob ein TXT-Member bereits unverändert entpackt vorliegt.
+
+    Args:
+        manifest (Manifest): Das Manifest bereits entpackter Dateien.
+        zip_path (str): Der Pfad zur ZIP-Datei.
+        member_name (str): Der Name des Members.
+        extract_dir (str): Das Zielverzeichnis.
+        size (int): Die unkomprimierte Größe des Members.
+        crc (int): Die CRC-32 des Members aus dem ZIP-Verzeichnis.
+
+    Returns:
+        bool: True, wenn der Member nicht erneut entpackt werden muss.
+    """
+    if not member_name.endswith('.txt'):
+        return False
+    target = member_target(extract_dir, member_name)
+    return target is not None and manifest.is_current(target, size, format_hash(crc))
+
+
+def extract_member(zip_path, member_name, extract_dir):
+    """
+    Entpackt einen einzelnen Member in das Zielverzeichnis.
+
+    Die Datei wird zunächst unter einem temporären Namen geschrieben und erst nach vollständigem Entpacken
+    umbenannt, damit parallel laufende Suchen keine halb geschriebenen Dateien sehen.
+
+    Args:
+        zip_path (str): Der Pfad zur ZIP-Datei.
+        member_name (str): Der Name des Members.
+        extract_dir (str): Das Zielverzeichnis.
+
+    Returns:
+        str: Der Pfad der entpackten Datei.
+    """
+    target = member_target(extract_dir, member_name)
+    if target is None:
+        raise ValueError(f"Unsafe member path: {member_name}")
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with timed('extract'), zipfile.ZipFile(zip_path, 'r') as zip_file:
+        with zip_file.open(member_name) as source, open(target + '.part', 'wb') as destination:
+            shutil.copyfileobj(source, destination, COPY_BUFFER_BYTES)
+    os.replace(target + '.part', target)
+    return target
+
+
+def stream_member_to_columnar(zip_path, member_name, extract_dir):
+    """
+    Wandelt einen Member ohne Zwischendatei direkt in den spaltenbasierten Cache um.
+
+    Args:
+        zip_path (str): Der Pfad zur ZIP-Datei.
+        member_name (str): Der Name des Members.
+        extract_dir (str): Das Zielverzeichnis der Lieferung (ungenutzt; der Cache liegt neben der ZIP-Datei).
+
+    Returns:
+        str: Der Pfad zum Cache-Verzeichnis.
+    """
+    target = member_columnar_path(zip_path, member_name)
+    stamp = zip_stamp(zip_path)
+    if load_columnar(target, stamp) is not None:
+        return target
+    with timed('extract'), zipfile.ZipFile(zip_path, 'r') as zip_file:
+        try:
+            return write_columnar(lambda: zip_file.open(member_name), target, stamp)
+        except Exception:
+            shutil.rmtree(target, ignore_errors=True)
+            raise
+
+
+def extract_archives(archives, max_workers=None, stream=False, logger=None, manifest=None):
+    """
+    Entpackt mehrere ZIP-Dateien parallel auf Member-Ebene und misst den Durchsatz.
+
+    Mit einem Manifest werden nur neue oder geänderte Members entpackt: ein Member gilt als unverändert, wenn die
+    Zieldatei mit gleicher Größe und gleicher CRC-32 (aus dem ZIP-Verzeichnis) im Manifest steht.
+
+    Args:
+        archives (list): Tupel (ZIP-Pfad, Zielverzeichnis).
+        max_workers (int): Die Anzahl paralleler Worker (Standard: Anzahl CPU-Kerne).
+        stream (bool): Members direkt in den spaltenbasierten Cache streamen statt TXT-Dateien zu schreiben.
+        logger (logging.Logger): Optionaler Logger für Fortschritt, Fehler und Durchsatz.
+        manifest (Manifest): Optionales Manifest bereits entpackter Dateien (nicht im Streaming-Modus); die neuen
+            Members werden darin vermerkt, gespeichert wird es erst vom Aufrufer nach der Weiterverarbeitung.
+
+    Returns:
+        tuple: Die Liste der neu erzeugten TXT-Dateien (bzw. Cache-Verzeichnisse im Streaming-Modus) und ein
+        Dictionary mit Statistiken (`members`, `skipped`, `bytes`, `seconds`, `mb_per_s`).
+    """
+    start = time.perf_counter()
+    tasks = list_member_tasks(archives, txt_only=stream)
+    worker = stream_member_to_columnar if stream else extract_member
+    skipped = 0
+    if manifest is not None and not stream:
+        pending = [task for task in tasks if not is_unchanged_member(manifest, *task)]
+        skipped = len(tasks) - len(pending)
+        tasks = pending
+
+    paths = []
+    total_bytes = 0
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 4) as executor:
+        futures = {executor.submit(worker, zip_path, member_name, extract_dir): (zip_path, member_name, size, crc)
+                   for zip_path, member_name, extract_dir, size, crc in tasks}
+        for future in as_completed(futures):
+            zip_path, member_name, size, crc = futures[future]
+            try:
+                path = future.result()
+                total_bytes += size
+                if manifest is not None and not stream and member_name.endswith('.txt'):
+                    manifest.record(path, format_hash(crc))
+                if stream or member_name.endswith('.txt'):
+                    paths.append(path)
+            except Exception as e:
+                if logger:
+                    logger.error("Error extracting member %s from %s: %s", member_name, zip_path, e)
+
+    seconds = time.perf_counter() - start
+    stats = {
+        'members': len(tasks),
+        'skipped': skipped,
+        'bytes': total_bytes,
+        'seconds': round(seconds, 3),
+        'mb_per_s': round(total_bytes / (1024 * 1024) / seconds, 2) if seconds > 0 else 0.0,
+    }
+    if logger:
+        logger.info("Extracted %d members (%.1f MB) from %d archives in %ss: %s MB/s (%d unchanged members skipped)",
+                    stats['members'], total_bytes / (1024 * 1024), len(archives), stats['seconds'],
+                    stats['mb_per_s'], skipped)
+    return sorted(paths), stats
@@ -0,0 +1,88 @@
+"""
+Kompakte Darstellung der Treffer einer Datei und ihre Serialisierung.
+
+Die Treffer einer Datei werden als `ResultTable` gehalten: die Spaltennamen einmal, jede Zeile als Liste von Werten
+und zu jeder Zeile ihre Zeilennummer in der Datei (0 = erste Datenzeile nach der Kopfzeile). Die Tabelle wird
+spaltenweise aus dem DataFrame der Treffer gebaut, ohne `iterrows`. Für bestehende Aufrufer verhält sie sich wie eine
+Liste von Dictionaries (Länge, Slicing, Iteration).
+
+Im kompakten Antwortformat (`format=compact`, siehe `streaming`) wird jede Kopfzeile nur einmal gesendet und jeder
+Treffer als Array `[Dateinummer, Zeilennummer, Wert, ...]`. Serialisiert wird mit `orjson`, falls installiert, sonst
+mit dem `json`-Modul der Standardbibliothek.
+"""
+
+import json
+from collections.abc import Sequence
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optionale Abhängigkeit
+    orjson = None
+
+
+def dumps(value):
+    """
+    Serialisiert einen Wert als kompaktes JSON (UTF-8).
+
+    Args:
+        value: Der Wert (nur JSON-Typen; unbekannte Typen werden als Text ausgegeben).
+
+    Returns:
+        bytes: Das JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=str)
+    return json.dumps(value, default=str, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+class ResultTable(Sequence):
+    """
+    Die Treffer einer Datei: Spaltennamen, Zeilen als Listen und die Zeilennummern der Treffer in der Datei.
+
+    Konnte die Datei nicht durchsucht werden, ist die Tabelle leer und `error` enthält die Fehlermeldung; solche
+    Ergebnisse sind unvollständig und werden nicht zwischengespeichert.
+    """
+
+    def __init__(self, columns=(), rows=(), row_numbers=(), error=None):
+        self.columns = list(columns)
+        self.rows = list(rows)
+        self.row_numbers = list(row_numbers)
+        self.error = error
+
+    @classmethod
+    def from_frame(cls, df):
+        """
+        Baut die Tabelle aus einem DataFrame, dessen Index die Zeilennummern in der Datei enthält.
+
+        Fehlende Werte (NaN) werden zu None, damit die Zeilen gültiges JSON ergeben.
+
+        Args:
+            df (pandas.DataFrame): Die passenden Zeilen.
+
+        Returns:
+            ResultTable: Die Treffer.
+        """
+        if df.empty:
+            return cls(df.columns.tolist())
+        rows = df.astype(object).where(df.notna(), None).to_numpy().tolist()
+        return cls(df.columns.tolist(), rows, df.index.tolist())
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ResultTable(self.columns, self.rows[index], self.row_numbers[index], self.error)
+        return dict(zip(self.columns, self.rows[index]))
+
+    def __eq__(self, other):
+        if isinstance(other, ResultTable):
+            return (self.columns, self.rows, self.row_numbers) == (other.columns, other.rows, other.row_numbers)
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ResultTable(columns={self.columns!r}, rows={self.rows!r}, row_numbers={self.row_numbers!r})"
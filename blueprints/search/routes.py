@@ -3,89 +3,676 @@ Dieses Modul definiert die Routen für die Such-Blueprints der Flask-Anwendung.
 
 Es enthält Endpunkte für:
 - Die Hauptseite
-- Hochladen und Speichern von ZIP-Dateien
-- Extrahieren von ZIP-Dateien aus einem Verzeichnis
+- Hochladen und Speichern von ZIP-Dateien und SIARD-Paketen (auch wiederaufnehmbar in Chunks)
+- Extrahieren von ZIP-Dateien aus einem Verzeichnis (als Hintergrund-Jobs mit Statusabfrage)
+- Verwalten der Korpora (ein Namensraum pro Upload bzw. Verzeichnis-Ingest)
 - Durchführen von Suchanfragen in extrahierten Dateien
+- Metriken im Prometheus-Format (`/metrics`); jede Antwort erhält die Zeitaufteilung als `Server-Timing`-Header
 
 Logging wird verwendet, um den Verlauf und eventuelle Fehler zu verfolgen.
 """
 
-from flask import Blueprint, render_template, request, jsonify, current_app
+from flask import Blueprint, render_template, request, jsonify, current_app, Response, stream_with_context, url_for
 import os
-from .common import save_uploaded_file, extract_zip_file
-from .extraction import extract_files_in_directory, analyze_structure, read_schemas
-from .analysis import search_files
-from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
+import time
+from werkzeug.http import parse_content_range_header
+from .common import UPLOAD_FOLDER, save_uploaded_file, extract_zip_file, extract_siard_file
+from .extraction import extract_files_in_directory, analyze_structure, update_structure, read_schemas
+from .analysis import iter_search_results
+from .index import SearchIndex, index_path_for, KEY_COLUMNS
+from .streaming import decode_cursor, paginate, iter_ndjson, json_safe, compact_page, iter_compact_ndjson
+from .results import dumps
+from .cache import get_result_cache, corpus_fingerprint, normalize_query
+from .columnar import update_columnar_cache
+from .archives import register_archive, list_archive_members, split_member_path
+from .structured import build_predicates, build_range_predicates, iter_structured_results
+from .joins import DEFAULT_JOIN_DEPTH, files_by_table, lookup_rows, resolve_related
+from .jobs import Job, QueueFullError, get_job_queue
+from .corpora import (UnknownCorpusError, corpus_dir, create_corpus, list_corpora, remove_corpus, search_roots,
+                      select_evictions, update_corpus_size)
+from .manifest import Manifest, format_hash
+from .siard import SIARD_EXTENSION
+from .uploads import (IncompleteUploadError, UnknownUploadError, UploadConflictError, create_upload, expire_uploads,
+                      finalize_upload, read_upload, record_upload_job, remove_upload, upload_lock, upload_status,
+                      write_chunk)
+from .metrics import CONTENT_TYPE, REGISTRY, REQUEST_SECONDS, start_request, current_timings, timed
 
 search_bp = Blueprint('search_bp', __name__)
-executor = ThreadPoolExecutor(max_workers=4)  # Anpassung der Anzahl der Worker je nach Systemressourcen
 
-def extract_file_async(file_path, extract_dir):
+@search_bp.before_request
+def start_request_timing():
+    """
+    Beginnt die Zeitmessung der Anfrage (siehe `metrics`).
+    """
+    start_request()
+
+@search_bp.after_request
+def add_timing_header(response):
+    """
+    Hängt die Zeitaufteilung der Anfrage als `Server-Timing`-Header an und trägt ihre Dauer in das Histogramm ein.
+
+    Bei NDJSON-Streams wird die Antwort erst danach erzeugt; Header und Dauer umfassen dann nur den Start der Suche.
+
+    Args:
+        response (werkzeug.wrappers.Response): Die Antwort.
+
+    Returns:
+        werkzeug.wrappers.Response: Die Antwort mit Header.
+    """
+    timings = current_timings()
+    if timings is not None:
+        response.headers['Server-Timing'] = timings.server_timing()
+        REQUEST_SECONDS.observe(time.perf_counter() - timings.started, endpoint=request.endpoint or '',
+                                method=request.method, status=response.status_code)
+    return response
+
+def extract_file_async(app, file_path, extract_dir, job=None):
     """
     Führt die asynchrone Extraktion der Datei durch.
 
+    SIARD-Pakete werden unabhängig von `SEARCH_IN_PLACE` und `EXTRACT_STREAM` tabellenweise in TXT-Dateien
+    umgewandelt, da ihre Tabellen-XML nicht direkt durchsucht werden kann.
+
     Args:
-        file_path (str): Der Pfad zur Datei (ZIP).
+        app (Flask): Die Flask-Anwendung, deren Kontext im Worker-Thread verwendet wird.
+        file_path (str): Der Pfad zur Datei (ZIP oder SIARD).
         extract_dir (str): Das Verzeichnis, in das extrahiert werden soll.
+        job (Job): Der Hintergrund-Job, an den der Fortschritt gemeldet wird.
 
     Returns:
         list: Eine Liste der extrahierten TXT-Dateien.
+
+    Raises:
+        Exception: Fehler werden protokolliert und an den Job weitergereicht.
     """
-    with current_app.app_context():
+    job = job or Job('inline')
+    with app.app_context():
         try:
-            txt_files = extract_zip_file(file_path, extract_dir)
-            current_app.logger.info(f'Successfully extracted file: {file_path}')
-            analyze_and_log_structure(extract_dir)
+            if file_path.endswith(SIARD_EXTENSION):
+                return convert_siard_packages(app, [file_path], extract_dir, job)
+            if current_app.config.get('SEARCH_IN_PLACE'):
+                job.set_progress('register')
+                return register_archives_in_place([file_path], extract_dir)
+            stream = current_app.config.get('EXTRACT_STREAM', False)
+            manifest = None if stream else Manifest(current_app.config['EXTRACT_FOLDER'])
+            job.set_progress('extract')
+            txt_files = extract_zip_file(file_path, extract_dir, stream, manifest)
+            current_app.logger.info('Successfully extracted file: %s', file_path)
+            process_extracted_files(app, [file_path], txt_files, extract_dir, stream, job, manifest)
             return txt_files
         except Exception as e:
-            current_app.logger.error(f'Exception during file extraction: {e}')
-            return []
+            current_app.logger.error('Exception during file extraction: %s', e)
+            raise
 
-def extract_directory_async(directory, extract_to):
+def extract_directory_async(app, directory, extract_to, job=None):
     """
-    Führt die asynchrone Extraktion eines Verzeichnisses mit ZIP-Dateien durch.
+    Führt die asynchrone Extraktion eines Verzeichnisses mit ZIP-Dateien und SIARD-Paketen durch.
 
     Args:
+        app (Flask): Die Flask-Anwendung, deren Kontext im Worker-Thread verwendet wird.
         directory (str): Das Verzeichnis, das die ZIP-Dateien enthält.
         extract_to (str): Das Verzeichnis, in das extrahiert werden soll.
+        job (Job): Der Hintergrund-Job, an den der Fortschritt gemeldet wird.
 
     Returns:
         list: Eine Liste der extrahierten TXT-Dateien.
+
+    Raises:
+        Exception: Fehler werden protokolliert und an den Job weitergereicht.
     """
-    with current_app.app_context():
+    job = job or Job('inline')
+    with app.app_context():
         try:
-            txt_files = extract_files_in_directory(directory, extract_to)
-            current_app.logger.info(f'Successfully extracted directory: {directory}')
-            analyze_and_log_structure(extract_to)
-            return txt_files
+            zip_paths = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.zip')]
+            siard_paths = [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+                           if name.endswith(SIARD_EXTENSION)]
+            siard_files = convert_siard_packages(app, siard_paths, extract_to, job) if siard_paths else []
+            if current_app.config.get('SEARCH_IN_PLACE'):
+                job.set_progress('register')
+                return siard_files + register_archives_in_place(zip_paths, extract_to)
+            stream = current_app.config.get('EXTRACT_STREAM', False)
+            manifest = None if stream else Manifest(current_app.config['EXTRACT_FOLDER'])
+            job.set_progress('extract')
+            txt_files = extract_files_in_directory(directory, extract_to, stream, manifest)
+            current_app.logger.info('Successfully extracted directory: %s', directory)
+            process_extracted_files(app, zip_paths, txt_files, extract_to, stream, job, manifest)
+            return siard_files + txt_files
+        except Exception as e:
+            current_app.logger.error('Exception during directory extraction: %s', e)
+            raise
+
+def convert_siard_packages(app, siard_paths, extract_dir, job):
+    """
+    Wandelt SIARD-Pakete in TXT-Dateien um und verarbeitet diese wie entpackte Dateien weiter.
+
+    Args:
+        app (Flask): Die Flask-Anwendung.
+        siard_paths (list): Die Pfade der SIARD-Pakete.
+        extract_dir (str): Das Zielverzeichnis (das Verzeichnis des Korpus).
+        job (Job): Der Hintergrund-Job, an den der Fortschritt gemeldet wird.
+
+    Returns:
+        list: Die neu geschriebenen TXT-Dateien.
+    """
+    manifest = Manifest(current_app.config['EXTRACT_FOLDER'])
+    txt_files = []
+    for number, siard_path in enumerate(siard_paths):
+        job.set_progress('siard', number, len(siard_paths))
+        txt_files.extend(extract_siard_file(siard_path, extract_dir, manifest))
+        current_app.logger.info('Successfully converted SIARD package: %s', siard_path)
+    process_extracted_files(app, [], txt_files, extract_dir, False, job, manifest)
+    return txt_files
+
+def process_extracted_files(app, zip_paths, txt_files, extract_dir, stream, job, manifest=None):
+    """
+    Führt die Verarbeitungsschritte nach der Extraktion aus (Cache, Strukturanalyse, Index).
+
+    Alle Schritte arbeiten nur auf den neu extrahierten Dateien; unveränderte Members wurden laut Manifest bereits
+    bei einem früheren Ingest verarbeitet. Das Manifest wird deshalb erst gespeichert, wenn alle Schritte gelungen
+    sind: bricht ein Schritt ab, werden die Dateien beim nächsten Ingest erneut verarbeitet.
+
+    Args:
+        app (Flask): Die Flask-Anwendung.
+        zip_paths (list): Die Pfade der verarbeiteten ZIP-Dateien.
+        txt_files (list): Die neu extrahierten TXT-Dateien (im Streaming-Modus die Cache-Verzeichnisse).
+        extract_dir (str): Das Extraktionsverzeichnis.
+        stream (bool): Ob die Members direkt in den spaltenbasierten Cache gestreamt wurden.
+        job (Job): Der Hintergrund-Job, an den der Fortschritt gemeldet wird.
+        manifest (Manifest): Das Manifest, in dem die neuen Dateien vermerkt wurden.
+    """
+    succeeded = True
+    if stream:
+        # Gestreamte Members sind nur über das registrierte Archiv auffindbar
+        for zip_path in zip_paths:
+            register_archive(extract_dir, zip_path)
+    else:
+        job.set_progress('columnar')
+        succeeded = convert_to_columnar_cache(txt_files)
+    job.set_progress('analyze')
+    succeeded = analyze_and_log_structure(extract_dir, None if stream else txt_files) and succeeded
+    if not stream:
+        job.set_progress('index')
+        succeeded = update_search_index(txt_files) and succeeded
+    if manifest is not None and succeeded:
+        manifest.save()
+    elif manifest is not None:
+        current_app.logger.warning('Manifest not saved, files will be processed again on the next ingest: %s',
+                                   extract_dir)
+    get_result_cache(app).clear()
+
+def run_upload_job(job, app, file_paths, extract_dir, corpus_id=None):
+    """
+    Job-Funktion für `/upload`: extrahiert die hochgeladenen ZIP-Dateien nacheinander.
+
+    Args:
+        job (Job): Der Hintergrund-Job.
+        app (Flask): Die Flask-Anwendung.
+        file_paths (list): Die Pfade der gespeicherten ZIP-Dateien.
+        extract_dir (str): Das Extraktionsverzeichnis (das Verzeichnis des Korpus).
+        corpus_id (str): Die ID des Korpus, in den eingelesen wird.
+
+    Returns:
+        dict: Das Job-Ergebnis mit der Korpus-ID und den extrahierten TXT-Dateien.
+    """
+    all_txt_files = []
+    for number, file_path in enumerate(file_paths):
+        job.set_progress('extract', number, len(file_paths))
+        all_txt_files.extend(extract_file_async(app, file_path, extract_dir, job))
+    job.set_progress('done', len(file_paths), len(file_paths))
+    finish_corpus(app, corpus_id, job)
+    return {"corpus_id": corpus_id, "txt_files": all_txt_files}
+
+def run_directory_job(job, app, directory, extract_to, corpus_id=None):
+    """
+    Job-Funktion für `/upload_directory`.
+
+    Args:
+        job (Job): Der Hintergrund-Job.
+        app (Flask): Die Flask-Anwendung.
+        directory (str): Das Verzeichnis, das die ZIP-Dateien enthält.
+        extract_to (str): Das Verzeichnis, in das extrahiert werden soll (das Verzeichnis des Korpus).
+        corpus_id (str): Die ID des Korpus, in den eingelesen wird.
+
+    Returns:
+        dict: Das Job-Ergebnis mit der Korpus-ID und den extrahierten TXT-Dateien.
+    """
+    txt_files = extract_directory_async(app, directory, extract_to, job)
+    finish_corpus(app, corpus_id, job)
+    return {"corpus_id": corpus_id, "txt_files": txt_files}
+
+def finish_corpus(app, corpus_id, job):
+    """
+    Aktualisiert nach einem Ingest die Größe des Korpus und entfernt alte Korpora gemäß Alters- und Speichergrenze.
+
+    Args:
+        app (Flask): Die Flask-Anwendung.
+        corpus_id (str): Die ID des eingelesenen Korpus (wird selbst nie entfernt).
+        job (Job): Der Hintergrund-Job, an den der Fortschritt gemeldet wird.
+    """
+    if corpus_id is None:
+        return
+    with app.app_context():
+        job.set_progress('evict')
+        update_corpus_size(app.config['EXTRACT_FOLDER'], corpus_id)
+        evict_corpora(app, keep=[corpus_id])
+
+def evict_corpora(app, keep=()):
+    """
+    Entfernt Korpora, die älter als `CORPUS_MAX_AGE_SECONDS` sind oder das Kontingent `CORPUS_MAX_BYTES` sprengen.
+
+    Mit den Dateien werden auch ihre Einträge im Suchindex und im Manifest entfernt.
+
+    Args:
+        app (Flask): Die Flask-Anwendung.
+        keep (iterable): Korpus-IDs, die nicht entfernt werden.
+
+    Returns:
+        list: Die IDs der entfernten Korpora.
+    """
+    extract_root = app.config['EXTRACT_FOLDER']
+    evicted = select_evictions(list_corpora(extract_root), app.config.get('CORPUS_MAX_AGE_SECONDS'),
+                               app.config.get('CORPUS_MAX_BYTES'), keep)
+    for corpus_id in evicted:
+        try:
+            delete_corpus(app, corpus_id)
+            app.logger.info('Evicted corpus: %s', corpus_id)
         except Exception as e:
-            current_app.logger.error(f'Exception during directory extraction: {e}')
-            return []
+            app.logger.error('Error evicting corpus %s: %s', corpus_id, e)
+    return evicted
+
+def delete_corpus(app, corpus_id):
+    """
+    Löscht einen Korpus samt Index- und Manifest-Einträgen und leert den Ergebnis-Cache.
+
+    Args:
+        app (Flask): Die Flask-Anwendung.
+        corpus_id (str): Die Korpus-ID.
+
+    Raises:
+        UnknownCorpusError: Wenn der Korpus nicht existiert.
+    """
+    extract_root = app.config['EXTRACT_FOLDER']
+    directory = remove_corpus(extract_root, corpus_id)
+    SearchIndex(index_path_for(extract_root)).remove_directory(directory)
+    Manifest(extract_root).forget_directory(directory)
+    get_result_cache(app).clear()
 
-def analyze_and_log_structure(extract_dir):
+def job_accepted(job, message, corpus_id=None):
+    """
+    Erzeugt die Antwort für einen angenommenen Hintergrund-Job.
+
+    Args:
+        job (Job): Der angelegte Job.
+        message (str): Die Meldung für den Client.
+        corpus_id (str): Die ID des Korpus, in den der Job einliest.
+
+    Returns:
+        tuple: Die JSON-Antwort mit Job-ID, Korpus-ID und Status-URL sowie der Statuscode 202.
+    """
+    status_url = url_for('search_bp.job_status', job_id=job.id)
+    response = jsonify({"message": message, "job_id": job.id, "corpus_id": corpus_id, "status_url": status_url})
+    response.headers['Location'] = status_url
+    return response, 202
+
+def queue_full_response(e):
+    """
+    Erzeugt die Antwort für eine volle Job-Warteschlange.
+
+    Args:
+        e (QueueFullError): Der Fehler der Warteschlange.
+
+    Returns:
+        tuple: Die JSON-Antwort und der Statuscode 429.
+    """
+    current_app.logger.warning('Rejected ingest job: %s', e)
+    response = jsonify({"message": "Too many pending jobs, please retry later."})
+    response.headers['Retry-After'] = '5'
+    return response, 429
+
+def open_corpus(kind, source):
+    """
+    Legt für einen Ingest einen neuen Korpus an oder öffnet den im Formularfeld `corpus` angegebenen.
+
+    Args:
+        kind (str): Die Art des Ingests.
+        source (str): Die Quelle zur Anzeige.
+
+    Returns:
+        dict: Die Metadaten des Korpus; `new` gibt an, ob er neu angelegt wurde.
+
+    Raises:
+        UnknownCorpusError: Wenn die angegebene Korpus-ID nicht existiert.
+    """
+    extract_root = os.path.abspath(current_app.config['EXTRACT_FOLDER'])
+    corpus_id = request.form.get('corpus', '').strip() or None
+    if corpus_id is not None:
+        search_roots(extract_root, [corpus_id])
+    corpus = create_corpus(extract_root, kind, source, corpus_id)
+    return dict(corpus, new=corpus_id is None)
+
+def discard_new_corpus(corpus):
+    """
+    Entfernt einen für einen abgelehnten Job neu angelegten (leeren) Korpus wieder.
+
+    Args:
+        corpus (dict): Die Metadaten aus `open_corpus`.
+    """
+    if corpus.get('new'):
+        remove_corpus(os.path.abspath(current_app.config['EXTRACT_FOLDER']), corpus['id'])
+
+def submit_upload_job(app, queue, file_paths):
+    """
+    Legt den Korpus eines Uploads an bzw. öffnet ihn und stellt die Extraktion der Dateien als Hintergrund-Job ein.
+
+    Args:
+        app (Flask): Die Flask-Anwendung.
+        queue (JobQueue): Die Job-Warteschlange.
+        file_paths (list): Die absoluten Pfade der gespeicherten Dateien (ZIP oder SIARD).
+
+    Returns:
+        tuple: Der angelegte Job und die ID des Korpus.
+
+    Raises:
+        UnknownCorpusError: Wenn der im Formularfeld `corpus` angegebene Korpus nicht existiert.
+        QueueFullError: Wenn die Warteschlange voll ist (ein neu angelegter Korpus wird wieder entfernt).
+    """
+    corpus = open_corpus('upload', ', '.join(os.path.basename(path) for path in file_paths))
+    extract_dir = corpus_dir(os.path.abspath(current_app.config['EXTRACT_FOLDER']), corpus['id'])
+
+    # Die Extraktion läuft als Hintergrund-Job; der Status ist über /jobs/<id> abrufbar
+    try:
+        job = queue.submit('upload', run_upload_job, app, file_paths, extract_dir, corpus['id'])
+    except QueueFullError:
+        discard_new_corpus(corpus)
+        raise
+    current_app.logger.info('Queued upload job %s into corpus %s for files: %s', job.id, corpus["id"], file_paths)
+    return job, corpus['id']
+
+def upload_root():
+    """
+    Gibt das absolute Upload-Verzeichnis der Anwendung zurück.
+
+    Returns:
+        str: Der Pfad (`UPLOAD_FOLDER`).
+    """
+    return os.path.abspath(current_app.config.get('UPLOAD_FOLDER', UPLOAD_FOLDER))
+
+def register_archives_in_place(zip_paths, extract_dir):
+    """
+    Registriert ZIP-Dateien für die Suche ohne Entpacken; dabei wird nichts extrahiert oder analysiert.
+
+    Args:
+        zip_paths (list): Die Pfade der ZIP-Dateien.
+        extract_dir (str): Das Verzeichnis (des Korpus), in dem die Registrierung abgelegt wird.
+
+    Returns:
+        list: Die virtuellen Pfade der nun durchsuchbaren TXT-Members.
+    """
+    for zip_path in zip_paths:
+        register_archive(extract_dir, zip_path)
+        current_app.logger.info('Registered archive for in-place search: %s', zip_path)
+    get_result_cache(current_app._get_current_object()).clear()
+    registered = {os.path.abspath(zip_path) for zip_path in zip_paths}
+    return [member for member in list_archive_members(extract_dir) if split_member_path(member)[0] in registered]
+
+def load_json_artefact(file_path):
+    """
+    Liest ein gespeichertes JSON-Artefakt (z.B. `structure.json`) ein.
+
+    Args:
+        file_path (str): Der Pfad zur JSON-Datei.
+
+    Returns:
+        dict: Der Inhalt oder None, wenn die Datei fehlt oder ungültig ist.
+    """
+    try:
+        with open(file_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def analyze_and_log_structure(extract_dir, txt_files=None):
     """
     Analysiert die Struktur der extrahierten Dateien und protokolliert die Schema-Informationen.
 
+    Sind die neuen oder geänderten Dateien bekannt und liegen `structure.json` und `schemas.json` bereits vor,
+    werden nur diese Dateien analysiert und in die bestehenden Artefakte übernommen.
+
     Args:
         extract_dir (str): Das Verzeichnis mit den extrahierten Dateien.
+        txt_files (list): Die neuen oder geänderten TXT-Dateien (None: alles neu analysieren).
+
+    Returns:
+        bool: True, wenn die Analyse gelungen ist (Fehler werden protokolliert).
     """
     try:
-        file_structure = analyze_structure(extract_dir)
         structure_file_path = os.path.join(extract_dir, 'structure.json')
+        schema_info_file_path = os.path.join(extract_dir, 'schemas.json')
+        file_structure = load_json_artefact(structure_file_path)
+        schema_info = load_json_artefact(schema_info_file_path)
+        if txt_files is None or file_structure is None or schema_info is None:
+            file_structure = analyze_structure(extract_dir)
+            schema_info = read_schemas(extract_dir)
+        elif not txt_files:
+            current_app.logger.info("No new or changed files in: %s", extract_dir)
+            return True
+        else:
+            update_structure(file_structure, extract_dir, txt_files)
+            schema_info.update(read_schemas(extract_dir, file_paths=txt_files))
+
         with open(structure_file_path, 'w') as f:
             json.dump(file_structure, f)
-            current_app.logger.info(f"File structure saved to: {structure_file_path}")
+            current_app.logger.info("File structure saved to: %s", structure_file_path)
 
-        schema_info = read_schemas(extract_dir)
-        schema_info_file_path = os.path.join(extract_dir, 'schemas.json')
         with open(schema_info_file_path, 'w') as f:
             json.dump(schema_info, f)
-            current_app.logger.info(f"Schema information saved to: {schema_info_file_path}")
+            current_app.logger.info("Schema information saved to: %s", schema_info_file_path)
 
-        current_app.logger.debug(f"Extracted directory structure: {file_structure}")
-        current_app.logger.debug(f"Extracted schemas: {schema_info}")
+        if current_app.logger.isEnabledFor(logging.DEBUG):
+            current_app.logger.debug("Extracted directory structure: %s", file_structure)
+            current_app.logger.debug("Extracted schemas: %s", schema_info)
+    except Exception as e:
+        current_app.logger.error("Error analyzing and logging structure: %s", e)
+        return False
+    return True
+
+def convert_to_columnar_cache(txt_files):
+    """
+    Wandelt die extrahierten TXT-Dateien in den spaltenbasierten Cache um, sofern dieser aktiviert ist.
+
+    Args:
+        txt_files (list): Die Pfade der extrahierten TXT-Dateien.
+
+    Returns:
+        bool: True, wenn die Umwandlung gelungen oder der Cache deaktiviert ist (Fehler werden protokolliert).
+    """
+    if not current_app.config.get('COLUMNAR_CACHE'):
+        return True
+    try:
+        converted = update_columnar_cache(txt_files, current_app.logger)
+        current_app.logger.info("Converted %s files to the columnar cache", converted)
+    except Exception as e:
+        current_app.logger.error("Error converting files to the columnar cache: %s", e)
+        return False
+    return True
+
+def update_search_index(txt_files):
+    """
+    Nimmt die extrahierten TXT-Dateien in den invertierten Suchindex auf.
+
+    Args:
+        txt_files (list): Die Pfade der extrahierten TXT-Dateien.
+
+    Returns:
+        bool: True, wenn der Index aktualisiert wurde (Fehler werden protokolliert).
+    """
+    try:
+        index = SearchIndex(index_path_for(current_app.config['EXTRACT_FOLDER']))
+        indexed = index.update(txt_files, current_app.logger)
+        current_app.logger.info("Indexed %s files in: %s", indexed, index.path)
     except Exception as e:
-        current_app.logger.error(f"Error analyzing and logging structure: {e}")
+        current_app.logger.error("Error updating search index: %s", e)
+        return False
+    return True
+
+def parse_pagination():
+    """
+    Liest Ergebnislimit und Cursor aus der Anfrage.
+
+    Das Limit ist durch `SEARCH_MAX_RESULTS` aus der Konfiguration nach oben begrenzt.
+
+    Returns:
+        tuple: Das Limit, die bereits ausgelieferten Dateinummern und die teilweise ausgelieferte Datei.
+
+    Raises:
+        ValueError: Wenn Limit oder Cursor ungültig sind.
+    """
+    max_results = current_app.config['SEARCH_MAX_RESULTS']
+    limit = int(request.form.get('limit') or max_results)
+    if limit < 1:
+        raise ValueError(f"Invalid limit: {limit}")
+    done_files, partial = decode_cursor(request.form.get('cursor', '').strip())
+    return min(limit, max_results), done_files, partial
+
+def parse_corpora():
+    """
+    Liest die Korpus-IDs, auf die eine Suche beschränkt wird, aus der Anfrage.
+
+    Das Formularfeld `corpus` kann mehrfach oder mit kommagetrennten IDs angegeben werden.
+
+    Returns:
+        list: Die Korpus-IDs oder None, wenn alle Korpora durchsucht werden.
+
+    Raises:
+        UnknownCorpusError: Wenn eine Korpus-ID nicht existiert.
+    """
+    corpora = [corpus_id.strip() for value in request.form.getlist('corpus') for corpus_id in value.split(',')
+               if corpus_id.strip()]
+    if not corpora:
+        return None
+    search_roots(current_app.config['EXTRACT_FOLDER'], corpora)
+    return corpora
+
+def wants_stream():
+    """
+    Prüft, ob der Client die Ergebnisse als NDJSON-Stream angefordert hat.
+
+    Returns:
+        bool: True bei `stream=1` im Formular oder `Accept: application/x-ndjson`.
+    """
+    if request.form.get('stream', '').lower() in ('1', 'true', 'ndjson'):
+        return True
+    return request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson']) == 'application/x-ndjson'
+
+def wants_compact():
+    """
+    Prüft, ob der Client die Ergebnisse im kompakten Format angefordert hat (siehe `streaming.compact_page`).
+
+    Returns:
+        bool: True bei `format=compact` im Formular.
+    """
+    return request.form.get('format', '').lower() == 'compact'
+
+def cached_search_results(kind, query, done_files, corpora=None):
+    """
+    Liefert dateiweise Suchergebnisse, nach Möglichkeit aus dem Ergebnis-Cache.
+
+    Der Cache-Schlüssel besteht aus Suchart, normalisierter Abfrage, den abgefragten Korpora und dem Fingerabdruck
+    ihrer Dateien.
+
+    Args:
+        kind (str): Die Suchart (z.B. 'search' oder 'detailed_search').
+        query (str): Die Suchabfrage.
+        done_files (set): Die bereits ausgelieferten Dateinummern.
+        corpora (list): Die Korpus-IDs, auf die die Suche beschränkt wird; None durchsucht alle.
+
+    Returns:
+        iterable: Tupel (Dateinummer, Dateipfad, Treffer).
+    """
+    app = current_app._get_current_object()
+    extract_dir = app.config['EXTRACT_FOLDER']
+    key = (kind, normalize_query(query), corpora and tuple(corpora), corpus_fingerprint(extract_dir, corpora))
+    return get_result_cache(app).cached(
+        key,
+        lambda skip_files: iter_search_results(query, extract_dir, app, max_workers=4, skip_files=skip_files,
+                                               corpora=corpora),
+        done_files,
+    )
+
+def cached_structured_results(predicates, done_files, corpora=None, fuzzy=False, ranges=()):
+    """
+    Liefert dateiweise Ergebnisse der feldbezogenen Suche, nach Möglichkeit aus dem Ergebnis-Cache.
+
+    Args:
+        predicates (list): Tupel (Spaltenname oder None, kleingeschriebener Suchwert).
+        done_files (set): Die bereits ausgelieferten Dateinummern.
+        corpora (list): Die Korpus-IDs, auf die die Suche beschränkt wird; None durchsucht alle.
+        fuzzy (bool): Namensspalten phonetisch und tippfehlertolerant durchsuchen.
+        ranges (list): Die Bereichsprädikate (siehe `build_range_predicates`).
+
+    Returns:
+        iterable: Tupel (Dateinummer, Dateipfad, Treffer).
+    """
+    app = current_app._get_current_object()
+    extract_dir = app.config['EXTRACT_FOLDER']
+    query = tuple((column, normalize_query(value)) for column, value in predicates)
+    kind = 'detailed_search_fuzzy' if fuzzy else 'detailed_search'
+    key = (kind, query, tuple(ranges), corpora and tuple(corpora), corpus_fingerprint(extract_dir, corpora))
+    return get_result_cache(app).cached(
+        key,
+        lambda skip_files: iter_structured_results(predicates, extract_dir, app, max_workers=4, skip_files=skip_files,
+                                                   corpora=corpora, fuzzy=fuzzy, ranges=ranges),
+        done_files,
+    )
+
+def results_response(file_results, limit, done_files, partial):
+    """
+    Erzeugt die Antwort für dateiweise gelieferte Suchergebnisse.
+
+    Im Streaming-Modus wird jeder Treffer als NDJSON-Zeile gesendet, sobald die Suche seiner Datei abgeschlossen
+    ist; andernfalls wird eine JSON-Antwort mit den Ergebnissen dieser Seite erzeugt. Mit `format=compact` werden die
+    Kopfzeilen nur einmal gesendet und die Treffer als Arrays mit Dateinummer und Zeilennummer. Konnten Dateien nicht
+    durchsucht werden, nennt `failed_files` ihre Nummern.
+
+    Args:
+        file_results (iterable): Die Ausgabe von `iter_search_results`.
+        limit (int): Die maximale Anzahl Treffer.
+        done_files (set): Die bereits ausgelieferten Dateinummern.
+        partial (dict): Die teilweise ausgelieferte Datei.
+
+    Returns:
+        werkzeug.wrappers.Response: Die Antwort.
+    """
+    if wants_compact():
+        pages = paginate(file_results, limit, done_files, partial, provenance=True)
+        if wants_stream():
+            return Response(stream_with_context(iter_compact_ndjson(pages)), mimetype='application/x-ndjson')
+        page = compact_page(pages)
+        with timed('serialize'):
+            return Response(dumps(page), mimetype='application/json'), 200
+
+    pages = paginate(file_results, limit, done_files, partial)
+    if wants_stream():
+        return Response(stream_with_context(iter_ndjson(pages)), mimetype='application/x-ndjson')
+
+    results = []
+    failed = []
+    next_cursor = None
+    for kind, payload in pages:
+        if kind == 'results':
+            results.extend(payload)
+        elif kind == 'failed':
+            failed.append(payload)
+        else:
+            next_cursor = payload
+    body = {"results": results, "next_cursor": next_cursor}
+    if failed:
+        # Unvollständige Antwort: diese Dateien konnten nicht durchsucht werden
+        body["failed_files"] = failed
+    with timed('serialize'):
+        return jsonify(body), 200
 
 @search_bp.route('/')
 def index():
@@ -101,38 +688,48 @@ def index():
 @search_bp.route('/upload', methods=['POST'])
 def upload():
     """
-    Endpunkt zum Hochladen und Extrahieren von Dateien (ZIP).
+    Endpunkt zum Hochladen und Extrahieren von Dateien (ZIP oder SIARD-Paket).
+
+    Die Dateien werden in einen neuen Korpus entpackt; mit dem Formularfeld `corpus` wird stattdessen ein bestehender
+    Korpus aktualisiert (nur neue oder geänderte Dateien werden verarbeitet).
 
     Returns:
-        werkzeug.wrappers.Response: Eine JSON-Antwort mit dem Ergebnis des Hochladens und Extrahierens.
+        werkzeug.wrappers.Response: Eine JSON-Antwort mit der Job-ID (HTTP 202) oder HTTP 429 bei voller
+        Warteschlange.
     """
     files = request.files.getlist('file')
-    all_txt_files = []
     if files:
+        app = current_app._get_current_object()
+        queue = get_job_queue(app)
+        if queue.pending() >= queue.max_pending:
+            # Volle Warteschlange: die Dateien gar nicht erst speichern
+            return queue_full_response(QueueFullError(f"{queue.pending()} pending jobs"))
+
         file_paths = []
         for file in files:
-            current_app.logger.info(f'Received file: {file.filename}')
-            current_app.logger.info(f'File content type: {file.content_type}')
-            if file.filename.endswith('.zip'):
+            current_app.logger.info('Received file: %s', file.filename)
+            current_app.logger.info('File content type: %s', file.content_type)
+            if file.filename.endswith(('.zip', SIARD_EXTENSION)):
                 try:
                     file_path = save_uploaded_file(file)
-                    file_paths.append(file_path)
+                    file_paths.append(os.path.abspath(file_path))
                 except Exception as e:
-                    current_app.logger.error(f'Exception during file upload: {e}')
+                    current_app.logger.error('Exception during file upload: %s', e)
                     return jsonify({"message": "Internal server error."}), 500
             else:
                 current_app.logger.warning('Invalid file format received.')
                 return jsonify({"message": "Invalid file format."}), 400
 
-        extract_dir = 'temp_extracted'
-        os.makedirs(extract_dir, exist_ok=True)
-
-        # Asynchrone Extraktion aller hochgeladenen ZIP-Dateien und Sammeln aller TXT-Dateien
-        futures = [executor.submit(extract_file_async, file_path, extract_dir) for file_path in file_paths]
-        for future in futures:
-            all_txt_files.extend(future.result())
-
-        return jsonify({"message": "Files uploaded and extraction started.", "txt_files": all_txt_files}), 200
+        try:
+            job, corpus_id = submit_upload_job(app, queue, file_paths)
+            return job_accepted(job, "Files uploaded and extraction started.", corpus_id)
+        except UnknownCorpusError as e:
+            current_app.logger.warning('Invalid corpus for upload: %s', e)
+            return jsonify({"message": "Unknown corpus."}), 400
+        except QueueFullError as e:
+            for file_path in file_paths:
+                os.remove(file_path)
+            return queue_full_response(e)
     else:
         current_app.logger.warning('No file part in the request.')
         return jsonify({"message": "No file part in the request."}), 400
@@ -140,47 +737,229 @@ def upload():
 @search_bp.route('/upload_directory', methods=['POST'])
 def upload_directory():
     """
-    Endpunkt zum Hochladen und Extrahieren eines Verzeichnisses mit ZIP-Dateien.
+    Endpunkt zum Hochladen und Extrahieren eines Verzeichnisses mit ZIP-Dateien und SIARD-Paketen.
+
+    Das Verzeichnis wird in einen neuen Korpus entpackt; mit dem Formularfeld `corpus` wird stattdessen ein
+    bestehender Korpus aktualisiert (nur neue oder geänderte Dateien werden verarbeitet).
 
     Returns:
-        werkzeug.wrappers.Response: Eine JSON-Antwort mit dem Ergebnis des Extrahierens.
+        werkzeug.wrappers.Response: Eine JSON-Antwort mit der Job-ID (HTTP 202) oder HTTP 429 bei voller
+        Warteschlange.
     """
     directory = request.form.get('directory')
     if directory:
-        current_app.logger.info(f'Received directory path: {directory}')
-        extract_to = os.path.join('temp_extracted', os.path.basename(directory))
-        os.makedirs(extract_to, exist_ok=True)
-
-        # Asynchrone Extraktion starten
-        future = executor.submit(extract_directory_async, directory, extract_to)
-        txt_files_list = future.result()
-        return jsonify({"message": "Directory extraction started.", "txt_files": txt_files_list}), 200
+        current_app.logger.info('Received directory path: %s', directory)
+        directory = os.path.abspath(directory)
+        app = current_app._get_current_object()
+        queue = get_job_queue(app)
+        if queue.pending() >= queue.max_pending:
+            return queue_full_response(QueueFullError(f"{queue.pending()} pending jobs"))
+        try:
+            corpus = open_corpus('upload_directory', directory)
+        except UnknownCorpusError as e:
+            current_app.logger.warning('Invalid corpus for directory upload: %s', e)
+            return jsonify({"message": "Unknown corpus."}), 400
+        extract_to = corpus_dir(os.path.abspath(current_app.config['EXTRACT_FOLDER']), corpus['id'])
+
+        # Die Extraktion läuft als Hintergrund-Job; der Status ist über /jobs/<id> abrufbar
+        try:
+            job = queue.submit('upload_directory', run_directory_job, app, directory, extract_to, corpus['id'])
+        except QueueFullError as e:
+            discard_new_corpus(corpus)
+            return queue_full_response(e)
+        current_app.logger.info('Queued directory job %s into corpus %s for: %s', job.id, corpus["id"], directory)
+        return job_accepted(job, "Directory extraction started.", corpus['id'])
     else:
         current_app.logger.warning('No directory path in the request.')
         return jsonify({"message": "No directory path in the request."}), 400
 
+@search_bp.route('/uploads', methods=['POST'])
+def create_chunked_upload():
+    """
+    Endpunkt zum Anlegen eines wiederaufnehmbaren Uploads (Formularfelder `filename` und `size` in Bytes).
+
+    Die Datei wird anschließend in Chunks per `PUT /uploads/<id>` mit `Content-Range`-Header übertragen und mit
+    `POST /uploads/<id>/finalize` abgeschlossen. Uploads, die seit `UPLOAD_MAX_AGE_SECONDS` nicht mehr verändert
+    wurden, werden dabei entfernt.
+
+    Returns:
+        werkzeug.wrappers.Response: Eine JSON-Antwort mit Upload-ID, empfohlener Chunk-Größe und Upload-URL
+        (HTTP 201) oder HTTP 400 bei ungültigen Angaben (auch bei mehr als `UPLOAD_MAX_BYTES`).
+    """
+    filename = request.form.get('filename', '')
+    if not filename.endswith(('.zip', SIARD_EXTENSION)):
+        current_app.logger.warning('Invalid file format for chunked upload: %s', filename)
+        return jsonify({"message": "Invalid file format."}), 400
+    try:
+        size = int(request.form.get('size', ''))
+        corpora = {corpus['id'] for corpus in list_corpora(os.path.abspath(current_app.config['EXTRACT_FOLDER']))}
+        expire_uploads(upload_root(), current_app.config.get('UPLOAD_MAX_AGE_SECONDS'), keep_corpora=corpora)
+        meta = create_upload(upload_root(), filename, size, current_app.config.get('UPLOAD_MAX_BYTES'))
+    except ValueError as e:
+        current_app.logger.warning('Invalid chunked upload: %s', e)
+        return jsonify({"message": "Invalid file name or size."}), 400
+    current_app.logger.info('Created chunked upload %s for %s (%d bytes)', meta['id'], meta['filename'], size)
+    upload_url = url_for('search_bp.chunked_upload', upload_id=meta['id'])
+    response = jsonify(dict(upload_status(meta), chunk_bytes=current_app.config.get('UPLOAD_CHUNK_BYTES'),
+                            upload_url=upload_url))
+    response.headers['Location'] = upload_url
+    return response, 201
+
+@search_bp.route('/uploads/<upload_id>', methods=['GET', 'PUT', 'DELETE'])
+def chunked_upload(upload_id):
+    """
+    Endpunkt für einen wiederaufnehmbaren Upload.
+
+    - `GET`: Status mit den empfangenen und den noch fehlenden Byte-Bereichen (zum Fortsetzen nach Abbrüchen).
+    - `PUT`: Überträgt einen Chunk; der Body wird ohne Zwischenpuffer an die Stelle geschrieben, die der Header
+      `Content-Range: bytes <Start>-<Ende>/<Größe>` angibt. Chunks dürfen in beliebiger Reihenfolge und parallel
+      gesendet werden.
+    - `DELETE`: Bricht den Upload ab und löscht seine Daten.
+
+    Args:
+        upload_id (str): Die Upload-ID.
+
+    Returns:
+        werkzeug.wrappers.Response: Eine JSON-Antwort mit dem Status des Uploads, HTTP 404 für unbekannte Uploads,
+        HTTP 400 bei ungültigem oder unvollständigem Chunk (auch wenn die Gesamtgröße im `Content-Range` abweicht),
+        HTTP 409 für bereits abgeschlossene Uploads und HTTP 422, wenn die Datei kein gültiges ZIP-Archiv ist.
+    """
+    try:
+        if request.method == 'GET':
+            return jsonify(upload_status(read_upload(upload_root(), upload_id)))
+        if request.method == 'DELETE':
+            remove_upload(upload_root(), upload_id)
+            current_app.logger.info('Removed chunked upload %s', upload_id)
+            return jsonify({"message": "Upload removed.", "upload_id": upload_id})
+
+        content_range = parse_content_range_header(request.headers.get('Content-Range'))
+        if content_range is None or content_range.units != 'bytes':
+            return jsonify({"message": "Missing or invalid Content-Range header."}), 400
+        length = content_range.stop - content_range.start
+        if request.content_length is not None and request.content_length != length:
+            return jsonify({"message": "Content-Length does not match Content-Range."}), 400
+        meta = write_chunk(upload_root(), upload_id, content_range.start, length, request.stream,
+                           total=content_range.length)
+    except UnknownUploadError as e:
+        current_app.logger.warning('Unknown chunked upload: %s', e)
+        return jsonify({"message": "Unknown upload."}), 404
+    except UploadConflictError as e:
+        current_app.logger.warning('Rejected chunk for upload %s: %s', upload_id, e)
+        return jsonify({"message": str(e)}), 409
+    except ValueError as e:
+        current_app.logger.warning('Rejected chunk for upload %s: %s', upload_id, e)
+        return jsonify({"message": str(e)}), 400
+
+    status = upload_status(meta)
+    current_app.logger.debug('Upload %s: %d of %d bytes received', upload_id, status['received_bytes'], meta['size'])
+    return jsonify(status), 422 if status['archive_error'] else 200
+
+@search_bp.route('/uploads/<upload_id>/finalize', methods=['POST'])
+def finalize_chunked_upload(upload_id):
+    """
+    Endpunkt zum Abschließen eines wiederaufnehmbaren Uploads; die Datei wird danach wie bei `/upload` extrahiert.
+
+    Mit dem Formularfeld `crc32` wird die während der Übertragung berechnete Prüfsumme mit der des Clients
+    verglichen, mit `corpus` wird ein bestehender Korpus aktualisiert. Der Aufruf kann wiederholt werden (z.B. nach
+    HTTP 429); wurde für den Upload schon ein Job eingestellt, wird dieser zurückgegeben.
+
+    Args:
+        upload_id (str): Die Upload-ID.
+
+    Returns:
+        werkzeug.wrappers.Response: Eine JSON-Antwort mit der Job-ID (HTTP 202), HTTP 404 für unbekannte Uploads,
+        HTTP 409 mit den fehlenden Bereichen oder solange noch Chunks geschrieben werden, HTTP 422 bei abweichender
+        Prüfsumme oder ungültigem Archiv und HTTP 429 bei voller Warteschlange.
+    """
+    app = current_app._get_current_object()
+    queue = get_job_queue(app)
+    # Abschluss und Einstellen des Jobs gemeinsam sperren, damit gleichzeitige Aufrufe nur einen Job anlegen
+    with upload_lock(upload_id):
+        try:
+            file_path, meta = finalize_upload(upload_root(), upload_id, request.form.get('crc32'))
+        except UnknownUploadError as e:
+            current_app.logger.warning('Unknown chunked upload: %s', e)
+            return jsonify({"message": "Unknown upload."}), 404
+        except IncompleteUploadError as e:
+            return jsonify({"message": "Upload is incomplete.", "missing": e.missing}), 409
+        except UploadConflictError as e:
+            return jsonify({"message": str(e)}), 409
+        except ValueError as e:
+            current_app.logger.warning('Rejected chunked upload %s: %s', upload_id, e)
+            return jsonify({"message": str(e)}), 422
+
+        if meta.get('job_id'):
+            current_app.logger.info('Chunked upload %s was already finalized as job %s', upload_id, meta['job_id'])
+            job = queue.get(meta['job_id'])
+            if job is None:
+                return jsonify({"message": "Upload was already finalized.", "job_id": meta['job_id'],
+                                "corpus_id": meta['corpus_id']}), 200
+            return job_accepted(job, "Upload was already finalized.", meta['corpus_id'])
+        current_app.logger.info('Finalized chunked upload %s (crc32 %s)', upload_id, format_hash(meta['crc']))
+
+        try:
+            job, corpus_id = submit_upload_job(app, queue, [file_path])
+        except UnknownCorpusError as e:
+            current_app.logger.warning('Invalid corpus for upload: %s', e)
+            return jsonify({"message": "Unknown corpus."}), 400
+        except QueueFullError as e:
+            return queue_full_response(e)
+        in_place = bool(current_app.config.get('SEARCH_IN_PLACE')) and not file_path.endswith(SIARD_EXTENSION)
+        record_upload_job(upload_root(), upload_id, job.id, corpus_id, in_place)
+    return job_accepted(job, "Files uploaded and extraction started.", corpus_id)
+
+@search_bp.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """
+    Endpunkt mit Status, Fortschritt und Zeitmessung eines Hintergrund-Jobs.
+
+    Args:
+        job_id (str): Die Job-ID.
+
+    Returns:
+        werkzeug.wrappers.Response: Eine JSON-Antwort mit den Job-Informationen oder HTTP 404.
+    """
+    job = get_job_queue(current_app._get_current_object()).get(job_id)
+    if job is None:
+        return jsonify({"message": "Unknown job."}), 404
+    return jsonify(job.to_dict()), 200
+
 @search_bp.route('/search', methods=['POST'])
 def search():
     """
     Endpunkt für die Suche in den extrahierten Dateien.
 
+    Das Formularfeld `corpus` (mehrfach oder kommagetrennt) beschränkt die Suche auf einzelne Korpora.
+
     Returns:
-        werkzeug.wrappers.Response: Eine JSON-Antwort mit den Suchergebnissen.
+        werkzeug.wrappers.Response: Eine JSON-Antwort mit den Suchergebnissen oder ein NDJSON-Stream
+        (Formularfeld `stream=1`); `limit` und `cursor` steuern die seitenweise Auslieferung, `format=compact` wählt
+        das kompakte Format.
     """
     query = request.form.get('search_query', '').strip()
     if not query:
         current_app.logger.warning('Empty search query received.')
         return jsonify({"message": "Search query cannot be empty."}), 400
 
-    current_app.logger.info(f'Searching for query: {query}')
-    extract_dir = 'temp_extracted'
-    app = current_app._get_current_object()
     try:
-        results = search_files(query, extract_dir, app, max_workers=4)
-        current_app.logger.info(f'Search completed for query: {query}')
-        return jsonify({"results": results}), 200
+        limit, done_files, partial = parse_pagination()
+    except ValueError as e:
+        current_app.logger.warning('Invalid pagination parameters: %s', e)
+        return jsonify({"message": "Invalid limit or cursor."}), 400
+    try:
+        corpora = parse_corpora()
+    except UnknownCorpusError as e:
+        current_app.logger.warning('Invalid corpus in search: %s', e)
+        return jsonify({"message": "Unknown corpus."}), 400
+
+    current_app.logger.info('Searching for query: %s in corpora: %s', query, corpora or "all")
+    try:
+        file_results = cached_search_results('search', query, done_files, corpora)
+        response = results_response(file_results, limit, done_files, partial)
+        current_app.logger.info('Search completed for query: %s', query)
+        return response
     except Exception as e:
-        current_app.logger.error(f'Exception during search: {e}')
+        current_app.logger.error('Exception during search: %s', e)
         return jsonify({"message": "Internal server error during search."}), 500
 
 @search_bp.route('/detailed_search', methods=['POST'])
@@ -188,31 +967,149 @@ def detailed_search():
     """
     Endpunkt für die detaillierte Suche in den extrahierten Dateien.
 
+    Das Formularfeld `corpus` (mehrfach oder kommagetrennt) beschränkt die Suche auf einzelne Korpora. Mit
+    `fuzzy=1` finden Name, Vorname und Adresse auch gleich klingende oder leicht falsch geschriebene Werte
+    ("Meyer" findet "Meier" und "Maier"). Das Formularfeld `range` (mehrfach) fügt Bereichsprädikate auf typisierten
+    Spalten hinzu, z.B. `Geburtsdatum:1980-01-01..1989-12-31` oder `Motorleistung>200`.
+
     Returns:
-        werkzeug.wrappers.Response: Eine JSON-Antwort mit den detaillierten Suchergebnissen.
+        werkzeug.wrappers.Response: Eine JSON-Antwort mit den detaillierten Suchergebnissen oder ein NDJSON-Stream
+        (Formularfeld `stream=1`); `limit` und `cursor` steuern die seitenweise Auslieferung, `format=compact` wählt
+        das kompakte Format.
     """
-    first_name = request.form.get('first_name', '').strip()
-    last_name = request.form.get('last_name', '').strip()
-    address = request.form.get('address', '').strip()
-    email = request.form.get('email', '').strip()
-    phone_number = request.form.get('phone_number', '').strip()
-    license_plate = request.form.get('license_plate', '').strip()
-    inspection_date = request.form.get('inspection_date', '').strip()
-    car_model = request.form.get('car_model', '').strip()
-    birth_date = request.form.get('birth_date', '').strip()
-
-    query = ' '.join(filter(None, [first_name, last_name, address, email, phone_number, license_plate, inspection_date, car_model, birth_date]))
-    if not query:
+    # Jedes Formularfeld wird zu einem Prädikat auf seiner Schemaspalte (UND-verknüpft)
+    predicates = build_predicates(request.form)
+    try:
+        ranges = build_range_predicates(request.form)
+    except ValueError as e:
+        current_app.logger.warning('Invalid range predicate: %s', e)
+        return jsonify({"message": "Invalid range predicate."}), 400
+    if not predicates and not ranges:
         current_app.logger.warning('Empty detailed search query received.')
         return jsonify({"message": "Search query cannot be empty."}), 400
 
-    current_app.logger.info(f'Detailed search for query: {query}')
-    extract_dir = 'temp_extracted'
-    app = current_app._get_current_object()
     try:
-        results = search_files(query, extract_dir, app, max_workers=4)
-        current_app.logger.info(f'Detailed search completed for query: {query}')
-        return jsonify({"results": results}), 200
+        limit, done_files, partial = parse_pagination()
+    except ValueError as e:
+        current_app.logger.warning('Invalid pagination parameters: %s', e)
+        return jsonify({"message": "Invalid limit or cursor."}), 400
+    try:
+        corpora = parse_corpora()
+    except UnknownCorpusError as e:
+        current_app.logger.warning('Invalid corpus in detailed search: %s', e)
+        return jsonify({"message": "Unknown corpus."}), 400
+
+    fuzzy = request.form.get('fuzzy', '').lower() in ('1', 'true', 'on')
+    current_app.logger.info('Detailed search for predicates: %s, ranges: %s in corpora: %s (fuzzy: %s)', predicates,
+                            ranges, corpora or "all", fuzzy)
+    try:
+        file_results = cached_structured_results(predicates, done_files, corpora, fuzzy, ranges)
+        response = results_response(file_results, limit, done_files, partial)
+        current_app.logger.info('Detailed search completed for predicates: %s', predicates)
+        return response
     except Exception as e:
-        current_app.logger.error(f'Exception during detailed search: {e}')
+        current_app.logger.error('Exception during detailed search: %s', e)
         return jsonify({"message": "Internal server error during detailed search."}), 500
+
+@search_bp.route('/related', methods=['POST'])
+def related():
+    """
+    Endpunkt für die tabellenübergreifende Suche (z.B. alle Fahrzeuge einer Person).
+
+    Die Ausgangstreffer in `table` werden über `column`/`value` oder die Felder der detaillierten Suche bestimmt;
+    anschließend werden die verknüpften Zeilen über die Schlüsselspalten aufgelöst. `targets` (kommagetrennt)
+    beschränkt die Antwort auf bestimmte Tabellen, `depth` die Anzahl Verknüpfungsschritte und `corpus` die
+    berücksichtigten Korpora.
+
+    Returns:
+        werkzeug.wrappers.Response: Eine JSON-Antwort mit den Zeilen pro Tabelle.
+    """
+    table = request.form.get('table', '').strip()
+    column = request.form.get('column', '').strip()
+    value = request.form.get('value', '').strip()
+    targets = [target.strip() for target in request.form.get('targets', '').split(',') if target.strip()] or None
+    predicates = [(column, value.lower())] if column and value else build_predicates(request.form)
+    if not table or not predicates:
+        current_app.logger.warning('Incomplete related search received.')
+        return jsonify({"message": "Table and search criteria are required."}), 400
+    try:
+        depth = int(request.form.get('depth') or DEFAULT_JOIN_DEPTH)
+    except ValueError:
+        return jsonify({"message": "Invalid depth."}), 400
+    try:
+        corpora = parse_corpora()
+    except UnknownCorpusError as e:
+        current_app.logger.warning('Invalid corpus in related search: %s', e)
+        return jsonify({"message": "Unknown corpus."}), 400
+
+    current_app.logger.info('Related search in %s for %s, targets: %s', table, predicates, targets)
+    try:
+        app = current_app._get_current_object()
+        extract_dir = app.config['EXTRACT_FOLDER']
+        index = SearchIndex(index_path_for(extract_dir))
+        tables = files_by_table(index, extract_dir, corpora)
+        if column in KEY_COLUMNS and value:
+            # Schlüsselwerte werden direkt über den Index aufgelöst
+            start_rows = lookup_rows(index, tables.get(table, []), column, [value])
+        else:
+            start_rows = [row for _, _, rows in iter_structured_results(predicates, extract_dir, app, tables=[table],
+                                                                        corpora=corpora)
+                          for row in rows]
+        start_rows = start_rows[:app.config['SEARCH_MAX_RESULTS']]
+
+        found = resolve_related(index, tables, table, start_rows, targets, depth, current_app.logger)
+        return jsonify({
+            "tables": {name: [json_safe(row) for row in rows] for name, rows in found.items()},
+            "counts": {name: len(rows) for name, rows in found.items()},
+        }), 200
+    except Exception as e:
+        current_app.logger.error('Exception during related search: %s', e)
+        return jsonify({"message": "Internal server error during related search."}), 500
+
+@search_bp.route('/cache_stats', methods=['GET'])
+def cache_stats():
+    """
+    Endpunkt mit den Treffer- und Fehlzugriffszählern des Ergebnis-Caches.
+
+    Returns:
+        werkzeug.wrappers.Response: Eine JSON-Antwort mit den Cache-Statistiken.
+    """
+    return jsonify(get_result_cache(current_app._get_current_object()).stats()), 200
+
+@search_bp.route('/corpora', methods=['GET'])
+def corpora():
+    """
+    Endpunkt mit allen Korpora (ID, Art und Quelle des Ingests, Erstellungszeit, Größe), älteste zuerst.
+
+    Returns:
+        werkzeug.wrappers.Response: Eine JSON-Antwort mit der Liste der Korpora.
+    """
+    return jsonify({"corpora": list_corpora(current_app.config['EXTRACT_FOLDER'])}), 200
+
+@search_bp.route('/corpora/<corpus_id>', methods=['DELETE'])
+def delete_corpus_route(corpus_id):
+    """
+    Endpunkt zum Löschen eines Korpus samt entpackter Dateien, Caches und Indexeinträgen.
+
+    Args:
+        corpus_id (str): Die Korpus-ID.
+
+    Returns:
+        werkzeug.wrappers.Response: Eine JSON-Antwort oder HTTP 404, wenn der Korpus nicht existiert.
+    """
+    try:
+        delete_corpus(current_app._get_current_object(), corpus_id)
+    except UnknownCorpusError:
+        return jsonify({"message": "Unknown corpus."}), 404
+    current_app.logger.info('Deleted corpus: %s', corpus_id)
+    return jsonify({"message": "Corpus deleted.", "corpus_id": corpus_id}), 200
+
+@search_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Endpunkt mit den Histogrammen der Verarbeitungsschritte und Anfragen im Prometheus-Textformat.
+
+    Returns:
+        werkzeug.wrappers.Response: Die Metriken als Text.
+    """
+    return Response(REGISTRY.render(), mimetype=CONTENT_TYPE.split(';')[0], content_type=CONTENT_TYPE)
@@ -0,0 +1,67 @@
+"""
+Fehlertolerante Zuordnung von Spaltennamen zu den erwarteten Schemas.
+
+Die Kandidatenliste (alle Spaltennamen aus `EXPECTED_SCHEMAS`, ohne Duplikate) wird einmal beim Import aufgebaut.
+Exakt bekannte Spaltennamen werden ohne Ähnlichkeitsberechnung übernommen; die übrigen werden gesammelt und in einem
+Aufruf gegen alle Kandidaten bewertet. Ist `rapidfuzz` installiert, geschieht das vektorisiert mit `cdist`,
+andernfalls mit `fuzzywuzzy`. Da die Kopfzeilen der Dateien einer Tabelle fast immer identisch sind, wird das
+Ergebnis pro Kopfzeile (Tupel der Spaltennamen) zwischengespeichert.
+"""
+
+from functools import lru_cache
+
+from tests.test import EXPECTED_SCHEMAS
+
+try:
+    from rapidfuzz import fuzz as rapid_fuzz, process as rapid_process, utils as rapid_utils
+except ImportError:  # pragma: no cover - optionale Abhängigkeit
+    rapid_process = None
+    from fuzzywuzzy import process as fuzzy_process
+
+# Ab dieser Ähnlichkeit (0-100) gilt ein Spaltenname als Tippfehler des Kandidaten
+MATCH_THRESHOLD = 80
+
+# Anzahl zwischengespeicherter Kopfzeilen
+HEADER_CACHE_SIZE = 4096
+
+# Reihenfolge wie in EXPECTED_SCHEMAS, damit bei gleicher Bewertung derselbe Kandidat gewinnt wie bisher
+CANDIDATES = tuple(dict.fromkeys(column for schema in EXPECTED_SCHEMAS.values() for column in schema))
+_KNOWN = frozenset(CANDIDATES)
+
+
+def best_matches(columns):
+    """
+    Bestimmt für mehrere Spaltennamen den ähnlichsten Kandidaten in einem Durchlauf.
+
+    Args:
+        columns (list): Die unbekannten Spaltennamen.
+
+    Returns:
+        list: Tupel (bester Kandidat, Bewertung 0-100) in der Reihenfolge der Eingabe.
+    """
+    if not columns:
+        return []
+    if rapid_process is not None:
+        scores = rapid_process.cdist(columns, CANDIDATES, scorer=rapid_fuzz.WRatio, processor=rapid_utils.default_process)
+        best = scores.argmax(axis=1)
+        return [(CANDIDATES[index], float(scores[row, index])) for row, index in enumerate(best)]
+    return [fuzzy_process.extractOne(column, CANDIDATES) for column in columns]
+
+
+@lru_cache(maxsize=HEADER_CACHE_SIZE)
+def correct_header(columns):
+    """
+    Korrigiert eine Kopfzeile anhand der erwarteten Schemas (mit Zwischenspeicher pro Kopfzeile).
+
+    Args:
+        columns (tuple): Die Spaltennamen der Kopfzeile.
+
+    Returns:
+        tuple: Die korrigierten Spaltennamen.
+    """
+    unknown = list(dict.fromkeys(column for column in columns if column not in _KNOWN))
+    corrections = {}
+    for column, (best_match, score) in zip(unknown, best_matches(unknown)):
+        # Wenn keine gute Übereinstimmung gefunden wird, den ursprünglichen Namen beibehalten
+        corrections[column] = best_match if score > MATCH_THRESHOLD else column
+    return tuple(corrections.get(column, column) for column in columns)
@@ -0,0 +1,283 @@
+"""
+Ingest von SIARD-Paketen (`.siard`, SIARD 2.x und 1.0).
+
+Ein SIARD-Paket ist eine ZIP-Datei mit den Metadaten in `header/metadata.xml` und einer XML-Datei pro Tabelle unter
+`content/<Schema>/<Tabelle>/<Tabelle>.xml`. Die Tabellen- und Spaltennamen stehen nur in den Metadaten; die Zeilen
+der Tabellen-XML enthalten die Werte als Elemente `c1` bis `cN`.
+
+Die Tabellen-XML wird nicht entpackt: sie wird direkt aus dem ZIP-Strom mit `iterparse` gelesen, jede verarbeitete
+Zeile wird sofort wieder aus dem Baum entfernt (konstanter Speicherbedarf, auch für Tabellen mit mehreren GB) und als
+tabulatorgetrennte Zeile in die TXT-Datei der Tabelle geschrieben. Die TXT-Dateien durchlaufen anschließend dieselbe
+Pipeline wie entpackte Lieferungen (spaltenbasierter Cache, Schema-Analyse, Index).
+"""
+
+import csv
+import os
+import re
+import zipfile
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .manifest import format_hash
+from .metrics import timed
+
+SIARD_EXTENSION = '.siard'
+METADATA_MEMBER = 'header/metadata.xml'
+
+# Zeichen, die in XML nicht vorkommen dürfen, kodiert SIARD als `\uXXXX` (den Backslash selbst als `\u005c`)
+ESCAPE_PATTERN = re.compile(r'\\u([0-9a-fA-F]{4})')
+
+# Zeichen, die in Datei- und Verzeichnisnamen ersetzt werden
+UNSAFE_NAME_PATTERN = re.compile(r'[^\w.-]')
+
+
+def local_name(tag):
+    """
+    Entfernt den Namensraum eines XML-Tags (`{http://...}table` -> `table`).
+
+    Args:
+        tag (str): Der Tag.
+
+    Returns:
+        str: Der lokale Name.
+    """
+    return tag.rpartition('}')[2]
+
+
+def child_text(element, name):
+    """
+    Gibt den Text des ersten Kindelements mit dem angegebenen lokalen Namen zurück.
+
+    Args:
+        element (xml.etree.ElementTree.Element): Das Element.
+        name (str): Der lokale Name des Kindelements.
+
+    Returns:
+        str: Der Text oder None, wenn das Kindelement fehlt.
+    """
+    for child in element:
+        if local_name(child.tag) == name:
+            return (child.text or '').strip()
+    return None
+
+
+def children(element, name):
+    """
+    Liefert die Kindelemente mit dem angegebenen lokalen Namen.
+
+    Args:
+        element (xml.etree.ElementTree.Element): Das Element.
+        name (str): Der lokale Name.
+
+    Returns:
+        list: Die Kindelemente.
+    """
+    return [child for child in element if local_name(child.tag) == name]
+
+
+def safe_name(name):
+    """
+    Macht einen Schema- oder Tabellennamen als Datei- bzw. Verzeichnisnamen verwendbar.
+
+    Args:
+        name (str): Der Name.
+
+    Returns:
+        str: Der bereinigte Name.
+    """
+    return UNSAFE_NAME_PATTERN.sub('_', name).strip('.') or '_'
+
+
+def unescape(value):
+    """
+    Dekodiert die `\\uXXXX`-Sequenzen eines SIARD-Werts.
+
+    Args:
+        value (str): Der Wert.
+
+    Returns:
+        str: Der dekodierte Wert.
+    """
+    if '\\u' not in value:
+        return value
+    return ESCAPE_PATTERN.sub(lambda match: chr(int(match.group(1), 16)), value)
+
+
+def read_siard_metadata(zip_file):
+    """
+    Liest Schemas, Tabellen und Spaltennamen aus `header/metadata.xml`.
+
+    Die Namensräume werden ignoriert, damit SIARD 1.0 und 2.x gleichermaßen gelesen werden.
+
+    Args:
+        zip_file (zipfile.ZipFile): Das geöffnete SIARD-Paket.
+
+    Returns:
+        list: Pro Tabelle ein Dictionary mit `schema`, `name`, `member` (Pfad der Tabellen-XML), `columns` und der
+        in den Metadaten angegebenen Zeilenzahl `rows` (oder None).
+
+    Raises:
+        ValueError: Wenn das Paket keine Metadaten enthält.
+    """
+    try:
+        with zip_file.open(METADATA_MEMBER) as handle:
+            root = ElementTree.parse(handle).getroot()
+    except KeyError:
+        raise ValueError(f"Missing {METADATA_MEMBER} in SIARD package")
+
+    tables = []
+    for schemas in children(root, 'schemas'):
+        for schema in children(schemas, 'schema'):
+            schema_name = child_text(schema, 'name')
+            schema_folder = child_text(schema, 'folder') or schema_name
+            for table_list in children(schema, 'tables'):
+                for table in children(table_list, 'table'):
+                    name = child_text(table, 'name')
+                    folder = child_text(table, 'folder') or name
+                    columns = [child_text(column, 'name')
+                               for column_list in children(table, 'columns')
+                               for column in children(column_list, 'column')]
+                    rows = child_text(table, 'rows')
+                    tables.append({
+                        'schema': schema_name,
+                        'name': name,
+                        'member': f"content/{schema_folder}/{folder}/{folder}.xml",
+                        'columns': columns,
+                        'rows': int(rows) if rows and rows.isdigit() else None,
+                    })
+    return tables
+
+
+def iter_table_rows(source, num_columns):
+    """
+    Liest die Zeilen einer Tabellen-XML als Listen von Werten (Streaming mit konstantem Speicherbedarf).
+
+    Fehlende Zellen (NULL) werden als leere Werte geliefert. Strukturierte Werte (Arrays, benutzerdefinierte Typen)
+    werden zu ihrem Text zusammengefügt; ausgelagerte LOBs (Attribut `file`) bleiben leer.
+
+    Args:
+        source (io.BufferedIOBase): Der Strom der Tabellen-XML (z.B. ein ZIP-Member).
+        num_columns (int): Die Anzahl Spalten laut Metadaten.
+
+    Yields:
+        list: Die Werte einer Zeile.
+    """
+    root = None
+    for event, element in ElementTree.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = element
+            continue
+        if local_name(element.tag) != 'row':
+            continue
+        values = [''] * num_columns
+        for cell in element:
+            position = local_name(cell.tag)[1:]
+            if position.isdigit() and 0 < int(position) <= num_columns:
+                values[int(position) - 1] = unescape(''.join(cell.itertext()))
+        # Verarbeitete Zeilen sofort verwerfen, sonst wächst der Baum mit der Tabelle
+        element.clear()
+        root.clear()
+        yield values
+
+
+def table_target(extract_dir, siard_path, table):
+    """
+    Bestimmt die TXT-Datei einer SIARD-Tabelle (`<Paket>/<Schema>/<Tabelle>_1.txt`, wie die Dateien einer Lieferung).
+
+    Wie bei ZIP-Dateien liegt jedes Paket in einem eigenen Verzeichnis (Dateiname ohne Endung), damit gleichnamige
+    Tabellen verschiedener Pakete einander nicht überschreiben.
+
+    Args:
+        extract_dir (str): Das Zielverzeichnis.
+        siard_path (str): Der Pfad zum SIARD-Paket.
+        table (dict): Die Tabelle aus `read_siard_metadata`.
+
+    Returns:
+        str: Der Pfad der TXT-Datei.
+    """
+    package = os.path.splitext(os.path.basename(siard_path))[0]
+    return os.path.join(extract_dir, package, safe_name(table['schema'] or 'schema'),
+                        f"{safe_name(table['name'])}_1.txt")
+
+
+def convert_table(siard_path, table, target):
+    """
+    Wandelt eine Tabelle eines SIARD-Pakets in eine tabulatorgetrennte TXT-Datei um, ohne die XML zu entpacken.
+
+    Die Datei wird unter einem temporären Namen geschrieben und erst am Ende umbenannt, damit parallel laufende
+    Suchen keine halb geschriebenen Tabellen sehen.
+
+    Args:
+        siard_path (str): Der Pfad zum SIARD-Paket.
+        table (dict): Die Tabelle aus `read_siard_metadata`.
+        target (str): Der Pfad der TXT-Datei.
+
+    Returns:
+        str: Der Pfad der TXT-Datei.
+    """
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with timed('extract'), zipfile.ZipFile(siard_path, 'r') as zip_file:
+        with zip_file.open(table['member']) as source, \
+                open(target + '.part', 'w', encoding='utf-8', newline='') as destination:
+            writer = csv.writer(destination, delimiter='\t', lineterminator='\n')
+            writer.writerow(table['columns'])
+            writer.writerows(iter_table_rows(source, len(table['columns'])))
+    os.replace(target + '.part', target)
+    return target
+
+
+def extract_siard(siard_path, extract_dir, max_workers=None, logger=None, manifest=None):
+    """
+    Wandelt alle Tabellen eines SIARD-Pakets parallel in TXT-Dateien um.
+
+    Mit einem Manifest werden Tabellen übersprungen, deren XML laut CRC-32 aus dem ZIP-Verzeichnis unverändert ist;
+    für die TXT-Datei wird dazu die Prüfsumme der Tabellen-XML im Manifest vermerkt.
+
+    Args:
+        siard_path (str): Der Pfad zum SIARD-Paket.
+        extract_dir (str): Das Zielverzeichnis.
+        max_workers (int): Die Anzahl paralleler Worker (Standard: Anzahl CPU-Kerne).
+        logger (logging.Logger): Optionaler Logger für Fortschritt und Fehler.
+        manifest (Manifest): Optionales Manifest bereits umgewandelter Tabellen; die neuen Tabellen werden darin
+            vermerkt, gespeichert wird es erst vom Aufrufer nach der Weiterverarbeitung.
+
+    Returns:
+        list: Die neu geschriebenen TXT-Dateien.
+
+    Raises:
+        ValueError: Wenn das Paket keine Metadaten enthält.
+    """
+    with zipfile.ZipFile(siard_path, 'r') as zip_file:
+        tables = read_siard_metadata(zip_file)
+        crcs = {info.filename: info.CRC for info in zip_file.infolist()}
+
+    tasks = []
+    for table in tables:
+        if table['member'] not in crcs:
+            if logger:
+                logger.error("Missing table data %s in SIARD package %s", table['member'], siard_path)
+            continue
+        target = table_target(extract_dir, siard_path, table)
+        if manifest is not None and manifest.is_current(target, digest=format_hash(crcs[table['member']])):
+            continue
+        tasks.append((table, target))
+
+    paths = []
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 4) as executor:
+        futures = {executor.submit(convert_table, siard_path, table, target): table for table, target in tasks}
+        for future in as_completed(futures):
+            table = futures[future]
+            try:
+                path = future.result()
+                if manifest is not None:
+                    manifest.record(path, format_hash(crcs[table['member']]))
+                paths.append(path)
+            except Exception as e:
+                if logger:
+                    logger.error("Error converting table %s from %s: %s", table['name'], siard_path, e)
+
+    if logger:
+        logger.info("Converted %d of %d tables from SIARD package %s (%d unchanged tables skipped)",
+                    len(paths), len(tables), siard_path, len(tables) - len(tasks))
+    return sorted(paths)
@@ -0,0 +1,276 @@
+"""
+Seitenweise und gestreamte Auslieferung von Suchergebnissen.
+
+Die Treffer werden dateiweise geliefert, sobald die Suche einer Datei abgeschlossen ist (siehe
+`analysis.iter_search_results`). Ein Cursor beschreibt, welche Dateien bereits vollständig ausgeliefert wurden
+und wie viele Treffer einer teilweise ausgelieferten Datei schon gesendet sind, sodass eine Folgeanfrage genau dort
+weitermacht.
+
+Neben dem bisherigen Format (eine Liste von Dictionaries) gibt es ein kompaktes Format (siehe `compact_page` und
+`iter_compact_ndjson`): jede Kopfzeile wird nur einmal gesendet, jeder Treffer als Array
+`[Dateinummer, Zeilennummer, Wert, ...]`.
+"""
+
+import base64
+import json
+import math
+
+from .analysis import table_name_for
+from .results import dumps
+
+
+class InvalidCursorError(ValueError):
+    """
+    Wird ausgelöst, wenn ein übergebener Cursor nicht dekodiert werden kann.
+    """
+
+
+def compress_numbers(numbers):
+    """
+    Fasst eine Menge von Dateinummern zu zusammenhängenden Bereichen zusammen.
+
+    Args:
+        numbers (iterable): Die Dateinummern.
+
+    Returns:
+        list: Liste von [Start, Ende]-Paaren (inklusive).
+    """
+    ranges = []
+    for number in sorted(numbers):
+        if ranges and ranges[-1][1] == number - 1:
+            ranges[-1][1] = number
+        else:
+            ranges.append([number, number])
+    return ranges
+
+
+def encode_cursor(done_files, partial_file=None, partial_offset=0):
+    """
+    Kodiert den Fortschritt einer Suche als URL-sicheren Cursor.
+
+    Args:
+        done_files (iterable): Die Nummern der vollständig ausgelieferten Dateien.
+        partial_file (int): Die Nummer der teilweise ausgelieferten Datei.
+        partial_offset (int): Die Anzahl der bereits ausgelieferten Treffer dieser Datei.
+
+    Returns:
+        str: Der Cursor.
+    """
+    state = {'d': compress_numbers(done_files)}
+    if partial_file is not None:
+        state['p'] = [partial_file, partial_offset]
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(',', ':')).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Dekodiert einen Cursor.
+
+    Args:
+        cursor (str): Der Cursor oder ein leerer Wert für den Anfang der Ergebnisse.
+
+    Returns:
+        tuple: Die Menge der erledigten Dateinummern und ein Dictionary Dateinummer -> Offset.
+
+    Raises:
+        InvalidCursorError: Wenn der Cursor ungültig ist.
+    """
+    if not cursor:
+        return set(), {}
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        done_files = {number for start, end in state['d'] for number in range(int(start), int(end) + 1)}
+        partial = {}
+        if 'p' in state:
+            partial_file, partial_offset = state['p']
+            partial[int(partial_file)] = int(partial_offset)
+        return done_files, partial
+    except Exception as e:
+        raise InvalidCursorError(f"Invalid cursor: {e}") from e
+
+
+def paginate(file_results, limit, done_files=(), partial=None, provenance=False):
+    """
+    Begrenzt dateiweise gelieferte Treffer auf `limit` und ermittelt den Cursor für die nächste Seite.
+
+    Args:
+        file_results (iterable): Tupel (Dateinummer, Dateipfad, Treffer), z.B. von `iter_search_results`.
+        limit (int): Die maximale Anzahl Treffer dieser Seite.
+        done_files (iterable): Die bereits in früheren Seiten vollständig ausgelieferten Dateien.
+        partial (dict): Dateinummer -> Anzahl bereits ausgelieferter Treffer aus früheren Seiten.
+        provenance (bool): Die Treffer zusammen mit Dateinummer und Dateipfad liefern.
+
+    Yields:
+        tuple: ('results', Liste der Treffer) für jede Datei mit Treffern, mit `provenance` stattdessen
+            ('results', (Dateinummer, Dateipfad, Treffer)), ('failed', Dateinummer) für jede Datei, die nicht
+            durchsucht werden konnte (siehe `ResultTable.error`), und zum Schluss
+            ('cursor', Cursor der nächsten Seite oder None, wenn alle Treffer ausgeliefert sind).
+    """
+    done_files = set(done_files)
+    partial = partial or {}
+    emitted = 0
+    for number, file_path, results in file_results:
+        if getattr(results, 'error', None):
+            # Nicht als erledigt vermerken: ein Cursor dieser Suche durchsucht die Datei erneut
+            yield 'failed', number
+            continue
+        results = results[partial.get(number, 0):]
+        remaining = limit - emitted
+        if len(results) > remaining:
+            if remaining:
+                page = results[:remaining]
+                yield 'results', (number, file_path, page) if provenance else page
+            offset = partial.get(number, 0) + remaining
+            yield 'cursor', encode_cursor(done_files, number, offset)
+            return
+        if results:
+            yield 'results', (number, file_path, results) if provenance else results
+        emitted += len(results)
+        done_files.add(number)
+    yield 'cursor', None
+
+
+def json_safe(row):
+    """
+    Ersetzt NaN-Werte durch None, damit die Zeile als gültiges JSON serialisiert werden kann.
+
+    Args:
+        row (dict): Die Ergebniszeile.
+
+    Returns:
+        dict: Die bereinigte Zeile.
+    """
+    return {key: None if isinstance(value, float) and math.isnan(value) else value for key, value in row.items()}
+
+
+def done_record(count, next_cursor, failed):
+    """
+    Erzeugt den Abschluss einer gestreamten Ergebnisseite.
+
+    Args:
+        count (int): Die Anzahl gesendeter Treffer.
+        next_cursor (str): Der Cursor der nächsten Seite oder None.
+        failed (list): Die Nummern der Dateien, die nicht durchsucht werden konnten.
+
+    Returns:
+        dict: `{"done": true, "count": n, "next_cursor": ...}`, bei fehlgeschlagenen Dateien mit `failed_files`.
+    """
+    record = {'done': True, 'count': count, 'next_cursor': next_cursor}
+    if failed:
+        record['failed_files'] = failed
+    return record
+
+
+def iter_ndjson(pages):
+    """
+    Serialisiert die Ausgabe von `paginate` als NDJSON (eine JSON-Zeile pro Treffer).
+
+    Jeder Treffer wird als `{"result": {...}}` gesendet, zum Schluss folgt
+    `{"done": true, "count": n, "next_cursor": ...}`; konnten Dateien nicht durchsucht werden, enthält die letzte
+    Zeile zusätzlich `"failed_files": [Dateinummer, ...]`.
+
+    Args:
+        pages (iterable): Die Ausgabe von `paginate`.
+
+    Yields:
+        str: Die NDJSON-Zeilen.
+    """
+    count = 0
+    failed = []
+    for kind, payload in pages:
+        if kind == 'results':
+            for row in payload:
+                yield json.dumps({'result': json_safe(row)}, default=str, ensure_ascii=False) + '\n'
+            count += len(payload)
+        elif kind == 'failed':
+            failed.append(payload)
+        else:
+            yield json.dumps(done_record(count, payload, failed)) + '\n'
+
+
+def iter_compact(pages):
+    """
+    Zerlegt die Ausgabe von `paginate(..., provenance=True)` in die Bestandteile des kompakten Formats.
+
+    Jede Kopfzeile (Liste der Spaltennamen) erhält beim ersten Auftreten eine Nummer; Dateien derselben Tabelle
+    teilen sich ihre Kopfzeile.
+
+    Args:
+        pages (iterable): Die Ausgabe von `paginate` mit `provenance=True`; die Treffer als `ResultTable`.
+
+    Yields:
+        tuple: ('header', {"header": n, "columns": [...]}) beim ersten Auftreten einer Kopfzeile,
+            ('file', {"file": Dateinummer, "table": Tabellenname, "header": n}) und
+            ('rows', Liste der Treffer als [Dateinummer, Zeilennummer, Wert, ...]) für jede Datei mit Treffern,
+            ('failed', Dateinummer) für jede fehlgeschlagene Datei und zum Schluss ('cursor', Cursor der nächsten Seite
+            oder None).
+    """
+    headers = {}
+    for kind, payload in pages:
+        if kind != 'results':
+            yield kind, payload
+            continue
+        number, file_path, results = payload
+        key = tuple(results.columns)
+        if key not in headers:
+            headers[key] = len(headers)
+            yield 'header', {'header': headers[key], 'columns': results.columns}
+        yield 'file', {'file': number, 'table': table_name_for(file_path), 'header': headers[key]}
+        yield 'rows', [[number, row_number, *row] for row_number, row in zip(results.row_numbers, results.rows)]
+
+
+def compact_page(pages):
+    """
+    Fasst eine Ergebnisseite im kompakten Format zusammen.
+
+    Args:
+        pages (iterable): Die Ausgabe von `paginate` mit `provenance=True`.
+
+    Returns:
+        dict: `{"headers": [[Spalte, ...], ...], "files": [{"file", "table", "header"}, ...],
+        "rows": [[Dateinummer, Zeilennummer, Wert, ...], ...], "next_cursor": ...}`; bei fehlgeschlagenen Dateien
+        zusätzlich `"failed_files": [Dateinummer, ...]`.
+    """
+    page = {'headers': [], 'files': [], 'rows': [], 'next_cursor': None}
+    for kind, payload in iter_compact(pages):
+        if kind == 'header':
+            page['headers'].append(payload['columns'])
+        elif kind == 'file':
+            page['files'].append(payload)
+        elif kind == 'rows':
+            page['rows'].extend(payload)
+        elif kind == 'failed':
+            page.setdefault('failed_files', []).append(payload)
+        else:
+            page['next_cursor'] = payload
+    return page
+
+
+def iter_compact_ndjson(pages):
+    """
+    Serialisiert die Ausgabe von `paginate(..., provenance=True)` als NDJSON im kompakten Format.
+
+    Vor den Treffern einer Datei stehen bei Bedarf ihre Kopfzeile `{"header": n, "columns": [...]}` und
+    `{"file": Dateinummer, "table": ..., "header": n}`; jeder Treffer ist eine Zeile
+    `[Dateinummer, Zeilennummer, Wert, ...]`. Zum Schluss folgt `{"done": true, "count": n, "next_cursor": ...}`
+    (siehe `done_record`).
+
+    Args:
+        pages (iterable): Die Ausgabe von `paginate` mit `provenance=True`.
+
+    Yields:
+        bytes: Die NDJSON-Zeilen.
+    """
+    count = 0
+    failed = []
+    for kind, payload in iter_compact(pages):
+        if kind == 'rows':
+            # Alle Zeilen einer Datei werden in einem Block gesendet
+            yield b'\n'.join(dumps(row) for row in payload) + b'\n'
+            count += len(payload)
+        elif kind == 'failed':
+            failed.append(payload)
+        elif kind == 'cursor':
+            yield dumps(done_record(count, payload, failed)) + b'\n'
+        else:
+            yield dumps(payload) + b'\n'
@@ -0,0 +1,398 @@
+"""
+Feldbezogene Suche für `/detailed_search`.
+
+Jedes Formularfeld wird auf die passende Spalte der erwarteten Schemas abgebildet (z.B. `first_name` -> `Vorname`).
+Durchsucht werden nur Tabellen, deren Kopfzeile alle abgefragten Spalten enthält; die Prädikate werden UND-verknüpft
+und nach Selektivität sortiert ausgewertet, sodass jedes weitere Prädikat nur noch die verbliebenen Zeilen prüft.
+
+Bei der unscharfen Suche passen Prädikate auf Namensspalten (`NAME_COLUMNS`) auch auf phonetisch gleiche oder leicht
+falsch geschriebene Namen ("Meyer" findet "Meier" und "Maier"). Für indexierte Dateien werden diese Prädikate
+vollständig im Index beantwortet; nur nicht indexierte Dateien werden über ihre verschiedenen Werte geprüft.
+
+Bereichsprädikate (z.B. `Geburtsdatum:1980-01-01..1989-12-31` oder `Motorleistung>200`) vergleichen typisierte Werte.
+Im spaltenbasierten Cache werden dabei ganze Dateien und Blöcke anhand ihrer Zone Maps übersprungen.
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from .analysis import list_txt_files, match_vectorized, table_name_for
+from .archives import open_binary, open_source_columnar
+from .columnar import RANGE_OPERATORS, date_days, parse_bound
+from .index import NAME_COLUMNS, SearchIndex, index_path_for, tokenize
+from .phonetics import tokens_match
+from .metrics import submit, timed
+from .results import ResultTable
+
+# Formularfelder der detaillierten Suche und ihre Schemaspalten; None durchsucht alle Spalten
+DETAILED_SEARCH_FIELDS = {
+    'first_name': 'Vorname',
+    'last_name': 'Name',
+    'address': 'Adresse',
+    'license_plate': 'Kennzeichen',
+    'birth_date': 'Geburtsdatum',
+    'car_model': 'Modell',
+    'email': None,
+    'phone_number': None,
+    'inspection_date': None,
+}
+
+# Bereichsprädikat: `Spalte<Operator>Wert` oder `Spalte:Von..Bis` (eine der beiden Grenzen darf fehlen)
+RANGE_PATTERN = re.compile(r'^\s*(?P<column>[^<>=:]+?)\s*(?P<operator><=|>=|<|>|=|:)\s*(?P<value>.+?)\s*$')
+
+
+def build_predicates(form):
+    """
+    Erzeugt die Spaltenprädikate aus den Formularfeldern der detaillierten Suche.
+
+    Args:
+        form (werkzeug.datastructures.MultiDict): Die Formulardaten.
+
+    Returns:
+        list: Tupel (Spaltenname oder None, kleingeschriebener Suchwert) für alle ausgefüllten Felder.
+    """
+    predicates = []
+    for field, column in DETAILED_SEARCH_FIELDS.items():
+        value = form.get(field, '').strip().lower()
+        if value:
+            predicates.append((column, value))
+    return predicates
+
+
+def build_range_predicates(form):
+    """
+    Erzeugt die Bereichsprädikate aus den Formularfeldern `range` der detaillierten Suche.
+
+    Args:
+        form (werkzeug.datastructures.MultiDict): Die Formulardaten.
+
+    Returns:
+        list: Tupel (Spaltenname, Operator, Typ 'date' oder 'number', Grenze); ein Bereich `Von..Bis` ergibt zwei
+        Prädikate.
+
+    Raises:
+        ValueError: Wenn ein Prädikat oder eine Grenze ungültig ist.
+    """
+    ranges = []
+    for expression in form.getlist('range'):
+        if not expression.strip():
+            continue
+        match = RANGE_PATTERN.match(expression)
+        if match is None:
+            raise ValueError(f"Invalid range predicate: {expression!r}")
+        column, op, value = match.group('column'), match.group('operator'), match.group('value')
+        if op == ':':
+            low, separator, high = value.partition('..')
+            if not separator or not (low.strip() or high.strip()):
+                raise ValueError(f"Invalid range: {expression!r}")
+            bounds = [(bound_op, bound) for bound_op, bound in (('>=', low), ('<=', high)) if bound.strip()]
+        else:
+            bounds = [(op, value)]
+        for bound_op, bound in bounds:
+            ranges.append((column, bound_op) + parse_bound(bound))
+    return ranges
+
+
+def range_mask(df, ranges):
+    """
+    Wertet Bereichsprädikate ohne spaltenbasierten Cache aus (die Werte werden dafür typisiert).
+
+    Args:
+        df (pandas.DataFrame): Die Daten.
+        ranges (list): Die Bereichsprädikate (siehe `build_range_predicates`).
+
+    Returns:
+        pandas.Series: Die boolesche Maske der passenden Zeilen.
+    """
+    mask = pd.Series(True, index=df.index)
+    for column, op, kind, value in ranges:
+        series = df[column]
+        typed = date_days(series) if kind == 'date' else pd.to_numeric(series, errors='coerce')
+        mask &= RANGE_OPERATORS[op](typed, value).fillna(False).astype(bool)
+    return mask
+
+
+def read_header(file_path):
+    """
+    Liest nur die Kopfzeile einer TXT-Datei.
+
+    Args:
+        file_path (str): Der Pfad zur Datei.
+
+    Returns:
+        list: Die Spaltennamen.
+    """
+    with open_binary(file_path) as handle:
+        return [str(column) for column in pd.read_csv(handle, sep="\t", nrows=0).columns]
+
+
+def supports_predicates(header, predicates):
+    """
+    Prüft, ob eine Tabelle alle Spalten der Prädikate enthält.
+
+    Args:
+        header (list): Die Spaltennamen der Tabelle.
+        predicates (list): Die Prädikate.
+
+    Returns:
+        bool: True, wenn die Tabelle durchsucht werden muss.
+    """
+    return all(column is None or column in header for column, _ in predicates)
+
+
+def order_predicates(predicates, candidate_counts=None):
+    """
+    Sortiert die Prädikate nach geschätzter Selektivität (selektivstes zuerst).
+
+    Liegen Kandidatenzahlen aus dem Index vor, werden diese verwendet; sonst gelten spaltengebundene und längere
+    Suchwerte als selektiver.
+
+    Args:
+        predicates (list): Die Prädikate.
+        candidate_counts (dict): Optional Prädikat -> Anzahl Kandidatenzeilen.
+
+    Returns:
+        list: Die sortierten Prädikate.
+    """
+    candidate_counts = candidate_counts or {}
+    return sorted(predicates, key=lambda predicate: (candidate_counts.get(predicate, float('inf')),
+                                                     predicate[0] is None, -len(predicate[1])))
+
+
+def filter_frame(df, predicates):
+    """
+    Wertet UND-verknüpfte Prädikate auf einem DataFrame aus; jedes Prädikat prüft nur die verbliebenen Zeilen.
+
+    Args:
+        df (pandas.DataFrame): Die Daten.
+        predicates (list): Die sortierten Prädikate.
+
+    Returns:
+        pandas.DataFrame: Die passenden Zeilen.
+    """
+    for column, value in predicates:
+        if df.empty:
+            break
+        searched = df if column is None else df[[column]]
+        df = df[match_vectorized(searched, value)]
+    return df
+
+
+def split_fuzzy_predicates(predicates, fuzzy=False):
+    """
+    Trennt die unscharf auszuwertenden Prädikate (auf Namensspalten) von den übrigen.
+
+    Args:
+        predicates (list): Die Prädikate.
+        fuzzy (bool): Ob unscharf gesucht wird.
+
+    Returns:
+        tuple: Die exakt und die unscharf auszuwertenden Prädikate.
+    """
+    if not fuzzy:
+        return list(predicates), []
+    return ([predicate for predicate in predicates if predicate[0] not in NAME_COLUMNS],
+            [predicate for predicate in predicates if predicate[0] in NAME_COLUMNS])
+
+
+def fuzzy_mask(series, value):
+    """
+    Wertet ein unscharfes Prädikat aus: jedes Suchtoken muss einem Token der Zelle entsprechen, oder die Zelle
+    enthält den Suchwert wie bei der exakten Suche. Die unscharfe Suche findet damit nie weniger als die exakte.
+
+    Jeder verschiedene Wert der Spalte wird nur einmal geprüft.
+
+    Args:
+        series (pandas.Series): Die Spalte.
+        value (str): Der kleingeschriebene Suchwert.
+
+    Returns:
+        pandas.Series: Die boolesche Maske der passenden Zeilen.
+    """
+    query_tokens = tokenize(value)
+    texts = series.fillna('').astype(str).str.lower()
+    contains = match_vectorized(series.to_frame(), value)
+    matching = {text for text in texts[~contains].unique()
+                if all(any(tokens_match(query_token, token) for token in tokenize(text)) for query_token in query_tokens)}
+    return texts.isin(matching) | contains
+
+
+def search_file_structured(file_path, predicates, app, index=None, file_id=None, rows=None, candidate_counts=None,
+                           fuzzy_predicates=(), ranges=()):
+    """
+    Durchsucht eine Tabelle mit feldbezogenen Prädikaten.
+
+    Args:
+        file_path (str): Der Pfad zur Datei.
+        predicates (list): Die Prädikate.
+        app (Flask): Die Flask-Anwendung für Logging.
+        index (SearchIndex): Der Suchindex, falls die Datei indexiert ist.
+        file_id (int): Die Datei-ID im Index.
+        rows (list): Kandidatenzeilen aus dem Index oder None für alle Zeilen.
+        candidate_counts (dict): Kandidatenzahlen pro Prädikat für die Sortierung.
+        fuzzy_predicates (list): Unscharfe Prädikate (siehe `fuzzy_mask`); sie werden immer auf den Zeilen geprüft.
+        ranges (list): Die Bereichsprädikate (siehe `build_range_predicates`).
+
+    Returns:
+        ResultTable: Die gefundenen Ergebnisse.
+    """
+    try:
+        ordered = order_predicates(predicates, candidate_counts)
+        app.logger.debug("Structured search in file: %s with predicates: %s", file_path, ordered)
+
+        with timed('parse'):
+            table = open_source_columnar(file_path)
+        if table is not None:
+            with timed('match'):
+                # Bereichsprädikate zuerst: sie überspringen ganze Blöcke und vergleichen nur Zahlen
+                rows = table.filter_rows(ordered, table.filter_ranges(ranges, rows))
+                if fuzzy_predicates:
+                    df = table.take(rows, [column for column, _ in fuzzy_predicates])
+                    mask = np.ones(len(rows), dtype=bool)
+                    for column, value in fuzzy_predicates:
+                        mask &= fuzzy_mask(df[column], value).to_numpy()
+                    rows = rows[mask]
+                matches = table.take(rows)
+        else:
+            with timed('parse'):
+                if rows is not None and index is not None:
+                    df = index.read_rows(file_id, rows)
+                else:
+                    with open_binary(file_path) as handle:
+                        df = pd.read_csv(handle, sep="\t")
+            with timed('match'):
+                matches = filter_frame(df, ordered)
+                if ranges:
+                    matches = matches[range_mask(matches, ranges)]
+                for column, value in fuzzy_predicates:
+                    matches = matches[fuzzy_mask(matches[column], value)]
+        with timed('serialize'):
+            return ResultTable.from_frame(matches)
+    except Exception as e:
+        with app.app_context():
+            app.logger.error("Error in structured search of file %s: %s", file_path, e)
+        return ResultTable(error=str(e))
+
+
+def iter_structured_results(predicates, extract_dir, app, max_workers=4, index_path=None, skip_files=(), tables=None,
+                            corpora=None, fuzzy=False, ranges=()):
+    """
+    Führt eine feldbezogene Suche über alle passenden Tabellen aus und liefert die Treffer dateiweise.
+
+    Tabellen ohne die abgefragten Spalten werden anhand ihrer Kopfzeile übersprungen. Für indexierte Dateien
+    werden die Kandidatenzeilen jedes Prädikats spaltengenau aus dem Index ermittelt und geschnitten, bevor
+    überhaupt Daten gelesen werden; unscharfe Prädikate auf Namensspalten werden dabei bereits exakt beantwortet.
+
+    Args:
+        predicates (list): Tupel (Spaltenname oder None, kleingeschriebener Suchwert).
+        extract_dir (str): Das Verzeichnis, in dem die Dateien durchsucht werden sollen.
+        app (Flask): Die Flask-Anwendung für Logging.
+        max_workers (int): Die maximale Anzahl der Worker-Threads.
+        index_path (str): Pfad zur Index-Datenbank. Standardmäßig liegt sie im Extraktionsverzeichnis.
+        skip_files (iterable): Dateinummern (siehe `list_txt_files`), die übersprungen werden.
+        tables (iterable): Optional die Tabellennamen (siehe `table_name_for`), auf die die Suche beschränkt wird.
+        corpora (list): Nur die Dateien dieser Korpora durchsuchen; None durchsucht alle.
+        fuzzy (bool): Namensspalten phonetisch und tippfehlertolerant durchsuchen.
+        ranges (list): Die Bereichsprädikate (siehe `build_range_predicates`); Dateien, deren Zone Maps sie nicht
+            erfüllen können, werden nicht gelesen.
+
+    Yields:
+        tuple: Dateinummer, Dateipfad und die Treffer dieser Datei (`ResultTable`).
+    """
+    futures = {}
+    executor = None
+    pending = None
+    try:
+        skip_files = set(skip_files)
+        headers = {}
+        file_numbers = {}
+        for number, file_path in enumerate(list_txt_files(extract_dir, corpora)):
+            if number in skip_files:
+                continue
+            file_path = os.path.abspath(file_path)
+            if tables is not None and table_name_for(file_path) not in tables:
+                yield number, file_path, ResultTable()
+                continue
+            try:
+                header = read_header(file_path)
+            except Exception as e:
+                app.logger.error("Error reading header of file %s: %s", file_path, e)
+                yield number, file_path, ResultTable(error=str(e))
+                continue
+            if not supports_predicates(header, list(predicates) + [(column, None) for column, *_ in ranges]):
+                # Tabellen ohne passende Spalten können keine Treffer enthalten
+                yield number, file_path, ResultTable()
+                continue
+            if ranges:
+                table = open_source_columnar(file_path)
+                if table is not None and not table.may_match(ranges):
+                    # Laut Zone Maps liegt kein Wert der Datei im abgefragten Bereich
+                    yield number, file_path, ResultTable()
+                    continue
+            headers[file_path] = header
+            file_numbers[file_path] = number
+
+        app.logger.debug("Structured search in %s tables with predicates: %s", len(headers), predicates)
+        # Noch nicht gelieferte Dateien (werden bei einem Fehler als fehlgeschlagen gemeldet)
+        pending = dict.fromkeys(headers)
+        exact_predicates, fuzzy_predicates = split_fuzzy_predicates(predicates, fuzzy)
+
+        with timed('index'):
+            index = SearchIndex(index_path or index_path_for(extract_dir))
+            covered = index.covered_files(list(headers))
+            candidate_rows = {file_path: None for file_path in headers}
+            candidate_counts = {file_path: {} for file_path in headers}
+            if covered:
+                file_paths = {file_id: file_path for file_path, file_id in covered.items()}
+                for predicate in predicates:
+                    column, value = predicate
+                    if not tokenize(value):
+                        continue
+                    positions = None if column is None else {
+                        file_id: headers[file_path].index(column) for file_id, file_path in file_paths.items()}
+                    hits = index.candidate_rows(value, covered.values(), columns=positions)
+                    if predicate in fuzzy_predicates:
+                        # Unscharfe Treffer kommen zu den Kandidaten der exakten Suche hinzu
+                        fuzzy_hits = index.fuzzy_rows(value, covered.values(), positions)
+                        hits = {file_id: set(hits.get(file_id, ())) | set(fuzzy_hits.get(file_id, ()))
+                                for file_id in set(hits) | set(fuzzy_hits)}
+                    for file_id, file_path in file_paths.items():
+                        rows = set(hits.get(file_id, ()))
+                        candidate_counts[file_path][predicate] = len(rows)
+                        previous = candidate_rows[file_path]
+                        candidate_rows[file_path] = rows if previous is None else previous & rows
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        for file_path in headers:
+            rows = candidate_rows[file_path]
+            if rows is not None and not rows:
+                del pending[file_path]
+                yield file_numbers[file_path], file_path, ResultTable()
+                continue
+            rows = None if rows is None else np.array(sorted(rows), dtype=np.int64)
+            futures[submit(executor, search_file_structured, file_path, exact_predicates, app, index,
+                           covered.get(file_path), rows, candidate_counts[file_path], fuzzy_predicates,
+                           ranges)] = file_path
+
+        for future in as_completed(futures):
+            file_results = future.result()
+            file_path = futures[future]
+            del pending[file_path]
+            yield file_numbers[file_path], file_path, file_results
+    except Exception as e:
+        with app.app_context():
+            app.logger.error("Error in structured search: %s", e)
+        if pending is None:
+            raise
+        # Nicht durchsuchte Dateien als fehlgeschlagen melden, damit die Antwort als unvollständig erkennbar ist
+        for file_path in list(pending):
+            yield file_numbers[file_path], file_path, ResultTable(error=str(e))
+    finally:
+        for future in futures:
+            future.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False)
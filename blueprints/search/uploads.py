@@ -0,0 +1,596 @@
+"""
+Wiederaufnehmbare Uploads großer Dateien in Teilstücken (Chunks).
+
+Ein Upload wird angelegt (`create_upload`), danach werden die Chunks in beliebiger Reihenfolge und auch parallel mit
+ihrem Byte-Bereich übertragen (`write_chunk`) und zum Schluss abgeschlossen (`finalize_upload`). Jeder Chunk wird
+direkt aus dem Request-Strom mit positionellen Schreibzugriffen (`os.pwrite`) an seine Stelle in einer vorab
+angelegten Datei geschrieben; es wird nichts im Speicher gepuffert. Die empfangenen Bereiche stehen im Zustand des
+Uploads (`upload.json`), sodass ein abgebrochener Upload mit den fehlenden Bereichen fortgesetzt werden kann.
+
+Die Prüfsumme (CRC-32 wie im Manifest) wird während der Übertragung berechnet: Chunks, die an der bisher geprüften
+Position beginnen, werden beim Schreiben mitgerechnet; vorzeitig eingetroffene Chunks werden nachgelesen, sobald die
+Lücke davor geschlossen ist. Da der Zustand von CRC-32 eine einzige Zahl ist, überlebt er auch Unterbrechungen.
+
+Sobald das Ende der Datei eingetroffen ist, wird das zentrale Verzeichnis des ZIP-Archivs gelesen (auch wenn der Rest
+der Datei noch fehlt): ungültige Archive werden so früh erkannt, und die Members sind schon vor dem Abschluss bekannt.
+
+Jeder Upload hat eine eigene Sperre; sie schützt nur das Lesen und Schreiben seines Zustands. Das Nachlesen für die
+Prüfsumme und das Lesen des zentralen Verzeichnisses laufen außerhalb der Sperre. Solange Chunks geschrieben werden,
+kann der Upload nicht abgeschlossen werden, und nach dem Abschluss werden keine Chunks mehr angenommen.
+
+Die Uploads liegen als `chunked/<ID>` unterhalb des Upload-Verzeichnisses.
+"""
+
+import json
+import os
+import re
+import shutil
+import struct
+import threading
+import time
+import uuid
+import zipfile
+import zlib
+
+from werkzeug.utils import secure_filename
+
+from .manifest import HASH_BUFFER_BYTES, format_hash
+
+CHUNKED_DIRNAME = 'chunked'
+UPLOAD_META_FILENAME = 'upload.json'
+DATA_FILENAME = 'data.part'
+
+# Erlaubte Upload-IDs (verhindert Pfade außerhalb des Upload-Verzeichnisses)
+UPLOAD_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+# Maximale Länge des Kommentars am Ende einer ZIP-Datei (bestimmt, wie weit nach dem Endsatz gesucht wird)
+MAX_ZIP_COMMENT_BYTES = 0xFFFF
+
+_uploads_lock = threading.Lock()
+# Sperren und Anzahl laufender Schreibzugriffe pro Upload-ID
+_upload_locks = {}
+_active_writers = {}
+
+
+class UnknownUploadError(Exception):
+    """
+    Eine angefragte Upload-ID ist ungültig oder existiert nicht.
+    """
+
+
+class IncompleteUploadError(Exception):
+    """
+    Ein Upload soll abgeschlossen werden, obwohl noch Bereiche der Datei fehlen.
+    """
+
+    def __init__(self, missing):
+        super().__init__(f"Missing byte ranges: {missing}")
+        self.missing = missing
+
+
+class UploadConflictError(Exception):
+    """
+    Ein Chunk trifft für einen bereits abgeschlossenen Upload ein, oder ein Upload soll abgeschlossen werden, während
+    noch Chunks geschrieben werden.
+    """
+
+
+def upload_lock(upload_id):
+    """
+    Gibt die Sperre eines Uploads zurück (wiedereintrittsfähig, damit ein Aufrufer den Abschluss und das Einstellen
+    des Jobs gemeinsam sperren kann).
+
+    Args:
+        upload_id (str): Die Upload-ID.
+
+    Returns:
+        threading.RLock: Die Sperre.
+    """
+    with _uploads_lock:
+        return _upload_locks.setdefault(upload_id, threading.RLock())
+
+
+def upload_dir_for(upload_root, upload_id):
+    """
+    Gibt das Verzeichnis eines Uploads zurück.
+
+    Args:
+        upload_root (str): Das Upload-Verzeichnis.
+        upload_id (str): Die Upload-ID.
+
+    Returns:
+        str: Der Pfad zum Verzeichnis des Uploads.
+
+    Raises:
+        UnknownUploadError: Wenn die ID ungültige Zeichen enthält.
+    """
+    if not UPLOAD_ID_PATTERN.match(upload_id or ''):
+        raise UnknownUploadError(f"Invalid upload id: {upload_id!r}")
+    return os.path.join(upload_root, CHUNKED_DIRNAME, upload_id)
+
+
+def read_upload(upload_root, upload_id):
+    """
+    Liest den Zustand eines Uploads.
+
+    Args:
+        upload_root (str): Das Upload-Verzeichnis.
+        upload_id (str): Die Upload-ID.
+
+    Returns:
+        dict: Der Zustand des Uploads.
+
+    Raises:
+        UnknownUploadError: Wenn der Upload nicht existiert.
+    """
+    try:
+        with open(os.path.join(upload_dir_for(upload_root, upload_id), UPLOAD_META_FILENAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        raise UnknownUploadError(f"Unknown upload: {upload_id}")
+
+
+def write_upload(upload_root, meta):
+    """
+    Schreibt den Zustand eines Uploads.
+
+    Args:
+        upload_root (str): Das Upload-Verzeichnis.
+        meta (dict): Der Zustand (mit `id`).
+    """
+    meta['updated'] = time.time()
+    path = os.path.join(upload_dir_for(upload_root, meta['id']), UPLOAD_META_FILENAME)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(meta, f)
+    os.replace(path + '.tmp', path)
+
+
+def add_range(ranges, start, end):
+    """
+    Fügt einen Byte-Bereich zu einer Liste empfangener Bereiche hinzu und fasst angrenzende Bereiche zusammen.
+
+    Args:
+        ranges (list): Die sortierten, disjunkten Bereiche als Paare [Start, Ende).
+        start (int): Der Beginn des neuen Bereichs.
+        end (int): Das Ende (exklusiv) des neuen Bereichs.
+
+    Returns:
+        list: Die zusammengefassten Bereiche.
+    """
+    merged = []
+    for range_start, range_end in sorted(ranges + [[start, end]]):
+        if range_end <= range_start:
+            continue
+        if merged and range_start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], range_end)
+        else:
+            merged.append([range_start, range_end])
+    return merged
+
+
+def missing_ranges(ranges, size):
+    """
+    Bestimmt die noch fehlenden Byte-Bereiche einer Datei.
+
+    Args:
+        ranges (list): Die empfangenen Bereiche (siehe `add_range`).
+        size (int): Die Größe der Datei.
+
+    Returns:
+        list: Die fehlenden Bereiche als Paare [Start, Ende).
+    """
+    missing = []
+    position = 0
+    for start, end in ranges:
+        if start > position:
+            missing.append([position, start])
+        position = max(position, end)
+    if position < size:
+        missing.append([position, size])
+    return missing
+
+
+def covers(ranges, start, end):
+    """
+    Prüft, ob ein Byte-Bereich vollständig empfangen wurde.
+
+    Args:
+        ranges (list): Die empfangenen Bereiche (siehe `add_range`).
+        start (int): Der Beginn des Bereichs.
+        end (int): Das Ende (exklusiv) des Bereichs.
+
+    Returns:
+        bool: True, wenn der Bereich in einem empfangenen Bereich liegt.
+    """
+    return start >= end or any(range_start <= start and end <= range_end for range_start, range_end in ranges)
+
+
+def expire_uploads(upload_root, max_age_seconds, now=None, keep_corpora=()):
+    """
+    Entfernt Uploads, die länger als `max_age_seconds` nicht mehr verändert wurden.
+
+    Nicht abgeschlossene Uploads haben so lange keinen Chunk mehr erhalten; abgeschlossene sind bis dahin längst
+    eingelesen. Ausgenommen sind abgeschlossene Uploads, deren Archiv direkt durchsucht wird (`in_place`), solange ihr
+    Korpus noch existiert.
+
+    Args:
+        upload_root (str): Das Upload-Verzeichnis.
+        max_age_seconds (float): Das maximale Alter (None: unbegrenzt).
+        now (float): Der Bezugszeitpunkt (Standard: aktuelle Zeit).
+        keep_corpora (collections.abc.Container): Die IDs der bestehenden Korpora.
+
+    Returns:
+        list: Die IDs der entfernten Uploads.
+    """
+    chunked_dir = os.path.join(upload_root, CHUNKED_DIRNAME)
+    if max_age_seconds is None or not os.path.isdir(chunked_dir):
+        return []
+    now = time.time() if now is None else now
+    expired = []
+    for upload_id in os.listdir(chunked_dir):
+        try:
+            meta = read_upload(upload_root, upload_id)
+        except UnknownUploadError:
+            continue
+        if meta.get('in_place') and meta.get('corpus_id') in keep_corpora:
+            continue
+        if now - meta['updated'] > max_age_seconds:
+            remove_upload(upload_root, upload_id)
+            expired.append(upload_id)
+    return expired
+
+
+def create_upload(upload_root, filename, size, max_bytes=None):
+    """
+    Legt einen Upload an und reserviert die Zieldatei in voller Größe (als Sparse-Datei, ohne Daten zu schreiben).
+
+    Args:
+        upload_root (str): Das Upload-Verzeichnis.
+        filename (str): Der Dateiname der hochgeladenen Datei.
+        size (int): Die Größe der Datei in Bytes.
+        max_bytes (int): Die maximal erlaubte Größe (None: unbegrenzt).
+
+    Returns:
+        dict: Der Zustand des Uploads.
+
+    Raises:
+        ValueError: Wenn Dateiname oder Größe ungültig sind.
+    """
+    filename = secure_filename(filename or '')
+    if not filename:
+        raise ValueError("Invalid file name")
+    if size < 0 or (max_bytes is not None and size > max_bytes):
+        raise ValueError(f"Invalid file size: {size}")
+    meta = {'id': uuid.uuid4().hex[:16], 'filename': filename, 'size': size, 'created': time.time(),
+            'received': [], 'hashed': 0, 'crc': 0, 'archive': None, 'finalized': False}
+    directory = upload_dir_for(upload_root, meta['id'])
+    os.makedirs(directory)
+    with open(os.path.join(directory, DATA_FILENAME), 'wb') as f:
+        f.truncate(size)
+    with upload_lock(meta['id']):
+        write_upload(upload_root, meta)
+    return meta
+
+
+def write_chunk(upload_root, upload_id, start, length, stream, buffer_bytes=HASH_BUFFER_BYTES, total=None):
+    """
+    Schreibt einen Chunk aus einem Strom an seine Position in der Zieldatei.
+
+    Mehrere Chunks desselben Uploads dürfen gleichzeitig geschrieben werden; nur die Aktualisierung des Zustands ist
+    gesperrt. Bricht der Strom ab, wird der bereits geschriebene Teil trotzdem als empfangen vermerkt.
+
+    Args:
+        upload_root (str): Das Upload-Verzeichnis.
+        upload_id (str): Die Upload-ID.
+        start (int): Die Position des ersten Bytes des Chunks.
+        length (int): Die Länge des Chunks.
+        stream (io.RawIOBase): Der Strom mit den Daten (z.B. `request.stream`).
+        buffer_bytes (int): Die Größe der einzelnen Lese- und Schreibzugriffe.
+        total (int): Die vom Client angegebene Größe der ganzen Datei (None: nicht angegeben).
+
+    Returns:
+        dict: Der aktualisierte Zustand des Uploads.
+
+    Raises:
+        UnknownUploadError: Wenn der Upload nicht existiert.
+        UploadConflictError: Wenn der Upload bereits abgeschlossen ist.
+        ValueError: Wenn die Größe nicht übereinstimmt, der Bereich außerhalb der Datei liegt oder der Strom vorzeitig
+            endet.
+    """
+    lock = upload_lock(upload_id)
+    with lock:
+        meta = read_upload(upload_root, upload_id)
+        if meta['finalized']:
+            raise UploadConflictError("Upload is already finalized")
+        if total is not None and total != meta['size']:
+            raise ValueError(f"Total size {total} does not match file size {meta['size']}")
+        if start < 0 or length < 0 or start + length > meta['size']:
+            raise ValueError(f"Range {start}-{start + length} outside of file size {meta['size']}")
+        # Solange geschrieben wird, kann der Upload nicht abgeschlossen werden (siehe `finalize_upload`)
+        _active_writers[upload_id] = _active_writers.get(upload_id, 0) + 1
+
+    # Beginnt der Chunk an der bisher geprüften Position, wird die Prüfsumme beim Schreiben mitgerechnet
+    hashing = start == meta['hashed']
+    crc = meta['crc']
+    data_path = os.path.join(upload_dir_for(upload_root, upload_id), DATA_FILENAME)
+    position = start
+    try:
+        fd = os.open(data_path, os.O_WRONLY)
+        try:
+            while position < start + length:
+                block = stream.read(min(buffer_bytes, start + length - position))
+                if not block:
+                    break
+                if hashing:
+                    crc = zlib.crc32(block, crc)
+                view = memoryview(block)
+                while view:
+                    written = os.pwrite(fd, view, position)
+                    view = view[written:]
+                    position += written
+        finally:
+            os.close(fd)
+    finally:
+        with lock:
+            _active_writers[upload_id] -= 1
+            if not _active_writers[upload_id]:
+                del _active_writers[upload_id]
+            meta = read_upload(upload_root, upload_id)
+            meta['received'] = add_range(meta['received'], start, position)
+            if hashing and meta['hashed'] == start:
+                meta['hashed'] = position
+                meta['crc'] = crc
+            write_upload(upload_root, meta)
+    meta = catch_up(upload_root, upload_id, meta, data_path)
+    if position < start + length:
+        raise ValueError(f"Chunk ended after {position - start} of {length} bytes")
+    return meta
+
+
+def catch_up(upload_root, upload_id, meta, data_path):
+    """
+    Rechnet die Prüfsumme über vorzeitig eingetroffene Chunks weiter und liest das zentrale Verzeichnis, sobald das
+    Ende der Datei da ist. Gelesen wird ohne Sperre; übernommen werden die Ergebnisse nur, wenn kein gleichzeitiger
+    Aufruf schon weiter gekommen ist.
+
+    Args:
+        upload_root (str): Das Upload-Verzeichnis.
+        upload_id (str): Die Upload-ID.
+        meta (dict): Der zuletzt geschriebene Zustand des Uploads.
+        data_path (str): Der Pfad der Zieldatei.
+
+    Returns:
+        dict: Der aktualisierte Zustand des Uploads.
+    """
+    checked = dict(meta)
+    advance_hash(checked, data_path)
+    # Sobald das Ende der Datei da ist, das zentrale Verzeichnis lesen (ggf. erneut, bis es vollständig ist)
+    pending = meta['archive'] is None or meta['archive'].get('pending')
+    archive = None
+    if pending and meta['received'] and meta['received'][-1][1] == meta['size']:
+        archive = read_central_directory(meta, data_path)
+    if checked['hashed'] == meta['hashed'] and archive is None:
+        return meta
+
+    with upload_lock(upload_id):
+        meta = read_upload(upload_root, upload_id)
+        if checked['hashed'] > meta['hashed']:
+            meta['hashed'] = checked['hashed']
+            meta['crc'] = checked['crc']
+        if archive is not None and (meta['archive'] is None or meta['archive'].get('pending')):
+            meta['archive'] = archive
+        write_upload(upload_root, meta)
+    return meta
+
+
+def advance_hash(meta, data_path):
+    """
+    Rechnet die Prüfsumme über vorzeitig eingetroffene Chunks weiter, sobald sie an den geprüften Teil anschließen.
+
+    Args:
+        meta (dict): Der Zustand des Uploads (wird aktualisiert).
+        data_path (str): Der Pfad der Zieldatei.
+    """
+    end = next((range_end for range_start, range_end in meta['received']
+                if range_start <= meta['hashed'] < range_end), None)
+    if end is None:
+        return
+    crc = meta['crc']
+    with open(data_path, 'rb') as handle:
+        handle.seek(meta['hashed'])
+        remaining = end - meta['hashed']
+        while remaining > 0:
+            block = handle.read(min(HASH_BUFFER_BYTES, remaining))
+            if not block:
+                break
+            crc = zlib.crc32(block, crc)
+            remaining -= len(block)
+    meta['crc'] = crc
+    meta['hashed'] = end - remaining
+
+
+def locate_central_directory(meta, handle):
+    """
+    Sucht den Endsatz einer ZIP-Datei im empfangenen Ende der Datei und bestimmt die Lage des zentralen Verzeichnisses.
+
+    Args:
+        meta (dict): Der Zustand des Uploads.
+        handle (io.BufferedReader): Die geöffnete Zieldatei.
+
+    Returns:
+        tuple: Beginn und Ende (exklusiv) des zentralen Verzeichnisses oder None, wenn dafür noch Daten fehlen.
+
+    Raises:
+        zipfile.BadZipFile: Wenn die Datei keine ZIP-Datei ist.
+    """
+    size = meta['size']
+    received_start = next((start for start, end in meta['received'] if end == size), size)
+    search_start = max(0, size - zipfile.sizeEndCentDir - MAX_ZIP_COMMENT_BYTES)
+    # Nur das empfangene Ende lesen, höchstens so weit, wie der Endsatz samt Kommentar und ZIP64-Locator reicht
+    tail_start = max(received_start, search_start - zipfile.sizeEndCentDir64Locator, 0)
+    handle.seek(tail_start)
+    tail = handle.read(size - tail_start)
+    position = tail.rfind(zipfile.stringEndArchive)
+    while position >= 0 and len(tail) - position < zipfile.sizeEndCentDir:
+        position = tail.rfind(zipfile.stringEndArchive, 0, position)
+    if position < 0:
+        if received_start > search_start:
+            return None
+        raise zipfile.BadZipFile("File is not a zip file")
+
+    record = struct.unpack(zipfile.structEndArchive, tail[position:position + zipfile.sizeEndCentDir])
+    end_offset = tail_start + position
+    cd_size = record[5]
+    locator_start = position - zipfile.sizeEndCentDir64Locator
+    if locator_start >= 0 and tail[locator_start:locator_start + 4] == zipfile.stringEndArchive64Locator:
+        locator = struct.unpack(zipfile.structEndArchive64Locator, tail[locator_start:position])
+        record_start = locator[2]
+        if not covers(meta['received'], record_start, record_start + zipfile.sizeEndCentDir64):
+            return None
+        handle.seek(record_start)
+        record64 = struct.unpack(zipfile.structEndArchive64, handle.read(zipfile.sizeEndCentDir64))
+        end_offset = tail_start + locator_start - zipfile.sizeEndCentDir64
+        cd_size = record64[8]
+    elif locator_start < 0 and tail_start > 0:
+        # Der ZIP64-Locator könnte noch im fehlenden Teil liegen
+        return None
+    if cd_size > end_offset:
+        raise zipfile.BadZipFile("Truncated central directory")
+    return end_offset - cd_size, end_offset
+
+
+def read_central_directory(meta, data_path):
+    """
+    Liest das zentrale Verzeichnis einer (noch unvollständigen) ZIP-Datei, sobald sein Bereich empfangen wurde.
+
+    Args:
+        meta (dict): Der Zustand des Uploads.
+        data_path (str): Der Pfad der Zieldatei.
+
+    Returns:
+        dict: Die Members (Name, Größe, CRC-32), `pending`, wenn noch Daten fehlen, oder `error` bei einer
+        ungültigen Datei.
+    """
+    try:
+        with open(data_path, 'rb') as handle:
+            directory = locate_central_directory(meta, handle)
+            if directory is None or not covers(meta['received'], *directory):
+                return {'pending': True}
+            # ZipFile liest beim Öffnen nur den Endsatz und das zentrale Verzeichnis
+            with zipfile.ZipFile(handle) as zip_file:
+                members = [{'name': info.filename, 'size': info.file_size, 'crc': format_hash(info.CRC)}
+                           for info in zip_file.infolist() if not info.is_dir()]
+    except (zipfile.BadZipFile, struct.error, ValueError) as e:
+        return {'error': str(e)}
+    return {'members': members}
+
+
+def finalize_upload(upload_root, upload_id, expected_hash=None):
+    """
+    Schließt einen vollständig empfangenen Upload ab und benennt die Zieldatei nach der hochgeladenen Datei um.
+
+    Ein bereits abgeschlossener Upload wird nicht erneut geprüft; sein Zustand enthält nach `record_upload_job` den
+    dafür eingestellten Job.
+
+    Args:
+        upload_root (str): Das Upload-Verzeichnis.
+        upload_id (str): Die Upload-ID.
+        expected_hash (str): Optional die vom Client berechnete CRC-32-Prüfsumme (8-stellig hexadezimal).
+
+    Returns:
+        tuple: Der Pfad der fertigen Datei und der Zustand des Uploads.
+
+    Raises:
+        UnknownUploadError: Wenn der Upload nicht existiert.
+        IncompleteUploadError: Wenn noch Bereiche fehlen.
+        UploadConflictError: Wenn noch Chunks geschrieben werden.
+        ValueError: Wenn die Prüfsumme nicht übereinstimmt oder die Datei kein gültiges ZIP-Archiv ist.
+    """
+    directory = upload_dir_for(upload_root, upload_id)
+    with upload_lock(upload_id):
+        meta = read_upload(upload_root, upload_id)
+        path = os.path.join(directory, meta['filename'])
+        if meta['finalized']:
+            return path, meta
+        if _active_writers.get(upload_id):
+            raise UploadConflictError("Chunks are still being written")
+        missing = missing_ranges(meta['received'], meta['size'])
+        if missing:
+            raise IncompleteUploadError(missing)
+        digest = format_hash(meta['crc'])
+        if expected_hash and expected_hash.strip().lower() != digest:
+            raise ValueError(f"Checksum mismatch: expected {expected_hash}, received {digest}")
+        if meta['archive'] and meta['archive'].get('error'):
+            raise ValueError(f"Invalid archive: {meta['archive']['error']}")
+        os.replace(os.path.join(directory, DATA_FILENAME), path)
+        meta['finalized'] = True
+        write_upload(upload_root, meta)
+    return path, meta
+
+
+def record_upload_job(upload_root, upload_id, job_id, corpus_id, in_place=False):
+    """
+    Vermerkt den Job, der einen abgeschlossenen Upload einliest, damit ein wiederholter Abschluss keinen zweiten Job
+    (und keinen zweiten Korpus) anlegt.
+
+    Args:
+        upload_root (str): Das Upload-Verzeichnis.
+        upload_id (str): Die Upload-ID.
+        job_id (str): Die Job-ID.
+        corpus_id (str): Die ID des Korpus, in den eingelesen wird.
+        in_place (bool): Ob das Archiv direkt durchsucht wird (es bleibt dann bis zum Entfernen des Korpus erhalten).
+
+    Returns:
+        dict: Der aktualisierte Zustand des Uploads.
+    """
+    with upload_lock(upload_id):
+        meta = read_upload(upload_root, upload_id)
+        meta.update(job_id=job_id, corpus_id=corpus_id, in_place=in_place)
+        write_upload(upload_root, meta)
+    return meta
+
+
+def remove_upload(upload_root, upload_id):
+    """
+    Bricht einen Upload ab und löscht seine Daten.
+
+    Args:
+        upload_root (str): Das Upload-Verzeichnis.
+        upload_id (str): Die Upload-ID.
+
+    Raises:
+        UnknownUploadError: Wenn der Upload nicht existiert.
+    """
+    directory = upload_dir_for(upload_root, upload_id)
+    if not os.path.isdir(directory):
+        raise UnknownUploadError(f"Unknown upload: {upload_id}")
+    with upload_lock(upload_id):
+        shutil.rmtree(directory, ignore_errors=True)
+    with _uploads_lock:
+        _upload_locks.pop(upload_id, None)
+
+
+def upload_status(meta):
+    """
+    Fasst den Zustand eines Uploads für den Client zusammen.
+
+    Args:
+        meta (dict): Der Zustand des Uploads.
+
+    Returns:
+        dict: Upload-ID, Dateiname, Größe, empfangene und fehlende Bereiche, die Prüfsumme (sobald die ganze Datei
+        geprüft ist) und die Anzahl Members des Archivs (sobald das zentrale Verzeichnis gelesen ist).
+    """
+    archive = meta['archive'] or {}
+    return {
+        'upload_id': meta['id'],
+        'filename': meta['filename'],
+        'size': meta['size'],
+        'received_bytes': sum(end - start for start, end in meta['received']),
+        'missing': missing_ranges(meta['received'], meta['size']),
+        'hashed_bytes': meta['hashed'],
+        'crc32': format_hash(meta['crc']) if meta['hashed'] == meta['size'] else None,
+        'members': len(archive['members']) if 'members' in archive else None,
+        'archive_error': archive.get('error'),
+        'finalized': meta['finalized'],
+    }
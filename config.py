@@ -1,10 +1,63 @@
+import atexit
+import logging
 import os
+import queue
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
 
 class Config:
     # Geheime Schlüssel für Sicherheitsfunktionen
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'you-will-never-guess'
 
+    # Verzeichnis, in das hochgeladene Archive extrahiert und in dem gesucht wird
+    EXTRACT_FOLDER = 'temp_extracted'
+
+    # Anzahl paralleler Worker beim Entpacken (über alle ZIP-Dateien und deren Members hinweg)
+    EXTRACT_WORKERS = os.cpu_count() or 4
+
+    # Verzeichnis für hochgeladene Dateien
+    UPLOAD_FOLDER = 'uploads'
+
+    # Wiederaufnehmbare Uploads: empfohlene Chunk-Größe, maximale Dateigröße (die Datei wird beim Anlegen in voller
+    # Größe reserviert) und maximales Alter seit der letzten Änderung in Sekunden (danach werden ihre Daten entfernt,
+    # außer das Archiv wird direkt durchsucht; None: unbegrenzt)
+    UPLOAD_CHUNK_BYTES = 16 * 1024 * 1024  # 16MB
+    UPLOAD_MAX_BYTES = 64 * 1024 * 1024 * 1024  # 64GB
+    UPLOAD_MAX_AGE_SECONDS = 24 * 60 * 60
+
+    # Members direkt aus dem ZIP in den spaltenbasierten Cache streamen, ohne TXT-Dateien zu schreiben
+    EXTRACT_STREAM = False
+
+    # ZIP-Dateien nicht entpacken, sondern ihre TXT-Members direkt im Archiv durchsuchen (Read-in-place)
+    SEARCH_IN_PLACE = False
+
+    # Korpora (ein Namensraum pro Upload): maximales Alter in Sekunden und Speicherkontingent aller Korpora in Bytes;
+    # ältere bzw. die ältesten Korpora werden nach jedem Ingest entfernt (None: unbegrenzt)
+    CORPUS_MAX_AGE_SECONDS = None
+    CORPUS_MAX_BYTES = None
+
+    # Hintergrund-Jobs für Uploads: Anzahl Worker, maximale Anzahl offener Jobs (sonst HTTP 429) und Historie
+    JOB_WORKERS = 2
+    JOB_QUEUE_SIZE = 32
+    JOB_HISTORY_SIZE = 1000
+
+    # Speicherbudget pro Such-Worker: größere TXT-Dateien werden chunkweise gestreamt statt vollständig geladen
+    SEARCH_CHUNK_BYTES = 64 * 1024 * 1024  # 64MB
+
+    # Extrahierte TXT-Dateien beim Ingest in spaltenbasierte NumPy-Dateien umwandeln (kein Parsen mehr bei der Suche)
+    COLUMNAR_CACHE = True
+
+    # Backend für die parallele Dateisuche: 'thread' oder 'process' (umgeht das GIL bei CPU-lastiger Suche)
+    SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND') or 'thread'
+    SEARCH_PROCESS_WORKERS = os.cpu_count() or 4  # Anzahl Worker-Prozesse für das Prozess-Backend
+
+    # Maximale Anzahl Treffer pro Antwort; weitere Treffer werden über den zurückgegebenen Cursor abgerufen
+    SEARCH_MAX_RESULTS = 5000
+
+    # Größenbegrenzung des LRU-Caches für Suchergebnisse
+    RESULT_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 256MB insgesamt
+    RESULT_CACHE_MAX_ENTRY_BYTES = 32 * 1024 * 1024  # 32MB pro Suchanfrage
+
     # Log-Verzeichnis erstellen, falls es nicht existiert
     LOG_DIR = 'logs'
     if not os.path.exists(LOG_DIR):
@@ -70,8 +123,58 @@ class Config:
                 'level': 'ERROR',
                 'propagate': False,
             },
-        }
+            # Logger der Flask-Anwendung (`app.logger`); mit eigenen Handlern hängt Flask keinen StreamHandler an
+            'app': {
+                'handlers': ['detailed_file', 'important_file', 'error_file', 'console'],
+                'level': 'DEBUG',
+                'propagate': False,
+            },
+        },
+        # Diese Logger schreiben nicht selbst: ein QueueHandler stellt die Datensätze nur in eine Warteschlange, ein
+        # QueueListener-Thread übergibt sie an die oben konfigurierten Handler (Datei- und Konsolen-I/O erfolgt
+        # damit nicht mehr in den Request- und Such-Threads; siehe `configure_logging`)
+        'queue_loggers': ['detailed', 'important', 'errors', 'app'],
     }
 
+# Laufende QueueListener mit ihren Loggern
+_log_listeners = []
+
+def configure_logging(logging_config):
+    """
+    Wendet eine Logging-Konfiguration an und leitet die Logger aus `queue_loggers` über je einen QueueListener.
+
+    Bereits laufende Listener werden vorher gestoppt, damit keine Datensätze an geschlossene Handler gehen.
+
+    Args:
+        logging_config (dict): Die Konfiguration im Format von `logging.config.dictConfig`.
+    """
+    stop_log_listeners()
+    dictConfig(logging_config)
+    for name in logging_config.get('queue_loggers', ()):
+        logger = logging.getLogger(name)
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *logger.handlers, respect_handler_level=True)
+        logger.handlers = [QueueHandler(log_queue)]
+        listener.start()
+        _log_listeners.append((logger, listener))
+
+def stop_log_listeners():
+    """
+    Stoppt alle QueueListener (noch wartende Datensätze werden geschrieben) und hängt die Handler wieder direkt an.
+    """
+    while _log_listeners:
+        logger, listener = _log_listeners.pop()
+        listener.stop()
+        logger.handlers = list(listener.handlers)
+
+def _restore_handlers_in_child():
+    # Nach einem fork (z.B. Prozess-Pool der Suche) läuft kein Listener-Thread mit; Worker schreiben wieder direkt
+    for logger, listener in _log_listeners:
+        logger.handlers = list(listener.handlers)
+    _log_listeners.clear()
+
+os.register_at_fork(after_in_child=_restore_handlers_in_child)
+atexit.register(stop_log_listeners)
+
 # Logging-Konfiguration anwenden
-dictConfig(Config.LOGGING)
+configure_logging(Config.LOGGING)
@@ -157,12 +157,12 @@ def search():
     results = None
     if request.method == 'POST':
         query = request.form['query']
-        current_app.logger.info(f'Search query received: {query}')
+        current_app.logger.info('Search query received: %s', query)
         # Hier können Sie die Suchlogik hinzufügen, um die SIARD-Datei zu durchsuchen
         # Zum Beispiel:
         # results = search_siard_file(query)
         results = ["Example result 1", "Example result 2"]  # Dummy-Daten
-        current_app.logger.info(f'Search results: {results}')
+        current_app.logger.info('Search results: %s', results)
     return render_template('index.html', results=results)
 """
 
@@ -0,0 +1,66 @@
+"""
+Benchmark der Such-Engines in `blueprints.search.analysis`.
+
+Erzeugt mit dem Generator aus `tests/test.py` TXT-Dateien für alle erwarteten Schemas und misst den Durchsatz
+(Zeilen pro Sekunde) der zeilenweisen und der vektorisierten Suche auf denselben DataFrames.
+
+Aufruf:
+    python -m tests.bench_matching --rows 2000 --query meier
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from blueprints.search.analysis import MATCH_ENGINES, filter_matches
+from tests.test import EXPECTED_SCHEMAS, create_txt_file
+
+
+def generate_frames(directory, num_rows):
+    frames = []
+    for name, schema in EXPECTED_SCHEMAS.items():
+        file_path = os.path.join(directory, f"{name}.txt")
+        create_txt_file(file_path, schema, num_rows)
+        frames.append(pd.read_csv(file_path, sep="\t"))
+    return frames
+
+
+def run_benchmark(frames, query, repeat):
+    total_rows = sum(len(df) for df in frames) * repeat
+    report = {}
+    for engine in MATCH_ENGINES:
+        hits = 0
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for df in frames:
+                hits += len(filter_matches(df, query.lower(), engine=engine))
+        elapsed = time.perf_counter() - start
+        report[engine] = {
+            "seconds": round(elapsed, 4),
+            "rows_per_second": round(total_rows / elapsed),
+            "hits": hits // repeat,
+        }
+    report["speedup"] = round(report["rowwise"]["seconds"] / report["vectorized"]["seconds"], 1)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Such-Engines")
+    parser.add_argument("--rows", type=int, default=1000, help="Zeilen pro generierter Datei")
+    parser.add_argument("--query", default="an", help="Suchbegriff")
+    parser.add_argument("--repeat", type=int, default=3, help="Anzahl Wiederholungen")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        frames = generate_frames(directory, args.rows)
+        report = run_benchmark(frames, args.query, args.repeat)
+    report["rows"] = sum(len(df) for df in frames)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+"""
+Reproduzierbarer Benchmark für Ingest und Suche über die HTTP-Endpunkte.
+
+Erzeugt mit dem Generator aus `tests/test.py` (oder dem schnellen Generator aus `tests/bulk_generator.py`) synthetische
+SIARD-Lieferungen in einstellbarer Größe (Zeilen pro Datei, Dateien pro ZIP, Anzahl ZIPs) in einem temporären
+Verzeichnis und misst über den Flask-Test-Client:
+
+- Upload (`/upload`, eine ZIP-Datei pro Anfrage) und die Verarbeitungsschritte des Ingest-Jobs (Extraktion,
+  spaltenbasierter Cache, Schema-Analyse, Index) aus der Zeitmessung des Jobs
+- `/search` und `/detailed_search` mit Suchbegriffen aus den erzeugten Daten
+- Antwortgröße und Serialisierungszeit des bisherigen und des kompakten Antwortformats (`format=compact`)
+
+Ausgegeben werden p50/p95/p99-Latenzen, Zeilen pro Sekunde und der maximale Speicherbedarf (Peak RSS) als JSON,
+damit Messungen verschiedener Stände miteinander verglichen werden können.
+
+Aufruf:
+    python -m tests.benchmark --rows 1000 --files 5 --zips 12 --repeat 20 --output bench.json
+    python -m tests.benchmark --generator bulk --rows 1000000 --files 10 --zips 12 --repeat 5
+"""
+
+import argparse
+import io
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from app import create_app
+from blueprints.search.cache import get_result_cache
+from blueprints.search.jobs import get_job_queue
+from tests.bulk_generator import create_bulk_zip_files
+from tests.test import EXPECTED_SCHEMAS, create_large_zip
+
+# Maximale Wartezeit auf einen Ingest-Job in Sekunden
+JOB_TIMEOUT_SECONDS = 3600
+
+
+def peak_rss_mb():
+    """
+    Gibt den bisher maximalen Speicherbedarf (Resident Set Size) des Prozesses in MB zurück.
+
+    Returns:
+        float: Der Peak RSS in MB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux meldet Kilobytes, macOS Bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def latency_stats(seconds):
+    """
+    Fasst gemessene Latenzen zusammen.
+
+    Args:
+        seconds (list): Die Latenzen in Sekunden.
+
+    Returns:
+        dict: Anzahl, p50/p95/p99, Mittelwert und Maximum in Millisekunden.
+    """
+    if not seconds:
+        return {'count': 0}
+    millis = np.array(seconds) * 1000
+    p50, p95, p99 = np.percentile(millis, [50, 95, 99])
+    return {
+        'count': len(seconds),
+        'p50_ms': round(float(p50), 2),
+        'p95_ms': round(float(p95), 2),
+        'p99_ms': round(float(p99), 2),
+        'mean_ms': round(float(millis.mean()), 2),
+        'max_ms': round(float(millis.max()), 2),
+    }
+
+
+def generate_corpus(directory, num_rows, num_files, num_zips, generator='faker'):
+    """
+    Erzeugt `num_zips` ZIP-Dateien mit je `num_files` TXT-Dateien; die Schemas werden der Reihe nach verwendet.
+
+    Gibt es mehr ZIP-Dateien als Schemas, werden weitere Lieferungen in eigenen Unterverzeichnissen angelegt, damit
+    die Dateinamen (und damit die Tabellennamen) denen echter Lieferungen entsprechen.
+
+    Args:
+        directory (str): Das Zielverzeichnis.
+        num_rows (int): Zeilen pro TXT-Datei.
+        num_files (int): TXT-Dateien pro ZIP.
+        num_zips (int): Anzahl ZIP-Dateien.
+        generator (str): 'faker' (Generator aus `tests/test.py`) oder 'bulk' (schneller, referenziell konsistenter
+            Generator aus `tests/bulk_generator.py`, eine Lieferung mit eigenem Seed pro Unterverzeichnis).
+
+    Returns:
+        list: Die Pfade der erzeugten ZIP-Dateien.
+    """
+    names = list(EXPECTED_SCHEMAS)
+    zip_paths = []
+    for number in range(num_zips):
+        delivery, position = divmod(number, len(names))
+        name = names[position]
+        delivery_dir = os.path.join(directory, f"delivery_{delivery + 1}")
+        zip_path = os.path.join(delivery_dir, f"{name}.zip")
+        if generator == 'bulk':
+            if position == 0:
+                count = min(len(names), num_zips - number)
+                create_bulk_zip_files(delivery_dir, {table: EXPECTED_SCHEMAS[table] for table in names[:count]},
+                                      num_rows_per_file=num_rows, num_txt_files_per_zip=num_files, seed=delivery)
+        else:
+            create_large_zip(zip_path, EXPECTED_SCHEMAS[name], num_rows=num_rows, num_txt_files=num_files)
+        zip_paths.append(zip_path)
+    return zip_paths
+
+
+def pick_search_terms(zip_paths):
+    """
+    Wählt Suchbegriffe aus den erzeugten Daten, damit die Suchen tatsächlich Treffer liefern.
+
+    Args:
+        zip_paths (list): Die erzeugten ZIP-Dateien.
+
+    Returns:
+        dict: Ein Nachname und ein Vorname aus der ersten Personen-Tabelle (oder Ersatzwerte).
+    """
+    for zip_path in zip_paths:
+        if os.path.basename(zip_path) != 'Person.zip':
+            continue
+        with zipfile.ZipFile(zip_path) as zip_file:
+            with zip_file.open(zip_file.namelist()[0]) as member:
+                df = pd.read_csv(member, sep="\t", nrows=1)
+        return {'last_name': str(df['Name'].iloc[0]), 'first_name': str(df['Vorname'].iloc[0])}
+    return {'last_name': 'an', 'first_name': 'an'}
+
+
+def ingest(client, app, zip_paths):
+    """
+    Lädt alle ZIP-Dateien einzeln über `/upload` hoch (ein Korpus pro Lieferung) und wartet jeweils auf den Job.
+
+    Args:
+        client (flask.testing.FlaskClient): Der Test-Client.
+        app (Flask): Die Flask-Anwendung.
+        zip_paths (list): Die hochzuladenden ZIP-Dateien.
+
+    Returns:
+        dict: Upload-Latenzen, Ingest-Dauer pro ZIP und aufsummierte Dauer der Verarbeitungsschritte.
+    """
+    upload_seconds = []
+    job_seconds = []
+    steps = {}
+    corpora = {}
+    for zip_path in zip_paths:
+        delivery = os.path.dirname(zip_path)
+        with open(zip_path, 'rb') as f:
+            data = {'file': (io.BytesIO(f.read()), os.path.basename(zip_path))}
+        if delivery in corpora:
+            data['corpus'] = corpora[delivery]
+        start = time.perf_counter()
+        response = client.post('/upload', data=data, content_type='multipart/form-data')
+        upload_seconds.append(time.perf_counter() - start)
+        if response.status_code != 202:
+            raise RuntimeError(f"Upload of {zip_path} failed: {response.status_code} {response.get_json()}")
+        corpora[delivery] = response.get_json()['corpus_id']
+
+        job = get_job_queue(app).get(response.get_json()['job_id'])
+        if not job.wait(JOB_TIMEOUT_SECONDS) or job.error:
+            raise RuntimeError(f"Ingest of {zip_path} failed: {job.error}")
+        info = job.to_dict()
+        job_seconds.append(info['timing']['run_seconds'])
+        for step, seconds in info['timing']['steps'].items():
+            steps[step] = round(steps.get(step, 0.0) + seconds, 3)
+    return {'corpora': list(corpora.values()), 'upload': upload_seconds, 'jobs': job_seconds, 'steps': steps}
+
+
+def time_queries(client, app, endpoint, forms, repeat, cached=False):
+    """
+    Misst die Latenz eines Such-Endpunkts.
+
+    Args:
+        client (flask.testing.FlaskClient): Der Test-Client.
+        app (Flask): Die Flask-Anwendung.
+        endpoint (str): Der Endpunkt (z.B. '/search').
+        forms (list): Die Formulardaten der Anfragen.
+        repeat (int): Anzahl Wiederholungen jeder Anfrage.
+        cached (bool): Den Ergebnis-Cache zwischen den Anfragen nicht leeren.
+
+    Returns:
+        tuple: Die Latenzen in Sekunden und die Anzahl Treffer der letzten Wiederholung.
+    """
+    seconds = []
+    hits = 0
+    for _ in range(repeat):
+        hits = 0
+        for form in forms:
+            if not cached:
+                get_result_cache(app).clear()
+            start = time.perf_counter()
+            response = client.post(endpoint, data=form)
+            results = response.get_json()['results']
+            seconds.append(time.perf_counter() - start)
+            hits += len(results)
+    return seconds, hits
+
+
+def server_timing(response, name):
+    """
+    Liest die Dauer eines Abschnitts aus dem `Server-Timing`-Header einer Antwort.
+
+    Args:
+        response (flask.Response): Die Antwort.
+        name (str): Der Abschnitt (z.B. 'serialize').
+
+    Returns:
+        float: Die Dauer in Millisekunden (0, wenn der Abschnitt fehlt).
+    """
+    for entry in response.headers.get('Server-Timing', '').split(','):
+        parts = entry.strip().split(';')
+        if parts[0] == name:
+            return sum(float(part[4:]) for part in parts[1:] if part.startswith('dur='))
+    return 0.0
+
+
+def compare_wire_formats(client, endpoint, forms, repeat, limit):
+    """
+    Vergleicht Antwortgröße und Serialisierungszeit des bisherigen und des kompakten Antwortformats.
+
+    Die Serialisierungszeit stammt aus dem `Server-Timing`-Header (Aufbau der Treffer in den Workern und Kodierung
+    der Antwort); die Latenz enthält auch die Suche selbst.
+
+    Args:
+        client (flask.testing.FlaskClient): Der Test-Client.
+        endpoint (str): Der Endpunkt (z.B. '/search').
+        forms (list): Die Formulardaten der Anfragen.
+        repeat (int): Anzahl Wiederholungen jeder Anfrage.
+        limit (int): Die maximale Anzahl Treffer pro Antwort.
+
+    Returns:
+        dict: Pro Format die Antwortgröße in Bytes, die Serialisierungszeit (Server-Timing) und die Latenz.
+    """
+    report = {}
+    for name, extra in (('json', {}), ('compact', {'format': 'compact'})):
+        payload_bytes = 0
+        serialize_ms = []
+        seconds = []
+        for _ in range(repeat):
+            payload_bytes = 0
+            for form in forms:
+                start = time.perf_counter()
+                response = client.post(endpoint, data=dict(form, limit=limit, **extra))
+                seconds.append(time.perf_counter() - start)
+                payload_bytes += len(response.get_data())
+                serialize_ms.append(server_timing(response, 'serialize'))
+        report[name] = dict(latency_stats(seconds), bytes=payload_bytes,
+                            serialize_ms=round(float(np.mean(serialize_ms)), 3) if serialize_ms else None)
+    if report['json']['bytes']:
+        report['compact_size_ratio'] = round(report['compact']['bytes'] / report['json']['bytes'], 3)
+    return report
+
+
+def run_benchmark(directory, num_rows=100, num_files=5, num_zips=12, repeat=10, cached=False, generator='faker'):
+    """
+    Führt den vollständigen Benchmark in einem Arbeitsverzeichnis aus.
+
+    Args:
+        directory (str): Das (temporäre) Arbeitsverzeichnis.
+        num_rows (int): Zeilen pro TXT-Datei.
+        num_files (int): TXT-Dateien pro ZIP.
+        num_zips (int): Anzahl ZIP-Dateien.
+        repeat (int): Wiederholungen jeder Suchanfrage.
+        cached (bool): Suchanfragen mit Ergebnis-Cache messen (sonst wird er vor jeder Anfrage geleert).
+        generator (str): Der Datengenerator ('faker' oder 'bulk', siehe `generate_corpus`).
+
+    Returns:
+        dict: Der Bericht.
+    """
+    total_rows = num_rows * num_files * num_zips
+    report = {'scale': {'rows_per_file': num_rows, 'files_per_zip': num_files, 'zips': num_zips,
+                        'total_rows': total_rows, 'repeat': repeat, 'cached': cached,
+                        'generator': generator}}
+
+    start = time.perf_counter()
+    zip_paths = generate_corpus(os.path.join(directory, 'deliveries'), num_rows, num_files, num_zips,
+                                generator)
+    report['generate'] = {'seconds': round(time.perf_counter() - start, 3),
+                          'zip_bytes': sum(os.path.getsize(path) for path in zip_paths)}
+
+    app = create_app()
+    app.config['EXTRACT_FOLDER'] = os.path.join(directory, 'extracted')
+    client = app.test_client()
+
+    # Hochgeladene Dateien werden relativ zum Arbeitsverzeichnis gespeichert
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        start = time.perf_counter()
+        ingested = ingest(client, app, zip_paths)
+        ingest_seconds = time.perf_counter() - start
+        report['upload'] = latency_stats(ingested['upload'])
+        report['ingest'] = {
+            'seconds': round(ingest_seconds, 3),
+            'rows_per_s': round(total_rows / ingest_seconds) if ingest_seconds else None,
+            'job_latency': latency_stats(ingested['jobs']),
+            'steps': ingested['steps'],
+        }
+        report['peak_rss_mb_after_ingest'] = peak_rss_mb()
+
+        terms = pick_search_terms(zip_paths)
+        searches = [{'search_query': terms['last_name']}, {'search_query': terms['first_name']}]
+        detailed = [{'last_name': terms['last_name']},
+                    {'last_name': terms['last_name'], 'first_name': terms['first_name']}]
+        for name, endpoint, forms in (('search', '/search', searches),
+                                      ('detailed_search', '/detailed_search', detailed)):
+            seconds, hits = time_queries(client, app, endpoint, forms, repeat, cached)
+            report[name] = dict(latency_stats(seconds), hits=hits,
+                                rows_per_s=round(total_rows * len(seconds) / sum(seconds)) if sum(seconds) else None)
+        # Breite Anfragen (ein Buchstabe) liefern viele Treffer und zeigen den Unterschied der Formate
+        broad = [{'search_query': terms['last_name'][:1]}]
+        report['wire_format'] = compare_wire_formats(client, '/search', broad, repeat, app.config['SEARCH_MAX_RESULTS'])
+    finally:
+        os.chdir(cwd)
+
+    report['peak_rss_mb'] = peak_rss_mb()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für Ingest und Suche")
+    parser.add_argument("--rows", type=int, default=100, help="Zeilen pro TXT-Datei")
+    parser.add_argument("--files", type=int, default=5, help="TXT-Dateien pro ZIP")
+    parser.add_argument("--zips", type=int, default=len(EXPECTED_SCHEMAS), help="Anzahl ZIP-Dateien")
+    parser.add_argument("--repeat", type=int, default=10, help="Wiederholungen jeder Suchanfrage")
+    parser.add_argument("--cached", action="store_true", help="Ergebnis-Cache zwischen den Suchen nicht leeren")
+    parser.add_argument("--generator", choices=('faker', 'bulk'), default='faker',
+                        help="Datengenerator: 'faker' (tests/test.py) oder 'bulk' (schnell, für große Lasttests)")
+    parser.add_argument("--output", help="Bericht zusätzlich in diese JSON-Datei schreiben")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        report = run_benchmark(directory, args.rows, args.files, args.zips, args.repeat, args.cached,
+                               args.generator)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+"""
+Schneller Generator für große synthetische SIARD-Lieferungen (Lasttests).
+
+Im Gegensatz zu `create_txt_file` in `tests/test.py`, das jede Zelle mit einem eigenen Faker-Aufruf erzeugt, werden
+hier ganze Spalten vektorisiert aus vorab gezogenen Wertepools (Namen, Adressen, Wörter, ...) und NumPy-Zufallszahlen
+gebildet. Die Zeilen werden blockweise in Worker-Prozessen erzeugt und vom Hauptprozess in der richtigen Reihenfolge
+direkt in den ZIP-Member geschrieben, ohne Zwischendatei.
+
+Die Ausgabe ist bei gleichem Seed unabhängig von der Anzahl der Worker identisch: jeder Block hat einen eigenen,
+aus Seed, Tabelle, Datei und Blocknummer abgeleiteten Zufallsgenerator.
+
+Die Schlüsselspalten bleiben referenziell konsistent: Jeder Schlüssel gehört zu einem Schlüsselraum (`KEY_SPACES`).
+Die besitzende Tabelle (z.B. `Person` für `PIN`) vergibt jeden Schlüssel genau einmal, die übrigen Tabellen ziehen
+ihre Werte aus demselben Raum. Schlüssel werden als reine Funktion von Seed, Raum und Position berechnet, sodass die
+Worker dafür nichts austauschen müssen.
+
+Aufruf:
+    python -m tests.bulk_generator /tmp/siard --rows 1000000 --files 10 --seed 42
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from faker import Faker
+
+from tests.test import EXPECTED_SCHEMAS
+
+# Zeilen pro Block, der in einem Worker erzeugt und als Ganzes in den ZIP-Member geschrieben wird
+CHUNK_ROWS = 100_000
+
+# Größe der vorab gezogenen Wertepools
+POOL_SIZE = 10_000
+
+# Bezugsdatum für Datumsspalten (fest, damit die Ausgabe nur vom Seed abhängt)
+REFERENCE_DATE = date(2025, 1, 1)
+
+# Schlüsselräume: (Tabelle, Spalte) -> (Raum, besitzende Tabelle?)
+KEY_SPACES = {
+    ('Person', 'PIN'): ('person', True),
+    ('PersonHist', 'PIN'): ('person', False),
+    ('Ausweis', 'PIN'): ('person', False),
+    ('Fzausweis', 'PIN'): ('person', False),
+    ('Ausweis', 'ID'): ('ausweis', True),
+    ('Ausweishist', 'ID'): ('ausweis', False),
+    ('Ausweiskat', 'AUSWEISID'): ('ausweis', False),
+    ('Ausweiskat', 'ID'): ('ausweiskat', True),
+    ('Ausweiskathist', 'ID'): ('ausweiskat', False),
+    ('Fzausweis', 'ID'): ('fzausweis', True),
+    ('Fzausweishist', 'ID'): ('fzausweis', False),
+    ('Fzallgemein', 'STAMM'): ('fahrzeug', True),
+    ('FZ', 'STAMM'): ('fahrzeug', True),
+    ('Fzausweis', 'STAMM'): ('fahrzeug', False),
+    ('Fzallgemeinhist', 'STAMM'): ('fahrzeug', False),
+    ('Fzhist', 'STAMM'): ('fahrzeug', False),
+}
+
+# Schlüsselräume mit ganzzahligen Schlüsseln; alle anderen erhalten UUIDs wie im Faker-Generator
+INTEGER_SPACES = {'person'}
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+_pools = None
+
+
+def build_pools(seed, size=POOL_SIZE):
+    """
+    Zieht die Wertepools einmalig mit Faker.
+
+    Args:
+        seed (int): Der Seed für Faker.
+        size (int): Anzahl Werte pro Pool.
+
+    Returns:
+        dict: Pools als NumPy-Objekt-Arrays.
+    """
+    fake = Faker()
+    fake.seed_instance(seed)
+    pools = {
+        'last_name': [fake.last_name() for _ in range(size)],
+        'first_name': [fake.first_name() for _ in range(size)],
+        'word': [fake.word() for _ in range(size)],
+        'color': [fake.safe_color_name() for _ in range(size)],
+        'address': [fake.address().replace("\n", ", ") for _ in range(size)],
+        'letters2': [fake.bothify(text='??') for _ in range(size)],
+        'letters3': [fake.bothify(text='???') for _ in range(size)],
+    }
+    return {name: np.array(values, dtype=object) for name, values in pools.items()}
+
+
+def _init_worker(pools):
+    global _pools
+    _pools = pools
+
+
+def splitmix64(values):
+    """
+    Vektorisierte SplitMix64-Mischfunktion (bijektiv auf 64 Bit).
+
+    Args:
+        values (numpy.ndarray): Eingabewerte (uint64).
+
+    Returns:
+        numpy.ndarray: Die gemischten Werte (uint64).
+    """
+    with np.errstate(over='ignore'):
+        z = (values + np.uint64(0x9E3779B97F4A7C15)) & _MASK64
+        z = ((z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)) & _MASK64
+        z = ((z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)) & _MASK64
+        return z ^ (z >> np.uint64(31))
+
+
+def space_salt(seed, space):
+    """
+    Leitet einen stabilen 64-Bit-Wert aus Seed und Schlüsselraum ab (unabhängig von `PYTHONHASHSEED`).
+
+    Args:
+        seed (int): Der Seed.
+        space (str): Der Schlüsselraum.
+
+    Returns:
+        numpy.uint64: Der Wert.
+    """
+    salt = np.uint64(seed & 0xFFFFFFFFFFFFFFFF)
+    for byte in space.encode():
+        salt = splitmix64(np.array([salt ^ np.uint64(byte)], dtype=np.uint64))[0]
+    return salt
+
+
+def format_keys(seed, space, positions, space_size):
+    """
+    Berechnet die Schlüssel an den gegebenen Positionen eines Schlüsselraums.
+
+    Ganzzahlige Schlüssel (PIN) sind eine Permutation von 1..`space_size`, damit sie nicht sortiert in den Dateien
+    stehen; die übrigen Schlüssel sind UUID-formatierte 128-Bit-Werte.
+
+    Args:
+        seed (int): Der Seed.
+        space (str): Der Schlüsselraum.
+        positions (numpy.ndarray): Die Positionen (0 bis `space_size` - 1).
+        space_size (int): Die Anzahl Schlüssel im Raum.
+
+    Returns:
+        numpy.ndarray: Die Schlüssel.
+    """
+    positions = positions.astype(np.uint64)
+    if space in INTEGER_SPACES:
+        # Affine Permutation: (a * i + b) mod n mit zu n teilerfremdem a
+        multiplier = 2_654_435_761 % space_size or 1
+        while math.gcd(multiplier, space_size) != 1:
+            multiplier += 1
+        offset = seed % space_size
+        with np.errstate(over='ignore'):
+            pins = (positions * np.uint64(multiplier) + np.uint64(offset)) % np.uint64(space_size)
+        return (pins + np.uint64(1)).astype(np.int64)
+
+    salt = space_salt(seed, space)
+    high = splitmix64(positions ^ salt)
+    low = splitmix64(high ^ salt)
+    raw = np.empty((len(positions), 2), dtype='>u8')
+    raw[:, 0] = high
+    raw[:, 1] = low
+    digits = raw.tobytes().hex()
+    return np.array([f"{digits[i:i + 8]}-{digits[i + 8:i + 12]}-4{digits[i + 13:i + 16]}-"
+                     f"{digits[i + 16:i + 20]}-{digits[i + 20:i + 32]}" for i in range(0, len(digits), 32)],
+                    dtype=object)
+
+
+def random_dates(rng, count, start, end):
+    """
+    Zieht gleichverteilte Datumswerte im ISO-Format.
+
+    Args:
+        rng (numpy.random.Generator): Der Zufallsgenerator.
+        count (int): Die Anzahl Werte.
+        start (datetime.date): Das früheste Datum.
+        end (datetime.date): Das späteste Datum.
+
+    Returns:
+        numpy.ndarray: Die Datumswerte als Zeichenketten `YYYY-MM-DD`.
+    """
+    days = rng.integers(0, (end - start).days + 1, count)
+    return (np.datetime64(start, 'D') + days).astype(str)
+
+
+def pattern_values(rng, count, letters_pool, digits):
+    """
+    Bildet Werte wie `AB 123456` aus einem Buchstaben-Pool und Ziffern (z.B. Ausweisnummern).
+
+    Args:
+        rng (numpy.random.Generator): Der Zufallsgenerator.
+        count (int): Die Anzahl Werte.
+        letters_pool (numpy.ndarray): Der Pool der Buchstabenfolgen.
+        digits (int): Anzahl Ziffern.
+
+    Returns:
+        numpy.ndarray: Die Werte.
+    """
+    letters = letters_pool[rng.integers(0, len(letters_pool), count)].astype(str)
+    numbers = np.char.zfill(rng.integers(0, 10 ** digits, count).astype(str), digits)
+    return np.char.add(np.char.add(letters, ' '), numbers)
+
+
+def generate_column(rng, table, column, row_start, count, seed, space_size, pools):
+    """
+    Erzeugt eine Spalte eines Blocks vektorisiert.
+
+    Args:
+        rng (numpy.random.Generator): Der Zufallsgenerator des Blocks.
+        table (str): Der Tabellenname.
+        column (str): Der Spaltenname.
+        row_start (int): Die globale Position der ersten Zeile des Blocks innerhalb der Tabelle.
+        count (int): Die Anzahl Zeilen.
+        seed (int): Der Seed (für die Schlüssel).
+        space_size (int): Die Größe der Schlüsselräume.
+        pools (dict): Die Wertepools.
+
+    Returns:
+        numpy.ndarray: Die Spaltenwerte.
+    """
+    today = REFERENCE_DATE
+    key = KEY_SPACES.get((table, column))
+    if key is not None:
+        space, owner = key
+        if owner:
+            positions = np.arange(row_start, row_start + count) % space_size
+        else:
+            positions = rng.integers(0, space_size, count)
+        return format_keys(seed, space, positions, space_size)
+    if column in ('ID', 'STAMM', 'AUSWEISID'):
+        return format_keys(seed, f"{table}.{column}", np.arange(row_start, row_start + count), space_size)
+    if column == 'PIN':
+        return format_keys(seed, 'person', rng.integers(0, space_size, count), space_size)
+    if column == 'HISTNR':
+        return rng.integers(1, 101, count)
+    if column == 'Name':
+        return pools['last_name'][rng.integers(0, len(pools['last_name']), count)]
+    if column == 'Vorname':
+        return pools['first_name'][rng.integers(0, len(pools['first_name']), count)]
+    if column == 'Farbe':
+        return pools['color'][rng.integers(0, len(pools['color']), count)]
+    if column == 'Adresse':
+        return pools['address'][rng.integers(0, len(pools['address']), count)]
+    if column == 'Kennzeichen':
+        suffix = pools['letters2'][rng.integers(0, len(pools['letters2']), count)].astype(str)
+        return np.char.add(np.char.add(pattern_values(rng, count, pools['letters2'], 3), ' '), suffix)
+    if column == 'Ausweisnummer':
+        return pattern_values(rng, count, pools['letters3'], 6)
+    if column == 'Fahrzeugausweisnummer':
+        return pattern_values(rng, count, pools['letters2'], 6)
+    if column == 'Geburtsdatum':
+        return random_dates(rng, count, today.replace(year=today.year - 90), today.replace(year=today.year - 18))
+    if column in ('Ausstellungsdatum', 'Gültigkeitsdatum', 'Änderungsdatum', 'Baujahr'):
+        return random_dates(rng, count, today.replace(year=today.year - 30), today)
+    if column == 'Motorleistung':
+        return rng.integers(50, 401, count)
+    if column == 'Kilometerstand':
+        return rng.integers(0, 300_001, count)
+    return pools['word'][rng.integers(0, len(pools['word']), count)]
+
+
+def generate_chunk(table, schema, file_number, chunk_number, row_start, count, seed, space_size, header):
+    """
+    Erzeugt einen Block einer TXT-Datei als tabulatorgetrennten Text (Worker-Funktion).
+
+    Args:
+        table (str): Der Tabellenname.
+        schema (list): Die Spaltennamen.
+        file_number (int): Die Nummer der Datei innerhalb der ZIP-Datei.
+        chunk_number (int): Die Nummer des Blocks innerhalb der Datei.
+        row_start (int): Die globale Position der ersten Zeile innerhalb der Tabelle.
+        count (int): Die Anzahl Zeilen.
+        seed (int): Der Seed.
+        space_size (int): Die Größe der Schlüsselräume.
+        header (bool): Ob die Kopfzeile mit ausgegeben wird.
+
+    Returns:
+        bytes: Der UTF-8-kodierte Block.
+    """
+    # Vom Tabellennamen statt von der Position abgeleitet, damit eine Auswahl von Schemas dieselben Daten liefert
+    table_salt = int(space_salt(seed, table))
+    rng = np.random.default_rng(np.random.SeedSequence([table_salt, file_number, chunk_number]))
+    df = pd.DataFrame({column: generate_column(rng, table, column, row_start, count, seed, space_size, _pools)
+                       for column in schema}, columns=schema)
+    return df.to_csv(sep="\t", index=False, header=header).encode('utf-8')
+
+
+def iter_chunk_tasks(schemas, num_rows_per_file, num_txt_files_per_zip, seed, chunk_rows):
+    """
+    Zerlegt alle Dateien aller ZIP-Dateien in Blöcke, in der Reihenfolge, in der sie geschrieben werden.
+
+    Yields:
+        tuple: Tabellenname und die Argumente für `generate_chunk`.
+    """
+    space_size = num_rows_per_file * num_txt_files_per_zip
+    for table, schema in schemas.items():
+        for file_number in range(num_txt_files_per_zip):
+            for chunk_number, offset in enumerate(range(0, num_rows_per_file, chunk_rows)):
+                count = min(chunk_rows, num_rows_per_file - offset)
+                row_start = file_number * num_rows_per_file + offset
+                yield table, (table, schema, file_number, chunk_number, row_start, count, seed, space_size,
+                              chunk_number == 0)
+
+
+def create_bulk_zip_files(directory, schemas=None, num_rows_per_file=100, num_txt_files_per_zip=5, seed=0,
+                          max_workers=None, chunk_rows=CHUNK_ROWS, pool_size=POOL_SIZE, compresslevel=None):
+    """
+    Erzeugt eine ZIP-Datei pro Schema mit `num_txt_files_per_zip` TXT-Dateien wie `create_zip_files`, aber schnell.
+
+    Args:
+        directory (str): Das Zielverzeichnis.
+        schemas (dict): Die Schemas (Standard: `EXPECTED_SCHEMAS`).
+        num_rows_per_file (int): Zeilen pro TXT-Datei.
+        num_txt_files_per_zip (int): TXT-Dateien pro ZIP.
+        seed (int): Der Seed; gleiche Parameter und gleicher Seed ergeben identische Dateien.
+        max_workers (int): Anzahl Worker-Prozesse (Standard: Anzahl CPU-Kerne).
+        chunk_rows (int): Zeilen pro Block.
+        pool_size (int): Größe der Wertepools (höchstens so groß wie eine Tabelle).
+        compresslevel (int): Kompressionsstufe (Standard: zlib-Standard).
+
+    Returns:
+        list: Pro ZIP-Datei ein Dictionary mit `zip_name`, `zip_path` und `schema`.
+    """
+    schemas = schemas or EXPECTED_SCHEMAS
+    os.makedirs(directory, exist_ok=True)
+    max_workers = max_workers or os.cpu_count() or 1
+    # Faker ist der feste Anteil der Laufzeit; für kleine Korpora genügen kleinere Pools
+    pool_size = max(1, min(pool_size, num_rows_per_file * num_txt_files_per_zip))
+    tasks = iter_chunk_tasks(schemas, num_rows_per_file, num_txt_files_per_zip, seed, chunk_rows)
+    entries = []
+    # Es ist immer nur eine ZIP-Datei mit einem Member zum Schreiben geöffnet
+    current = {'table': None, 'file_number': None, 'zip_file': None, 'member': None}
+
+    def close_member():
+        if current['member'] is not None:
+            current['member'].close()
+            current['member'] = None
+
+    def write(table, file_number, data):
+        if current['table'] != table:
+            close_member()
+            if current['zip_file'] is not None:
+                current['zip_file'].close()
+            zip_path = os.path.join(directory, f"{table}.zip")
+            current['zip_file'] = zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=compresslevel)
+            current['table'] = table
+            current['file_number'] = None
+            entries.append({'zip_name': os.path.basename(zip_path), 'zip_path': zip_path, 'schema': schemas[table]})
+        if current['file_number'] != file_number:
+            close_member()
+            current['member'] = current['zip_file'].open(f"{table}_{file_number + 1}.txt", 'w', force_zip64=True)
+            current['file_number'] = file_number
+        current['member'].write(data)
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(build_pools(seed, pool_size),)) as executor:
+            # Begrenztes Vorausrechnen, damit der Speicherbedarf unabhängig von der Korpusgröße bleibt
+            window = deque()
+            for table, args in tasks:
+                window.append((table, args[2], executor.submit(generate_chunk, *args)))
+                if len(window) >= 2 * max_workers:
+                    table_name, file_number, future = window.popleft()
+                    write(table_name, file_number, future.result())
+            while window:
+                table_name, file_number, future = window.popleft()
+                write(table_name, file_number, future.result())
+    finally:
+        close_member()
+        if current['zip_file'] is not None:
+            current['zip_file'].close()
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schneller Generator für synthetische SIARD-Lieferungen")
+    parser.add_argument("directory", help="Zielverzeichnis der ZIP-Dateien")
+    parser.add_argument("--rows", type=int, default=100, help="Zeilen pro TXT-Datei")
+    parser.add_argument("--files", type=int, default=5, help="TXT-Dateien pro ZIP")
+    parser.add_argument("--seed", type=int, default=0, help="Seed für reproduzierbare Daten")
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl Worker-Prozesse")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="Zeilen pro Block")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    entries = create_bulk_zip_files(args.directory, num_rows_per_file=args.rows, num_txt_files_per_zip=args.files,
+                                    seed=args.seed, max_workers=args.workers, chunk_rows=args.chunk_rows)
+    seconds = time.perf_counter() - start
+    rows = args.rows * args.files * len(entries)
+    print(json.dumps({'zips': len(entries), 'rows': rows, 'seconds': round(seconds, 3),
+                      'rows_per_s': round(rows / seconds) if seconds else None}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
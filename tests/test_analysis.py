@@ -0,0 +1,106 @@
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+import pandas as pd
+
+from app import create_app
+from blueprints.search.analysis import (MATCH_ENGINES, filter_matches, iter_search_file, iter_search_results,
+                                        read_and_search_file, search_files)
+
+VEHICLES = pd.DataFrame({
+    "STAMM": ["a1", "b2", "c3", "d4"],
+    "Kennzeichen": ["ZH 123 AB", "BE 456 CD", "ZH 789 EF", "BS 1.2 GH"],
+    "Farbe": ["Rot", "Blau", None, "Grün"],
+    "Motorleistung": [120, 250, 90, 400],
+})
+
+
+class MatchEngineTestCase(unittest.TestCase):
+    def test_engines_agree(self):
+        for query in ["zh", "blau", "25", "nothing"]:
+            expected = filter_matches(VEHICLES, query, engine='rowwise')
+            for engine in MATCH_ENGINES:
+                self.assertEqual(filter_matches(VEHICLES, query, engine=engine)["STAMM"].tolist(),
+                                 expected["STAMM"].tolist(), f"{engine} / {query}")
+
+    def test_literal_search_by_default(self):
+        self.assertEqual(filter_matches(VEHICLES, "1.2")["STAMM"].tolist(), ["d4"])
+        self.assertEqual(filter_matches(VEHICLES, "1.3")["STAMM"].tolist(), [])
+        self.assertEqual(filter_matches(VEHICLES, "1.3", regex=True)["STAMM"].tolist(), ["a1"])
+
+
+
+class StreamingScanTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        handle, self.file_path = tempfile.mkstemp(suffix='.txt')
+        os.close(handle)
+        pd.concat([VEHICLES] * 50, ignore_index=True).to_csv(self.file_path, sep="\t", index=False)
+
+    def tearDown(self):
+        os.remove(self.file_path)
+
+    def test_streaming_matches_full_read(self):
+        expected = read_and_search_file(self.file_path, "zh", self.app)
+        streamed = read_and_search_file(self.file_path, "zh", self.app, chunk_bytes=256)
+        self.assertEqual(len(expected), 100)
+        self.assertEqual(streamed, expected)
+
+    def test_iter_search_file_yields_per_chunk(self):
+        chunks = list(iter_search_file(self.file_path, "blau", chunk_rows=40))
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual(sum(len(chunk) for chunk in chunks), 50)
+
+
+class SearchBackendTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.extract_dir = tempfile.mkdtemp()
+        for i, repeat in enumerate([1, 20, 5]):
+            pd.concat([VEHICLES] * repeat, ignore_index=True).to_csv(
+                os.path.join(self.extract_dir, f"FZ_{i}.txt"), sep="\t", index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.extract_dir, ignore_errors=True)
+
+    def test_process_backend_matches_thread_backend(self):
+        thread_results = search_files("ZH", self.extract_dir, self.app, backend='thread')
+        process_results = search_files("ZH", self.extract_dir, self.app, backend='process')
+        self.assertEqual(len(thread_results), 52)
+        self.assertEqual(sorted(map(str, process_results)), sorted(map(str, thread_results)))
+
+    def test_broken_process_pool_is_retried_once(self):
+        def executor(broken):
+            def run(function, *args):
+                future = Future()
+                if broken:
+                    future.set_exception(BrokenProcessPool('worker died'))
+                else:
+                    future.set_result(function(*args))
+                return future
+            return mock.Mock(submit=run)
+
+        with mock.patch('blueprints.search.analysis.get_process_pool', side_effect=[executor(True), executor(False)]), \
+                mock.patch('blueprints.search.analysis.discard_process_pool'):
+            results = list(iter_search_results("ZH", self.extract_dir, self.app, backend='process'))
+        self.assertEqual(sum(len(rows) for _, _, rows in results), 52)
+        self.assertFalse(any(rows.error for _, _, rows in results))
+
+        with mock.patch('blueprints.search.analysis.get_process_pool', side_effect=lambda workers: executor(True)), \
+                mock.patch('blueprints.search.analysis.discard_process_pool'):
+            results = list(iter_search_results("ZH", self.extract_dir, self.app, backend='process'))
+        self.assertEqual(sorted(number for number, _, _ in results), [0, 1, 2])
+        self.assertTrue(all(rows.error for _, _, rows in results))
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            search_files("ZH", self.extract_dir, self.app, backend='gpu')
+
+
+if __name__ == '__main__':
+    unittest.main()
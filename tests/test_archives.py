@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+import pandas as pd
+
+from app import create_app
+from blueprints.search.analysis import list_txt_files, read_and_search_file
+from blueprints.search.archives import ARCHIVES_FILENAME, open_source_columnar, split_member_path
+from blueprints.search.corpora import CORPUS_META_FILENAME, corpus_dir
+from blueprints.search.jobs import get_job_queue
+
+PERSONS = pd.DataFrame({"PIN": [1, 2], "Name": ["Meier", "Huber"], "Vorname": ["Hans", "Anna"]})
+
+
+class InPlaceSearchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.directory = tempfile.mkdtemp()
+        self.delivery = os.path.join(self.directory, 'delivery')
+        self.extract_dir = os.path.join(self.directory, 'extracted')
+        os.makedirs(self.delivery)
+        self.app.config['EXTRACT_FOLDER'] = self.extract_dir
+        self.zip_path = os.path.join(self.delivery, 'Person.zip')
+        with zipfile.ZipFile(self.zip_path, 'w') as zip_file:
+            content = PERSONS.to_csv(sep="\t", index=False)
+            zip_file.writestr('Person_1.txt', content, compress_type=zipfile.ZIP_DEFLATED)
+            zip_file.writestr('Person_2.txt', content, compress_type=zipfile.ZIP_STORED)
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def ingest(self):
+        response = self.client.post('/upload_directory', data={'directory': self.delivery})
+        job = get_job_queue(self.app).get(response.get_json()['job_id'])
+        self.assertTrue(job.wait(30))
+        self.corpus_id = job.result['corpus_id']
+        return job.result['txt_files']
+
+    def test_search_inside_zip_without_extracting(self):
+        self.app.config['SEARCH_IN_PLACE'] = True
+        members = self.ingest()
+        self.assertEqual([split_member_path(member)[1] for member in members], ['Person_1.txt', 'Person_2.txt'])
+        self.assertEqual(sorted(os.listdir(corpus_dir(self.extract_dir, self.corpus_id))),
+                         [ARCHIVES_FILENAME, CORPUS_META_FILENAME])
+
+        results = self.client.post('/search', data={'search_query': 'huber'}).get_json()['results']
+        self.assertEqual([row['PIN'] for row in results], [2, 2])
+        results = self.client.post('/detailed_search', data={'first_name': 'hans'}).get_json()['results']
+        self.assertEqual(len(results), 2)
+
+    def test_chunked_scan_of_member_matches_extracted_file(self):
+        self.app.config['SEARCH_IN_PLACE'] = True
+        self.ingest()
+        member = list_txt_files(self.extract_dir)[0]
+        self.assertEqual(read_and_search_file(member, 'meier', self.app, chunk_bytes=1),
+                         read_and_search_file(member, 'meier', self.app))
+
+    def test_streamed_members_are_searched_from_columnar_cache(self):
+        self.app.config['EXTRACT_STREAM'] = True
+        self.ingest()
+        members = list_txt_files(self.extract_dir)
+        self.assertEqual(len(members), 2)
+        self.assertIsNotNone(open_source_columnar(members[0]))
+        results = self.client.post('/search', data={'search_query': 'anna'}).get_json()['results']
+        self.assertEqual(len(results), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import tempfile
+import unittest
+
+from tests.benchmark import latency_stats, run_benchmark
+
+
+class BenchmarkTestCase(unittest.TestCase):
+    def test_latency_percentiles(self):
+        stats = latency_stats([i / 1000 for i in range(1, 101)])
+        self.assertEqual(stats['count'], 100)
+        self.assertAlmostEqual(stats['p50_ms'], 50.5)
+        self.assertAlmostEqual(stats['p99_ms'], 99.01)
+        self.assertEqual(latency_stats([]), {'count': 0})
+
+    def test_small_run_reports_all_phases(self):
+        with tempfile.TemporaryDirectory() as directory:
+            report = run_benchmark(directory, num_rows=5, num_files=1, num_zips=13, repeat=1)
+        self.assertEqual(report['scale']['total_rows'], 65)
+        self.assertEqual(report['upload']['count'], 13)
+        self.assertIn('analyze', report['ingest']['steps'])
+        self.assertGreaterEqual(report['search']['hits'], 1)
+        self.assertEqual(report['detailed_search']['count'], 2)
+        # Bei wenigen Treffern überwiegen die Kopfzeilen; verglichen wird erst bei größeren Läufen
+        self.assertGreater(report['wire_format']['compact']['bytes'], 0)
+        self.assertGreater(report['wire_format']['json']['bytes'], 0)
+        self.assertGreater(report['peak_rss_mb'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
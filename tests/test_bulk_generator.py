@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+import zipfile
+
+import pandas as pd
+
+from tests.bulk_generator import create_bulk_zip_files
+from tests.test import EXPECTED_SCHEMAS
+
+
+def read_table(directory, table):
+    frames = []
+    with zipfile.ZipFile(os.path.join(directory, f'{table}.zip')) as zip_file:
+        for name in sorted(zip_file.namelist()):
+            with zip_file.open(name) as member:
+                frames.append(pd.read_csv(member, sep="\t"))
+    return pd.concat(frames, ignore_index=True)
+
+
+class BulkGeneratorTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.entries = create_bulk_zip_files(cls.directory.name, num_rows_per_file=250, num_txt_files_per_zip=3,
+                                            seed=7, max_workers=2, chunk_rows=100, pool_size=200)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_all_schemas_are_written(self):
+        self.assertEqual([entry['zip_name'] for entry in self.entries], [f'{name}.zip' for name in EXPECTED_SCHEMAS])
+        person = read_table(self.directory.name, 'Person')
+        self.assertEqual(person.columns.tolist(), EXPECTED_SCHEMAS['Person'])
+        self.assertEqual(len(person), 750)
+        with zipfile.ZipFile(os.path.join(self.directory.name, 'Person.zip')) as zip_file:
+            self.assertEqual(zip_file.namelist(), ['Person_1.txt', 'Person_2.txt', 'Person_3.txt'])
+
+    def test_keys_are_referentially_consistent(self):
+        tables = {name: read_table(self.directory.name, name) for name in EXPECTED_SCHEMAS}
+        pins = set(tables['Person']['PIN'])
+        self.assertEqual(len(pins), len(tables['Person']))
+        for table in ('PersonHist', 'Ausweis', 'Fzausweis'):
+            self.assertTrue(set(tables[table]['PIN']) <= pins, table)
+
+        stamms = set(tables['Fzallgemein']['STAMM'])
+        self.assertEqual(stamms, set(tables['FZ']['STAMM']))
+        for table in ('Fzausweis', 'Fzallgemeinhist', 'Fzhist'):
+            self.assertTrue(set(tables[table]['STAMM']) <= stamms, table)
+
+        self.assertTrue(set(tables['Ausweiskat']['AUSWEISID']) <= set(tables['Ausweis']['ID']))
+        self.assertTrue(set(tables['Ausweiskathist']['ID']) <= set(tables['Ausweiskat']['ID']))
+        self.assertTrue(set(tables['Fzausweishist']['ID']) <= set(tables['Fzausweis']['ID']))
+
+    def test_output_is_deterministic(self):
+        with tempfile.TemporaryDirectory() as directory:
+            create_bulk_zip_files(directory, schemas={'Fzausweis': EXPECTED_SCHEMAS['Fzausweis']},
+                                  num_rows_per_file=250, num_txt_files_per_zip=3, seed=7, max_workers=1, pool_size=200,
+                                  chunk_rows=100)
+            pd.testing.assert_frame_equal(read_table(directory, 'Fzausweis'),
+                                          read_table(self.directory.name, 'Fzausweis'))
+
+
+if __name__ == '__main__':
+    unittest.main()
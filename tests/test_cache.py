@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from app import create_app
+from blueprints.search.cache import ResultCache, corpus_fingerprint, estimate_size, normalize_query
+from blueprints.search.results import ResultTable
+
+PERSONS = pd.DataFrame({"PIN": [1, 2], "Name": ["Meier", "Huber"]})
+
+
+class ResultCacheTestCase(unittest.TestCase):
+    def test_lru_eviction_by_bytes(self):
+        entry = [(0, 'a.txt', [{'Name': 'Meier'}])]
+        cache = ResultCache(max_bytes=estimate_size(entry) * 2)
+        cache.put('a', entry)
+        cache.put('b', entry)
+        self.assertIsNotNone(cache.get('a'))
+        cache.put('c', entry)
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_incomplete_searches_are_not_cached(self):
+        cache = ResultCache(max_bytes=1024 * 1024)
+        produce = lambda skip_files: iter([(0, 'a.txt', [{'Name': 'Meier'}]), (1, 'b.txt', [])])
+        next(iter(cache.cached('key', produce)))
+        self.assertIsNone(cache.get('key'))
+        list(cache.cached('key', produce))
+        self.assertEqual(len(cache.get('key')), 2)
+
+    def test_searches_with_failed_files_are_not_cached(self):
+        cache = ResultCache(max_bytes=1024 * 1024)
+        produce = lambda skip_files: iter([(0, 'a.txt', ResultTable(['Name'], [['Meier']], [0])),
+                                           (1, 'b.txt', ResultTable(error='worker died'))])
+        self.assertEqual(len(list(cache.cached('key', produce))), 2)
+        self.assertIsNone(cache.get('key'))
+
+    def test_normalize_query(self):
+        self.assertEqual(normalize_query('Hans MEIER'), 'hans meier')
+        self.assertNotEqual(normalize_query('hans  meier'), normalize_query('hans meier'))
+
+
+class CachedSearchRoutesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.extract_dir = tempfile.mkdtemp()
+        self.app.config['EXTRACT_FOLDER'] = self.extract_dir
+        PERSONS.to_csv(os.path.join(self.extract_dir, 'Person_1.txt'), sep="\t", index=False)
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.extract_dir, ignore_errors=True)
+
+    def test_repeated_query_hits_cache_until_corpus_changes(self):
+        fingerprint = corpus_fingerprint(self.extract_dir)
+        for query in ['Meier', ' meier ']:
+            response = self.client.post('/search', data={'search_query': query})
+            self.assertEqual(len(response.get_json()['results']), 1)
+        stats = self.client.get('/cache_stats').get_json()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+        PERSONS.to_csv(os.path.join(self.extract_dir, 'Person_2.txt'), sep="\t", index=False)
+        self.assertNotEqual(corpus_fingerprint(self.extract_dir), fingerprint)
+        response = self.client.post('/search', data={'search_query': 'meier'})
+        self.assertEqual(len(response.get_json()['results']), 2)
+        self.assertEqual(self.client.get('/cache_stats').get_json()['misses'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from app import create_app
+from blueprints.search.analysis import read_and_search_file
+from blueprints.search.columnar import convert_to_columnar, open_columnar, parse_bound, update_columnar_cache
+
+PERSONS = pd.DataFrame({
+    "PIN": [1, 2, 3, 4],
+    "Name": ["Meier", "Huber", None, "Keller"],
+    "Adresse": ["Bahnhofstrasse 1, Zürich", "Seeweg 2, Bern", "Hauptgasse 3, Basel", "Langstrasse 250, Zürich"],
+    "Gewicht": [70.5, None, 81.0, 25.0],
+})
+
+
+class ColumnarCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, 'Person_1.txt')
+        PERSONS.to_csv(self.file_path, sep="\t", index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_columnar_search_matches_text_search(self):
+        queries = ['zürich', '25', 'MEIER', 'nan', 'xyz']
+        expected = [read_and_search_file(self.file_path, query, self.app) for query in queries]
+
+        convert_to_columnar(self.file_path, chunk_rows=3)
+        table = open_columnar(self.file_path)
+        self.assertEqual(table.rows, 4)
+        self.assertEqual(table.meta['kinds'], ['i', 'U', 'U', 'f'])
+
+        for query, results in zip(queries, expected):
+            self.assertEqual(str(read_and_search_file(self.file_path, query, self.app)), str(results), query)
+
+    def test_typed_columns_and_zone_maps(self):
+        persons = pd.DataFrame({
+            "PIN": range(10),
+            "Geburtsdatum": ["1950-01-01", "1960-06-15", "1970-03-03", None, "1980-12-31",
+                             "01.02.1985", "1990-01-01", "1995-05-05", "2000-01-01", "2010-10-10"],
+            "Motorleistung": [50, 80, 120, 150, 180, 210, 240, 270, 300, 330],
+        })
+        persons.to_csv(self.file_path, sep="\t", index=False)
+        convert_to_columnar(self.file_path, chunk_rows=4)
+        table = open_columnar(self.file_path)
+        self.assertEqual(table.range_type('Geburtsdatum'), 'date')
+        self.assertEqual(table.range_type('Motorleistung'), 'number')
+        self.assertIsNone(table.range_type('Name'))
+
+        born_in_80s = [('Geburtsdatum', '>=') + parse_bound('1980-01-01'),
+                       ('Geburtsdatum', '<=') + parse_bound('31.12.1989')]
+        self.assertEqual(table.filter_ranges(born_in_80s).tolist(), [4, 5])
+        self.assertEqual(table.filter_ranges([('Motorleistung', '>') + parse_bound('200')], [1, 6, 9]).tolist(),
+                         [6, 9])
+        # Grenzen außerhalb der Zone Map: die Tabelle wird gar nicht gelesen
+        self.assertFalse(table.may_match([('Motorleistung', '>') + parse_bound('330')]))
+        # Zahlengrenze auf einer Datumsspalte: keine Zone Map, zeilenweise typisiert findet sie nichts
+        self.assertEqual(table.filter_ranges([('Geburtsdatum', '>') + parse_bound('100')]).tolist(), [])
+
+        # Kleine Blöcke: nur Blöcke, deren Bereich passt, werden ausgewertet
+        table.meta['zone_rows'] = 4
+        table.meta['zones'] = {'2': [[50, 150], [180, 270], [300, 330]]}
+        table._load = lambda i, part: self.fail('zone map should skip all blocks')
+        self.assertFalse(table.may_match([('Motorleistung', '<') + parse_bound('10')]))
+        self.assertEqual(table.filter_ranges([('Motorleistung', '=') + parse_bound('160')]).tolist(), [])
+
+    def test_dirty_values_keep_range_predicates(self):
+        persons = pd.DataFrame({
+            "PIN": range(12),
+            "Geburtsdatum": ["unbekannt"] + [f"19{70 + i}-01-01" for i in range(11)],
+            "Motorleistung": ["k.A."] + [str(50 + 10 * i) for i in range(11)],
+        })
+        persons.to_csv(self.file_path, sep="\t", index=False)
+        convert_to_columnar(self.file_path)
+        table = open_columnar(self.file_path)
+        self.assertEqual(table.range_type('Geburtsdatum'), 'date')
+        self.assertIsNone(table.range_type('Motorleistung'))
+        self.assertEqual(table.filter_ranges([('Geburtsdatum', '>=') + parse_bound('1980-01-01')]).tolist(), [11])
+        # Ohne Typ im Cache wird zeilenweise typisiert statt die Tabelle zu überspringen
+        ranges = [('Motorleistung', '>') + parse_bound('130')]
+        self.assertTrue(table.may_match(ranges))
+        self.assertEqual(table.filter_ranges(ranges).tolist(), [10, 11])
+
+    def test_text_is_stored_with_variable_length_and_only_once(self):
+        persons = pd.DataFrame({
+            "PIN": [1, 2, 3],
+            "Name": ["Müller", "x" * 10000, "Gößmann"],
+            "Kanton": ["zh", "be", None],
+        })
+        persons.to_csv(self.file_path, sep="\t", index=False)
+        target = convert_to_columnar(self.file_path)
+        table = open_columnar(self.file_path)
+        self.assertEqual(table.meta['shared_text'], [2])
+        self.assertFalse(os.path.exists(os.path.join(target, '2.text.bin')))
+        # Der lange Wert vergrößert nur seine eigene Zeile
+        self.assertEqual(os.path.getsize(os.path.join(target, '1.values.bin')), len("MüllerGößmann".encode()) + 10003)
+
+        self.assertEqual(table.search('müll')['PIN'].tolist(), [1])
+        self.assertEqual(table.search('zh')['Kanton'].tolist(), ['zh'])
+        self.assertEqual(table.search('^g.ß', regex=True)['Name'].tolist(), ['Gößmann'])
+        self.assertEqual(table.filter_rows([('Name', 'ößm')], rows=[0, 2]).tolist(), [2])
+        self.assertEqual(table.take([2, 1], ['Kanton'])['Kanton'].isna().tolist(), [True, False])
+
+    def test_projection_only_searches_requested_columns(self):
+        convert_to_columnar(self.file_path)
+        table = open_columnar(self.file_path)
+        self.assertEqual(table.search('25')['PIN'].tolist(), [4])
+        self.assertEqual(table.search('25', columns=['Gewicht'])['PIN'].tolist(), [4])
+        self.assertEqual(table.search('25', columns=['Name']).empty, True)
+
+    def test_stale_cache_is_ignored_and_rebuilt(self):
+        self.assertEqual(update_columnar_cache([self.file_path]), 1)
+        self.assertEqual(update_columnar_cache([self.file_path]), 0)
+        PERSONS.head(2).to_csv(self.file_path, sep="\t", index=False)
+        self.assertIsNone(open_columnar(self.file_path))
+        self.assertEqual(update_columnar_cache([self.file_path]), 1)
+        self.assertEqual(open_columnar(self.file_path).rows, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
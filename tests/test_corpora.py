@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+import pandas as pd
+
+from app import create_app
+from blueprints.search.corpora import corpus_dir, list_corpora, select_evictions
+from blueprints.search.index import SearchIndex, index_path_for
+from blueprints.search.jobs import get_job_queue
+
+
+class CorpusNamespaceTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.directory = tempfile.mkdtemp()
+        self.extract_dir = os.path.join(self.directory, 'extracted')
+        self.app.config['EXTRACT_FOLDER'] = self.extract_dir
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def ingest(self, name, persons):
+        delivery = os.path.join(self.directory, name)
+        os.makedirs(delivery)
+        with zipfile.ZipFile(os.path.join(delivery, 'Person.zip'), 'w') as zip_file:
+            zip_file.writestr('Person_1.txt', pd.DataFrame(persons).to_csv(sep="\t", index=False))
+        response = self.client.post('/upload_directory', data={'directory': delivery})
+        self.assertEqual(response.status_code, 202)
+        job = get_job_queue(self.app).get(response.get_json()['job_id'])
+        self.assertTrue(job.wait(30))
+        return job.result['corpus_id']
+
+    def search(self, query, corpus=None):
+        data = {'search_query': query}
+        if corpus is not None:
+            data['corpus'] = corpus
+        return self.client.post('/search', data=data)
+
+    def test_same_file_name_in_two_corpora(self):
+        first = self.ingest('a', {"PIN": [1], "Name": ["Meier"]})
+        second = self.ingest('b', {"PIN": [2], "Name": ["Meier"]})
+        self.assertNotEqual(first, second)
+
+        self.assertEqual(len(self.search('meier').get_json()['results']), 2)
+        self.assertEqual([row['PIN'] for row in self.search('meier', second).get_json()['results']], [2])
+        self.assertEqual(len(self.search('meier', f'{first},{second}').get_json()['results']), 2)
+        self.assertEqual(self.search('meier', 'missing').status_code, 400)
+        self.assertEqual(self.search('meier', '../etc').status_code, 400)
+
+    def test_delete_corpus_removes_files_and_index_entries(self):
+        first = self.ingest('a', {"PIN": [1], "Name": ["Meier"]})
+        second = self.ingest('b', {"PIN": [2], "Name": ["Huber"]})
+        self.assertEqual(self.client.delete(f'/corpora/{first}').status_code, 200)
+        self.assertEqual(self.client.delete(f'/corpora/{first}').status_code, 404)
+
+        self.assertFalse(os.path.exists(corpus_dir(self.extract_dir, first)))
+        self.assertEqual([corpus['id'] for corpus in self.client.get('/corpora').get_json()['corpora']], [second])
+        self.assertEqual(self.search('meier').get_json()['results'], [])
+        covered = SearchIndex(index_path_for(self.extract_dir)).covered_files(
+            [os.path.join(corpus_dir(self.extract_dir, second), 'Person', 'Person_1.txt')])
+        self.assertEqual(len(covered), 1)
+
+    def test_oldest_corpora_are_evicted_over_quota(self):
+        first = self.ingest('a', {"PIN": [1], "Name": ["Meier"]})
+        self.app.config['CORPUS_MAX_BYTES'] = 1
+        second = self.ingest('b', {"PIN": [2], "Name": ["Huber"]})
+        self.assertEqual([corpus['id'] for corpus in list_corpora(self.extract_dir)], [second])
+        self.assertFalse(os.path.exists(corpus_dir(self.extract_dir, first)))
+
+    def test_select_evictions(self):
+        corpora = [{'id': 'old', 'created': 0, 'size': 10},
+                   {'id': 'mid', 'created': 50, 'size': 10},
+                   {'id': 'new', 'created': 100, 'size': 10}]
+        self.assertEqual(select_evictions(corpora, max_age_seconds=60, now=100), ['old'])
+        self.assertEqual(select_evictions(corpora, max_bytes=15, now=100), ['old', 'mid'])
+        self.assertEqual(select_evictions(corpora, max_bytes=15, keep=['old'], now=100), ['mid', 'new'])
+
+
+if __name__ == '__main__':
+    unittest.main()
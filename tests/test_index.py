@@ -0,0 +1,86 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+import pandas as pd
+
+from app import create_app
+from blueprints.search.analysis import search_files
+from blueprints.search.index import SearchIndex, index_path_for, is_indexable
+from blueprints.search.jobs import get_job_queue
+
+PERSONS = pd.DataFrame({
+    "PIN": [1, 2, 3],
+    "Name": ["Meier", "Muster-Hansen", "Keller"],
+    "Vorname": ["Anna", "Max", "Eva"],
+    "Adresse": ["Bahnhofstrasse 1, Zürich", "Seeweg 2, Bern", "Hauptgasse 3, Basel"],
+})
+
+
+class SearchIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.config['TESTING'] = True
+        self.extract_dir = tempfile.mkdtemp()
+        self.app.config['EXTRACT_FOLDER'] = self.extract_dir
+        self.file_path = os.path.join(self.extract_dir, 'Person_1.txt')
+        PERSONS.to_csv(self.file_path, sep="\t", index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.extract_dir, ignore_errors=True)
+
+    def test_index_answers_query(self):
+        index = SearchIndex(index_path_for(self.extract_dir))
+        self.assertEqual(index.update([self.file_path]), 1)
+        self.assertEqual(index.update([self.file_path]), 0)
+
+        covered = index.covered_files([self.file_path])
+        candidates = index.candidate_rows('hansen', covered.values())
+        self.assertEqual(list(candidates.values()), [[1]])
+        self.assertEqual(index.read_rows(*next(iter(candidates.items())))['Vorname'].tolist(), ['Max'])
+
+    def test_search_uses_index_and_falls_back_for_new_files(self):
+        SearchIndex(index_path_for(self.extract_dir)).update([self.file_path])
+        PERSONS.assign(Name=["Meyer", "Huber", "Graf"]).to_csv(
+            os.path.join(self.extract_dir, 'Person_2.txt'), sep="\t", index=False)
+
+        results = search_files('Bahnhofstrasse 1', self.extract_dir, self.app)
+        self.assertEqual(sorted(result['Name'] for result in results), ['Meier', 'Meyer'])
+
+    def test_regex_queries_are_not_indexable(self):
+        self.assertTrue(is_indexable('Meier'))
+        self.assertTrue(is_indexable('Me.er'))
+        self.assertFalse(is_indexable('Me.er', regex=True))
+        self.assertFalse(is_indexable('--'))
+
+    def test_upload_builds_index(self):
+        os.remove(self.file_path)
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zip_file:
+            zip_file.writestr('Person_3.txt', PERSONS.to_csv(sep="\t", index=False))
+        archive.seek(0)
+
+        client = self.app.test_client()
+        cwd = os.getcwd()
+        os.chdir(self.extract_dir)
+        try:
+            response = client.post('/upload', data={'file': (archive, 'Person.zip')},
+                                   content_type='multipart/form-data')
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(response.status_code, 202)
+        job = get_job_queue(self.app).get(response.get_json()['job_id'])
+        self.assertTrue(job.wait(30))
+
+        index = SearchIndex(index_path_for(self.extract_dir))
+        self.assertEqual(len(index.covered_files(job.result['txt_files'])), 1)
+
+        response = client.post('/search', data={'search_query': 'keller'})
+        self.assertEqual([result['Vorname'] for result in response.get_json()['results']], ['Eva'])
+
+
+if __name__ == '__main__':
+    unittest.main()
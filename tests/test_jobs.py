@@ -0,0 +1,59 @@
+import threading
+import unittest
+
+from app import create_app
+from blueprints.search.jobs import JOB_FAILED, JOB_FINISHED, JobQueue, QueueFullError
+
+
+class JobQueueTestCase(unittest.TestCase):
+    def test_job_reports_progress_and_timing(self):
+        queue = JobQueue(max_workers=1, max_pending=2)
+
+        def work(job, count):
+            for number in range(count):
+                job.set_progress('extract', number, count)
+            job.set_progress('index')
+            return {'files': count}
+
+        job = queue.submit('upload', work, 3)
+        self.assertTrue(job.wait(10))
+        info = queue.get(job.id).to_dict()
+        self.assertEqual(info['status'], JOB_FINISHED)
+        self.assertEqual(info['result'], {'files': 3})
+        self.assertEqual(sorted(info['timing']['steps']), ['extract', 'index'])
+
+    def test_failed_job_keeps_error(self):
+        queue = JobQueue(max_workers=1, max_pending=2)
+        job = queue.submit('upload', lambda job: 1 / 0)
+        self.assertTrue(job.wait(10))
+        self.assertEqual(job.status, JOB_FAILED)
+        self.assertIn('division', job.error)
+
+    def test_full_queue_rejects_jobs(self):
+        queue = JobQueue(max_workers=1, max_pending=1)
+        release = threading.Event()
+        job = queue.submit('upload', lambda job: release.wait(10))
+        with self.assertRaises(QueueFullError):
+            queue.submit('upload', lambda job: None)
+        release.set()
+        self.assertTrue(job.wait(10))
+        self.assertTrue(queue.submit('upload', lambda job: None).wait(10))
+
+
+class JobRoutesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.config['JOB_QUEUE_SIZE'] = 0
+        self.client = self.app.test_client()
+
+    def test_full_queue_returns_429(self):
+        response = self.client.post('/upload_directory', data={'directory': '/nonexistent'})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response.headers)
+
+    def test_unknown_job_returns_404(self):
+        self.assertEqual(self.client.get('/jobs/unknown').status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
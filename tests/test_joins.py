@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from app import create_app
+from blueprints.search.index import SearchIndex, index_path_for, key_value
+from blueprints.search.joins import files_by_table, plan_joins, resolve_related
+
+TABLES = {
+    'Person_1.txt': pd.DataFrame({"PIN": [1, 2], "Name": ["Meier", "Huber"], "Vorname": ["Hans", "Anna"]}),
+    'Fzausweis_1.txt': pd.DataFrame({"ID": ["a", "b", "c"], "STAMM": ["s1", "s2", "s3"], "PIN": [1, 1, 2],
+                                     "Fahrzeugausweisnummer": ["FA 1", "FA 2", "FA 3"]}),
+    'FZ_1.txt': pd.DataFrame({"STAMM": ["s1", "s2", "s3"], "Kennzeichen": ["ZH 1", "ZH 2", "BE 3"]}),
+    'FZ_2.txt': pd.DataFrame({"STAMM": ["s9"], "Kennzeichen": ["SG 9"]}),
+    'Ausweis_1.txt': pd.DataFrame({"ID": ["x"], "PIN": [2], "Ausweisnummer": ["AB 1"]}),
+}
+
+
+class JoinEngineTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.extract_dir = tempfile.mkdtemp()
+        self.app.config['EXTRACT_FOLDER'] = self.extract_dir
+        files = []
+        for name, df in TABLES.items():
+            files.append(os.path.join(self.extract_dir, name))
+            df.to_csv(files[-1], sep="\t", index=False)
+        self.index = SearchIndex(index_path_for(self.extract_dir))
+        self.index.update(files)
+
+    def tearDown(self):
+        shutil.rmtree(self.extract_dir, ignore_errors=True)
+
+    def test_plan_follows_shortest_path_to_targets(self):
+        self.assertEqual(plan_joins('Person', ['FZ']),
+                         [('Person', 'PIN', 'Fzausweis', 'PIN'), ('Fzausweis', 'STAMM', 'FZ', 'STAMM')])
+        self.assertEqual(plan_joins('FZ', ['Person'], max_depth=1), [])
+
+    def test_vehicles_of_person(self):
+        tables = files_by_table(self.index, self.extract_dir)
+        self.assertEqual(len(tables['FZ']), 2)
+        start = [{"PIN": 1, "Name": "Meier"}]
+        found = resolve_related(self.index, tables, 'Person', start, targets=['FZ'])
+        self.assertEqual(sorted(found), ['FZ', 'Person'])
+        self.assertEqual(sorted(row['Kennzeichen'] for row in found['FZ']), ['ZH 1', 'ZH 2'])
+
+    def test_key_values_are_normalized(self):
+        self.assertEqual(key_value(2.0), '2')
+        self.assertEqual(key_value(float('nan')), '')
+        self.assertEqual(len(self.index.lookup_keys('PIN', [2.0], range(1, 6))), 3)
+
+    def test_related_route(self):
+        client = self.app.test_client()
+        response = client.post('/related', data={'table': 'Person', 'column': 'PIN', 'value': '2'})
+        counts = response.get_json()['counts']
+        self.assertEqual((counts['Person'], counts['Fzausweis'], counts['FZ'], counts['Ausweis']), (1, 1, 1, 1))
+
+        response = client.post('/related', data={'table': 'Person', 'last_name': 'Meier', 'targets': 'FZ'})
+        self.assertEqual(response.get_json()['counts'], {'Person': 1, 'FZ': 2})
+        self.assertEqual(client.post('/related', data={'table': 'Person'}).status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import logging
+import os
+import tempfile
+import unittest
+from logging.handlers import QueueHandler
+
+import config
+
+
+class QueueLoggingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.directory.name, 'test.log')
+        self.logging_config = {
+            'version': 1,
+            'disable_existing_loggers': False,
+            'formatters': {'default': {'format': '%(levelname)s %(module)s: %(message)s'}},
+            'handlers': {
+                'file': {'class': 'logging.FileHandler', 'formatter': 'default', 'level': 'INFO',
+                         'filename': self.log_path},
+            },
+            'loggers': {'queued_test': {'handlers': ['file'], 'level': 'DEBUG', 'propagate': False}},
+            'queue_loggers': ['queued_test'],
+        }
+
+    def tearDown(self):
+        config.configure_logging(config.Config.LOGGING)
+        self.directory.cleanup()
+
+    def test_records_are_written_by_the_listener(self):
+        config.configure_logging(self.logging_config)
+        logger = logging.getLogger('queued_test')
+        self.assertEqual([type(handler) for handler in logger.handlers], [QueueHandler])
+
+        logger.info("Searched %d files for %s", 3, 'meier')
+        logger.debug("Below the handler level: %s", 'dropped')
+        config.stop_log_listeners()
+
+        self.assertIsInstance(logger.handlers[0], logging.FileHandler)
+        with open(self.log_path) as f:
+            self.assertEqual(f.read().splitlines(), ['INFO test_logging: Searched 3 files for meier'])
+
+        for handler in logger.handlers:
+            handler.close()
+
+
+class AppLoggerTestCase(unittest.TestCase):
+    def test_flask_logger_is_queued(self):
+        from app import create_app
+        logger = create_app().logger
+        self.assertEqual(logger.name, 'app')
+        self.assertEqual([type(handler) for handler in logger.handlers], [QueueHandler])
+
+
+if __name__ == '__main__':
+    unittest.main()
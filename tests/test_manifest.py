@@ -0,0 +1,94 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+import pandas as pd
+
+from app import create_app
+from blueprints.search.corpora import corpus_dir
+from blueprints.search.jobs import get_job_queue
+from blueprints.search.manifest import Manifest
+from blueprints.search.pipeline import extract_archives
+
+PERSONS = pd.DataFrame({"PIN": [1, 2], "Name": ["Meier", "Huber"], "Vorname": ["Hans", "Anna"]})
+
+
+class IncrementalIngestTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.delivery = os.path.join(self.directory, 'delivery')
+        self.extract_dir = os.path.join(self.directory, 'extracted')
+        os.makedirs(self.delivery)
+        self.write_zip('Person', {'Person_1.txt': PERSONS, 'Person_2.txt': PERSONS})
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def write_zip(self, name, members):
+        zip_path = os.path.join(self.delivery, f'{name}.zip')
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            for member, df in members.items():
+                zip_file.writestr(member, df.to_csv(sep="\t", index=False))
+        return zip_path
+
+    def extract(self):
+        archives = [(os.path.join(self.delivery, 'Person.zip'), os.path.join(self.extract_dir, 'Person'))]
+        manifest = Manifest(self.extract_dir)
+        result = extract_archives(archives, max_workers=2, manifest=manifest)
+        manifest.save()
+        return result
+
+    def test_unchanged_members_are_skipped(self):
+        txt_files, stats = self.extract()
+        self.assertEqual(len(txt_files), 2)
+        self.assertEqual(stats['skipped'], 0)
+
+        txt_files, stats = self.extract()
+        self.assertEqual((txt_files, stats['members'], stats['skipped']), ([], 0, 2))
+
+        changed = pd.concat([PERSONS, PERSONS.head(1)], ignore_index=True)
+        self.write_zip('Person', {'Person_1.txt': PERSONS, 'Person_2.txt': changed})
+        txt_files, stats = self.extract()
+        self.assertEqual([os.path.basename(path) for path in txt_files], ['Person_2.txt'])
+        self.assertEqual(stats['skipped'], 1)
+
+    def ingest(self, app, corpus=''):
+        response = app.test_client().post('/upload_directory', data={'directory': self.delivery, 'corpus': corpus})
+        job = get_job_queue(app).get(response.get_json()['job_id'])
+        self.assertTrue(job.wait(30))
+        return job.result
+
+    def test_failed_processing_is_retried(self):
+        app = create_app()
+        app.config['EXTRACT_FOLDER'] = self.extract_dir
+        with mock.patch('blueprints.search.routes.SearchIndex.update', side_effect=OSError("disk full")):
+            result = self.ingest(app)
+        self.assertEqual(len(result['txt_files']), 2)
+        self.assertFalse(os.path.exists(os.path.join(self.extract_dir, 'manifest.json')))
+
+        # Die Dateien wurden nicht als verarbeitet vermerkt und werden beim nächsten Ingest indexiert
+        self.assertEqual(len(self.ingest(app, result['corpus_id'])['txt_files']), 2)
+        self.assertEqual(self.ingest(app, result['corpus_id'])['txt_files'], [])
+
+    def test_reingest_merges_artefacts(self):
+        app = create_app()
+        app.config['EXTRACT_FOLDER'] = self.extract_dir
+        result = self.ingest(app)
+        self.assertEqual(len(result['txt_files']), 2)
+        self.write_zip('Vehicle', {'Fahrzeug_1.txt': PERSONS})
+        txt_files = self.ingest(app, result['corpus_id'])['txt_files']
+        self.assertEqual([os.path.basename(path) for path in txt_files], ['Fahrzeug_1.txt'])
+
+        directory = corpus_dir(self.extract_dir, result['corpus_id'])
+        with open(os.path.join(directory, 'schemas.json')) as f:
+            self.assertEqual(sorted(json.load(f)), ['Fahrzeug_1.txt', 'Person_1.txt', 'Person_2.txt'])
+        with open(os.path.join(directory, 'structure.json')) as f:
+            self.assertEqual(sorted(json.load(f)['.']['dirs']), ['Person', 'Vehicle'])
+
+
+if __name__ == '__main__':
+    unittest.main()
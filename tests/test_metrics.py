@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from app import create_app
+from blueprints.search.jobs import get_job_queue
+from blueprints.search.metrics import Histogram, STAGE_SECONDS, observe, start_request, submit
+
+
+class HistogramTestCase(unittest.TestCase):
+    def test_render_prometheus_text(self):
+        histogram = Histogram('test_seconds', 'Test.', ('stage',), buckets=(0.1, 1.0))
+        histogram.observe(0.05, stage='parse')
+        histogram.observe(0.5, stage='parse')
+        histogram.observe(5, stage='parse')
+        lines = histogram.render()
+        self.assertIn('# TYPE test_seconds histogram', lines)
+        self.assertIn('test_seconds_bucket{stage="parse",le="0.1"} 1', lines)
+        self.assertIn('test_seconds_bucket{stage="parse",le="1.0"} 2', lines)
+        self.assertIn('test_seconds_bucket{stage="parse",le="+Inf"} 3', lines)
+        self.assertIn('test_seconds_count{stage="parse"} 3', lines)
+        self.assertIn('test_seconds_sum{stage="parse"} 5.55', lines)
+
+    def test_request_timings_reach_worker_threads(self):
+        timings = start_request()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [submit(executor, observe, 'match', 0.25) for _ in range(4)]
+            for future in futures:
+                future.result()
+        self.assertEqual(timings.to_dict()['match'], {'seconds': 1.0, 'count': 4})
+        self.assertIn('match;dur=1000.00', timings.server_timing())
+
+
+class MetricsEndpointTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.directory = tempfile.mkdtemp()
+        self.app.config['EXTRACT_FOLDER'] = os.path.join(self.directory, 'extracted')
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_search_reports_stage_timings(self):
+        with zipfile.ZipFile(os.path.join(self.directory, 'Person.zip'), 'w') as zip_file:
+            zip_file.writestr('Person_1.txt', pd.DataFrame({"PIN": [1, 2], "Name": ["Meier", "Huber"]})
+                              .to_csv(sep="\t", index=False))
+        response = self.client.post('/upload_directory', data={'directory': self.directory})
+        self.assertTrue(get_job_queue(self.app).get(response.get_json()['job_id']).wait(30))
+
+        response = self.client.post('/search', data={'search_query': 'meier'})
+        self.assertEqual(len(response.get_json()['results']), 1)
+        stages = [entry.split(';')[0] for entry in response.headers['Server-Timing'].split(', ')]
+        self.assertIn('discover', stages)
+        self.assertIn('serialize', stages)
+        self.assertEqual(stages[-1], 'total')
+
+        snapshot = STAGE_SECONDS.snapshot()
+        for stage in ('extract', 'schema', 'discover', 'parse', 'match'):
+            self.assertIn((stage,), snapshot)
+
+        metrics = self.client.get('/metrics')
+        self.assertEqual(metrics.status_code, 200)
+        self.assertTrue(metrics.content_type.startswith('text/plain'))
+        text = metrics.get_data(as_text=True)
+        self.assertIn('search_stage_seconds_count{stage="match"}', text)
+        self.assertIn('search_request_seconds_bucket{endpoint="search_bp.search",method="POST",status="200",le="+Inf"}',
+                      text)
+
+
+if __name__ == '__main__':
+    unittest.main()
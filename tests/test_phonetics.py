@@ -0,0 +1,33 @@
+import unittest
+
+from blueprints.search.phonetics import cologne_phonetics, deletion_variants, edit_distance, tokens_match
+
+
+class PhoneticsTestCase(unittest.TestCase):
+    def test_cologne_phonetics(self):
+        self.assertEqual(cologne_phonetics('Müller-Lüdenscheidt'), '65752682')
+        self.assertEqual(cologne_phonetics('Wikipedia'), '3412')
+        self.assertEqual({cologne_phonetics(name) for name in ('Meier', 'Meyer', 'Maier', 'Mayr')}, {'67'})
+        self.assertEqual(cologne_phonetics('Schmidt'), cologne_phonetics('Schmitt'))
+        self.assertEqual(cologne_phonetics('42'), '')
+
+    def test_edit_distance(self):
+        self.assertEqual(edit_distance('meier', 'meire', 2), 1)
+        self.assertEqual(edit_distance('huber', 'hubert', 2), 1)
+        self.assertEqual(edit_distance('huber', 'meier', 1), 2)
+        self.assertEqual(edit_distance('abc', 'abcdef', 2), 3)
+
+    def test_deletion_variants_share_a_key_within_distance(self):
+        self.assertEqual(deletion_variants('ab'), {'ab'})
+        self.assertTrue(deletion_variants('bernhard') & deletion_variants('bernard'))
+        self.assertTrue(deletion_variants('bernhard') & deletion_variants('bennhadr'))
+
+    def test_tokens_match(self):
+        self.assertTrue(tokens_match('meyer', 'maier'))
+        self.assertTrue(tokens_match('hubr', 'huber'))
+        self.assertFalse(tokens_match('12', '13'))
+        self.assertFalse(tokens_match('huber', 'meier'))
+
+
+if __name__ == '__main__':
+    unittest.main()
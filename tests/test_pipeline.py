@@ -0,0 +1,54 @@
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+import pandas as pd
+
+from blueprints.search.columnar import load_columnar
+from blueprints.search.pipeline import extract_archives, member_columnar_path, member_target, zip_stamp
+
+PERSONS = pd.DataFrame({"PIN": [1, 2], "Name": ["Meier", "Huber"]})
+
+
+class ParallelExtractionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.archives = []
+        for name in ('Person', 'PersonHist'):
+            zip_path = os.path.join(self.directory, f'{name}.zip')
+            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+                for i in range(3):
+                    zip_file.writestr(f'{name}_{i + 1}.txt', PERSONS.to_csv(sep="\t", index=False))
+                zip_file.writestr('header/metadata.xml', '<siardArchive/>')
+            self.archives.append((zip_path, os.path.join(self.directory, 'out', name)))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_extracts_all_members_in_parallel(self):
+        txt_files, stats = extract_archives(self.archives, max_workers=4)
+        self.assertEqual(len(txt_files), 6)
+        self.assertEqual(stats['members'], 8)
+        self.assertGreater(stats['mb_per_s'], 0)
+        self.assertTrue(os.path.exists(os.path.join(self.archives[0][1], 'header', 'metadata.xml')))
+        self.assertEqual(pd.read_csv(txt_files[0], sep="\t")['Name'].tolist(), ['Meier', 'Huber'])
+        self.assertFalse([name for name in os.listdir(self.archives[0][1]) if name.endswith('.part')])
+
+    def test_stream_mode_writes_columnar_cache_only(self):
+        cache_dirs, stats = extract_archives(self.archives, max_workers=4, stream=True)
+        self.assertEqual(stats['members'], 6)
+        zip_path, extract_dir = self.archives[0]
+        self.assertIn(member_columnar_path(zip_path, 'Person_1.txt'), cache_dirs)
+        table = load_columnar(member_columnar_path(zip_path, 'Person_1.txt'), zip_stamp(zip_path))
+        self.assertEqual(table.search('huber')['PIN'].tolist(), [2])
+        self.assertFalse(os.path.exists(extract_dir))
+
+    def test_unsafe_member_paths_are_rejected(self):
+        self.assertIsNone(member_target(self.directory, '../evil.txt'))
+        self.assertEqual(member_target(self.directory, 'a/b.txt'), os.path.join(self.directory, 'a', 'b.txt'))
+
+
+if __name__ == '__main__':
+    unittest.main()
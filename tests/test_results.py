@@ -0,0 +1,57 @@
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from app import create_app
+from blueprints.search.analysis import read_and_search_file
+from blueprints.search.columnar import convert_to_columnar
+from blueprints.search.results import ResultTable, dumps
+
+PERSONS = pd.DataFrame({
+    "PIN": range(1, 9),
+    "Name": ["Meier", "Huber", None, "Keller", "Meyer", "Graf", "Maier", "Meierhans"],
+    "Gewicht": [70.5, None, 81.0, 25.0, 60.0, 90.5, 77.0, 66.0],
+})
+
+
+class ResultTableTestCase(unittest.TestCase):
+    def test_behaves_like_list_of_dicts(self):
+        results = ResultTable.from_frame(PERSONS[PERSONS["Gewicht"] > 70])
+        self.assertEqual(results.row_numbers, [0, 2, 5, 6])
+        self.assertEqual(results[0], {"PIN": 1, "Name": "Meier", "Gewicht": 70.5})
+        self.assertEqual(results[1]["Name"], None)
+        self.assertEqual(results[2:].row_numbers, [5, 6])
+        self.assertEqual(results[:1], [{"PIN": 1, "Name": "Meier", "Gewicht": 70.5}])
+        self.assertEqual(pickle.loads(pickle.dumps(results)), results)
+        self.assertEqual(len(ResultTable.from_frame(PERSONS.iloc[0:0])), 0)
+
+    def test_dumps_native_values(self):
+        results = ResultTable.from_frame(PERSONS.head(2))
+        self.assertEqual(json.loads(dumps(results.rows)), [[1, "Meier", 70.5], [2, "Huber", None]])
+
+
+class ProvenanceTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, 'Person_1.txt')
+        PERSONS.to_csv(self.file_path, sep="\t", index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_row_numbers_agree_across_read_paths(self):
+        expected = read_and_search_file(self.file_path, 'mei', self.app)
+        self.assertEqual(expected.row_numbers, [0, 7])
+        self.assertEqual(read_and_search_file(self.file_path, 'mei', self.app, chunk_bytes=64), expected)
+        convert_to_columnar(self.file_path, chunk_rows=3)
+        self.assertEqual(read_and_search_file(self.file_path, 'mei', self.app).row_numbers, [0, 7])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+from fuzzywuzzy import process
+
+from blueprints.search.common import correct_schema
+from blueprints.search.schema_matching import CANDIDATES, correct_header
+from tests.test import EXPECTED_SCHEMAS
+
+
+def reference_correct_schema(columns):
+    # Bisherige Implementierung: jede Spalte einzeln gegen die vollständige Kandidatenliste
+    candidates = [col for schema in EXPECTED_SCHEMAS.values() for col in schema]
+    corrected = []
+    for col in columns:
+        best_match, score = process.extractOne(col, candidates)
+        corrected.append(best_match if score > 80 else col)
+    return corrected
+
+
+class SchemaMatchingTestCase(unittest.TestCase):
+    def test_matches_previous_implementation(self):
+        headers = [
+            ['PIN', 'Nmae', 'Vornme', 'Geburtsdatum', 'Adrese'],
+            ['STAMM', 'Kennzeichn', 'Farbe', 'Motorleistug', 'Kilometerstand'],
+            ['ID', 'AUSWEISID', 'Kategorie', 'Unbekannt', 'xyz'],
+        ]
+        for header in headers:
+            self.assertEqual(correct_schema(header), reference_correct_schema(header), header)
+
+    def test_candidates_are_unique(self):
+        self.assertEqual(len(CANDIDATES), len(set(CANDIDATES)))
+        self.assertIn('Fahrzeugausweisnummer', CANDIDATES)
+
+    def test_headers_are_memoized(self):
+        header = ('PIN', 'Name', 'Vornme')
+        correct_header(header)
+        hits = correct_header.cache_info().hits
+        self.assertEqual(correct_schema(list(header)), ['PIN', 'Name', 'Vorname'])
+        self.assertEqual(correct_header.cache_info().hits, hits + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from app import create_app
+from blueprints.search.extraction import read_schemas, sniff_schema
+
+PERSONS = pd.DataFrame({
+    "PIN": [1, 2, 3],
+    "Nmae": ["Meier", "Huber", "Keller"],
+    "Geburtsdatum": ["1980-01-02", "1975-12-31", None],
+    "Gewicht": [70.5, None, 81.0],
+    "Notiz": [None, None, None],
+})
+
+
+class SchemaSniffingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, 'Person_1.txt')
+        PERSONS.to_csv(self.file_path, sep="\t", index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_small_file_is_read_exactly(self):
+        schema = sniff_schema(self.file_path)
+        self.assertEqual(schema['columns'], ['PIN', 'Nmae', 'Geburtsdatum', 'Gewicht', 'Notiz'])
+        self.assertEqual(schema['types'], ['integer', 'string', 'date', 'float', 'empty'])
+        self.assertEqual((schema['estimated_rows'], schema['exact_rows']), (3, True))
+
+    def test_row_count_is_estimated_from_sample(self):
+        large = pd.concat([PERSONS] * 5000, ignore_index=True)
+        large.to_csv(self.file_path, sep="\t", index=False)
+        schema = sniff_schema(self.file_path, sample_bytes=4096)
+        self.assertFalse(schema['exact_rows'])
+        self.assertAlmostEqual(schema['estimated_rows'], len(large), delta=len(large) * 0.05)
+
+    def test_read_schemas_in_parallel(self):
+        PERSONS.to_csv(os.path.join(self.directory, 'Person_2.txt'), sep="\t", index=False)
+        with self.app.app_context():
+            schemas = read_schemas(self.directory, max_workers=2)
+        self.assertEqual(sorted(schemas), ['Person_1.txt', 'Person_2.txt'])
+        self.assertEqual(schemas['Person_2.txt']['estimated_rows'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+import pandas as pd
+
+from app import create_app
+from blueprints.search.jobs import get_job_queue
+from blueprints.search.siard import iter_table_rows, read_siard_metadata
+
+METADATA = """<?xml version="1.0" encoding="UTF-8"?>
+<siardArchive xmlns="http://www.bar.admin.ch/xmlns/siard/2/metadata.xsd" version="2.1">
+  <dbname>Fahrzeugregister</dbname>
+  <schemas>
+    <schema>
+      <name>REG</name>
+      <folder>schema0</folder>
+      <tables>
+        <table>
+          <name>Person</name>
+          <folder>table0</folder>
+          <columns>
+            <column><name>PIN</name><type>INTEGER</type></column>
+            <column><name>Name</name><type>VARCHAR(100)</type></column>
+            <column><name>Vorname</name><type>VARCHAR(100)</type></column>
+          </columns>
+          <rows>3</rows>
+        </table>
+        <table>
+          <name>Fahrzeug</name>
+          <folder>table1</folder>
+          <columns>
+            <column><name>STAMM</name><type>VARCHAR(36)</type></column>
+            <column><name>Kennzeichen</name><type>VARCHAR(20)</type></column>
+          </columns>
+          <rows>1</rows>
+        </table>
+      </tables>
+    </schema>
+  </schemas>
+</siardArchive>
+"""
+
+PERSON_TABLE = """<?xml version="1.0" encoding="UTF-8"?>
+<table xmlns="http://www.bar.admin.ch/xmlns/siard/2/table.xsd">
+  <row><c1>1</c1><c2>Meier</c2><c3>Anna</c3></row>
+  <row><c1>2</c1><c2>Back\\u005cslash\\u0009Tab</c2></row>
+  <row><c1>3</c1><c2>Zeilen
+umbruch</c2><c3>"Jo"</c3></row>
+</table>
+"""
+
+VEHICLE_TABLE = """<?xml version="1.0" encoding="UTF-8"?>
+<table xmlns="http://www.bar.admin.ch/xmlns/siard/2/table.xsd">
+  <row><c1>abc-1</c1><c2>ZH 12345</c2></row>
+</table>
+"""
+
+
+def create_siard(path, person_table=PERSON_TABLE):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr('header/metadata.xml', METADATA)
+        zip_file.writestr('content/schema0/table0/table0.xml', person_table)
+        zip_file.writestr('content/schema0/table1/table1.xml', VEHICLE_TABLE)
+
+
+class SiardParsingTestCase(unittest.TestCase):
+    def test_metadata_and_rows(self):
+        buffer = io.BytesIO()
+        create_siard(buffer)
+        with zipfile.ZipFile(buffer) as zip_file:
+            tables = read_siard_metadata(zip_file)
+            self.assertEqual([(table['schema'], table['name'], table['rows']) for table in tables],
+                             [('REG', 'Person', 3), ('REG', 'Fahrzeug', 1)])
+            self.assertEqual(tables[0]['columns'], ['PIN', 'Name', 'Vorname'])
+            self.assertEqual(tables[0]['member'], 'content/schema0/table0/table0.xml')
+            with zip_file.open(tables[0]['member']) as source:
+                rows = list(iter_table_rows(source, 3))
+        self.assertEqual(rows, [['1', 'Meier', 'Anna'], ['2', 'Back\\slash\tTab', ''],
+                                ['3', 'Zeilen\numbruch', '"Jo"']])
+
+
+class SiardIngestTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.directory = tempfile.mkdtemp()
+        self.app.config['EXTRACT_FOLDER'] = os.path.join(self.directory, 'extracted')
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def ingest(self):
+        response = self.client.post('/upload_directory', data={'directory': self.directory})
+        self.assertEqual(response.status_code, 202)
+        job = get_job_queue(self.app).get(response.get_json()['job_id'])
+        self.assertTrue(job.wait(30))
+        self.assertIsNone(job.error)
+        return job.result
+
+    def test_siard_tables_are_searchable(self):
+        create_siard(os.path.join(self.directory, 'register.siard'))
+        result = self.ingest()
+        self.assertEqual([os.path.basename(path) for path in result['txt_files']], ['Fahrzeug_1.txt', 'Person_1.txt'])
+        person = pd.read_csv(sorted(result['txt_files'])[1], sep="\t")
+        self.assertEqual(person['Name'].tolist(), ['Meier', 'Back\\slash\tTab', 'Zeilen\numbruch'])
+
+        results = self.client.post('/search', data={'search_query': 'zh 12345'}).get_json()['results']
+        self.assertEqual(results, [{'STAMM': 'abc-1', 'Kennzeichen': 'ZH 12345'}])
+        results = self.client.post('/detailed_search', data={'first_name': 'anna'}).get_json()['results']
+        self.assertEqual([row['PIN'] for row in results], [1])
+
+        # Unveränderte Tabellen werden beim erneuten Ingest in denselben Korpus übersprungen
+        response = self.client.post('/upload_directory', data={'directory': self.directory,
+                                                              'corpus': result['corpus_id']})
+        job = get_job_queue(self.app).get(response.get_json()['job_id'])
+        self.assertTrue(job.wait(30))
+        self.assertEqual(job.result['txt_files'], [])
+
+    def test_packages_with_the_same_tables_are_kept_apart(self):
+        create_siard(os.path.join(self.directory, 'register.siard'))
+        create_siard(os.path.join(self.directory, 'archiv.siard'), PERSON_TABLE.replace('Meier', 'Muster'))
+        result = self.ingest()
+        self.assertEqual(len(result['txt_files']), 4)
+        self.assertEqual({os.path.basename(os.path.dirname(os.path.dirname(path))) for path in result['txt_files']},
+                         {'register', 'archiv'})
+        results = self.client.post('/detailed_search', data={'first_name': 'anna'}).get_json()['results']
+        self.assertEqual(sorted(row['Name'] for row in results), ['Meier', 'Muster'])
+
+        response = self.client.post('/upload_directory', data={'directory': self.directory,
+                                                              'corpus': result['corpus_id']})
+        job = get_job_queue(self.app).get(response.get_json()['job_id'])
+        self.assertTrue(job.wait(30))
+        self.assertEqual(job.result['txt_files'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from app import create_app
+from blueprints.search.results import ResultTable
+from blueprints.search.streaming import InvalidCursorError, decode_cursor, encode_cursor, paginate
+
+PERSONS = pd.DataFrame({
+    "PIN": range(1, 8),
+    "Name": ["Meier", "Meyer", "Huber", "Maier", "Graf", "Meierhans", "Keller"],
+})
+
+
+class PaginationTestCase(unittest.TestCase):
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor({0, 1, 2, 5, 7, 8}, partial_file=3, partial_offset=4)
+        self.assertEqual(decode_cursor(cursor), ({0, 1, 2, 5, 7, 8}, {3: 4}))
+        self.assertEqual(decode_cursor(''), (set(), {}))
+        with self.assertRaises(InvalidCursorError):
+            decode_cursor('not-a-cursor')
+
+    def test_paginate_splits_file_results(self):
+        file_results = [(0, 'a.txt', [1, 2]), (1, 'b.txt', [3, 4, 5]), (2, 'c.txt', [])]
+        pages = list(paginate(iter(file_results), 3))
+        self.assertEqual(pages[:2], [('results', [1, 2]), ('results', [3])])
+        self.assertEqual(decode_cursor(pages[2][1]), ({0}, {1: 1}))
+
+        done_files, partial = decode_cursor(pages[2][1])
+        remaining = [entry for entry in file_results if entry[0] not in done_files]
+        self.assertEqual(list(paginate(iter(remaining), 3, done_files, partial)),
+                         [('results', [4, 5]), ('cursor', None)])
+
+
+class StreamingRoutesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.config['TESTING'] = True
+        self.extract_dir = tempfile.mkdtemp()
+        self.app.config['EXTRACT_FOLDER'] = self.extract_dir
+        for i in range(3):
+            PERSONS.to_csv(os.path.join(self.extract_dir, f'Person_{i}.txt'), sep="\t", index=False)
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.extract_dir, ignore_errors=True)
+
+    def test_cursor_pagination_returns_every_hit_once(self):
+        names = []
+        cursor = ''
+        for _ in range(10):
+            response = self.client.post('/search', data={'search_query': 'mei', 'limit': 2, 'cursor': cursor})
+            self.assertEqual(response.status_code, 200)
+            data = response.get_json()
+            self.assertLessEqual(len(data['results']), 2)
+            names.extend(result['Name'] for result in data['results'])
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(sorted(names), sorted(['Meier', 'Meierhans'] * 3))
+
+    def test_ndjson_stream(self):
+        response = self.client.post('/search', data={'search_query': 'er', 'stream': '1', 'limit': 4})
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual(len([line for line in lines if 'result' in line]), 4)
+        self.assertEqual(lines[-1]['count'], 4)
+        self.assertIsNotNone(lines[-1]['next_cursor'])
+
+    def test_compact_format_sends_each_header_once(self):
+        response = self.client.post('/search', data={'search_query': 'mei', 'format': 'compact'})
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['headers'], [['PIN', 'Name']])
+        self.assertEqual(sorted(entry['file'] for entry in data['files']), [0, 1, 2])
+        self.assertEqual({entry['table'] for entry in data['files']}, {'Person'})
+        self.assertEqual(sorted(data['rows']), [[number, row, pin, name] for number in range(3)
+                                                for row, pin, name in ((0, 1, 'Meier'), (5, 6, 'Meierhans'))])
+        self.assertIsNone(data['next_cursor'])
+
+    def test_compact_ndjson_stream(self):
+        response = self.client.post('/search', data={'search_query': 'er', 'stream': '1', 'limit': 4,
+                                                     'format': 'compact'})
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual(lines[0], {'header': 0, 'columns': ['PIN', 'Name']})
+        self.assertEqual(len([line for line in lines if isinstance(line, list)]), 4)
+        self.assertEqual(lines[-1]['count'], 4)
+        self.assertIsNotNone(lines[-1]['next_cursor'])
+
+    def test_failed_files_are_reported_and_not_marked_done(self):
+        file_results = [(0, 'a.txt', ResultTable(['PIN'], [[1]], [0])), (1, 'b.txt', ResultTable(error='boom'))]
+        pages = list(paginate(iter(file_results), 1))
+        self.assertEqual(pages[1], ('failed', 1))
+        self.assertIsNone(pages[2][1])
+        with mock.patch('blueprints.search.routes.iter_search_results', return_value=iter(file_results)):
+            data = self.client.post('/search', data={'search_query': 'mei'}).get_json()
+        self.assertEqual(data['failed_files'], [1])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.post('/search', data={'search_query': 'mei', 'cursor': 'broken'})
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+from werkzeug.datastructures import MultiDict
+
+from app import create_app
+from blueprints.search.columnar import update_columnar_cache
+from blueprints.search.index import SearchIndex, index_path_for
+from blueprints.search.structured import build_range_predicates, iter_structured_results, order_predicates
+
+PERSONS = pd.DataFrame({
+    "PIN": [1, 2, 3],
+    "Vorname": ["Hans", "Anna", "Hans"],
+    "Name": ["Meier", "Meier", "Huber"],
+    "Adresse": ["Hansweg 1, Zürich", "Seeweg 2, Bern", "Hauptgasse 3, Basel"],
+    "Geburtsdatum": ["1975-04-01", "1984-11-30", "1991-07-14"],
+})
+VEHICLES = pd.DataFrame({
+    "STAMM": [10, 11],
+    "Kennzeichen": ["ZH 12345", "BE 999"],
+    "Modell": ["Meier Roadster", "Golf"],
+})
+
+
+class StructuredSearchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.extract_dir = tempfile.mkdtemp()
+        self.app.config['EXTRACT_FOLDER'] = self.extract_dir
+        self.files = [os.path.join(self.extract_dir, name) for name in ('Person_1.txt', 'FZ_1.txt')]
+        PERSONS.to_csv(self.files[0], sep="\t", index=False)
+        VEHICLES.to_csv(self.files[1], sep="\t", index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.extract_dir, ignore_errors=True)
+
+    def search(self, predicates, fuzzy=False, ranges=()):
+        results = list(iter_structured_results(predicates, self.extract_dir, self.app, fuzzy=fuzzy, ranges=ranges))
+        return sorted(row['PIN'] for _, _, rows in results for row in rows)
+
+    def assert_all_modes(self, predicates, expected, fuzzy=False, ranges=()):
+        self.assertEqual(self.search(predicates, fuzzy, ranges), expected)
+        SearchIndex(index_path_for(self.extract_dir)).update(self.files)
+        self.assertEqual(self.search(predicates, fuzzy, ranges), expected)
+        update_columnar_cache(self.files)
+        self.assertEqual(self.search(predicates, fuzzy, ranges), expected)
+
+    def test_predicates_are_column_bound_and_combined(self):
+        # "Hans" im Vornamen, nicht in der Adresse; "Meier" nur im Namen, nicht im Fahrzeugmodell
+        self.assert_all_modes([('Vorname', 'hans'), ('Name', 'meier')], [1])
+
+    def test_tables_without_columns_are_skipped(self):
+        results = list(iter_structured_results([('Kennzeichen', 'zh 12')], self.extract_dir, self.app))
+        self.assertEqual([len(rows) for _, _, rows in sorted(results)], [1, 0])
+
+    def test_any_column_predicate(self):
+        self.assert_all_modes([('Name', 'meier'), (None, 'bern')], [2])
+
+    def test_fuzzy_name_predicates(self):
+        self.assert_all_modes([('Name', 'meyer')], [1, 2], fuzzy=True)
+        self.assertEqual(self.search([('Name', 'meyer')]), [])
+
+    def test_fuzzy_typos_combined_with_exact_predicates(self):
+        # Tippfehler im Namen, phonetische Variante in der Adresse, exaktes Prädikat auf allen Spalten
+        self.assert_all_modes([('Name', 'hubr'), ('Adresse', 'hauptgase'), (None, 'basel')], [3], fuzzy=True)
+        self.assertEqual(self.search([('Vorname', 'anna'), ('Adresse', 'bärn')], fuzzy=True), [2])
+
+    def test_fuzzy_never_loses_exact_hits(self):
+        for predicates in ([('Name', 'mei')], [('Adresse', 'hansw')], [('Vorname', 'ann'), ('Adresse', 'seew')]):
+            expected = self.search(predicates)
+            self.assertTrue(expected, predicates)
+            self.assert_all_modes(predicates, expected, fuzzy=True)
+
+    def test_range_predicates(self):
+        form = MultiDict([('range', 'Geburtsdatum:1980-01-01..'), ('range', 'PIN < 3')])
+        ranges = build_range_predicates(form)
+        self.assertEqual([(column, op, kind) for column, op, kind, _ in ranges],
+                         [('Geburtsdatum', '>=', 'date'), ('PIN', '<', 'number')])
+        self.assert_all_modes([], [2], ranges=ranges)
+        self.assertEqual(self.search([('Name', 'meier')], ranges=build_range_predicates(
+            MultiDict([('range', 'Geburtsdatum:..31.12.1979')]))), [1])
+        with self.assertRaises(ValueError):
+            build_range_predicates(MultiDict([('range', 'Geburtsdatum:gestern..')]))
+
+    def test_range_predicates_with_dirty_dates(self):
+        PERSONS.assign(Geburtsdatum=["unbekannt", "1975-04-01", "1984-11-30"]).to_csv(self.files[0], sep="\t",
+                                                                                        index=False)
+        ranges = build_range_predicates(MultiDict([('range', 'Geburtsdatum>=1980-01-01')]))
+        self.assert_all_modes([], [3], ranges=ranges)
+
+    def test_order_predicates(self):
+        predicates = [(None, 'zürich'), ('Name', 'm'), ('Vorname', 'hans')]
+        self.assertEqual(order_predicates(predicates), [('Vorname', 'hans'), ('Name', 'm'), (None, 'zürich')])
+        counts = {('Name', 'm'): 1, ('Vorname', 'hans'): 5}
+        self.assertEqual(order_predicates(predicates, counts)[0], ('Name', 'm'))
+
+    def test_detailed_search_route(self):
+        client = self.app.test_client()
+        response = client.post('/detailed_search', data={'first_name': 'Hans', 'last_name': 'Meier'})
+        self.assertEqual([row['PIN'] for row in response.get_json()['results']], [1])
+        self.assertEqual(client.post('/detailed_search', data={}).status_code, 400)
+        response = client.post('/detailed_search', data={'first_name': 'Hanns', 'last_name': 'Maier', 'fuzzy': '1'})
+        self.assertEqual([row['PIN'] for row in response.get_json()['results']], [1])
+        response = client.post('/detailed_search', data={'range': 'Geburtsdatum:1980-01-01..1989-12-31'})
+        self.assertEqual([row['PIN'] for row in response.get_json()['results']], [2])
+        self.assertEqual(client.post('/detailed_search', data={'range': 'PIN>abc'}).status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+import zlib
+
+import pandas as pd
+
+from app import create_app
+from blueprints.search.jobs import get_job_queue
+from blueprints.search.uploads import (UploadConflictError, add_range, create_upload, expire_uploads,
+                                      finalize_upload, missing_ranges, read_upload, record_upload_job, write_chunk)
+
+
+def build_archive():
+    persons = pd.DataFrame({"PIN": range(5000), "Name": [f"Name{i}" for i in range(5000)]})
+    persons.loc[4321, "Name"] = "Chunkmann"
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as zip_file:
+        zip_file.writestr('Person_1.txt', persons.to_csv(sep="\t", index=False))
+        zip_file.writestr('Adresse_1.txt', "PIN\tOrt\n1\tBern\n")
+    return buffer.getvalue()
+
+
+class RangeTestCase(unittest.TestCase):
+    def test_ranges_are_merged(self):
+        ranges = add_range([], 10, 20)
+        ranges = add_range(ranges, 30, 40)
+        self.assertEqual(missing_ranges(ranges, 50), [[0, 10], [20, 30], [40, 50]])
+        ranges = add_range(ranges, 15, 30)
+        self.assertEqual(ranges, [[10, 40]])
+        self.assertEqual(missing_ranges(add_range(ranges, 0, 10), 40), [])
+
+
+class ChunkedUploadTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.directory = tempfile.mkdtemp()
+        self.app.config['EXTRACT_FOLDER'] = os.path.join(self.directory, 'extracted')
+        self.app.config['UPLOAD_FOLDER'] = os.path.join(self.directory, 'uploads')
+        self.client = self.app.test_client()
+        self.data = build_archive()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def put(self, upload_url, start, end):
+        return self.client.put(upload_url, data=self.data[start:end],
+                               headers={'Content-Range': f'bytes {start}-{end - 1}/{len(self.data)}'})
+
+    def test_out_of_order_resumable_upload(self):
+        response = self.client.post('/uploads', data={'filename': 'Person.zip', 'size': len(self.data)})
+        self.assertEqual(response.status_code, 201)
+        upload_url = response.get_json()['upload_url']
+        upload_id = response.get_json()['upload_id']
+        size = len(self.data)
+        chunk = size // 4
+
+        # Das Ende zuerst: das zentrale Verzeichnis wird gelesen, obwohl der Rest noch fehlt
+        status = self.put(upload_url, 3 * chunk, size).get_json()
+        self.assertEqual(status['members'], 2)
+        self.assertIsNone(status['crc32'])
+        self.assertEqual(status['missing'], [[0, 3 * chunk]])
+
+        # Abgebrochener Chunk: der empfangene Teil bleibt erhalten
+        with self.assertRaises(ValueError):
+            write_chunk(self.app.config['UPLOAD_FOLDER'], upload_id, 0, chunk,
+                        io.BytesIO(self.data[:chunk // 2]), buffer_bytes=1024)
+        status = self.client.get(upload_url).get_json()
+        self.assertEqual(status['missing'], [[chunk // 2, 3 * chunk]])
+        self.assertEqual(status['hashed_bytes'], chunk // 2)
+
+        self.assertEqual(self.client.post(f'{upload_url}/finalize').status_code, 409)
+        self.put(upload_url, 2 * chunk, 3 * chunk)
+        status = self.put(upload_url, chunk // 2, 2 * chunk).get_json()
+        self.assertEqual(status['missing'], [])
+        self.assertEqual(status['crc32'], f"{zlib.crc32(self.data):08x}")
+
+        response = self.client.post(f'{upload_url}/finalize', data={'crc32': '00000000'})
+        self.assertEqual(response.status_code, 422)
+        response = self.client.post(f'{upload_url}/finalize', data={'crc32': status['crc32']})
+        self.assertEqual(response.status_code, 202)
+        job = get_job_queue(self.app).get(response.get_json()['job_id'])
+        self.assertTrue(job.wait(30))
+        self.assertIsNone(job.error)
+
+        results = self.client.post('/search', data={'search_query': 'chunkmann'}).get_json()['results']
+        self.assertEqual([row['PIN'] for row in results], [4321])
+
+    def test_invalid_archive_is_rejected_when_tail_arrives(self):
+        upload_root = self.app.config['UPLOAD_FOLDER']
+        meta = create_upload(upload_root, 'Person.zip', 1000)
+        write_chunk(upload_root, meta['id'], 500, 500, io.BytesIO(b'x' * 500))
+        self.assertEqual(read_upload(upload_root, meta['id'])['archive'], {'pending': True})
+
+        response = self.client.put(f"/uploads/{meta['id']}", data=b'y' * 500)
+        self.assertEqual(response.status_code, 400)
+        self.data = b'y' * 1000
+        response = self.put(f"/uploads/{meta['id']}", 0, 500)
+        self.assertEqual(response.status_code, 422)
+        self.assertIsNotNone(response.get_json()['archive_error'])
+        self.assertEqual(self.client.post(f"/uploads/{meta['id']}/finalize").status_code, 422)
+        self.assertEqual(self.client.delete(f"/uploads/{meta['id']}").status_code, 200)
+        self.assertEqual(self.client.get(f"/uploads/{meta['id']}").status_code, 404)
+
+    def test_finalize_is_idempotent_and_rejects_late_chunks(self):
+        upload_root = self.app.config['UPLOAD_FOLDER']
+        meta = create_upload(upload_root, 'Person.zip', len(self.data))
+        upload_url = f"/uploads/{meta['id']}"
+        chunk = len(self.data) // 2
+
+        # Während ein Chunk geschrieben wird, kann der Upload nicht abgeschlossen werden
+        class FinalizingStream(io.BytesIO):
+            def read(stream, size=-1):
+                with self.assertRaises(UploadConflictError):
+                    finalize_upload(upload_root, meta['id'])
+                return io.BytesIO.read(stream, size)
+
+        write_chunk(upload_root, meta['id'], 0, chunk, FinalizingStream(self.data[:chunk]))
+        self.put(upload_url, chunk, len(self.data))
+
+        first = self.client.post(f'{upload_url}/finalize')
+        second = self.client.post(f'{upload_url}/finalize')
+        self.assertEqual(first.status_code, 202)
+        self.assertEqual(second.status_code, 202)
+        self.assertEqual(second.get_json()['job_id'], first.get_json()['job_id'])
+        self.assertEqual(second.get_json()['corpus_id'], first.get_json()['corpus_id'])
+        self.assertTrue(get_job_queue(self.app).get(first.get_json()['job_id']).wait(30))
+        self.assertEqual(len(self.client.get('/corpora').get_json()['corpora']), 1)
+        self.assertEqual(self.put(upload_url, 0, chunk).status_code, 409)
+
+    def test_sizes_are_checked(self):
+        self.app.config['UPLOAD_MAX_BYTES'] = len(self.data) - 1
+        response = self.client.post('/uploads', data={'filename': 'Person.zip', 'size': len(self.data)})
+        self.assertEqual(response.status_code, 400)
+
+        meta = create_upload(self.app.config['UPLOAD_FOLDER'], 'Person.zip', len(self.data))
+        response = self.client.put(f"/uploads/{meta['id']}", data=self.data[:100],
+                                   headers={'Content-Range': f'bytes 0-99/{len(self.data) + 1}'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(f"/uploads/{meta['id']}").get_json()['received_bytes'], 0)
+
+    def test_finalized_uploads_expire(self):
+        upload_root = self.app.config['UPLOAD_FOLDER']
+        extracted = create_upload(upload_root, 'Person.zip', 0)
+        in_place = create_upload(upload_root, 'Adresse.zip', 0)
+        for meta in (extracted, in_place):
+            finalize_upload(upload_root, meta['id'])
+        record_upload_job(upload_root, extracted['id'], 'job1', 'corpus1')
+        record_upload_job(upload_root, in_place['id'], 'job2', 'corpus2', in_place=True)
+
+        later = read_upload(upload_root, in_place['id'])['updated'] + 120
+        self.assertEqual(expire_uploads(upload_root, 60, later, keep_corpora={'corpus2'}), [extracted['id']])
+        self.assertEqual(expire_uploads(upload_root, 60, later), [in_place['id']])
+
+
+if __name__ == '__main__':
+    unittest.main()